@@ -1,6 +1,7 @@
 from flask import Flask, render_template, request, jsonify, send_from_directory
 import requests
 from bs4 import BeautifulSoup
+import hashlib
 import json
 import os
 from datetime import datetime
@@ -8,12 +9,94 @@ import re
 import time
 import random
 import string
+import threading
+import zlib
 from urllib.parse import urlparse, urljoin
+from collections import Counter, namedtuple
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: only the in-process lock applies
+    fcntl = None
+
+from keyword_matcher import KeywordMatcher, score_hits
+from render_router import (choose_route, record_static_result, record_render_result, static_only,
+                           get_render_stats, reset_domain, render_deadline, ROUTE_STATIC, ROUTE_RENDER,
+                           RENDER_MIN_BUDGET)
+from ingredient_normalizer import normalize_ingredients, split_ingredients
+from ingredient_dictionary import dictionary_lock, pack_record, unpack_record, find_ingredient_id, ingredient_name
+from cascade import run_cascade, CONFIDENCE_THRESHOLDS, DEFAULT_THRESHOLD
+from strategy_stats import get_strategy_stats, reset_domain as reset_strategy_domain
+from extraction_context import ExtractionContext, SCRAPE_BUDGET
+from lazy_fields import LazyFields
+from singleflight import SingleFlight
+from url_utils import normalize_url, canonicalize_url, is_valid_url
+from job_queue import create_job, get_job, list_jobs, get_results, cancel_job, retry_dead, start_workers
+import refresh_scheduler
+import robots_cache
+from discovery import discover, DISCOVERY_MAX_URLS
+from domain_registry import (domain_config, skips, SITE_CONFIDENCE, STRATEGY_APPLAWS_PROBE, STRATEGY_VIVA_RAW_PROBE,
+                             STRATEGY_GENERIC)
+from patterns import (APPLAWS_GA_PATTERNS, APPLAWS_INGREDIENTS_RE, APPLAWS_INGREDIENT_FALLBACK_PATTERNS,
+                      APPLAWS_INGREDIENT_PATTERNS, BACKGROUND_IMAGE_RE, BRAND_CLASS_RE, BRAND_LABEL_RE,
+                      BRAND_NAME_RE, BRAND_PREFIX_RE, CALORIES_PER_KG_PATTERNS, CAMEL_CASE_BREAK_RE,
+                      CHICKEN_LIST_RE, CHICKEN_TO_ROSEMARY_RE, DESCRIPTION_CALORIES_RE,
+                      DESCRIPTION_INGREDIENTS_RE, DIGITS_ONLY_RE, ESCAPED_NEWLINE_RE, ESCAPED_SLASH_RE,
+                      FACT_ITEM_RE, FIBRE_RE, FRISKIES_RE, FRISKIES_WORD_RE, GA_COMPONENT_PATTERNS,
+                      GA_FAT_MIN_RE, GA_MOISTURE_MAX_RE, GA_PROTEIN_MIN_RE, HTML_GA_COMPONENT_PATTERNS,
+                      HTML_IMAGE_URL_PATTERNS, HTML_TAG_RE, INGREDIENTS_LABEL_PREFIX_RE, INGREDIENTS_LABEL_RE,
+                      INGREDIENT_START_PATTERNS, INGREDIENT_TEXT_PATTERNS, KCAL_PER_KG_RE, KCAL_PER_OZ_RE,
+                      LABEL_INFO_PATTERNS, LABEL_INGREDIENTS_RE, LABEL_PROTEIN_LIST_RE, LEADING_NON_WORD_RE,
+                      METAFIELD_FACTS_RE, NUMBER_RE, OG_IMAGE_PATTERNS, ONP_INGREDIENT_PATTERNS,
+                      OUR_INGREDIENTS_RE, PACKAGE_SIZE_PATTERNS, REPEATED_INGREDIENTS_LABEL_RE,
+                      SCRIPT_IMAGE_PATTERNS, SHOPIFY_CDN_RE, SHOPIFY_PRODUCT_PATH_RE, SIZE_DETAIL_ATTR_RE,
+                      SIZE_IN_TEXT_RE, SIZE_NUMBER_UNIT_RE, SIZE_OPTION_NAME_RE, SIZE_PATTERNS,
+                      SIZE_UNIT_STANDARDIZATIONS, SKU_LABEL_RE, SLASH_SPACING_RE,
+                      TARGET_ESCAPED_BRAND_NAME_RE, TARGET_RENDERED_INGREDIENT_PATTERNS,
+                      TARGET_RENDERED_SIMPLE_RE, TARGET_SHOP_ALL_PATTERNS, TARGET_TITLE_SIZE_RE,
+                      TRAILING_NON_ANALYSIS_RE, TRAILING_NON_INGREDIENT_RE, TRAILING_NON_WORD_RE,
+                      UNICODE_ESCAPE_RE, VARIANT_PARAM_RE, VOLATILE_MARKUP_RE, VIVA_AAFCO_START_PATTERNS, VIVA_CALORIE_PATTERNS,
+                      VIVA_FALLBACK_INGREDIENTS_RE, VIVA_HUMANELY_RAISED_RE, VIVA_INFO_KCAL_PER_OUNCE_RE,
+                      VIVA_INGREDIENT_PATTERNS, VIVA_MARKETING_END_PATTERNS, VIVA_NATURAL_SUPPLEMENTS_RE,
+                      VIVA_PURE_INGREDIENTS_RE, VIVA_SCRIPT_CALORIE_PATTERNS, WHITESPACE_RE, WP_CONTENT_RE)
 
 app = Flask(__name__)
 
-# File to store scraped data
-DATA_FILE = 'scraped_data.json'
+# File to store scraped data (worker daemons on other machines can share it, and the ingredient
+# dictionary stored beside it, on a common volume)
+DATA_FILE = os.environ.get('DATA_FILE', 'scraped_data.json')
+
+# Serializes read-modify-write cycles on DATA_FILE between concurrent scrapes
+_data_lock = threading.Lock()
+
+# Earlier values kept per record when a rescrape changes fields (newest last); 0 keeps no history
+DATA_HISTORY_LIMIT = int(os.environ.get('DATA_HISTORY_LIMIT', 20))
+
+# Fields GET /changes reports on unless ?fields= says otherwise (formula changes)
+CHANGE_FIELDS = ['ingredients', 'guaranteedAnalysis']
+
+# Scrapes in flight, keyed by normalized URL and fields, so duplicates share one execution
+scrape_flights = SingleFlight()
+
+# Largest HTML /extract accepts once decompressed, in bytes
+EXTRACT_MAX_BYTES = int(os.environ.get('EXTRACT_MAX_BYTES', 20 * 1024 * 1024))
+
+# Set up comprehensive headers to mimic a real browser
+REQUEST_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Accept-Encoding': 'gzip, deflate',
+    'DNT': '1',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+    'Sec-Fetch-Dest': 'document',
+    'Sec-Fetch-Mode': 'navigate',
+    'Sec-Fetch-Site': 'none',
+    'Sec-Fetch-User': '?1',
+    'Cache-Control': 'max-age=0'
+}
 
 def generate_random_id():
     """Generate a random ID for barcode placeholder (mix of letters and numbers)"""
@@ -61,34 +144,22 @@ def add_proper_brand_spacing(brand):
     if brand_lower in brand_spacing_rules:
         return brand_spacing_rules[brand_lower]
     
-    # Pattern-based spacing for common compound patterns
-    import re
+    # Pattern-based spacing for common compound patterns (one anchored regex; the prefixes are mutually exclusive)
+    # Pet/Blue/Royal/Natural/Stella + word (e.g., "PetNaturals" -> "Pet Naturals", "BlueBuffalo" -> "Blue Buffalo")
+    # Hills + word (e.g., "HillsScience" -> "Hill's Science")
+    prefix_match = BRAND_PREFIX_RE.match(brand)
+    if prefix_match:
+        prefix = prefix_match.group(1)
+        if prefix[1:] == 'ills':
+            prefix = prefix[0] + "ill's"
+        brand = f"{prefix} {prefix_match.group(2)}{brand[prefix_match.end():]}"
     
-    # Pattern 1: Pet + word (e.g., "PetNaturals" -> "Pet Naturals")
-    brand = re.sub(r'^([Pp])et([A-Z][a-z]+)', r'\1et \2', brand)
-    
-    # Pattern 2: Blue + word (e.g., "BlueBuffalo" -> "Blue Buffalo") 
-    brand = re.sub(r'^([Bb])lue([A-Z][a-z]+)', r'\1lue \2', brand)
-    
-    # Pattern 3: Hill's + word (e.g., "HillsScience" -> "Hill's Science")
-    brand = re.sub(r'^([Hh])ills([A-Z][a-z]+)', r'\1ill\'s \2', brand)
-    
-    # Pattern 4: Royal + word (e.g., "RoyalCanin" -> "Royal Canin")
-    brand = re.sub(r'^([Rr])oyal([A-Z][a-z]+)', r'\1oyal \2', brand)
-    
-    # Pattern 5: Natural + word (e.g., "NaturalBalance" -> "Natural Balance")
-    brand = re.sub(r'^([Nn])atural([A-Z][a-z]+)', r'\1atural \2', brand)
-    
-    # Pattern 6: Stella + word (e.g., "StellaChewy" -> "Stella Chewy")  
-    brand = re.sub(r'^([Ss])tella([A-Z][a-z]+)', r'\1tella \2', brand)
-    
-    # Pattern 7: Generic pattern for camelCase brand names (Word1Word2 -> Word1 Word2)
+    # Generic pattern for camelCase brand names (Word1Word2 -> Word1 Word2)
     # Only apply if it results in reasonable looking words
     if len(brand) > 6 and brand.lower() not in ['petco', 'earthborn', 'orijen', 'acana']:
         # Look for pattern where lowercase is followed by uppercase
-        camel_pattern = r'([a-z])([A-Z][a-z]+)'
-        if re.search(camel_pattern, brand):
-            spaced_brand = re.sub(camel_pattern, r'\1 \2', brand)
+        if CAMEL_CASE_BREAK_RE.search(brand):
+            spaced_brand = CAMEL_CASE_BREAK_RE.sub(r'\1 \2', brand)
             # Only use the spaced version if both parts are reasonable length
             parts = spaced_brand.split()
             if len(parts) == 2 and len(parts[0]) >= 3 and len(parts[1]) >= 3:
@@ -96,8 +167,8 @@ def add_proper_brand_spacing(brand):
     
     return brand
 
-def load_data():
-    """Load existing scraped data"""
+def load_stored_data():
+    """Load scraped data as stored (ingredient lists as ingredientIds)"""
     if os.path.exists(DATA_FILE):
         try:
             with open(DATA_FILE, 'r') as f:
@@ -106,23 +177,156 @@ def load_data():
             return []
     return []
 
+def load_data():
+    """Load existing scraped data"""
+    return [unpack_record(item) for item in load_stored_data()]
+
+def to_stored_record(item):
+    """Storage form of a record; comma-joined ingredient strings from older records become ID lists too"""
+    if isinstance(item.get('ingredients'), str):
+        item = dict(item, ingredients=convert_ingredients_to_array(item['ingredients']))
+    return pack_record(item)
+
 def save_data(data):
-    """Save data to JSON file"""
-    with open(DATA_FILE, 'w') as f:
-        json.dump(data, f, indent=2)
+    """Save data to JSON file, storing ingredient lists as canonical ingredient IDs"""
+    # Written to a temporary file first so readers never see a half-written file
+    tmp_path = DATA_FILE + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump([to_stored_record(item) for item in data], f, indent=2)
+    os.replace(tmp_path, DATA_FILE)
+
+@contextmanager
+def data_file_lock():
+    """
+    Hold DATA_FILE for a read-modify-write cycle, across threads and across processes sharing it.
+    The ingredient dictionary is held too, so the IDs a save writes are the ones on disk.
+    """
+    with _data_lock:
+        if fcntl is None:
+            with dictionary_lock():
+                yield
+            return
+        with open(DATA_FILE + '.lock', 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                with dictionary_lock():
+                    yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def record_key(item):
+    """Canonical URL a record is stored under (records saved before canonicalization use their url)"""
+    return item.get('canonicalUrl') or canonicalize_url(item.get('url') or '')
+
+def stored_fields(values):
+    """Storage form of some record fields, for comparing values the way they are saved"""
+    return pack_record(dict(values))
+
+def update_record(record, values, url, timestamp, debug_info):
+    """
+    Rescrape of a stored record: replace the scraped fields in `values`, keeping its id, barcode
+    and firstSeen, and add the earlier values of the fields that changed to its history.
+    Returns the names of the changed fields.
+    """
+    changed = [field for field, value in values.items()
+               if stored_fields({field: record.get(field)}) != stored_fields({field: value})]
+    if changed and DATA_HISTORY_LIMIT > 0:
+        history = record.get('history', [])
+        history.append({'timestamp': record.get('timestamp'),
+                        'replaced': timestamp,
+                        'values': stored_fields({field: record.get(field) for field in changed})})
+        record['history'] = history[-DATA_HISTORY_LIMIT:]
+    if changed:
+        # When each field last changed, kept even when the history is capped or off
+        record['changedAt'] = dict(record.get('changedAt') or {}, **{field: timestamp for field in changed})
+    record.setdefault('firstSeen', record.get('timestamp'))
+    record.update(values, url=url, canonicalUrl=canonicalize_url(url), timestamp=timestamp,
+                  domain=urlparse(url).netloc, debug_info=debug_info)
+    return changed
+
+def index_records(data):
+    """
+    Unique index of records by canonical URL: ({canonical URL: record}, records).
+    
+    Rows that older versions appended for every scrape of the same product are merged here: the
+    oldest row keeps its id and barcode and takes the later rows' values, which become its history.
+    """
+    index = {}
+    records = []
+    for item in data:
+        key = record_key(item)
+        existing = index.get(key)
+        if existing is None:
+            index[key] = dict(item, canonicalUrl=key)
+            records.append(index[key])
+        else:
+            update_record(existing, {field: item.get(field) for field in SCRAPE_FIELDS},
+                          item.get('url') or existing['url'], item.get('timestamp'), item.get('debug_info'))
+    return index, records
+
+def find_record(url):
+    """The stored record for a URL's canonical form (API form), or None"""
+    key = canonicalize_url(url)
+    record = next((item for item in load_stored_data() if record_key(item) == key), None)
+    return record and unpack_record(record)
+
+def page_hash(html):
+    """Fingerprint of a page for change detection, ignoring whitespace and per-request tokens"""
+    if isinstance(html, bytes):
+        html = html.decode('utf-8', 'replace')
+    return hashlib.sha256(WHITESPACE_RE.sub(' ', VOLATILE_MARKUP_RE.sub('', html)).encode('utf-8')).hexdigest()
+
+def local_datetime(value):
+    """
+    A stored or requested ISO timestamp as a naive local datetime, the form records' timestamps
+    are saved in (times with an offset are converted first); None if it isn't an ISO date or time
+    """
+    try:
+        parsed = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed
+
+def changed_since(value, since):
+    """Whether a stored timestamp is at or after the datetime `since` (unreadable timestamps are not)"""
+    at = local_datetime(value)
+    return at is not None and at >= since
+
+def record_history(record):
+    """A record's earlier field values in API form, newest first"""
+    return [dict(entry, values=unpack_record(entry['values'])) for entry in reversed(record.get('history', []))]
+
+def fetch_json(url, context=None, timeout=10):
+    """
+    GET a JSON endpoint with the scraper's browser headers, returning None on any failure (or if
+    robots.txt disallows it). The site's Crawl-delay is waited out first. With a context, the call is skipped once the scrape's budget is spent
+    and its timeout never runs past the deadline.
+    """
+    if context is not None and context.expired():
+        return None
+    try:
+        if not robots_cache.is_allowed(url, REQUEST_HEADERS, context and context.remaining()):
+            return None
+        if robots_cache.wait_turn(url, REQUEST_HEADERS, context and context.remaining()) is None:
+            return None
+        remaining = context and context.remaining()
+        if remaining is not None:
+            if remaining <= 0:
+                return None
+            timeout = min(timeout, remaining)
+        headers = dict(REQUEST_HEADERS, Accept='application/json, text/javascript, */*;q=0.1')
+        response = requests.get(url, headers=headers, timeout=timeout)
+        response.raise_for_status()
+        return response.json()
+    except (requests.exceptions.RequestException, ValueError):
+        return None
 
 def extract_target_brand_from_shop_all(soup, url):
     """Extract brand from Target.com by looking for 'Show all [Brand]' or 'Shop all [Brand]' patterns"""
-    if 'target.com' not in url.lower():
-        return None
-    
     # PRIMARY: Look for "Show all [Brand]" or "Shop all [Brand]" text patterns (most reliable for Target.com)
     # This covers links like "Show all Pet Honesty", "Show all Meow Mix", etc.
-    show_all_patterns = [
-        r'show\s+all\s+([\w\s&\'-]{2,25})(?=\s|$|\.)',  # "Show all Pet Honesty"
-        r'shop\s+all\s+([\w\s&\'-]{2,25})(?=\s|$|\.)',  # "Shop all Pet Honesty" 
-    ]
-    
     # Search in all text elements for these patterns
     all_elements = soup.find_all(['a', 'span', 'div', 'button', 'li'])
     
@@ -133,13 +337,13 @@ def extract_target_brand_from_shop_all(soup, url):
         if len(text) > 200:
             continue
             
-        for pattern in show_all_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in TARGET_SHOP_ALL_PATTERNS:
+            match = pattern.search(text)
             if match:
                 brand = match.group(1).strip()
                 
                 # Clean up duplicated brand names (e.g., "Pet HonestyPet Honesty" -> "Pet Honesty")
-                brand = re.sub(r'\s+', ' ', brand)  # Normalize whitespace
+                brand = WHITESPACE_RE.sub(' ', brand)  # Normalize whitespace
                 
                 # Handle duplicated brand names
                 words = brand.split()
@@ -152,8 +356,8 @@ def extract_target_brand_from_shop_all(soup, url):
                 
                 if (brand and len(brand) > 1 and 
                     brand.lower() not in ['target', 'shop', 'all', 'items', 'products', 'brands', 'salmon', 'chicken', 'beef', 'recipe', 'flavor', 'food', 'more', 'less'] and
-                    not re.match(r'^\d+$', brand) and  # Not just numbers
-                    re.match(r'^[A-Za-z][A-Za-z0-9\s&\'-]*$', brand)):  # Valid brand format
+                    not DIGITS_ONLY_RE.match(brand) and  # Not just numbers
+                    BRAND_NAME_RE.match(brand)):  # Valid brand format
                     
                     # Capitalize properly (Title Case)
                     brand_words = brand.split()
@@ -168,8 +372,7 @@ def extract_target_brand_from_shop_all(soup, url):
             # Get the primary_brand section and look for name (handle escaped quotes in JSON)
             pos = script.string.find('primary_brand')
             context = script.string[pos:pos+500]
-            name_pattern = r'\\"name\\":\\s*\\"([^"\\]+)\\"'
-            match = re.search(name_pattern, context)
+            match = TARGET_ESCAPED_BRAND_NAME_RE.search(context)
             if match:
                 brand = match.group(1).strip()
                 if brand and len(brand) > 1 and brand.lower() not in ['target', 'shop', 'all']:
@@ -177,78 +380,80 @@ def extract_target_brand_from_shop_all(soup, url):
     
     return None
 
-def extract_brand(soup, url):
-    """Extract brand information from the webpage"""
-    brand = None
-    
-    # Common brand extraction strategies
-    strategies = [
-        # Target.com specific: Look for "Shop all [Brand]" pattern
-        lambda: extract_target_brand_from_shop_all(soup, url),
+def brand_text(result):
+    """Brand string from a strategy result (meta tag, element or plain string), or None"""
+    if not result:
+        return None
+    if hasattr(result, 'get'):
+        brand = result.get('content') or result.get_text()
+    elif hasattr(result, 'get_text'):
+        brand = result.get_text()
+    else:
+        brand = str(result)
+    brand = brand.strip() if brand else ''
+    if not brand or brand.lower() in ['brand not found', 'not found']:
+        return None
+    return brand
+
+def brand_confidence(brand):
+    """How much a found brand looks like a brand rather than a block of page text"""
+    if len(brand) > 40 or len(brand.split()) > 5:
+        return 0.5
+    return 1.0
+
+def extract_brand(soup, url, context=None):
+    """Extract brand information from the webpage (cheapest, most trusted sources first)"""
+    # (name, confidence, strategy); the cascade stops once a brand clears CONFIDENCE_THRESHOLDS['brand']
+    # Site-specific extractors from the domain registry (Target.com "Shop all [Brand]") come first
+    strategies = site_strategies(domain_config(url), 'brand', soup, url) + [
+        # Look for structured data (JSON-LD)
+        ('json_ld', 0.9, lambda: extract_from_json_ld(soup, 'brand')),
         
         # Look for brand in meta tags
-        lambda: soup.find('meta', {'property': 'product:brand'}),
-        lambda: soup.find('meta', {'name': 'brand'}),
-        lambda: soup.find('meta', {'itemprop': 'brand'}),
-        
-        # Look for structured data (JSON-LD)
-        lambda: extract_from_json_ld(soup, 'brand'),
+        ('product:brand meta', 0.9, lambda: soup.find('meta', {'property': 'product:brand'})),
+        ('brand meta', 0.85, lambda: soup.find('meta', {'name': 'brand'})),
+        ('itemprop brand', 0.85, lambda: soup.find('meta', {'itemprop': 'brand'})),
         
         # Look for common class names and patterns
-        lambda: soup.find(class_=re.compile(r'brand', re.I)),
-        lambda: soup.find('span', class_=re.compile(r'brand', re.I)),
-        lambda: soup.find('div', class_=re.compile(r'brand', re.I)),
+        ('brand class', 0.6, lambda: soup.find(class_=BRAND_CLASS_RE)),
+        ('brand class span', 0.6, lambda: soup.find('span', class_=BRAND_CLASS_RE)),
+        ('brand class div', 0.6, lambda: soup.find('div', class_=BRAND_CLASS_RE)),
         
         # Look for text patterns
-        lambda: soup.find(string=re.compile(r'brand:', re.I)),
+        ('brand label', 0.5, lambda: soup.find(string=BRAND_LABEL_RE)),
         
         # Look in title or headings
-        lambda: extract_from_title(soup),
+        ('title', 0.4, lambda: extract_from_title(soup)),
         
         # Extract from URL as fallback
-        lambda: extract_brand_from_url(url),
+        ('url', 0.3, lambda: extract_brand_from_url(url)),
     ]
+    strategies = [(name, confidence, lambda strategy=strategy: brand_text(strategy()))
+                  for name, confidence, strategy in strategies]
     
-    for i, strategy in enumerate(strategies):
-        try:
-            result = strategy()
-            if result:
-                if hasattr(result, 'get'):
-                    brand = result.get('content') or result.get_text()
-                elif hasattr(result, 'get_text'):
-                    brand = result.get_text()
-                else:
-                    brand = str(result)
-                
-
-                
-                if brand and brand.strip() and brand.strip().lower() not in ['brand not found', 'not found']:
-                    brand = brand.strip()
-                    # Handle Purina Friskies brand exception
-                    brand_lower = brand.lower()
-                    url_lower = url.lower()
-                    
-                    # Case 1: Brand is just "Friskies" → make it "Purina Friskies"
-                    if "friskies" in brand_lower and "purina" not in brand_lower:
-                        # Find Friskies with original case
-                        friskies_match = re.search(r'friskies', brand, re.IGNORECASE)
-                        if friskies_match:
-                            friskies_text = friskies_match.group()
-                            # Replace with Purina prefix
-                            brand = re.sub(r'\bfriskies\b', f'Purina {friskies_text}', brand, flags=re.IGNORECASE)
-                    
-                    # Case 2: Brand is "Purina" but URL contains "friskies" → make it "Purina Friskies"
-                    elif brand_lower == "purina" and "friskies" in url_lower:
-                        brand = "Purina Friskies"
-                    
-                    # Apply proper spacing to compound brand names
-                    brand = add_proper_brand_spacing(brand)
-                    
-                    return brand
-        except Exception:
-            continue
+    brand = run_cascade('brand', strategies, brand_confidence, url, context).value
+    if not brand:
+        return "Brand not found"
+    
+    # Handle Purina Friskies brand exception
+    brand_lower = brand.lower()
+    url_lower = url.lower()
+    
+    # Case 1: Brand is just "Friskies" → make it "Purina Friskies"
+    if "friskies" in brand_lower and "purina" not in brand_lower:
+        # Find Friskies with original case
+        friskies_match = FRISKIES_RE.search(brand)
+        if friskies_match:
+            friskies_text = friskies_match.group()
+            # Replace with Purina prefix
+            brand = FRISKIES_WORD_RE.sub(f'Purina {friskies_text}', brand)
     
-    return "Brand not found"
+    # Case 2: Brand is "Purina" but URL contains "friskies" → make it "Purina Friskies"
+    elif brand_lower == "purina" and "friskies" in url_lower:
+        brand = "Purina Friskies"
+    
+    # Apply proper spacing to compound brand names
+    return add_proper_brand_spacing(brand)
 
 def extract_brand_from_url(url):
     """Extract brand name from the URL itself"""
@@ -329,112 +534,58 @@ def extract_brand_from_url(url):
     
     return None
 
+# Keywords for each pet type (expanded list); matched as whole words so "cat" does not hit "category"
+PET_TYPE_KEYWORDS = {
+    'cat': ['cat', 'cats', 'cat food', 'feline', 'felines', 'kitten', 'kittens', 'kitty', 'kitties'],
+    'dog': ['dog', 'dogs', 'dog food', 'canine', 'canines', 'puppy', 'puppies', 'pup', 'pups'],
+}
+PET_TYPE_MATCHER = KeywordMatcher(PET_TYPE_KEYWORDS)
+
+def pet_type_regions(soup, url):
+    """Yield (region, weight, text) for pet type detection, most reliable region first"""
+    # Check URL path first (most reliable)
+    yield 'url', 10, url
+    
+    title_tag = soup.find('title')
+    if title_tag:
+        yield 'title', 9, title_tag.get_text('')
+    
+    meta_desc = soup.find('meta', attrs={'name': 'description'})
+    if meta_desc:
+        yield 'meta_description', 8, meta_desc.get('content', '')
+    
+    og_title = soup.find('meta', {'property': 'og:title'})
+    if og_title:
+        yield 'og_title', 7, og_title.get('content', '')
+    
+    og_desc = soup.find('meta', {'property': 'og:description'})
+    if og_desc:
+        yield 'og_description', 6, og_desc.get('content', '')
+    
+    # All headings, then breadcrumbs and navigation
+    for heading in soup.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6']):
+        yield 'heading', 5, heading.get_text('')
+    
+    for breadcrumb in soup.find_all(['nav', 'ol', 'ul'], class_=lambda x: x and ('breadcrumb' in x.lower() or 'nav' in x.lower())):
+        yield 'breadcrumb', 4, breadcrumb.get_text('')
+    
+    for content in soup.find_all(['main', 'article', 'section'], limit=3):
+        yield 'main_content', 3, content.get_text('')
+    
+    # Last resort: first 2000 characters of body text to avoid too much noise
+    body = soup.find('body')
+    if body:
+        yield 'body', 1, body.get_text('')[:2000]
+
 def extract_pet_type(soup, url):
     """Extract pet type (cat or dog) from URL and page content"""
     try:
-        # Convert to lowercase for easier matching
-        url_lower = url.lower()
-        
-        # Define keywords for each pet type (expanded list)
-        cat_keywords = ['cat', 'cats', 'feline', 'felines', 'kitten', 'kittens', 'kitty', 'kitties']
-        dog_keywords = ['dog', 'dogs', 'canine', 'canines', 'puppy', 'puppies', 'pup', 'pups']
-        
-        # Check URL path first (most reliable)
-        for keyword in cat_keywords:
-            if keyword in url_lower:
-                return 'cat'
-        
-        for keyword in dog_keywords:
-            if keyword in url_lower:
-                return 'dog'
-        
-        # Check page title
-        title_tag = soup.find('title')
-        if title_tag:
-            title_text = title_tag.get_text('').lower()
-            for keyword in cat_keywords:
-                if keyword in title_text:
-                    return 'cat'
-            for keyword in dog_keywords:
-                if keyword in title_text:
-                    return 'dog'
-        
-        # Check meta description
-        meta_desc = soup.find('meta', attrs={'name': 'description'})
-        if meta_desc:
-            desc_content = meta_desc.get('content', '').lower()
-            for keyword in cat_keywords:
-                if keyword in desc_content:
-                    return 'cat'
-            for keyword in dog_keywords:
-                if keyword in desc_content:
-                    return 'dog'
-        
-        # Check Open Graph title and description
-        og_title = soup.find('meta', {'property': 'og:title'})
-        if og_title:
-            og_title_content = og_title.get('content', '').lower()
-            for keyword in cat_keywords:
-                if keyword in og_title_content:
-                    return 'cat'
-            for keyword in dog_keywords:
-                if keyword in og_title_content:
-                    return 'dog'
-        
-        og_desc = soup.find('meta', {'property': 'og:description'})
-        if og_desc:
-            og_desc_content = og_desc.get('content', '').lower()
-            for keyword in cat_keywords:
-                if keyword in og_desc_content:
-                    return 'cat'
-            for keyword in dog_keywords:
-                if keyword in og_desc_content:
-                    return 'dog'
-        
-        # Check all headings (more comprehensive)
-        headings = soup.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
-        for heading in headings:
-            heading_text = heading.get_text('').lower()
-            for keyword in cat_keywords:
-                if keyword in heading_text:
-                    return 'cat'
-            for keyword in dog_keywords:
-                if keyword in heading_text:
-                    return 'dog'
-        
-        # Check product breadcrumbs and navigation
-        breadcrumbs = soup.find_all(['nav', 'ol', 'ul'], class_=lambda x: x and ('breadcrumb' in x.lower() or 'nav' in x.lower()))
-        for breadcrumb in breadcrumbs:
-            breadcrumb_text = breadcrumb.get_text('').lower()
-            for keyword in cat_keywords:
-                if keyword in breadcrumb_text:
-                    return 'cat'
-            for keyword in dog_keywords:
-                if keyword in breadcrumb_text:
-                    return 'dog'
-        
-        # Check main content areas
-        main_content = soup.find_all(['main', 'article', 'section'], limit=3)
-        for content in main_content:
-            content_text = content.get_text('').lower()
-            for keyword in cat_keywords:
-                if keyword in content_text:
-                    return 'cat'
-            for keyword in dog_keywords:
-                if keyword in content_text:
-                    return 'dog'
-        
-        # Last resort: Search entire page body text (limited to avoid noise)
-        body = soup.find('body')
-        if body:
-            # Get first 2000 characters of body text to avoid too much noise
-            body_text = body.get_text('')[:2000].lower()
-            for keyword in cat_keywords:
-                if keyword in body_text:
-                    return 'cat'
-            for keyword in dog_keywords:
-                if keyword in body_text:
-                    return 'dog'
+        # Regions are scanned in order of reliability; the first element with any pet keyword decides,
+        # by weighted hit count with cat winning ties (as the original cat-first keyword order did)
+        for region, weight, hits in PET_TYPE_MATCHER.scan_regions(pet_type_regions(soup, url)):
+            if hits:
+                scores = score_hits(hits)
+                return 'cat' if scores.get('cat', 0) >= scores.get('dog', 0) else 'dog'
         
         # Default fallback - could not determine
         return 'unknown'
@@ -442,6 +593,46 @@ def extract_pet_type(soup, url):
     except Exception:
         return 'unknown'
 
+# Food type indicators with separate freeze-dried category
+PET_FOOD_TYPE_KEYWORDS = {
+    'dry': [
+        'kibble', 'dry food', 'dry cat food', 'dry dog food', 'biscuit', 'pellet',
+        'crunchy', 'crunch', 'nugget', 'bits', 'dry-cat-food', 'dry-dog-food'
+    ],
+    'wet': [
+        'wet', 'canned', 'can', 'gravy', 'sauce', 'stew', 'broth',
+        'chunks in', 'flaked', 'shredded', 'minced', 'loaf', 'in-gravy',
+        'chicken broth', 'beef broth', 'fish broth', 'mousse'
+    ],
+    'raw': [
+        'raw', 'raw boost', 'raw pieces', 'raw nutrition', 'frozen raw',
+        'fresh raw', 'raw diet', 'raw food'
+    ],
+    'freeze dried': [
+        'freeze dried', 'freeze-dried', 'freezedried', 'freeze dry',
+        'lyophilized', 'freeze-drying', 'fd', 'freeze dried raw'
+    ],
+    'air dried': [
+        'air dried', 'air-dried', 'air dry', 'naturally dried'
+    ],
+    'dehydrated': [
+        'dehydrated', 'dehydrate', 'dried'
+    ],
+    'pate': [
+        'pate', 'paté', 'pâté', 'smooth pate', 'chunky pate', 'classic pate'
+    ],
+    'treats': [
+        'treat', 'treats', 'snack', 'training reward', 'dental chew',
+        'biscuit treat', 'jerky', 'cookie', 'chew', 'bone'
+    ],
+    'toppers': [
+        'topper', 'toppers', 'meal topper', 'food topper', 'flavor enhancer',
+        'meal enhancer', 'food enhancer', 'sprinkle', 'mix-in', 'mixins',
+        'food booster', 'meal booster', 'supplement powder', 'nutritional topper'
+    ]
+}
+PET_FOOD_TYPE_MATCHER = KeywordMatcher(PET_FOOD_TYPE_KEYWORDS)
+
 def extract_food_type(soup, url):
     """Extract food type from URL and page content - supports multiple types"""
     try:
@@ -452,68 +643,18 @@ def extract_food_type(soup, url):
         title = soup.find('title')
         title_text = title.get_text().lower() if title else ''
         
-        # Only combine URL and title for food type detection
-        all_text = f"{url_lower} {title_text}"
-        
-        # Define food type indicators with separate freeze-dried category
-        food_type_indicators = {
-            'dry': [
-                'kibble', 'dry food', 'dry cat food', 'dry dog food', 'biscuit', 'pellet',
-                'crunchy', 'crunch', 'nugget', 'bits', 'dry-cat-food', 'dry-dog-food'
-            ],
-            'wet': [
-                'wet', 'canned', 'can', 'gravy', 'sauce', 'stew', 'broth',
-                'chunks in', 'flaked', 'shredded', 'minced', 'loaf', 'in-gravy',
-                'chicken broth', 'beef broth', 'fish broth', 'mousse'
-            ],
-            'raw': [
-                'raw', 'raw boost', 'raw pieces', 'raw nutrition', 'frozen raw',
-                'fresh raw', 'raw diet', 'raw food'
-            ],
-            'freeze dried': [
-                'freeze dried', 'freeze-dried', 'freezedried', 'freeze dry',
-                'lyophilized', 'freeze-drying', 'fd', 'freeze dried raw'
-            ],
-            'air dried': [
-                'air dried', 'air-dried', 'air dry', 'naturally dried'
-            ],
-            'dehydrated': [
-                'dehydrated', 'dehydrate', 'dried'
-            ],
-            'pate': [
-                'pate', 'paté', 'pâté', 'smooth pate', 'chunky pate', 'classic pate'
-            ],
-            'treats': [
-                'treat', 'treats', 'snack', 'training reward', 'dental chew',
-                'biscuit treat', 'jerky', 'cookie', 'chew', 'bone'
-            ],
-            'toppers': [
-                'topper', 'toppers', 'meal topper', 'food topper', 'flavor enhancer',
-                'meal enhancer', 'food enhancer', 'sprinkle', 'mix-in', 'mixins',
-                'food booster', 'meal booster', 'supplement powder', 'nutritional topper'
-            ]
-        }
-        
         # Count indicators for each food type with weights
         # Give higher weight to URL indicators since they're most reliable
-        food_type_scores = {}
-        for food_type, indicators in food_type_indicators.items():
-            score = 0
-            for indicator in indicators:
-                if indicator in all_text:
-                    # Higher weight for URL/title mentions
-                    if indicator in url_lower or indicator in title_text:
-                        score += 3
-                    else:
-                        score += 1
-            food_type_scores[food_type] = score
+        hits = PET_FOOD_TYPE_MATCHER.scan(url_lower, 'url', 3) + PET_FOOD_TYPE_MATCHER.scan(title_text, 'title', 3)
+        food_type_scores = score_hits(hits)
+        found_keywords = {hit.keyword for hit in hits}
         
         # Find all food types that have a significant presence (threshold approach)
         detected_types = []
         
         # Primary type detection - at least 2 points or strong indicator
-        for food_type, score in food_type_scores.items():
-            if score >= 2:  # Threshold for detection
+        for food_type in PET_FOOD_TYPE_KEYWORDS:
+            if food_type_scores.get(food_type, 0) >= 2:  # Threshold for detection
                 detected_types.append(food_type)
         
         # Special logic for combinations and conflicts
@@ -527,7 +668,7 @@ def extract_food_type(soup, url):
             # Rule 2: If both dry (kibble) and raw are detected, it's likely dry with freeze-dried raw pieces
             if 'dry' in detected_types and 'raw' in detected_types:
                 # Check if freeze-dried is also mentioned
-                if 'freeze-dried' not in detected_types and any(indicator in all_text for indicator in ['freeze dried', 'freeze-dried']):
+                if 'freeze-dried' not in detected_types and 'freeze dried' in found_keywords:
                     detected_types.append('freeze-dried')
                 # Keep both dry and raw in this case
             
@@ -610,8 +751,7 @@ def extract_product_name_from_url(url):
         name = filename.replace('-', ' ').replace('_', ' ').replace('+', ' ')
         
         # Clean up multiple spaces
-        import re
-        name = re.sub(r'\s+', ' ', name).strip()
+        name = WHITESPACE_RE.sub(' ', name).strip()
         
         # Capitalize words appropriately
         if name:
@@ -626,20 +766,10 @@ def extract_product_name_from_url(url):
 def extract_pet_type_from_url(url):
     """Extract pet type from URL only (for direct image URLs)"""
     try:
-        url_lower = url.lower()
-        
-        # Define keywords for each pet type (expanded list - same as main function)
-        cat_keywords = ['cat', 'cats', 'feline', 'felines', 'kitten', 'kittens', 'kitty', 'kitties']
-        dog_keywords = ['dog', 'dogs', 'canine', 'canines', 'puppy', 'puppies', 'pup', 'pups']
-        
-        # Check URL for keywords
-        for keyword in cat_keywords:
-            if keyword in url_lower:
-                return 'cat'
-        
-        for keyword in dog_keywords:
-            if keyword in url_lower:
-                return 'dog'
+        # Check URL for keywords (same keywords as the main function)
+        scores = score_hits(PET_TYPE_MATCHER.scan(url, 'url'))
+        if scores:
+            return 'cat' if scores.get('cat', 0) >= scores.get('dog', 0) else 'dog'
         
         return 'unknown'
         
@@ -716,79 +846,71 @@ def convert_to_full_size_image(image_url):
     return image_url
 
 
-def extract_image_url(soup, url):
-    """Extract image URL from the webpage - prioritizes first reasonable image"""
-    image_url = None
-    
-    # Simple and effective image extraction strategies
+def image_src(result):
+    """Image URL from a strategy result (meta tag, img tag, list of img tags or plain string), or None"""
+    if isinstance(result, list):
+        result = result[0] if result else None
+    if not result:
+        return None
+    if isinstance(result, str):
+        image_url = result
+    elif result.name == 'meta':
+        image_url = result.get('content')
+    else:
+        image_url = result.get('src') or result.get('data-src')
+    return image_url.strip() if image_url and image_url.strip() else None
+
+def image_confidence(image_url):
+    """How much a found image URL looks like a product photo rather than site chrome"""
+    if any(keyword in image_url.lower() for keyword in ['logo', 'icon', 'sprite', 'placeholder']):
+        return 0.3
+    return 1.0
+
+def extract_image_url(soup, url, context=None):
+    """Extract image URL from the webpage (cheapest, most trusted sources first)"""
+    # (name, confidence, strategy); the cascade stops once an image clears CONFIDENCE_THRESHOLDS['image']
     strategies = [
-        # Prioritize full-size product images first
-        ('find_first_reasonable_image', lambda: find_first_reasonable_image(soup)),
-        
         # Look for structured data (JSON-LD)
-        ('extract_from_json_ld', lambda: extract_from_json_ld(soup, 'image')),
+        ('extract_from_json_ld', 0.9, lambda: extract_from_json_ld(soup, 'image')),
         
-        # Look for Open Graph image (often cropped for social sharing)
-        ('find_best_og_image', lambda: find_best_og_image(soup)),
-        ('product:image meta', lambda: soup.find('meta', {'property': 'product:image'})),
-        ('twitter:image meta', lambda: soup.find('meta', {'name': 'twitter:image'})),
+        # Look for Open Graph image (sometimes cropped for social sharing; see convert_to_full_size_image)
+        ('find_best_og_image', 0.8, lambda: find_best_og_image(soup)),
+        ('product:image meta', 0.8, lambda: soup.find('meta', {'property': 'product:image'})),
+        ('twitter:image meta', 0.7, lambda: soup.find('meta', {'name': 'twitter:image'})),
+        
+        # First image on the page that isn't a logo/icon
+        ('find_first_reasonable_image', 0.6, lambda: find_first_reasonable_image(soup)),
+        
+        # SUPER AGGRESSIVE: Direct regex search for og:image in HTML text
+        ('find_og_image_in_raw_html', 0.6, lambda: find_og_image_in_raw_html(soup)),
         
         # Fallback to any image that's not tiny
-        ('find_any_decent_image', lambda: find_any_decent_image(soup)),
+        ('find_any_decent_image', 0.4, lambda: find_any_decent_image(soup)),
         
         # Look for images in CSS background-image properties
-        ('find_background_images', lambda: find_background_images(soup)),
+        ('find_background_images', 0.3, lambda: find_background_images(soup)),
         
         # Look for images in JavaScript or data attributes
-        ('find_script_images', lambda: find_script_images(soup)),
+        ('find_script_images', 0.3, lambda: find_script_images(soup)),
         
         # AGGRESSIVE: Search entire HTML for any image-like URLs
-        ('find_any_image_url_in_html', lambda: find_any_image_url_in_html(soup)),
-        
-        # SUPER AGGRESSIVE: Direct regex search for og:image in HTML text
-        ('find_og_image_in_raw_html', lambda: find_og_image_in_raw_html(soup)),
+        ('find_any_image_url_in_html', 0.2, lambda: find_any_image_url_in_html(soup)),
     ]
+    strategies = [(name, confidence, lambda strategy=strategy: image_src(strategy()))
+                  for name, confidence, strategy in strategies]
     
-    for strategy_name, strategy in strategies:
-        try:
-            result = strategy()
-            if result:
-                # Store successful strategy for debug info
-                extract_image_url._last_strategy = strategy_name
-                
-                if hasattr(result, 'get'):
-                    # Meta tag
-                    image_url = result.get('content')
-                elif isinstance(result, list) and result:
-                    # List of images, take the first one
-                    image_url = result[0].get('src') if result[0] else None
-                elif hasattr(result, 'get') and 'src' in result.attrs:
-                    # Single img tag
-                    image_url = result.get('src')
-                
-                if image_url and image_url.strip():
-                    # Convert relative URLs to absolute
-                    image_url = image_url.strip()
-                    if image_url.startswith('//'):
-                        image_url = 'https:' + image_url
-                    elif image_url.startswith('/'):
-                        image_url = urljoin(url, image_url)
-                    elif not image_url.startswith(('http://', 'https://')):
-                        image_url = urljoin(url, image_url)
-                    
-                    # Convert social share/thumbnail URLs to full-size versions
-                    full_size_url = convert_to_full_size_image(image_url)
-                    if full_size_url != image_url:
-                        image_url = full_size_url
-                    
-                    return image_url
-        except Exception as e:
-            continue
+    image_url = run_cascade('image', strategies, image_confidence, url, context).value
+    if not image_url:
+        return "Image not found"
     
-    extract_image_url._last_strategy = 'none_successful'
-    return "Image not found"
-
-
+    # Convert relative URLs to absolute
+    if image_url.startswith('//'):
+        image_url = 'https:' + image_url
+    elif not image_url.startswith(('http://', 'https://')):
+        image_url = urljoin(url, image_url)
+    
+    # Convert social share/thumbnail URLs to full-size versions
+    return convert_to_full_size_image(image_url)
 
 def find_first_reasonable_image(soup):
     """Find the first image that's not obviously a logo/icon, prioritizing full-size images"""
@@ -930,8 +1052,7 @@ def find_background_images(soup):
             style = element.get('style', '')
             if 'background-image' in style.lower():
                 # Extract URL from background-image: url(...)
-                import re
-                matches = re.search(r'background-image:\s*url\(["\']?([^"\')]+)["\']?\)', style, re.I)
+                matches = BACKGROUND_IMAGE_RE.search(style)
                 if matches:
                     img_url = matches.group(1)
                     # Create a fake img element to return
@@ -943,9 +1064,9 @@ def find_background_images(soup):
         style_tags = soup.find_all('style')
         for style_tag in style_tags:
             if style_tag.string:
-                matches = re.findall(r'background-image:\s*url\(["\']?([^"\')]+)["\']?\)', style_tag.string, re.I)
+                matches = BACKGROUND_IMAGE_RE.search(style_tag.string)
                 if matches:
-                    img_url = matches[0]
+                    img_url = matches.group(1)
                     fake_img = soup.new_tag('img')
                     fake_img['src'] = img_url
                     return fake_img
@@ -976,18 +1097,11 @@ def find_script_images(soup):
         script_tags = soup.find_all('script')
         for script in script_tags:
             if script.string:
-                # Look for image URLs in JavaScript
-                import re
-                image_patterns = [
-                    r'["\']([^"\']*\.(?:jpg|jpeg|png|gif|webp|bmp)[^"\']*)["\']',
-                    r'image["\']?\s*:\s*["\']([^"\']+)["\']',
-                    r'src["\']?\s*:\s*["\']([^"\']+\.(?:jpg|jpeg|png|gif|webp|bmp)[^"\']*)["\']'
-                ]
-                
-                for pattern in image_patterns:
-                    matches = re.findall(pattern, script.string, re.I)
+                # Look for image URLs in JavaScript (only the first match of each pattern is considered)
+                for pattern in SCRIPT_IMAGE_PATTERNS:
+                    matches = pattern.search(script.string)
                     if matches:
-                        img_url = matches[0]
+                        img_url = matches.group(1)
                         if img_url and not any(skip in img_url.lower() for skip in ['icon', 'logo', 'sprite']):
                             fake_img = soup.new_tag('img')
                             fake_img['src'] = img_url
@@ -1000,63 +1114,38 @@ def find_script_images(soup):
 def find_any_image_url_in_html(soup):
     """AGGRESSIVE: Search entire HTML content for any image-like URLs"""
     try:
-        import re
         # Get the entire HTML content as text
         html_text = str(soup)
         
-        # Super aggressive patterns to find image URLs
-        image_patterns = [
-            # Standard image URLs
-            r'https?://[^\s"\'<>]+\.(?:jpg|jpeg|png|gif|webp|bmp)(?:\?[^\s"\'<>]*)?',
-            r'//[^\s"\'<>]+\.(?:jpg|jpeg|png|gif|webp|bmp)(?:\?[^\s"\'<>]*)?',
-            r'/[^\s"\'<>]+\.(?:jpg|jpeg|png|gif|webp|bmp)(?:\?[^\s"\'<>]*)?',
-            
-            # CDN and Shopify patterns
-            r'https?://cdn\.shopify\.com/[^\s"\'<>]+',
-            r'https?://[^\s"\'<>]*\.shopifycdn\.com/[^\s"\'<>]+',
-            r'https?://[^\s"\'<>]*amazonaws\.com/[^\s"\'<>]+\.(?:jpg|jpeg|png|gif|webp)',
-            
-            # Common CMS patterns
-            r'https?://[^\s"\'<>]*\.(?:cloudinary|imgix|cloudfront)\.com/[^\s"\'<>]+',
-            
-            # Look for any URL with 'image' in the path
-            r'https?://[^\s"\'<>]*image[^\s"\'<>]*\.(?:jpg|jpeg|png|gif|webp|bmp)',
-            r'https?://[^\s"\'<>]*/images?/[^\s"\'<>]+\.(?:jpg|jpeg|png|gif|webp|bmp)',
-            
-            # Look for data-src and other lazy loading attributes
-            r'data-src=["\'](https?://[^"\']+\.(?:jpg|jpeg|png|gif|webp|bmp)[^"\']*)["\']',
-            r'data-original=["\'](https?://[^"\']+\.(?:jpg|jpeg|png|gif|webp|bmp)[^"\']*)["\']',
-        ]
-        
-        for pattern in image_patterns:
-            matches = re.findall(pattern, html_text, re.I)
-            if matches:
-                # Return the first reasonable match
-                for match in matches:
-                    # Clean up the match (remove quotes if captured)
-                    clean_match = match.strip('\'"')
-                    
-                    # Skip tiny/icon images and common excludes
-                    if not any(skip in clean_match.lower() for skip in [
-                        'icon', 'favicon', 'logo', '16x16', '32x32', '64x64', 'sprite', 
-                        'placeholder', 'loading', 'blank', '1x1', 'pixel',
-                        'badge', 'button', 'arrow', 'star'
+        # Super aggressive patterns to find image URLs, in priority order. Matches are produced lazily
+        # so the scan stops at the first acceptable URL instead of collecting every match in the page
+        for pattern in HTML_IMAGE_URL_PATTERNS:
+            # Return the first reasonable match
+            for found in pattern.finditer(html_text):
+                # Clean up the match (remove quotes if captured)
+                clean_match = (found.group(1) if pattern.groups else found.group()).strip('\'"')
+                
+                # Skip tiny/icon images and common excludes
+                if not any(skip in clean_match.lower() for skip in [
+                    'icon', 'favicon', 'logo', '16x16', '32x32', '64x64', 'sprite', 
+                    'placeholder', 'loading', 'blank', '1x1', 'pixel',
+                    'badge', 'button', 'arrow', 'star'
+                ]):
+                    # Prefer larger or product-related images
+                    if any(good in clean_match.lower() for good in [
+                        'product', 'main', 'large', 'hero', 'feature', 'detail',
+                        'shopify', 'cdn', '_1024', '_800', '_600', 'x600', 'x800'
                     ]):
-                        # Prefer larger or product-related images
-                        if any(good in clean_match.lower() for good in [
-                            'product', 'main', 'large', 'hero', 'feature', 'detail',
-                            'shopify', 'cdn', '_1024', '_800', '_600', 'x600', 'x800'
-                        ]):
-                            fake_img = soup.new_tag('img')
-                            fake_img['src'] = clean_match
-                            return fake_img
-                            
-                        # If no preferred patterns, take any reasonable image
-                        if len(clean_match) > 50:  # Longer URLs are usually more legitimate
-                            fake_img = soup.new_tag('img')
-                            fake_img['src'] = clean_match
-                            return fake_img
+                        fake_img = soup.new_tag('img')
+                        fake_img['src'] = clean_match
+                        return fake_img
                         
+                    # If no preferred patterns, take any reasonable image
+                    if len(clean_match) > 50:  # Longer URLs are usually more legitimate
+                        fake_img = soup.new_tag('img')
+                        fake_img['src'] = clean_match
+                        return fake_img
+                    
     except Exception:
         pass
     return None
@@ -1064,21 +1153,13 @@ def find_any_image_url_in_html(soup):
 def find_og_image_in_raw_html(soup):
     """SUPER AGGRESSIVE: Direct regex search for og:image in raw HTML"""
     try:
-        import re
         html_text = str(soup)
         
-        # Look for og:image meta tags directly in the HTML text
-        patterns = [
-            r'<meta[^>]*property=["\']og:image["\'][^>]*content=["\']([^"\']+)["\'][^>]*>',
-            r'<meta[^>]*content=["\']([^"\']+)["\'][^>]*property=["\']og:image["\'][^>]*>',
-            r'property=["\']og:image["\'][^>]*content=["\']([^"\']+)["\']',
-            r'content=["\']([^"\']+)["\'][^>]*property=["\']og:image["\']'
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, html_text, re.I)
+        # Look for og:image meta tags directly in the HTML text (first match of each pattern, in order)
+        for pattern in OG_IMAGE_PATTERNS:
+            matches = pattern.search(html_text)
             if matches:
-                image_url = matches[0]
+                image_url = matches.group(1)
                 if image_url and len(image_url) > 10:
                     # Create a fake img tag to return
                     fake_img = soup.new_tag('img')
@@ -1199,197 +1280,177 @@ def clean_product_name(name):
     
     return cleaned if cleaned else None
 
-def extract_product_size(soup, url):
-    """Extract product size/weight from the webpage"""
-    import re
-    try:
-        # Strategy 1: Look for individual package size in visible text (prioritize over total weight)
-        page_text = soup.get_text()
-        
-        # Look for package size patterns that indicate individual package weight
-        package_size_patterns = [
-            r'sold\s+(?:as\s+)?(?:two\s+)?(\d+(?:\.\d+)?\s*(?:lb|oz|g|kg))\s+packages?',
-            r'sold\s+in\s+(\d+(?:\.\d+)?\s*(?:lb|oz|g|kg))\s+packages?',
-            r'individual\s+package[:\s]*(\d+(?:\.\d+)?\s*(?:lb|oz|g|kg))',
-            r'each\s+package[:\s]*(\d+(?:\.\d+)?\s*(?:lb|oz|g|kg))',
-            r'package\s+size[:\s]*(\d+(?:\.\d+)?\s*(?:lb|oz|g|kg))',
-            r'(\d+(?:\.\d+)?\s*(?:lb|oz|g|kg))\s+packages?',
-        ]
-        
-        for pattern in package_size_patterns:
-            matches = re.findall(pattern, page_text, re.IGNORECASE)
-            for match in matches:
-                # Clean and validate the match
-                cleaned_size = clean_product_size(match)
-                if cleaned_size:
-                    return cleaned_size
-        
-        # Strategy 2: Look for size in structured data (JSON-LD)
-        json_scripts = soup.find_all('script', type='application/ld+json')
-        for script in json_scripts:
-            try:
-                data = json.loads(script.string)
-                if isinstance(data, dict):
-                    # Look for weight/size in product data
-                    if data.get('@type') == 'Product':
-                        weight = data.get('weight') or data.get('size')
-                        if weight:
-                            # Handle structured weight data (QuantitativeValue)
-                            if isinstance(weight, dict):
-                                if weight.get('@type') == 'QuantitativeValue':
-                                    value = weight.get('value')
-                                    unit = weight.get('unitCode') or weight.get('unit', '')
-                                    if value:
-                                        return clean_product_size(f"{value}{unit}")
-                                else:
-                                    # Try to extract value from other dict structures
-                                    if 'value' in weight:
-                                        return clean_product_size(str(weight['value']))
+def size_from_package_text(soup):
+    """Individual package size in the visible text (prioritized over total weight)"""
+    page_text = soup.get_text()
+    
+    # Look for package size patterns that indicate individual package weight (in priority order)
+    for pattern in PACKAGE_SIZE_PATTERNS:
+        for match in pattern.finditer(page_text):
+            # Clean and validate the match
+            cleaned_size = clean_product_size(match.group(1))
+            if cleaned_size:
+                return cleaned_size
+    return None
+
+def size_from_json_ld(soup):
+    """Size/weight of the Product in structured data (JSON-LD)"""
+    json_scripts = soup.find_all('script', type='application/ld+json')
+    for script in json_scripts:
+        try:
+            data = json.loads(script.string)
+            if isinstance(data, dict):
+                # Look for weight/size in product data
+                if data.get('@type') == 'Product':
+                    weight = data.get('weight') or data.get('size')
+                    if weight:
+                        # Handle structured weight data (QuantitativeValue)
+                        if isinstance(weight, dict):
+                            if weight.get('@type') == 'QuantitativeValue':
+                                value = weight.get('value')
+                                unit = weight.get('unitCode') or weight.get('unit', '')
+                                if value:
+                                    return clean_product_size(f"{value}{unit}")
                             else:
-                                return clean_product_size(str(weight))
-                        # Look for offers with size information
-                        offers = data.get('offers', [])
-                        if isinstance(offers, list):
-                            for offer in offers:
-                                if isinstance(offer, dict):
-                                    weight = offer.get('weight') or offer.get('size')
-                                    if weight:
-                                        # Handle structured weight data (QuantitativeValue)
-                                        if isinstance(weight, dict):
-                                            if weight.get('@type') == 'QuantitativeValue':
-                                                value = weight.get('value')
-                                                unit = weight.get('unitCode') or weight.get('unit', '')
-                                                if value:
-                                                    return clean_product_size(f"{value}{unit}")
-                                            else:
-                                                # Try to extract value from other dict structures
-                                                if 'value' in weight:
-                                                    return clean_product_size(str(weight['value']))
+                                # Try to extract value from other dict structures
+                                if 'value' in weight:
+                                    return clean_product_size(str(weight['value']))
+                        else:
+                            return clean_product_size(str(weight))
+                    # Look for offers with size information
+                    offers = data.get('offers', [])
+                    if isinstance(offers, list):
+                        for offer in offers:
+                            if isinstance(offer, dict):
+                                weight = offer.get('weight') or offer.get('size')
+                                if weight:
+                                    # Handle structured weight data (QuantitativeValue)
+                                    if isinstance(weight, dict):
+                                        if weight.get('@type') == 'QuantitativeValue':
+                                            value = weight.get('value')
+                                            unit = weight.get('unitCode') or weight.get('unit', '')
+                                            if value:
+                                                return clean_product_size(f"{value}{unit}")
                                         else:
-                                            return clean_product_size(str(weight))
-            except:
-                continue
-        
-        # Strategy 2: Look for size patterns in the page text
-        # Get text from key areas where size info is typically found
-        search_areas = []
-        
-        # Product title area
-        h1_tags = soup.find_all('h1')
-        for h1 in h1_tags:
-            search_areas.append(h1.get_text())
-        
-        # Product details/specifications areas
-        detail_selectors = [
-            {'class': re.compile(r'(product|details|spec|info|size|weight)', re.I)},
-            {'id': re.compile(r'(product|details|spec|info|size|weight)', re.I)}
-        ]
-        
-        for selector in detail_selectors:
-            elements = soup.find_all(['div', 'span', 'p', 'li'], selector)
-            for element in elements[:5]:  # Limit to avoid too much text
-                search_areas.append(element.get_text())
-        
-        # Also check the page title and meta description for size info
-        title_tag = soup.find('title')
-        if title_tag:
-            search_areas.append(title_tag.get_text())
-        
-        meta_desc = soup.find('meta', {'name': 'description'})
-        if meta_desc:
-            search_areas.append(meta_desc.get('content', ''))
-        
-        # Check Open Graph title and description
-        og_title = soup.find('meta', {'property': 'og:title'})
-        if og_title:
-            search_areas.append(og_title.get('content', ''))
-        
-        og_desc = soup.find('meta', {'property': 'og:description'})
-        if og_desc:
-            search_areas.append(og_desc.get('content', ''))
-        
-        # Look for size in product code or SKU areas
-        sku_elements = soup.find_all(string=re.compile(r'(product code|sku|item|model)', re.I))
-        for sku_elem in sku_elements[:3]:
-            parent = sku_elem.parent
-            if parent:
-                search_areas.append(parent.get_text())
-        
-        # Look for size patterns in the text
-        size_patterns = [
-            # Most specific patterns first (exact matches)
-            r'(\d+(?:\.\d+)?\s*oz)\b',  # "2.47 oz"
-            r'(\d+(?:\.\d+)?\s*lbs?)\b',  # "5.5 lb" or "5.5 lbs"
-            r'(\d+(?:\.\d+)?\s*g)\b',    # "100 g"
-            r'(\d+(?:\.\d+)?\s*kg)\b',   # "1.5 kg"
-            r'(\d+(?:\.\d+)?\s*ml)\b',   # "250 ml"
-            r'(\d+(?:\.\d+)?\s*fl\s*oz)\b',  # "8 fl oz"
-            
-            # More general patterns
-            r'(\d+(?:\.\d+)?\s*(?:ounce|ounces))\b',
-            r'(\d+(?:\.\d+)?\s*(?:pound|pounds))\b',
-            r'(\d+(?:\.\d+)?\s*(?:gram|grams))\b',
-            r'(\d+(?:\.\d+)?\s*(?:kilogram|kilograms))\b',
-            r'(\d+(?:\.\d+)?\s*(?:milliliter|milliliters))\b',
-            r'(\d+(?:\.\d+)?\s*(?:liter|liters))\b',
-            r'(\d+(?:\.\d+)?\s*(?:fluid\s*ounce|fluid\s*ounces))\b',
-            
-            # Catch patterns in titles like "Product Name | 2.47 oz Pouch"
-            r'[|\-–]\s*(\d+(?:\.\d+)?\s*oz)\s*(?:pouch|can|bag|package)?',
-            r'[|\-–]\s*(\d+(?:\.\d+)?\s*lbs?)\s*(?:pouch|can|bag|package)?',
-            
-            # Parenthetical sizes like "(2.47oz)"
-            r'\((\d+(?:\.\d+)?\s*oz)\)',
-            r'\((\d+(?:\.\d+)?\s*lbs?)\)',
-        ]
-        
-        import re
-        for area_text in search_areas:
-            if not area_text:
-                continue
-            for pattern in size_patterns:
-                matches = re.findall(pattern, area_text, re.IGNORECASE)
-                for match in matches:
-                    cleaned_size = clean_product_size(match)
-                    if cleaned_size:
-                        return cleaned_size
-        
-        return None
-        
-    except Exception:
-        return None
+                                            # Try to extract value from other dict structures
+                                            if 'value' in weight:
+                                                return clean_product_size(str(weight['value']))
+                                    else:
+                                        return clean_product_size(str(weight))
+        except:
+            continue
+    return None
+
+def size_from_title_areas(soup):
+    """Size patterns in the title, headings, product details, meta descriptions and SKU areas"""
+    # Get text from key areas where size info is typically found
+    search_areas = []
+    
+    # Product title area
+    h1_tags = soup.find_all('h1')
+    for h1 in h1_tags:
+        search_areas.append(h1.get_text())
+    
+    # Product details/specifications areas
+    detail_selectors = [
+        {'class': SIZE_DETAIL_ATTR_RE},
+        {'id': SIZE_DETAIL_ATTR_RE}
+    ]
+    
+    for selector in detail_selectors:
+        elements = soup.find_all(['div', 'span', 'p', 'li'], selector)
+        for element in elements[:5]:  # Limit to avoid too much text
+            search_areas.append(element.get_text())
+    
+    # Also check the page title and meta description for size info
+    title_tag = soup.find('title')
+    if title_tag:
+        search_areas.append(title_tag.get_text())
+    
+    meta_desc = soup.find('meta', {'name': 'description'})
+    if meta_desc:
+        search_areas.append(meta_desc.get('content', ''))
+    
+    # Check Open Graph title and description
+    og_title = soup.find('meta', {'property': 'og:title'})
+    if og_title:
+        search_areas.append(og_title.get('content', ''))
+    
+    og_desc = soup.find('meta', {'property': 'og:description'})
+    if og_desc:
+        search_areas.append(og_desc.get('content', ''))
+    
+    # Look for size in product code or SKU areas
+    sku_elements = soup.find_all(string=SKU_LABEL_RE)
+    for sku_elem in sku_elements[:3]:
+        parent = sku_elem.parent
+        if parent:
+            search_areas.append(parent.get_text())
+    
+    # Look for size patterns in the text (most specific first)
+    for area_text in search_areas:
+        if not area_text:
+            continue
+        for pattern in SIZE_PATTERNS:
+            for match in pattern.finditer(area_text):
+                cleaned_size = clean_product_size(match.group(1))
+                if cleaned_size:
+                    return cleaned_size
+    return None
+
+def extract_product_size(soup, url, context=None):
+    """Extract product size/weight from the webpage"""
+    # (name, confidence, strategy); the cascade stops once a size clears CONFIDENCE_THRESHOLDS['size']
+    strategies = [
+        ('package_text', 0.9, lambda: size_from_package_text(soup)),
+        ('json_ld', 0.9, lambda: size_from_json_ld(soup)),
+        ('title_areas', 0.7, lambda: size_from_title_areas(soup)),
+    ]
+    return run_cascade('size', strategies, url=url, context=context).value
 
 def clean_product_size(size_text):
     """Clean and standardize product size text"""
     if not size_text:
         return None
     
-    import re
-    
     # Remove extra whitespace and normalize
-    cleaned = re.sub(r'\s+', ' ', size_text.strip())
+    cleaned = WHITESPACE_RE.sub(' ', size_text.strip())
     
     # Standardize common abbreviations
-    standardizations = {
-        r'\bounces?\b': 'oz',
-        r'\bpounds?\b': 'lbs',
-        r'\bpound\b': 'lb',
-        r'\bgrams?\b': 'g',
-        r'\bkilograms?\b': 'kg',
-        r'\bmilliliters?\b': 'ml',
-        r'\bliters?\b': 'l',
-        r'\bfluid\s+ounces?\b': 'fl oz',
-        r'\bfl\s+oz\b': 'fl oz'
-    }
-    
-    for pattern, replacement in standardizations.items():
-        cleaned = re.sub(pattern, replacement, cleaned, flags=re.IGNORECASE)
+    for pattern, replacement in SIZE_UNIT_STANDARDIZATIONS:
+        cleaned = pattern.sub(replacement, cleaned)
     
     # Ensure there's no space between number and unit for common cases
-    cleaned = re.sub(r'(\d+(?:\.\d+)?)\s+(oz|lb|lbs|g|kg|ml|l)\b', r'\1\2', cleaned)
+    cleaned = SIZE_NUMBER_UNIT_RE.sub(r'\1\2', cleaned)
     
     return cleaned if cleaned else None
 
+# Life stage keywords, checked in priority order: all life stages, then senior, kitten, puppy
+LIFE_STAGE_KEYWORDS = {
+    'all': [
+        'all life stages', 'all ages', 'all lifestages',
+        'aafco cat food nutrient profiles for all life stages',
+        'aafco dog food nutrient profiles for all life stages',
+        'formulated for all life stages',
+        'complete and balanced for all life stages',
+        'suitable for all life stages',
+        'meets aafco for all life stages',
+        'aafco all life stages'
+    ],
+    # More restrictive phrases to avoid false positives
+    'senior': [
+        'for senior', 'senior cat', 'senior dog', 'senior food', 'senior formula',
+        '7+ years', '8+ years', '9+ years', '10+ years', '11+ years', '12+ years',
+        '7+ year', '8+ year', '9+ year', '10+ year', '11+ year', '12+ year',
+        '7+ cat', '8+ cat', '9+ cat', '10+ cat', '11+ cat', '12+ cat',
+        '7+ dog', '8+ dog', '9+ dog', '10+ dog', '11+ dog', '12+ dog',
+        'mature cat', 'mature dog', 'aged cat', 'aged dog'
+    ],
+    'kitten': ['for kitten', 'for kittens', 'kitten food', 'kitten formula', 'kitten recipe'],
+    'puppy': ['for puppy', 'for puppies', 'puppy food', 'puppy formula', 'puppy recipe'],
+}
+LIFE_STAGE_MATCHER = KeywordMatcher(LIFE_STAGE_KEYWORDS)
+
 def extract_life_stage(soup, url):
     """Extract life stage information (kitten/puppy, adult, senior, all)"""
     try:
@@ -1399,80 +1460,30 @@ def extract_life_stage(soup, url):
         # Look for main product content areas
         main_content = soup.find('main')
         if main_content:
-            product_areas.append(main_content.get_text())
+            product_areas.append(('main', 1, main_content.get_text()))
         
         # Look for product description areas
         product_desc = soup.find_all(['div', 'section'], class_=lambda x: x and any(term in str(x).lower() for term in ['product', 'description', 'details', 'info']))
         for desc in product_desc[:3]:  # Limit to first 3
-            product_areas.append(desc.get_text())
+            product_areas.append(('product_description', 1, desc.get_text()))
         
         # Get page title and meta description (often contains life stage info)
         title = soup.find('title')
         if title:
-            product_areas.append(title.get_text())
+            product_areas.append(('title', 2, title.get_text()))
         
         meta_desc = soup.find('meta', {'name': 'description'})
         if meta_desc:
-            product_areas.append(meta_desc.get('content', ''))
-        
-        # Combine all product text
-        all_text = ' '.join(product_areas).lower()
-        
-        # First check for "all life stages" which takes priority
-        all_stages_keywords = [
-            'all life stages', 'all ages', 'all lifestages',
-            'aafco cat food nutrient profiles for all life stages',
-            'aafco dog food nutrient profiles for all life stages',
-            'formulated for all life stages',
-            'complete and balanced for all life stages',
-            'suitable for all life stages',
-            'meets aafco for all life stages',
-            'aafco all life stages'
-        ]
-        
-        # Check for all life stages patterns first (most specific)
-        for keyword in all_stages_keywords:
-            if keyword in all_text:
-                return "all"
-        
-        # Look for specific age categories with very specific patterns
-        import re
+            product_areas.append(('meta_description', 2, meta_desc.get('content', '')))
         
-        # More restrictive patterns to avoid false positives
-        kitten_patterns = [
-            r'\bfor\s+kittens?\b',           # "for kitten" or "for kittens"
-            r'\bkitten\s+food\b',            # "kitten food"
-            r'\bkitten\s+formula\b',         # "kitten formula"
-            r'\bkitten\s+recipe\b'           # "kitten recipe"
-        ]
-        
-        puppy_patterns = [
-            r'\bfor\s+puppies?\b',           # "for puppy" or "for puppies"
-            r'\bpuppy\s+food\b',             # "puppy food"
-            r'\bpuppy\s+formula\b',          # "puppy formula"
-            r'\bpuppy\s+recipe\b'            # "puppy recipe"
-        ]
-        
-        senior_patterns = [
-            r'\bfor\s+senior\b',             # "for senior"
-            r'\bsenior\s+(?:cat|dog|food|formula)\b',  # "senior cat/dog/food/formula"
-            r'\b(?:7|8|9|10|11|12)\+\s*(?:years?|cat|dog)\b',  # "7+ years" etc
-            r'\bmature\s+(?:cat|dog)\b',     # "mature cat/dog"
-            r'\baged\s+(?:cat|dog)\b'        # "aged cat/dog"
-        ]
-        
-        # Check for specific patterns (most restrictive first)
-        for pattern in senior_patterns:
-            if re.search(pattern, all_text):
-                return "senior"
+        # One scan per area; "all life stages" takes priority, then the most specific age categories
+        found_stages = set()
+        for region, weight, hits in LIFE_STAGE_MATCHER.scan_regions(product_areas):
+            found_stages.update(hit.label for hit in hits)
         
-        for pattern in kitten_patterns:
-            if re.search(pattern, all_text):
-                return "kitten"
-        
-        for pattern in puppy_patterns:
-            if re.search(pattern, all_text):
-                return "puppy"
+        for life_stage in ['all', 'senior', 'kitten', 'puppy']:
+            if life_stage in found_stages:
+                return life_stage
         
         # Default to adult if no specific life stage found
         return "adult"
@@ -1510,564 +1521,141 @@ def extract_life_stage_from_url(url):
     except Exception:
         return "adult"
 
-def clean_extra_content(ingredient_text):
-    """Remove unwanted trailing content from ingredient lists"""
-    import re
-    
-    # Remove common unwanted trailing content
-    unwanted_patterns = [
-        r'view all ingredients.*',
-        r'download.*ingredient.*list.*',
-        r'open in new window.*',
-        r'contact us.*',
-        r'reviews.*',
-        r'discover similar.*',
-        r'sitemap.*',
-        r'navigate to.*',
-        r'all rights reserved.*',
-        r'trademark.*',
-        r'©.*',
-        r'facebook.*',
-        r'twitter.*',
-        r'youtube.*',
-        r'instagram.*',
-        r'feed.*instructions.*',
-        r'guaranteed.*analysis.*',
-        r'nutritional.*info.*',
-        # Marketing phrases
-        r'tantalize.*',
-        r'gourmet.*',
-        r'delicious flavor.*',
-        r'hand-crafted.*',
-        r'toppers offer.*',
-        r'invite your cat.*',
-        r'experience gourmet.*',
-        r'looks good enough for you.*',
-        r'crafted especially for.*',
-        r'attention to detail.*',
-        r'unique taste cats love.*',
-        r'tender bites.*',
-        r'savory broth.*',
-        r'most refined.*',
-        r'between-meal snack.*',
-        r'complement tray.*',
-        r'single-serve.*',
-        r'adult cat food complement.*',
-        r'made to meet your.*',
-        r'ingredient criteria.*',
-        r'serve fancy feast.*',
-        r'favorite fancy feast.*',
-        r'add delicious flavor.*',
-        r'real high quality ingredients.*',
-        r'perfect way.*',
-        r'grain free.*appetizers.*',
-        r'cats alone or over.*',
-        r'the right size for.*'
-    ]
-    
-    cleaned_text = ingredient_text
-    for pattern in unwanted_patterns:
-        cleaned_text = re.sub(pattern, '', cleaned_text, flags=re.IGNORECASE | re.DOTALL)
-    
-    # Clean up any double spaces or trailing commas
-    cleaned_text = re.sub(r'\s+', ' ', cleaned_text)
-    cleaned_text = re.sub(r',\s*$', '', cleaned_text)
-    cleaned_text = cleaned_text.strip()
-    
-    # Remove unwanted characters from individual ingredients and at the end
-    if ',' in cleaned_text:
-        # Split by commas, remove unwanted characters from each ingredient, then rejoin
-        ingredients = []
-        for ing in cleaned_text.split(','):
-            cleaned = ing.strip()
-            while cleaned and cleaned[-1] in '.\\"\',;':
-                cleaned = cleaned[:-1].strip()
-            
-            # Check for patterns where valid ingredient is contaminated with invalid codes
-            # Pattern 1: "Blue 2. N600123" (period + space + invalid code)
-            if '. ' in cleaned and len(cleaned.split('. ')) == 2:
-                first_part, second_part = cleaned.split('. ', 1)
-                if is_valid_ingredient(first_part) and not is_valid_ingredient(second_part):
-                    ingredients.append(first_part)
-                elif is_valid_ingredient(cleaned):
-                    ingredients.append(cleaned)
-            # Pattern 2: "Blue 2 D600724" (space + invalid code starting with letter+numbers)
-            elif ' ' in cleaned and len(cleaned.split()) >= 2:
-                parts = cleaned.split()
-                # Check if last part looks like an invalid code (letter followed by many digits)
-                last_part = parts[-1]
-                if (len(parts) >= 2 and 
-                    re.match(r'^[A-Za-z]\d{5,}$', last_part) and  # Pattern like D600724, N600123
-                    not is_valid_ingredient(last_part)):
-                    # Rejoin everything except the last invalid part
-                    clean_part = ' '.join(parts[:-1])
-                    if is_valid_ingredient(clean_part):
-                        ingredients.append(clean_part)
-                elif cleaned and is_valid_ingredient(cleaned):
-                    ingredients.append(cleaned)
-            elif cleaned and is_valid_ingredient(cleaned):
-                ingredients.append(cleaned)
-        cleaned_text = ', '.join(ingredients)
-    
-    # Remove any trailing unwanted characters
-    while cleaned_text and cleaned_text[-1] in '.\\"\',;':
-        cleaned_text = cleaned_text[:-1].strip()
-    
-    return cleaned_text
-
-def is_valid_ingredient(ingredient):
-    """Check if an ingredient is valid and not a website error/typo"""
-    if not ingredient or len(ingredient.strip()) < 2:
-        return False
-    
-    ingredient = ingredient.strip().lower()
-    
-    # Allow known valid patterns first (vitamins, E-numbers, etc.)
-    # But only for specific known prefixes
-    if re.match(r'^[be]\d{1,3}$', ingredient):  # B1, E300, etc. (common vitamin/additive prefixes)
-        return True
-    if re.match(r'^[a-z]{1,2}-\d+$', ingredient):  # B-12, etc.
-        return True
-    if 'vitamin' in ingredient or 'supplement' in ingredient:
-        return True
-    
-    # Exclude random alphanumeric codes (like k600323, abc123, etc.)
-    # Pattern: letters followed by many numbers (3+)
-    if re.match(r'^[a-z]{1,3}\d{3,}$', ingredient):  # e.g., k600323, ab12345
-        return False
-    # Pattern: many numbers followed by few letters
-    if re.match(r'^\d{3,}[a-z]{1,3}$', ingredient):  # e.g., 12345k, 600ab
-        return False
-    # Pattern: alternating letters and numbers (multiple digit groups)
-    if re.search(r'\d.*[a-z].*\d', ingredient) and len(ingredient) > 3:  # z2z3z4, abc123def456
-        return False
-    
-    # Exclude single characters or very short nonsensical combinations
-    if len(ingredient) <= 2 and not ingredient.isalpha():
-        return False
-    
-    # Exclude items that are mostly numbers with minimal letters (but allow vitamins/E-numbers)
-    letter_count = sum(1 for c in ingredient if c.isalpha())
-    number_count = sum(1 for c in ingredient if c.isdigit())
-    if (number_count > 0 and letter_count > 0 and 
-        number_count >= letter_count * 3 and  # More strict ratio
-        len(ingredient) > 4):  # Don't apply to short ingredients
-        return False
-    
-    return True
-
 def format_ingredient_list(ingredient_text):
     """Universal function to format ingredient lists with proper comma separation"""
-    import re
-    
-    # Convert British spelling "fibre" to American spelling "fiber"
-    ingredient_text = re.sub(r'\bfibre\b', 'fiber', ingredient_text, flags=re.IGNORECASE)
-    
-    # Remove "Vitamins" wrapper and keep only the individual vitamins
-    # Pattern: "Vitamins (Vitamin E Supplement, Vitamin B3 (Niacin Supplement), ...)"
-    # Should become: "Vitamin E Supplement, Vitamin B3 (Niacin Supplement), ..."
-    
-    # Use a more robust approach to handle nested parentheses
-    def extract_vitamins_content(text):
-        # Find "Vitamins (" and then match balanced parentheses
-        start_pattern = r'\bVitamins\s*\('
-        match = re.search(start_pattern, text, re.IGNORECASE)
-        if match:
-            start_pos = match.end() - 1  # Position of opening parenthesis
-            paren_count = 0
-            end_pos = start_pos
-            
-            for i, char in enumerate(text[start_pos:], start_pos):
-                if char == '(':
-                    paren_count += 1
-                elif char == ')':
-                    paren_count -= 1
-                    if paren_count == 0:
-                        end_pos = i
-                        break
-            
-            if paren_count == 0:  # Found matching closing parenthesis
-                vitamins_content = text[start_pos + 1:end_pos]  # Content inside parentheses
-                # Replace the entire "Vitamins (...)" with just the content
-                return text[:match.start()] + vitamins_content + text[end_pos + 1:]
-        
-        return text
-    
-    # Remove "Minerals" wrapper and keep only the individual minerals
-    # Pattern: "Minerals (Zinc Proteinate, Iron Proteinate, Potassium Chloride, ...)"
-    # Should become: "Zinc Proteinate, Iron Proteinate, Potassium Chloride, ..."
-    
-    def extract_minerals_content(text):
-        # Find "Minerals (" and then match balanced parentheses
-        start_pattern = r'\bMinerals\s*\('
-        match = re.search(start_pattern, text, re.IGNORECASE)
-        if match:
-            start_pos = match.end() - 1  # Position of opening parenthesis
-            paren_count = 0
-            end_pos = start_pos
-            
-            for i, char in enumerate(text[start_pos:], start_pos):
-                if char == '(':
-                    paren_count += 1
-                elif char == ')':
-                    paren_count -= 1
-                    if paren_count == 0:
-                        end_pos = i
-                        break
-            
-            if paren_count == 0:  # Found matching closing parenthesis
-                minerals_content = text[start_pos + 1:end_pos]  # Content inside parentheses
-                # Replace the entire "Minerals (...)" with just the content
-                return text[:match.start()] + minerals_content + text[end_pos + 1:]
-        
-        return text
-    
-    ingredient_text = extract_vitamins_content(ingredient_text)
-    ingredient_text = extract_minerals_content(ingredient_text)
-    
-    # Remove any unwanted characters at the end of the entire text first
-    ingredient_text = ingredient_text.strip()
-    while ingredient_text and ingredient_text[-1] in '.\\"\',;':
-        ingredient_text = ingredient_text[:-1].strip()
-    
-    # If already has good comma separation, clean and return
-    if ', ' in ingredient_text and ingredient_text.count(',') > 3:
-        # Split into individual ingredients, remove unwanted characters from each, then rejoin
-        ingredients = []
-        for ing in ingredient_text.split(','):
-            cleaned = ing.strip()
-            
-            # Remove trailing unwanted characters
-            while cleaned and cleaned[-1] in '.\\"\',;':
-                cleaned = cleaned[:-1].strip()
-            
-            # Check for patterns where valid ingredient is contaminated with invalid codes
-            # Pattern 1: "Blue 2. N600123" (period + space + invalid code)
-            if '. ' in cleaned and len(cleaned.split('. ')) == 2:
-                first_part, second_part = cleaned.split('. ', 1)
-                if is_valid_ingredient(first_part) and not is_valid_ingredient(second_part):
-                    ingredients.append(first_part)
-                elif is_valid_ingredient(cleaned):
-                    ingredients.append(cleaned)
-            # Pattern 2: "Blue 2 D600724" (space + invalid code starting with letter+numbers)
-            elif ' ' in cleaned and len(cleaned.split()) >= 2:
-                parts = cleaned.split()
-                # Check if last part looks like an invalid code (letter followed by many digits)
-                last_part = parts[-1]
-                if (len(parts) >= 2 and 
-                    re.match(r'^[A-Za-z]\d{5,}$', last_part) and  # Pattern like D600724, N600123
-                    not is_valid_ingredient(last_part)):
-                    # Rejoin everything except the last invalid part
-                    clean_part = ' '.join(parts[:-1])
-                    if is_valid_ingredient(clean_part):
-                        ingredients.append(clean_part)
-                elif cleaned and is_valid_ingredient(cleaned):
-                    ingredients.append(cleaned)
-            elif cleaned and is_valid_ingredient(cleaned):
-                ingredients.append(cleaned)
-        
-        result = ', '.join(ingredients)
-        
-        # Apply generic ending cleanup to early return path too
-        generic_endings_patterns = [
-            r',?\s*and\s+other\s+minerals?\s*$',
-            r',?\s*and\s+other\s+vitamins?\s*$', 
-            r',?\s*and\s+other\s+supplements?\s*$',
-            r',?\s*and\s+other\s+additives?\s*$',
-            r',?\s*and\s+other\s+ingredients?\s*$',
-            r',?\s*etc\.?\s*$',
-            r',?\s*and\s+more\s*$'
-        ]
-        
-        for pattern in generic_endings_patterns:
-            original_text = result
-            result = re.sub(pattern, '', result, flags=re.IGNORECASE).strip()
-            if result != original_text:  # If a substitution was made, break
-                break
-        
-        return result
-    
-    # Apply universal comma formatting for ingredients that run together
-    formatted_text = ingredient_text
-    
-    # Special handling for dry food patterns that start with meat
-    # Handle patterns like "ChickenRice" -> "Chicken, Rice"
-    formatted_text = re.sub(r'(Chicken|Beef|Salmon|Turkey|Duck|Lamb)(Rice|Meal|Protein)', r'\1, \2', formatted_text)
-    
-    # Handle patterns like "RicePoultry" -> "Rice, Poultry"  
-    formatted_text = re.sub(r'(Rice|Corn|Wheat|Oat)(Poultry|Chicken|Beef|Protein|Meal)', r'\1, \2', formatted_text)
-    
-    # Handle "Poultry By-Product Meal" pattern
-    formatted_text = re.sub(r'(Rice|Corn|Wheat|Oat)(Poultry By-Product)', r'\1, \2', formatted_text)
-    
-    # Insert commas before capital letters that start new ingredients
-    # Pattern: lowercase/number/parenthesis followed by capital letter (common pattern across brands)
-    formatted_text = re.sub(r'([a-z0-9\)])([A-Z][a-z])', r'\1, \2', formatted_text)
-    
-    # Fix common issues across brands
-    formatted_text = re.sub(r', (Vitamin [A-Z]-?\d+)', r', \1', formatted_text)  # Keep vitamin names together
-    formatted_text = re.sub(r'Starch-, Modified', 'Starch-Modified', formatted_text)  # Fix modified starch
-    formatted_text = re.sub(r'B-, (\d)', r'B-\1', formatted_text)  # Fix B-vitamins
-    formatted_text = re.sub(r'Oil-, ', 'Oil, ', formatted_text)  # Fix oil names
-    formatted_text = re.sub(r'Acid-, ', 'Acid, ', formatted_text)  # Fix acid names
-    formatted_text = re.sub(r'Meal-, ', 'Meal, ', formatted_text)  # Fix meal names
-    formatted_text = re.sub(r'By-, Product', 'By-Product', formatted_text)  # Fix by-product
-    
-    # Handle common ingredient run-together patterns
-    # Fish/meat + other ingredients
-    formatted_text = re.sub(r'(Salmon|Chicken|Beef|Turkey|Duck|Tuna|Lamb)(Meal|Broth|Oil|Fat)', r'\1, \2', formatted_text)
-    
-    # Fix double commas
-    formatted_text = re.sub(r',\s*,', ',', formatted_text)
-    
-    # Clean up any leading/trailing commas
-    formatted_text = re.sub(r'^,\s*', '', formatted_text)
-    formatted_text = re.sub(r',\s*$', '', formatted_text)
-    
-    # Final cleanup: split ingredients, remove periods and unwanted characters from each, then rejoin
-    if ',' in formatted_text:
-        ingredients = []
-        for ing in formatted_text.split(','):
-            cleaned = ing.strip()
-            # Remove trailing unwanted characters (periods, slashes, quotes, etc.)
-            while cleaned and cleaned[-1] in '.\\"\',;':
-                cleaned = cleaned[:-1].strip()
-            
-            # Check for patterns where valid ingredient is contaminated with invalid codes
-            # Pattern 1: "Blue 2. N600123" (period + space + invalid code)
-            if '. ' in cleaned and len(cleaned.split('. ')) == 2:
-                first_part, second_part = cleaned.split('. ', 1)
-                if is_valid_ingredient(first_part) and not is_valid_ingredient(second_part):
-                    ingredients.append(first_part)
-                elif is_valid_ingredient(cleaned):
-                    ingredients.append(cleaned)
-            # Pattern 2: "Blue 2 D600724" (space + invalid code starting with letter+numbers)
-            elif ' ' in cleaned and len(cleaned.split()) >= 2:
-                parts = cleaned.split()
-                # Check if last part looks like an invalid code (letter followed by many digits)
-                last_part = parts[-1]
-                if (len(parts) >= 2 and 
-                    re.match(r'^[A-Za-z]\d{5,}$', last_part) and  # Pattern like D600724, N600123
-                    not is_valid_ingredient(last_part)):
-                    # Rejoin everything except the last invalid part
-                    clean_part = ' '.join(parts[:-1])
-                    if is_valid_ingredient(clean_part):
-                        ingredients.append(clean_part)
-                elif cleaned and is_valid_ingredient(cleaned):
-                    ingredients.append(cleaned)
-            elif cleaned and is_valid_ingredient(cleaned):
-                ingredients.append(cleaned)
-        formatted_text = ', '.join(ingredients)
-    
-    # Remove any remaining unwanted characters at the end
-    while formatted_text and formatted_text[-1] in '.\\"\',;':
-        formatted_text = formatted_text[:-1].strip()
-    
-    # Remove generic endings that don't provide specific ingredient information
-    generic_endings_patterns = [
-        r',?\s*and\s+other\s+minerals?\s*$',
-        r',?\s*and\s+other\s+vitamins?\s*$', 
-        r',?\s*and\s+other\s+supplements?\s*$',
-        r',?\s*and\s+other\s+additives?\s*$',
-        r',?\s*and\s+other\s+ingredients?\s*$',
-        r',?\s*etc\.?\s*$',
-        r',?\s*and\s+more\s*$'
-    ]
-    
-    for pattern in generic_endings_patterns:
-        original_text = formatted_text
-        formatted_text = re.sub(pattern, '', formatted_text, flags=re.IGNORECASE).strip()
-        if formatted_text != original_text:  # If a substitution was made, break
-            break
-    
-    return formatted_text
+    # One walk cuts trailing nav/marketing text, unwraps Vitamins/Minerals groups and cleans each ingredient
+    return ', '.join(normalize_ingredients(ingredient_text))
 
 def extract_applaws_dropdown_data(url):
     """Extract all Applaws dropdown data (ingredients, guaranteed analysis, nutritional info) in one browser session"""
-    import re
     from bs4 import BeautifulSoup
     
     try:
-        from selenium_scraper import _get_browser
-        import time
-        from selenium.webdriver.common.by import By
+        from selenium_scraper import render_accordion_snapshots, INGREDIENTS_ACCORDION, NUTRITION_ACCORDION
         
         results = {}
         
-        driver = _get_browser()
-        driver.get(url)
-        time.sleep(5)  # Allow page to load completely
-        
-        # Find all dropdown buttons
-        dropdown_buttons = [
-            ('ingredients', "//*[contains(text(), 'Ingredients')]"),
-            ('nutritional', "//*[contains(text(), 'Nutritional Information') or contains(text(), 'Guaranteed Analysis') or contains(text(), 'Nutrition')]")
+        # Click both accordions in one browser session; cached snapshots skip the browser entirely
+        snapshots = render_accordion_snapshots(url, [INGREDIENTS_ACCORDION, NUTRITION_ACCORDION])
+        dropdown_sources = [
+            ('ingredients', snapshots.get(INGREDIENTS_ACCORDION[0])),
+            ('nutritional', snapshots.get(NUTRITION_ACCORDION[0])),
         ]
         
-        for dropdown_type, xpath in dropdown_buttons:
+        for dropdown_type, new_source in dropdown_sources:
+            if not new_source:
+                continue
             try:
-                elements = driver.find_elements(By.XPATH, xpath)
+                # Parse the revealed content
+                soup_selenium = BeautifulSoup(new_source, 'html.parser')
+                page_text = soup_selenium.get_text()
                 
-                for element in elements:
-                    element_text = element.text.strip()
+                if dropdown_type == 'ingredients':
+                    # Extract ingredients - find the clean list after "Ingredients" keyword
                     
-                    # Click the appropriate dropdown
-                    should_click = False
-                    if dropdown_type == 'ingredients' and element_text == 'Ingredients':
-                        should_click = True
-                    elif dropdown_type == 'nutritional' and element_text in ['Nutritional Information', 'Guaranteed Analysis', 'Nutrition']:
-                        should_click = True
+                    # Look for the complete ingredients list after "Ingredients" keyword
+                    # Pattern: "Ingredients Chicken Breast, Chicken Broth, Rice, Rice Flour."
+                    # Look for exact match of the ingredients pattern
+                    # From debug: "Ingredients Chicken Breast, Chicken Broth, Rice, Rice Flour."
+                    # From debug: "Ingredients Tuna Fillet, Fish Broth, Rice"
                     
-                    if should_click:
-                        # Click to reveal content
-                        driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", element)
-                        time.sleep(1)
-                        driver.execute_script("arguments[0].click();", element)
-                        time.sleep(5)  # Wait for content to load
-                        
-                        # Get the revealed content
-                        new_source = driver.page_source
-                        soup_selenium = BeautifulSoup(new_source, 'html.parser')
-                        page_text = soup_selenium.get_text()
+                    # Simple approach: find "Ingredients" followed by food items and stop before next section
+                    ingredient_match = APPLAWS_INGREDIENTS_RE.search(page_text)
+                    
+                    if ingredient_match:
+                        clean_ingredients = ingredient_match.group(1).strip()
+                        # Remove the "ingredients" keyword if it got captured
+                        clean_ingredients = INGREDIENTS_LABEL_PREFIX_RE.sub('', clean_ingredients)
+                        # Remove extra whitespace and newlines
+                        clean_ingredients = WHITESPACE_RE.sub(' ', clean_ingredients)
+                        # Remove trailing punctuation
+                        clean_ingredients = TRAILING_NON_INGREDIENT_RE.sub('', clean_ingredients)
+                        if clean_ingredients.endswith('.'):
+                            clean_ingredients = clean_ingredients[:-1]
+                        clean_ingredients = clean_ingredients.strip()
                         
-                        if dropdown_type == 'ingredients':
-                            # Extract ingredients - find the clean list after "Ingredients" keyword
-                            
-                            # Look for the complete ingredients list after "Ingredients" keyword
-                            # Pattern: "Ingredients Chicken Breast, Chicken Broth, Rice, Rice Flour."
-                            # Look for exact match of the ingredients pattern
-                            # From debug: "Ingredients Chicken Breast, Chicken Broth, Rice, Rice Flour."
-                            # From debug: "Ingredients Tuna Fillet, Fish Broth, Rice"
-                            
-                            # Simple approach: find "Ingredients" followed by food items and stop before next section
-                            ingredients_pattern = r'ingredients\s+([a-z][a-z\s,]*(?:chicken|tuna|fish|beef|turkey|lamb|rice|flour|broth|water|oil)[a-z\s,]*?)(?=\s*\.\s*nutritional|\s*nutritional|\s*guaranteed|\s*peek|\s*$)'
-                            ingredient_match = re.search(ingredients_pattern, page_text, re.IGNORECASE)
-                            
-                            if ingredient_match:
-                                clean_ingredients = ingredient_match.group(1).strip()
-                                # Remove the "ingredients" keyword if it got captured
-                                clean_ingredients = re.sub(r'^ingredients\s*', '', clean_ingredients, flags=re.IGNORECASE)
-                                # Remove extra whitespace and newlines
-                                clean_ingredients = re.sub(r'\s+', ' ', clean_ingredients)
-                                # Remove trailing punctuation
-                                clean_ingredients = re.sub(r'[^\w\s,().-]+$', '', clean_ingredients)
-                                if clean_ingredients.endswith('.'):
-                                    clean_ingredients = clean_ingredients[:-1]
-                                clean_ingredients = clean_ingredients.strip()
+                        # Validate it's a proper ingredient list (has commas and food-related terms)
+                        if (len(clean_ingredients) > 5 and 
+                            ',' in clean_ingredients and
+                            clean_ingredients.count(',') >= 1 and  # Should have at least 2 ingredients
+                            any(word in clean_ingredients.lower() for word in ['tuna', 'chicken', 'fish', 'beef', 'turkey', 'lamb', 'broth', 'water', 'rice', 'oil'])):
+                            # Convert to array format
+                            ingredients_array = [ingredient.strip() for ingredient in clean_ingredients.split(',')]
+                            results['ingredients'] = ingredients_array
+                    
+                    # If no ingredients found with main patterns, try fallback
+                    if 'ingredients' not in results:
+                        # Fallback patterns if the first approach doesn't work
+                        for pattern in APPLAWS_INGREDIENT_FALLBACK_PATTERNS:
+                            matches = pattern.findall(page_text)
+                            for match in matches:
+                                match = match.strip()
+                                match = WHITESPACE_RE.sub(' ', match)
+                                match = LEADING_NON_WORD_RE.sub('', match)
+                                match = TRAILING_NON_INGREDIENT_RE.sub('', match)
                                 
-                                # Validate it's a proper ingredient list (has commas and food-related terms)
-                                if (len(clean_ingredients) > 5 and 
-                                    ',' in clean_ingredients and
-                                    clean_ingredients.count(',') >= 1 and  # Should have at least 2 ingredients
-                                    any(word in clean_ingredients.lower() for word in ['tuna', 'chicken', 'fish', 'beef', 'turkey', 'lamb', 'broth', 'water', 'rice', 'oil'])):
+                                # Must be short enough to be just ingredients (not marketing text)
+                                if (len(match) > 10 and len(match) < 200 and 
+                                    match.count(',') >= 1 and
+                                    not any(bad in match.lower() for bad in ['carrageenan', 'additive free', 'only', 'ingredients', 'feed with', 'complete', 'balanced diet', 'applaws']) and
+                                    any(word in match.lower() for word in ['chicken', 'fish', 'tuna', 'beef', 'turkey', 'lamb', 'broth', 'water', 'rice', 'oil'])):
                                     # Convert to array format
-                                    ingredients_array = [ingredient.strip() for ingredient in clean_ingredients.split(',')]
+                                    ingredients_array = [ingredient.strip() for ingredient in match.split(',')]
                                     results['ingredients'] = ingredients_array
-                            
-                            # If no ingredients found with main patterns, try fallback
-                            if 'ingredients' not in results:
-                                # Fallback patterns if the first approach doesn't work
-                                ingredient_patterns = [
-                                    # Pattern for "Ingredients X, Y, Z" format
-                                    r'ingredients[:\s]+([a-z][^.]*?(?:,\s*[a-z][^,]*){1,})',
-                                    # Pattern for clean ingredient lists (protein + at least 2 other items)
-                                    r'((?:chicken|fish|tuna|beef|turkey|lamb)[^,]*(?:,\s*[a-z][^,]*){1,})',
-                                    # Pattern for broth-based ingredients
-                                    r'((?:chicken|fish|tuna|beef|turkey|lamb)\s+(?:broth|fillet)[^,]*(?:,\s*[a-z][^,]*){1,})'
-                                ]
-                                
-                                for pattern in ingredient_patterns:
-                                    matches = re.findall(pattern, page_text, re.IGNORECASE)
-                                    for match in matches:
-                                        match = match.strip()
-                                        match = re.sub(r'\s+', ' ', match)
-                                        match = re.sub(r'^[^\w]+', '', match)
-                                        match = re.sub(r'[^\w\s,().-]+$', '', match)
-                                        
-                                        # Must be short enough to be just ingredients (not marketing text)
-                                        if (len(match) > 10 and len(match) < 200 and 
-                                            match.count(',') >= 1 and
-                                            not any(bad in match.lower() for bad in ['carrageenan', 'additive free', 'only', 'ingredients', 'feed with', 'complete', 'balanced diet', 'applaws']) and
-                                            any(word in match.lower() for word in ['chicken', 'fish', 'tuna', 'beef', 'turkey', 'lamb', 'broth', 'water', 'rice', 'oil'])):
-                                            # Convert to array format
-                                            ingredients_array = [ingredient.strip() for ingredient in match.split(',')]
-                                            results['ingredients'] = ingredients_array
-                                            break
-                                    
-                                    if 'ingredients' in results:
-                                        break
-                        
-                        elif dropdown_type == 'nutritional':
-                            # Extract guaranteed analysis
-                            ga_patterns = [
-                                # Pattern for protein-first format
-                                r'(crude\s+protein[^%]+%[^,]*,\s*crude\s+fat[^%]+%[^,]*,\s*crude\s+fiber[^%]+%[^,]*,\s*moisture[^%]+%[^.]*)',
-                                r'(crude\s+protein[^.]+fat[^.]+fiber[^.]+moisture[^.]*%)',
-                                r'(protein[^.]*%[^.]*fat[^.]*%[^.]*fiber[^.]*%[^.]*moisture[^.]*%)',
-                                # Pattern for fat-first format (like kitten tuna)
-                                r'(crude\s+fat[^%]+%[^,]*,\s*crude\s+fib[a-z]*[^%]+%[^,]*,\s*moisture[^%]+%[^,]*,\s*crude\s+protein[^%]+%)',
-                                # More flexible patterns that can capture in any order
-                                r'((?:crude\s+)?(?:fat|protein|fiber|fibre|moisture)[^%]*%[^,]*,\s*(?:crude\s+)?(?:fat|protein|fiber|fibre|moisture)[^%]*%[^,]*,\s*(?:crude\s+)?(?:fat|protein|fiber|fibre|moisture)[^%]*%[^,]*,\s*(?:crude\s+)?(?:fat|protein|fiber|fibre|moisture)[^%]*%)',
-                                # Simplified pattern that captures any sequence with multiple nutritional components
-                                r'((?:crude\s+)?(?:fat|protein|fib[a-z]*|moisture)[^%]*%[^.]*(?:,\s*[^.]*%[^.]*){2,})'
-                            ]
-                            
-                            for pattern in ga_patterns:
-                                matches = re.findall(pattern, page_text, re.IGNORECASE)
-                                for match in matches:
-                                    match = match.strip()
-                                    match = re.sub(r'\s+', ' ', match)
-                                    match = re.sub(r'^[^\w]+', '', match)
-                                    match = re.sub(r'[^\w\.%\)]+$', '', match)
-                                    if match.endswith('.'):
-                                        match = match[:-1]
-                                    
-                                    # DIRECT SEARCH: Extract ONLY the specific percentages we need
-                                    # Search for the specific guaranteed analysis components in the page text
-                                    protein_match = re.search(r'Crude\s+Protein\s+\(min\)\s+(\d+(?:\.\d+)?%)', page_text, re.IGNORECASE)
-                                    fat_match = re.search(r'Crude\s+Fat\s+\(min\)\s+(\d+(?:\.\d+)?%)', page_text, re.IGNORECASE)
-                                    moisture_match = re.search(r'Moisture\s+\(max\)\s+(\d+(?:\.\d+)?%)', page_text, re.IGNORECASE)
-                                    
-                                    # If we found at least protein and one other component, construct clean result
-                                    if protein_match and (fat_match or moisture_match):
-                                        components = []
-                                        components.append(f"Crude Protein (min) {protein_match.group(1)}")
-                                        if fat_match:
-                                            components.append(f"Crude Fat (min) {fat_match.group(1)}")
-                                        if moisture_match:
-                                            components.append(f"Moisture (max) {moisture_match.group(1)}")
-                                        
-                                        clean_analysis = ", ".join(components)
-                                        results['guaranteed_analysis'] = clean_analysis
-                                        break
-                                
-                                if 'guaranteed_analysis' in results:
                                     break
                             
-                            # Extract nutritional info (calories)
-                            calorie_patterns = [
-                                r'(\d+(?:\.\d+)?\s*kcal/kg)',
-                                r'(\d+(?:\.\d+)?\s*kcal\s*/\s*kg)',
-                                r'(\d+(?:\.\d+)?\s*kilocalories?\s*/\s*kg)',
-                                r'(\d+(?:\.\d+)?\s*cal/kg)',
-                            ]
+                            if 'ingredients' in results:
+                                break
+                
+                elif dropdown_type == 'nutritional':
+                    # Extract guaranteed analysis
+                    for pattern in APPLAWS_GA_PATTERNS:
+                        matches = pattern.findall(page_text)
+                        for match in matches:
+                            match = match.strip()
+                            match = WHITESPACE_RE.sub(' ', match)
+                            match = LEADING_NON_WORD_RE.sub('', match)
+                            match = TRAILING_NON_ANALYSIS_RE.sub('', match)
+                            if match.endswith('.'):
+                                match = match[:-1]
+                            
+                            # DIRECT SEARCH: Extract ONLY the specific percentages we need
+                            # Search for the specific guaranteed analysis components in the page text
+                            protein_match = GA_PROTEIN_MIN_RE.search(page_text)
+                            fat_match = GA_FAT_MIN_RE.search(page_text)
+                            moisture_match = GA_MOISTURE_MAX_RE.search(page_text)
                             
-                            for pattern in calorie_patterns:
-                                matches = re.findall(pattern, page_text, re.IGNORECASE)
-                                for match in matches:
-                                    match = match.strip()
-                                    match = re.sub(r'\s+', ' ', match)
-                                    match = re.sub(r'\s*/\s*', '/', match)
-                                    
-                                    calorie_num = re.findall(r'(\d+(?:\.\d+)?)', match)
-                                    if calorie_num and 50 <= float(calorie_num[0]) <= 10000:
-                                        results['nutritional_info'] = {'calories': match}
-                                        break
+                            # If we found at least protein and one other component, construct clean result
+                            if protein_match and (fat_match or moisture_match):
+                                components = []
+                                components.append(f"Crude Protein (min) {protein_match.group(1)}")
+                                if fat_match:
+                                    components.append(f"Crude Fat (min) {fat_match.group(1)}")
+                                if moisture_match:
+                                    components.append(f"Moisture (max) {moisture_match.group(1)}")
                                 
-                                if 'nutritional_info' in results:
-                                    break
+                                clean_analysis = ", ".join(components)
+                                results['guaranteed_analysis'] = clean_analysis
+                                break
+                        
+                        if 'guaranteed_analysis' in results:
+                            break
+                    
+                    # Extract nutritional info (calories)
+                    for pattern in CALORIES_PER_KG_PATTERNS:
+                        matches = pattern.findall(page_text)
+                        for match in matches:
+                            match = match.strip()
+                            match = WHITESPACE_RE.sub(' ', match)
+                            match = SLASH_SPACING_RE.sub('/', match)
+                            
+                            calorie_num = NUMBER_RE.findall(match)
+                            if calorie_num and 50 <= float(calorie_num[0]) <= 10000:
+                                results['nutritional_info'] = {'calories': match}
+                                break
                         
-                        break  # Found and clicked this dropdown type
+                        if 'nutritional_info' in results:
+                            break
                 
             except Exception as e:
                 continue
@@ -2079,39 +1667,23 @@ def extract_applaws_dropdown_data(url):
 
 def extract_nutritional_info_viva_raw(soup, url):
     """Extract nutritional info from Viva Raw using page text, JavaScript metafields, and image analysis"""
-    import re
     try:
         page_text = soup.get_text()
         page_source = str(soup)
         
-        # Look for calories in visible text with expanded patterns
-        calorie_patterns = [
-            # Standard patterns
-            r'(\d+(?:\.\d+)?\s*kcal/kg)',
-            r'(\d+(?:\.\d+)?\s*kcal\s*/\s*kg)',
-            r'(\d+(?:\.\d+)?\s*kilocalories?\s*/\s*kg)',
-            r'(\d+(?:\.\d+)?\s*cal/kg)',
-            r'(\d+(?:\.\d+)?\s*kcal)',
-            # Viva Raw specific patterns
-            r'calories\s+per\s+ounce[:\s]*(\d+(?:\.\d+)?)',
-            r'(\d+(?:\.\d+)?)\s*calories\s+per\s+ounce',
-            r'calories[:\s]*(\d+(?:\.\d+)?)\s*(?:per\s+)?(?:oz|ounce)',
-            r'(\d+(?:\.\d+)?)\s*kcal\s*/\s*oz',
-            r'(\d+(?:\.\d+)?)\s*kcal\s+per\s+oz',
-        ]
-        
-        for pattern in calorie_patterns:
-            matches = re.findall(pattern, page_text, re.IGNORECASE)
+        # Look for calories in visible text with expanded patterns (per kg first, then Viva Raw's per ounce)
+        for pattern, per_ounce in VIVA_CALORIE_PATTERNS:
+            matches = pattern.findall(page_text)
             for match in matches:
                 match = match.strip()
-                match = re.sub(r'\s+', ' ', match)
-                match = re.sub(r'\s*/\s*', '/', match)
+                match = WHITESPACE_RE.sub(' ', match)
+                match = SLASH_SPACING_RE.sub('/', match)
                 
-                calorie_num = re.findall(r'(\d+(?:\.\d+)?)', match)
+                calorie_num = NUMBER_RE.findall(match)
                 if calorie_num:
                     calorie_value = float(calorie_num[0])
                     # For per-ounce values, accept lower range (20-100 typical for per oz)
-                    if 'ounce' in pattern or 'oz' in pattern:
+                    if per_ounce:
                         if 20 <= calorie_value <= 200:
                             return {'calories': f"{calorie_value}kcal/oz"}
                     # For per-kg values, use higher range
@@ -2119,12 +1691,11 @@ def extract_nutritional_info_viva_raw(soup, url):
                         return {'calories': match}
         
         # Look for calories in JavaScript metafields
-        metafields_pattern = r'"facts":\s*\[(.*?)\]'
-        metafields_match = re.search(metafields_pattern, page_source, re.DOTALL)
+        metafields_match = METAFIELD_FACTS_RE.search(page_source)
         
         if metafields_match:
             facts_data = metafields_match.group(1)
-            fact_items = re.findall(r'"([^"]*\|[^"]*)"', facts_data)
+            fact_items = FACT_ITEM_RE.findall(facts_data)
             
             for fact in fact_items:
                 if '|' in fact and ('calor' in fact.lower() or 'kcal' in fact.lower()):
@@ -2135,23 +1706,15 @@ def extract_nutritional_info_viva_raw(soup, url):
         # Look for calories in script tags (Viva Raw specific) with product-specific data
         # Try to find product-specific calorie information
         variant_id = None
-        variant_match = re.search(r'variant[=:](\d+)', url)
+        variant_match = VARIANT_PARAM_RE.search(url)
         if variant_match:
             variant_id = variant_match.group(1)
         
-        script_calorie_patterns = [
-            r'"info":\s*"~?(\d+(?:\.\d+)?)\s*kilocalories?\s+per\s+ounce"',
-            r'"info":\s*"~?(\d+(?:\.\d+)?)\s*kcal\s+per\s+oz"',
-            r'"info":\s*"~?(\d+(?:\.\d+)?)\s*calories?\s+per\s+ounce"',
-            # More flexible patterns
-            r'"info":\s*"[^"]*?(\d+(?:\.\d+)?)[^"]*?(?:kilocalories?|kcal)[^"]*?per\s+ounce[^"]*?"',
-        ]
-        
         # Look for variant-specific calorie data using flexible pattern that handles large zipcode lists
         if variant_id:
-            # Use flexible pattern that can span large distances (like zipcode lists)
-            pattern = rf'variant_id:{variant_id}.*?"info":\s*"~?(\d+(?:\.\d+)?)\s*kilocalories?\s+per\s+ounce[^"]*"'
-            match = re.search(pattern, page_source, re.IGNORECASE | re.DOTALL)
+            # The first calorie info after the variant marker, however far away (like zipcode lists)
+            variant_marker = re.search(rf'variant_id:{variant_id}', page_source, re.IGNORECASE)
+            match = variant_marker and VIVA_INFO_KCAL_PER_OUNCE_RE.search(page_source, variant_marker.end())
             if match:
                 try:
                     calorie_value = float(match.group(1))
@@ -2161,8 +1724,8 @@ def extract_nutritional_info_viva_raw(soup, url):
                     pass
         
         # Fallback to general script search
-        for pattern in script_calorie_patterns:
-            matches = re.findall(pattern, page_source, re.IGNORECASE)
+        for pattern in VIVA_SCRIPT_CALORIE_PATTERNS:
+            matches = pattern.findall(page_source)
             for match in matches:
                 try:
                     calorie_value = float(match)
@@ -2206,138 +1769,91 @@ def extract_nutritional_info_applaws(soup, url):
         pass
     return None
 
-def extract_nutritional_info(soup, url):
-    """Extract nutritional info using fallback system: Brand-specific → Applaws method → Viva Raw method → Generic"""
-    import re
-    
+def extract_nutritional_info_applaws_rendered(soup, url):
+    """Extract calories from Applaws by clicking the nutritional information dropdown with Selenium"""
+    # Applaws hides nutritional info in clickable sections that need to be revealed
+    nutritional_info = {}
     try:
-        # METHOD 1: Brand-specific detection (prioritize known patterns)
-        if 'onlynaturalpet.com' in url.lower():
-            result = extract_nutritional_info_only_natural_pet(soup, url)
-            if result:
-                return result
-        
-        if 'vivarawpets.com' in url.lower():
-            result = extract_nutritional_info_viva_raw(soup, url)
-            if result:
-                return result
-        
-        if 'applaws.com' in url.lower():
-            result = extract_nutritional_info_applaws(soup, url)
-            if result:
-                return result
-        
-        # METHOD 2: Try Applaws method for any unknown brand (Selenium dropdown approach)
-        result = extract_nutritional_info_applaws(soup, url)
-        if result:
-            return result
-        
-        # METHOD 3: Try Viva Raw method for any unknown brand (JavaScript metafields)
-        result = extract_nutritional_info_viva_raw(soup, url)
-        if result:
-            return result
-        
-        # METHOD 4: Generic extraction methods (existing fallback logic)
-        nutritional_info = {}
-        
-        # APPLAWS DROPDOWN DETECTION: Use Selenium to click nutritional information dropdowns
-        # Applaws hides nutritional info in clickable sections that need to be revealed
-        if 'applaws.com' in url.lower():
-            try:
-                from selenium_scraper import _get_browser
-                import time
-                from selenium.webdriver.common.by import By
-                
-                driver = _get_browser()
-                driver.get(url)
-                time.sleep(5)  # Allow page to load completely
-                
-                # Look for clickable "Nutritional Information" sections
-                nutrition_buttons = driver.find_elements(By.XPATH, "//*[contains(text(), 'Nutritional Information') or contains(text(), 'Nutrition') or contains(text(), 'Guaranteed Analysis')]")
-                
-                for i, button in enumerate(nutrition_buttons):
-                    try:
-                        element_text = button.text.strip()
-                        
-                        # Look for nutritional information dropdown text
-                        if element_text in ['Nutritional Information', 'Nutrition', 'Guaranteed Analysis']:
-                            # Click to reveal hidden nutritional content
-                            driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", button)
-                            time.sleep(1)
-                            driver.execute_script("arguments[0].click();", button)
-                            time.sleep(5)  # Wait for content to load
-                            
-                            # Get the new page content and extract nutritional info
-                            new_source = driver.page_source
-                            soup_selenium = BeautifulSoup(new_source, 'html.parser')
-                            page_text = soup_selenium.get_text()
-                            
-                            # Look for calorie patterns directly in the page text
-                            
-                            # Look for kcal/kg patterns
-                            calorie_patterns = [
-                                r'(\d+(?:\.\d+)?\s*kcal/kg)',
-                                r'(\d+(?:\.\d+)?\s*kcal\s*/\s*kg)',
-                                r'(\d+(?:\.\d+)?\s*kilocalories?\s*/\s*kg)',
-                                r'(\d+(?:\.\d+)?\s*cal/kg)',
-                            ]
-                            
-                            for pattern in calorie_patterns:
-                                matches = re.findall(pattern, page_text, re.IGNORECASE)
-                                for match in matches:
-                                    # Clean up the match
-                                    match = match.strip()
-                                    # Standardize the format
-                                    match = re.sub(r'\s+', ' ', match)
-                                    match = re.sub(r'\s*/\s*', '/', match)
-                                    
-                                    # Validate it looks like a reasonable calorie value
-                                    calorie_num = re.findall(r'(\d+(?:\.\d+)?)', match)
-                                    if calorie_num and 50 <= float(calorie_num[0]) <= 10000:  # Reasonable calorie range
-                                        nutritional_info['calories'] = match
-                                        break
-                                
-                                if 'calories' in nutritional_info:
-                                    break
-                            
-                            break  # Found and clicked the nutrition button
-                            
-                    except Exception as e:
-                        continue
-                
-            except Exception as e:
-                # Fall through to regular extraction if Selenium fails
-                pass
+        from selenium_scraper import render_accordion_snapshots, NUTRITION_ACCORDION
         
-        # Fallback: Try to extract from static HTML if Selenium didn't work
-        if not nutritional_info:
-            page_text = soup.get_text()
+        # Click the nutritional information dropdown (reuses a cached snapshot when available)
+        new_source = render_accordion_snapshots(url, [NUTRITION_ACCORDION]).get(NUTRITION_ACCORDION[0])
+        if new_source:
+            soup_selenium = BeautifulSoup(new_source, 'html.parser')
+            page_text = soup_selenium.get_text()
             
-            # Look for calorie patterns in the static content
-            calorie_patterns = [
-                r'(\d+(?:\.\d+)?\s*kcal/kg)',
-                r'(\d+(?:\.\d+)?\s*kcal\s*/\s*kg)',
-                r'(\d+(?:\.\d+)?\s*kilocalories?\s*/\s*kg)',
-                r'(\d+(?:\.\d+)?\s*cal/kg)',
-            ]
+            # Look for calorie patterns directly in the page text
             
-            import re
-            for pattern in calorie_patterns:
-                matches = re.findall(pattern, page_text, re.IGNORECASE)
+            # Look for kcal/kg patterns
+            for pattern in CALORIES_PER_KG_PATTERNS:
+                matches = pattern.findall(page_text)
                 for match in matches:
+                    # Clean up the match
                     match = match.strip()
-                    match = re.sub(r'\s+', ' ', match)
-                    match = re.sub(r'\s*/\s*', '/', match)
+                    # Standardize the format
+                    match = WHITESPACE_RE.sub(' ', match)
+                    match = SLASH_SPACING_RE.sub('/', match)
                     
-                    # Validate calorie value
-                    calorie_num = re.findall(r'(\d+(?:\.\d+)?)', match)
-                    if calorie_num and 50 <= float(calorie_num[0]) <= 10000:
+                    # Validate it looks like a reasonable calorie value
+                    calorie_num = NUMBER_RE.findall(match)
+                    if calorie_num and 50 <= float(calorie_num[0]) <= 10000:  # Reasonable calorie range
                         nutritional_info['calories'] = match
                         break
                 
                 if 'calories' in nutritional_info:
                     break
         
+    except Exception as e:
+        # Fall through to regular extraction if Selenium fails
+        pass
+    return nutritional_info if nutritional_info else None
+
+def nutrition_confidence(nutritional_info):
+    """Calorie values score 1; anything else scores lower"""
+    if isinstance(nutritional_info, dict) and nutritional_info.get('calories'):
+        return 1.0
+    return 0.6
+
+def extract_nutritional_info(soup, url, context=None):
+    """Extract nutritional info with a confidence cascade: Site extractors → Viva Raw method → Generic → Applaws method"""
+    site = domain_config(url)
+    
+    # Static strategies run before the Applaws probe, which starts the browser on any site
+    strategies = site_strategies(site, 'nutritional_info', soup, url)
+    if not skips(site, STRATEGY_VIVA_RAW_PROBE):
+        strategies.append(('viva_raw_probe', 0.85, lambda: extract_nutritional_info_viva_raw(soup, url)))
+    if not skips(site, STRATEGY_GENERIC):
+        strategies.append(('generic', 0.85, lambda: extract_nutritional_info_generic(soup, url)))
+    if not skips(site, STRATEGY_APPLAWS_PROBE):
+        strategies.append(('applaws_probe', 0.8, lambda: extract_nutritional_info_applaws(soup, url)))
+    
+    return run_cascade('nutritional_info', strategies, nutrition_confidence, url, context).value
+
+def extract_nutritional_info_generic(soup, url):
+    """Search the page for nutritional info with the generic patterns (existing fallback logic)"""
+    try:
+        nutritional_info = {}
+        
+        # Look for calories in the static HTML
+        page_text = soup.get_text()
+        
+        # Look for calorie patterns in the static content
+        for pattern in CALORIES_PER_KG_PATTERNS:
+            matches = pattern.findall(page_text)
+            for match in matches:
+                match = match.strip()
+                match = WHITESPACE_RE.sub(' ', match)
+                match = SLASH_SPACING_RE.sub('/', match)
+                
+                # Validate calorie value
+                calorie_num = NUMBER_RE.findall(match)
+                if calorie_num and 50 <= float(calorie_num[0]) <= 10000:
+                    nutritional_info['calories'] = match
+                    break
+            
+            if 'calories' in nutritional_info:
+                break
+        
         # Return the nutritional info object or None if no calories found
         return nutritional_info if nutritional_info else None
         
@@ -2346,7 +1862,6 @@ def extract_nutritional_info(soup, url):
 
 def extract_guaranteed_analysis_viva_raw(soup, url):
     """Extract guaranteed analysis from Viva Raw using JavaScript metafields with product-specific data"""
-    import re
     try:
         # Get the raw HTML to search for JavaScript data
         page_source = str(soup)
@@ -2354,30 +1869,29 @@ def extract_guaranteed_analysis_viva_raw(soup, url):
         # Look for product-specific metafields with facts data
         # Try to find the specific product variant data first
         variant_id = None
-        variant_match = re.search(r'variant[=:](\d+)', url)
+        variant_match = VARIANT_PARAM_RE.search(url)
         if variant_match:
             variant_id = variant_match.group(1)
         
         # Look for variant-specific metafields using flexible pattern that handles large zipcode lists
         facts_data = None
         if variant_id:
-            # Use flexible pattern that can span large distances (like zipcode lists)
-            pattern = rf'variant_id:{variant_id}.*?"facts":\s*\[(.*?)\]'
-            match = re.search(pattern, page_source, re.DOTALL)
+            # The first facts list after the variant marker, however far away (like zipcode lists)
+            variant_pos = page_source.find(f'variant_id:{variant_id}')
+            match = METAFIELD_FACTS_RE.search(page_source, variant_pos) if variant_pos != -1 else None
             if match:
                 facts_data = match.group(1)
         
         # If no variant-specific data found, try general metafields
         if not facts_data:
-            metafields_pattern = r'"facts":\s*\[(.*?)\]'
-            metafields_match = re.search(metafields_pattern, page_source, re.DOTALL)
+            metafields_match = METAFIELD_FACTS_RE.search(page_source)
             if metafields_match:
                 facts_data = metafields_match.group(1)
             else:
                 return None
         
         # Extract individual facts like "Crude Protein (min)|16.3%"
-        fact_items = re.findall(r'"([^"]*\|[^"]*)"', facts_data)
+        fact_items = FACT_ITEM_RE.findall(facts_data)
         
         components = []
         for fact in fact_items:
@@ -2395,7 +1909,7 @@ def extract_guaranteed_analysis_viva_raw(soup, url):
         
         if components:
             clean_analysis = ", ".join(components)
-            clean_analysis = re.sub(r'\bfibre\b', 'fiber', clean_analysis, flags=re.IGNORECASE)
+            clean_analysis = FIBRE_RE.sub('fiber', clean_analysis)
             return clean_analysis
             
     except Exception:
@@ -2404,7 +1918,6 @@ def extract_guaranteed_analysis_viva_raw(soup, url):
 
 def extract_guaranteed_analysis_applaws(soup, url):
     """Extract guaranteed analysis from Applaws using Selenium dropdown method"""
-    import re
     try:
         applaws_data = extract_applaws_dropdown_data(url)
         if applaws_data and 'guaranteed_analysis' in applaws_data:
@@ -2413,153 +1926,91 @@ def extract_guaranteed_analysis_applaws(soup, url):
         pass
     return None
 
-def extract_guaranteed_analysis(soup, url):
-    """Extract guaranteed analysis using fallback system: Brand-specific → Applaws method → Viva Raw method → Generic"""
-    import re
-    
+def extract_guaranteed_analysis_applaws_rendered(soup, url):
+    """Extract guaranteed analysis from Applaws by clicking the dropdown with Selenium"""
     try:
-        # METHOD 1: Brand-specific detection (prioritize known patterns)
-        if 'onlynaturalpet.com' in url.lower():
-            result = extract_guaranteed_analysis_only_natural_pet(soup, url)
-            if result:
-                return result
-        
-        if 'vivarawpets.com' in url.lower():
-            result = extract_guaranteed_analysis_viva_raw(soup, url)
-            if result:
-                return result
-        
-        if 'applaws.com' in url.lower():
-            result = extract_guaranteed_analysis_applaws(soup, url)
-            if result:
-                return result
-        
-        # METHOD 2: Try Applaws method for any unknown brand (Selenium dropdown approach)
-        result = extract_guaranteed_analysis_applaws(soup, url)
-        if result:
-            return result
+        from selenium_scraper import render_accordion_snapshots, NUTRITION_ACCORDION
         
-        # METHOD 3: Try Viva Raw method for any unknown brand (JavaScript metafields)
-        result = extract_guaranteed_analysis_viva_raw(soup, url)
-        if result:
-            return result
+        # Click the guaranteed analysis dropdown (reuses a cached snapshot when available)
+        new_source = render_accordion_snapshots(url, [NUTRITION_ACCORDION]).get(NUTRITION_ACCORDION[0])
+        if new_source:
+            soup_selenium = BeautifulSoup(new_source, 'html.parser')
+            page_text = soup_selenium.get_text()
+            
+            # Look for guaranteed analysis patterns directly in the page text
+            
+            # DIRECT SEARCH: Look for the exact percentages in the entire page text
+            # This bypasses all complex patterns and just finds what we need
+            
+            # Search for the specific guaranteed analysis components
+            protein_match = GA_PROTEIN_MIN_RE.search(page_text)
+            fat_match = GA_FAT_MIN_RE.search(page_text)
+            moisture_match = GA_MOISTURE_MAX_RE.search(page_text)
+            
+            # If we found at least protein and one other component, construct clean result
+            if protein_match and (fat_match or moisture_match):
+                components = []
+                components.append(f"Crude Protein (min) {protein_match.group(1)}")
+                if fat_match:
+                    components.append(f"Crude Fat (min) {fat_match.group(1)}")
+                if moisture_match:
+                    components.append(f"Moisture (max) {moisture_match.group(1)}")
+                
+                clean_analysis = ", ".join(components)
+                return clean_analysis
         
-        # METHOD 4: Generic extraction methods (existing fallback logic)
+    except Exception as e:
+        # Fall through to regular extraction if Selenium fails
+        pass
+    return None
+
+def analysis_confidence(analysis):
+    """Analyses with at least two components score 1; single values and explanation messages score lower"""
+    if isinstance(analysis, str) and not is_field_complete(analysis):
+        return 0.1
+    return 1.0 if str(analysis).count('%') >= 2 else 0.6
+
+def extract_guaranteed_analysis(soup, url, context=None):
+    """Extract guaranteed analysis with a confidence cascade: Site extractors → Viva Raw method → Generic → Applaws method"""
+    site = domain_config(url)
+    
+    # Static strategies run before the Applaws probe, which starts the browser on any site
+    strategies = site_strategies(site, 'guaranteed_analysis', soup, url)
+    if not skips(site, STRATEGY_VIVA_RAW_PROBE):
+        strategies.append(('viva_raw_probe', 0.85, lambda: extract_guaranteed_analysis_viva_raw(soup, url)))
+    if not skips(site, STRATEGY_GENERIC):
+        strategies.append(('generic', 0.85, lambda: extract_guaranteed_analysis_generic(soup, url)))
+    if not skips(site, STRATEGY_APPLAWS_PROBE):
+        strategies.append(('applaws_probe', 0.8, lambda: extract_guaranteed_analysis_applaws(soup, url)))
+    
+    return run_cascade('guaranteed_analysis', strategies, analysis_confidence, url, context).value
+
+def extract_guaranteed_analysis_generic(soup, url):
+    """Search the page for guaranteed analysis with the generic patterns (existing fallback logic)"""
+    try:
         page_text = soup.get_text()
         
-        # Look for guaranteed analysis patterns in visible text
-        ga_patterns = [
-            r'Crude\s+Protein\s+\([^)]+\)\s*:?\s*(\d+(?:\.\d+)?%)',
-            r'Crude\s+Fat\s+\([^)]+\)\s*:?\s*(\d+(?:\.\d+)?%)',
-            r'(?:Crude\s+)?Fiber\s+\([^)]+\)\s*:?\s*(\d+(?:\.\d+)?%)',
-            r'Moisture\s+\([^)]+\)\s*:?\s*(\d+(?:\.\d+)?%)',
-        ]
-        
+        # Look for guaranteed analysis patterns in visible text (grouped by component, in label order)
         components = []
-        for pattern in ga_patterns:
-            matches = re.findall(pattern, page_text, re.IGNORECASE)
-            for match in matches:
-                if 'protein' in pattern.lower():
-                    components.append(f"Crude Protein (min): {match}")
-                elif 'fat' in pattern.lower():
-                    components.append(f"Crude Fat (min): {match}")
-                elif 'fiber' in pattern.lower() or 'fibre' in pattern.lower():
-                    components.append(f"Crude Fiber (max): {match}")
-                elif 'moisture' in pattern.lower():
-                    components.append(f"Moisture (max): {match}")
+        for label, pattern in GA_COMPONENT_PATTERNS:
+            for match in pattern.findall(page_text):
+                components.append(f"{label}: {match}")
         
         if components:
             clean_analysis = ", ".join(components)
-            clean_analysis = re.sub(r'\bfibre\b', 'fiber', clean_analysis, flags=re.IGNORECASE)
+            clean_analysis = FIBRE_RE.sub('fiber', clean_analysis)
             return clean_analysis
         
-        # Original Applaws method as final fallback
-        # This is more efficient and avoids multiple browser instances
-        if 'applaws.com' in url.lower():
-            try:
-                from selenium_scraper import _get_browser
-                import time
-                from selenium.webdriver.common.by import By
-                
-                driver = _get_browser()
-                driver.get(url)
-                time.sleep(5)  # Allow page to load completely
-                
-                # Look for clickable "Nutritional Information" or "Guaranteed Analysis" sections
-                analysis_buttons = driver.find_elements(By.XPATH, "//*[contains(text(), 'Nutritional Information') or contains(text(), 'Guaranteed Analysis') or contains(text(), 'Nutrition')]")
-                
-                for i, button in enumerate(analysis_buttons):
-                    try:
-                        element_text = button.text.strip()
-                        
-                        # Look for nutritional information dropdown text
-                        if element_text in ['Nutritional Information', 'Guaranteed Analysis', 'Nutrition']:
-                            # Click to reveal hidden content
-                            driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", button)
-                            time.sleep(1)
-                            driver.execute_script("arguments[0].click();", button)
-                            time.sleep(5)  # Wait for content to load
-                            
-                            # Get the new page content and extract guaranteed analysis
-                            new_source = driver.page_source
-                            soup_selenium = BeautifulSoup(new_source, 'html.parser')
-                            page_text = soup_selenium.get_text()
-                            
-                            # Look for guaranteed analysis patterns directly in the page text
-                            
-                            # Try multiple patterns to find guaranteed analysis after clicking
-                            # ULTRA-PRECISE: Extract ONLY the exact percentages, nothing else
-                            patterns = [
-                                # Pattern 1: Extract the exact sequence from your screenshot
-                                r'Guaranteed\s+Analysis\s+(Crude\s+Protein\s+\([^)]+\)\s+\d+(?:\.\d+)?%(?:\s*,\s*Crude\s+Fat\s+\([^)]+\)\s+\d+(?:\.\d+)?%)?(?:\s*,\s*(?:Crude\s+)?Fiber\s+\([^)]+\)\s+\d+(?:\.\d+)?%)?(?:\s*,\s*Moisture\s+\([^)]+\)\s+\d+(?:\.\d+)?%)?)',
-                                
-                                # Pattern 2: Just the percentages part without "Guaranteed Analysis" prefix
-                                r'(Crude\s+Protein\s+\([^)]+\)\s+\d+(?:\.\d+)?%(?:\s*,\s*Crude\s+Fat\s+\([^)]+\)\s+\d+(?:\.\d+)?%)?(?:\s*,\s*(?:Crude\s+)?Fiber\s+\([^)]+\)\s+\d+(?:\.\d+)?%)?(?:\s*,\s*Moisture\s+\([^)]+\)\s+\d+(?:\.\d+)?%)?)(?=\s+(?:Peek|Ideal|Added|With|Made|FAQs|Popular|$))',
-                                
-                                # Pattern 3: Very specific - match the exact format from screenshot
-                                r'(Crude\s+Protein\s+\(min\)\s+\d+%,\s+Crude\s+Fat\s+\(min\)\s+\d+%,\s+Moisture\s+\(max\)\s+\d+%)',
-                                
-                                # Pattern 4: Flexible but bounded by next sentence
-                                r'(Crude\s+Protein\s+\([^)]+\)\s+\d+(?:\.\d+)?%[^.]*?(?:,\s*[^.]*?){0,3})\s+(?=Peek\s+at|Ideal\s+balance|Added\s+calcium|With\s+vitamins|Made\s+without|FAQs|Popular|$)'
-                            ]
-                            
-                            # DIRECT SEARCH: Look for the exact percentages in the entire page text
-                            # This bypasses all complex patterns and just finds what we need
-                            
-                            # Search for the specific guaranteed analysis components
-                            protein_match = re.search(r'Crude\s+Protein\s+\(min\)\s+(\d+(?:\.\d+)?%)', page_text, re.IGNORECASE)
-                            fat_match = re.search(r'Crude\s+Fat\s+\(min\)\s+(\d+(?:\.\d+)?%)', page_text, re.IGNORECASE)
-                            moisture_match = re.search(r'Moisture\s+\(max\)\s+(\d+(?:\.\d+)?%)', page_text, re.IGNORECASE)
-                            
-                            # If we found at least protein and one other component, construct clean result
-                            if protein_match and (fat_match or moisture_match):
-                                components = []
-                                components.append(f"Crude Protein (min) {protein_match.group(1)}")
-                                if fat_match:
-                                    components.append(f"Crude Fat (min) {fat_match.group(1)}")
-                                if moisture_match:
-                                    components.append(f"Moisture (max) {moisture_match.group(1)}")
-                                
-                                clean_analysis = ", ".join(components)
-                                return clean_analysis
-                            
-                            break  # Found and clicked the analysis button
-                            
-                    except Exception as e:
-                        continue
-                
-            except Exception as e:
-                # Fall through to regular extraction if Selenium fails
-                pass
-        
-        # Fallback: Try to extract from static HTML if Selenium didn't work
-        page_text = soup.get_text()
+        # Site fallbacks from the domain registry (e.g. Applaws' rendered dropdown)
+        result = run_site_fallbacks(domain_config(url), 'guaranteed_analysis', soup, url)
+        if result:
+            return result
         
         # DIRECT SEARCH in static content: Look for the exact percentages
         # Search for the specific guaranteed analysis components in the entire page text
-        protein_match = re.search(r'Crude\s+Protein\s+\(min\)\s+(\d+(?:\.\d+)?%)', page_text, re.IGNORECASE)
-        fat_match = re.search(r'Crude\s+Fat\s+\(min\)\s+(\d+(?:\.\d+)?%)', page_text, re.IGNORECASE)
-        moisture_match = re.search(r'Moisture\s+\(max\)\s+(\d+(?:\.\d+)?%)', page_text, re.IGNORECASE)
+        protein_match = GA_PROTEIN_MIN_RE.search(page_text)
+        fat_match = GA_FAT_MIN_RE.search(page_text)
+        moisture_match = GA_MOISTURE_MAX_RE.search(page_text)
         
         # If we found at least protein and one other component, construct clean result
         if protein_match and (fat_match or moisture_match):
@@ -2572,7 +2023,7 @@ def extract_guaranteed_analysis(soup, url):
             
             clean_analysis = ", ".join(components)
             # Convert British spelling "fibre" to American spelling "fiber"
-            clean_analysis = re.sub(r'\bfibre\b', 'fiber', clean_analysis, flags=re.IGNORECASE)
+            clean_analysis = FIBRE_RE.sub('fiber', clean_analysis)
             return clean_analysis
         
         return None
@@ -2589,8 +2040,8 @@ def convert_ingredients_to_array(ingredients_string):
     if any(phrase in ingredients_string.lower() for phrase in ['unable to extract', 'error', 'not available', 'please check']):
         return ingredients_string
     
-    # Split by commas and clean each ingredient
-    ingredients_array = [ingredient.strip() for ingredient in ingredients_string.split(',')]
+    # Split on commas outside parentheses and clean each ingredient
+    ingredients_array = [ingredient.strip() for ingredient in split_ingredients(ingredients_string)]
     # Remove empty items
     ingredients_array = [ingredient for ingredient in ingredients_array if ingredient]
     
@@ -2598,14 +2049,12 @@ def convert_ingredients_to_array(ingredients_string):
 
 def extract_ingredients_viva_raw(soup, url):
     """Extract ingredients from Viva Raw using visible page content with universal patterns"""
-    import re
     try:
         page_text = soup.get_text()
         
         # Strategy 1: Handle Pure line products (simpler format)
         # Look for "Ingredients: Protein with Ground Bone..." without marketing text
-        pure_pattern = r'Ingredients:\s*([A-Z][^.]*?(?:Ground Bone|Heart|Liver)[^.]*?)(?:\s*Humanely|$)'
-        pure_match = re.search(pure_pattern, page_text, re.IGNORECASE | re.DOTALL)
+        pure_match = VIVA_PURE_INGREDIENTS_RE.search(page_text)
         if pure_match:
             ingredients_text = pure_match.group(1).strip()
             # Validate it's a clean ingredient list
@@ -2616,32 +2065,21 @@ def extract_ingredients_viva_raw(soup, url):
         
         # Strategy 2: Handle regular products with marketing text
         # Extract ingredients between marketing text and AAFCO statement
-        marketing_end_patterns = [
-            r'3%\s+Natural\s+Supplements',
-            r'growth-promoting\s+antibiotics[^.]*?supplements',
-            r'\d+%\s+Natural\s+Supplements',
-        ]
-        
-        aafco_start_patterns = [
-            r'Formulated\s+to\s+meet',
-            r'AAFCO\s+Cat\s+Food',
-        ]
-        
-        for marketing_pattern in marketing_end_patterns:
-            marketing_match = re.search(marketing_pattern, page_text, re.IGNORECASE)
+        for marketing_pattern in VIVA_MARKETING_END_PATTERNS:
+            marketing_match = marketing_pattern.search(page_text)
             if marketing_match:
                 marketing_end = marketing_match.end()
                 
-                for aafco_pattern in aafco_start_patterns:
-                    aafco_match = re.search(aafco_pattern, page_text[marketing_end:], re.IGNORECASE)
+                for aafco_pattern in VIVA_AAFCO_START_PATTERNS:
+                    aafco_match = aafco_pattern.search(page_text, marketing_end)
                     if aafco_match:
-                        aafco_start = marketing_end + aafco_match.start()
+                        aafco_start = aafco_match.start()
                         
                         # Extract text between marketing end and AAFCO start
                         between_text = page_text[marketing_end:aafco_start].strip()
                         
                         # Clean this text to get just ingredients
-                        cleaned = re.sub(r'\s+', ' ', between_text)
+                        cleaned = WHITESPACE_RE.sub(' ', between_text)
                         cleaned = cleaned.strip()
                         
                         # Validate it looks like ingredients
@@ -2650,35 +2088,25 @@ def extract_ingredients_viva_raw(soup, url):
                             return convert_ingredients_to_array(cleaned)
         
         # Strategy 3: Direct pattern matching for various ingredient formats
-        clean_patterns = [
-            # Standard "with Ground Bone" format
-            r'((?:Turkey|Chicken|Duck|Rabbit)\s+with\s+Ground\s+Bone[^.]*?(?:Chelate|Supplement|Extract|Acid|Oil|Yeast))',
-            # Beef format (no "with Ground Bone")
-            r'(Beef,\s+Beef\s+Heart[^.]*?(?:Chelate|Supplement|Extract|Acid|Oil|Yeast))',
-            # General protein-based format
-            r'((?:Turkey|Chicken|Beef|Duck|Rabbit)(?:\s+with\s+Ground\s+Bone)?,\s*(?:Turkey|Chicken|Beef|Duck|Rabbit)[^.]*?(?:Chelate|Supplement|Extract|Acid|Oil|Yeast))',
-        ]
-        
-        for pattern in clean_patterns:
-            matches = re.findall(pattern, page_text, re.IGNORECASE | re.DOTALL)
+        for pattern in VIVA_INGREDIENT_PATTERNS:
+            matches = pattern.findall(page_text)
             for match in matches:
                 # Clean up the match
-                cleaned = re.sub(r'\s+', ' ', match.strip())
+                cleaned = WHITESPACE_RE.sub(' ', match.strip())
                 if cleaned and len(cleaned) > 20:
                     return convert_ingredients_to_array(cleaned)
         
         # Strategy 4: Fallback - look for any ingredient list after "Ingredients"
-        fallback_pattern = r'Ingredients[:\s]*([^.]*?(?:Chicken|Beef|Duck|Turkey|Rabbit)[^.]*?(?:Heart|Liver|Gizzard|Bone)[^.]*?)(?:\s*(?:Humanely|Formulated)|$)'
-        fallback_match = re.search(fallback_pattern, page_text, re.IGNORECASE | re.DOTALL)
+        fallback_match = VIVA_FALLBACK_INGREDIENTS_RE.search(page_text)
         if fallback_match:
             ingredients_text = fallback_match.group(1).strip()
             # Clean up the ingredients text and remove marketing content
-            ingredients_text = re.sub(r'\s+', ' ', ingredients_text)
+            ingredients_text = WHITESPACE_RE.sub(' ', ingredients_text)
             ingredients_text = ingredients_text.replace('Ingredients:', '').strip()
             
             # Remove marketing text if present
-            ingredients_text = re.sub(r'\d+%\s+Humanely\s+Raised[^,]*,?\s*', '', ingredients_text, flags=re.IGNORECASE)
-            ingredients_text = re.sub(r'\d+%\s+Natural\s+Supplements\s*', '', ingredients_text, flags=re.IGNORECASE)
+            ingredients_text = VIVA_HUMANELY_RAISED_RE.sub('', ingredients_text)
+            ingredients_text = VIVA_NATURAL_SUPPLEMENTS_RE.sub('', ingredients_text)
             
             if ingredients_text and len(ingredients_text) > 10:
                 return convert_ingredients_to_array(ingredients_text)
@@ -2689,63 +2117,31 @@ def extract_ingredients_viva_raw(soup, url):
 
 def extract_ingredients_applaws(soup, url):
     """Extract ingredients from Applaws using Selenium dropdown method"""
-    import re
     try:
-        from selenium_scraper import _get_browser
-        import time
-        from selenium.webdriver.common.by import By
+        from selenium_scraper import render_accordion_snapshots, INGREDIENTS_ACCORDION
         
-        driver = _get_browser()
-        driver.get(url)
-        time.sleep(5)  # Allow page to load completely
+        # Click the "Ingredients" dropdown (reuses a cached snapshot when available)
+        new_source = render_accordion_snapshots(url, [INGREDIENTS_ACCORDION]).get(INGREDIENTS_ACCORDION[0])
+        if new_source:
+            soup_selenium = BeautifulSoup(new_source, 'html.parser')
+            page_text = soup_selenium.get_text()
         
-        # Look for clickable "Ingredients" sections on Applaws
-        ingredient_buttons = driver.find_elements(By.XPATH, "//*[contains(text(), 'Ingredients') or contains(text(), 'INGREDIENTS')]")
-        
-        for i, button in enumerate(ingredient_buttons):
-            try:
-                element_text = button.text.strip()
+        # Enhanced patterns for Applaws ingredients after dropdown click
+        for pattern in APPLAWS_INGREDIENT_PATTERNS:
+            matches = pattern.findall(page_text)
+            for match in matches:
+                match = match.strip()
+                match = WHITESPACE_RE.sub(' ', match)
+                match = LEADING_NON_WORD_RE.sub('', match)
+                match = TRAILING_NON_WORD_RE.sub('', match)
+                if match.endswith('.'):
+                    match = match[:-1]
                 
-                # Look for exact "Ingredients" dropdown (not marketing text like "100% Natural Ingredients")
-                if element_text == 'Ingredients':
-                    # Click to reveal hidden ingredient content
-                    driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", button)
-                    time.sleep(1)
-                    driver.execute_script("arguments[0].click();", button)
-                    time.sleep(5)  # Wait longer for content to load
-                    
-                    # Get the new page content and extract ingredients
-                    new_source = driver.page_source
-                    soup_selenium = BeautifulSoup(new_source, 'html.parser')
-                    page_text = soup_selenium.get_text()
-                    
-                    # Enhanced patterns for Applaws ingredients after dropdown click
-                    patterns = [
-                        r'Ingredients[:\s]*([^.]*?(?:Tuna|Chicken|Fish|Beef|Turkey|Lamb)[^.]*?(?:Broth|Oil|Starch|Gum)[^.]*?)(?:\s*\*|Nutritional|Guaranteed|$)',
-                        r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*(?:,\s*[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*){3,})',
-                        r'((?:Tuna|Chicken|Fish|Beef|Turkey|Lamb)[^.]*?(?:,\s*[^.,]{3,30}){2,}[^.]*?)(?:\.|$)',
-                    ]
-                    
-                    for pattern in patterns:
-                        matches = re.findall(pattern, page_text, re.IGNORECASE)
-                        for match in matches:
-                            match = match.strip()
-                            match = re.sub(r'\s+', ' ', match)
-                            match = re.sub(r'^[^\w]+', '', match)
-                            match = re.sub(r'[^\w\.]+$', '', match)
-                            if match.endswith('.'):
-                                match = match[:-1]
-                            
-                            if (len(match) > 20 and 
-                                match.count(',') >= 2 and
-                                any(word in match.lower() for word in ['tuna', 'chicken', 'fish', 'beef', 'turkey', 'lamb', 'broth', 'water', 'oil'])):
-                                ingredients_array = format_ingredient_list(match)
-                                return convert_ingredients_to_array(ingredients_array)
-                    
-                    break  # Found and clicked the ingredients button
-                    
-            except Exception as e:
-                continue
+                if (len(match) > 20 and 
+                    match.count(',') >= 2 and
+                    any(word in match.lower() for word in ['tuna', 'chicken', 'fish', 'beef', 'turkey', 'lamb', 'broth', 'water', 'oil'])):
+                    ingredients_array = format_ingredient_list(match)
+                    return convert_ingredients_to_array(ingredients_array)
         
     except Exception:
         pass
@@ -2753,7 +2149,6 @@ def extract_ingredients_applaws(soup, url):
 
 def extract_ingredients_only_natural_pet(soup, url):
     """Extract ingredients from Only Natural Pet using HTML-encoded content"""
-    import re
     import html
     
     try:
@@ -2762,28 +2157,21 @@ def extract_ingredients_only_natural_pet(soup, url):
         
         # Look for the specific Only Natural Pet ingredient pattern - more precise
         # Target the exact ingredient list without HTML markup
-        ingredient_patterns = [
-            # Pattern 1: Look for the clean ingredient list in metafields
-            r'"ingredients":\s*"[^"]*INGREDIENTS[^:]*:\s*([^"]*Turkey[^"]*Folic Acid[^"]*)"',
-            # Pattern 2: Look for ingredients in the main content
-            r'INGREDIENTS[^:]*:\s*([A-Z][^<]*?(?:Turkey|Chicken)[^<]*?Folic Acid)',
-        ]
-        
-        for pattern in ingredient_patterns:
-            matches = re.findall(pattern, page_source, re.IGNORECASE | re.DOTALL)
+        for pattern in ONP_INGREDIENT_PATTERNS:
+            matches = pattern.findall(page_source)
             
             for match in matches:
                 # Decode HTML entities
                 decoded = html.unescape(match)
                 # Clean up the decoded text
-                cleaned = re.sub(r'\\u[0-9a-fA-F]{4}', '', decoded)  # Remove unicode escapes
-                cleaned = re.sub(r'\\[rn]', ' ', cleaned)  # Remove escaped newlines
-                cleaned = re.sub(r'\s+', ' ', cleaned)  # Normalize whitespace
+                cleaned = UNICODE_ESCAPE_RE.sub('', decoded)  # Remove unicode escapes
+                cleaned = ESCAPED_NEWLINE_RE.sub(' ', cleaned)  # Remove escaped newlines
+                cleaned = WHITESPACE_RE.sub(' ', cleaned)  # Normalize whitespace
                 cleaned = cleaned.strip()
                 
                 # Remove any remaining HTML-like content
-                cleaned = re.sub(r'<[^>]*>', '', cleaned)
-                cleaned = re.sub(r'\\/', '/', cleaned)
+                cleaned = HTML_TAG_RE.sub('', cleaned)
+                cleaned = ESCAPED_SLASH_RE.sub('/', cleaned)
                 
                 # Extract just the ingredient list part (after "INGREDIENTS:")
                 if 'INGREDIENTS:' in cleaned:
@@ -2807,29 +2195,16 @@ def extract_ingredients_only_natural_pet(soup, url):
 
 def extract_guaranteed_analysis_only_natural_pet(soup, url):
     """Extract guaranteed analysis from Only Natural Pet using individual components"""
-    import re
-    
     try:
         page_source = str(soup)
         
         # Extract individual components separately for reliability
         components = {}
         
-        protein_match = re.search(r'Crude Protein[^<]*?(\d+(?:\.\d+)?%)', page_source, re.IGNORECASE)
-        if protein_match:
-            components['protein'] = protein_match.group(1)
-        
-        fat_match = re.search(r'Crude Fat[^<]*?(\d+(?:\.\d+)?%)', page_source, re.IGNORECASE)
-        if fat_match:
-            components['fat'] = fat_match.group(1)
-        
-        fiber_match = re.search(r'Crude Fiber[^<]*?(\d+(?:\.\d+)?%)', page_source, re.IGNORECASE)
-        if fiber_match:
-            components['fiber'] = fiber_match.group(1)
-        
-        moisture_match = re.search(r'Moisture[^<]*?(\d+(?:\.\d+)?%)', page_source, re.IGNORECASE)
-        if moisture_match:
-            components['moisture'] = moisture_match.group(1)
+        for name, pattern in HTML_GA_COMPONENT_PATTERNS:
+            component_match = pattern.search(page_source)
+            if component_match:
+                components[name] = component_match.group(1)
         
         # Reconstruct guaranteed analysis if we have at least 3 components
         if len(components) >= 3:
@@ -2852,14 +2227,12 @@ def extract_guaranteed_analysis_only_natural_pet(soup, url):
 
 def extract_nutritional_info_only_natural_pet(soup, url):
     """Extract nutritional info from Only Natural Pet using calorie patterns"""
-    import re
-    
     try:
         page_source = str(soup)
         
         # Look for both kcal/kg and kcal/oz values
-        kg_matches = re.findall(r'(\d+,?\d*)\s*kcal/kg', page_source, re.IGNORECASE)
-        oz_matches = re.findall(r'(\d+(?:\.\d+)?)\s*kcal/oz', page_source, re.IGNORECASE)
+        kg_matches = KCAL_PER_KG_RE.findall(page_source)
+        oz_matches = KCAL_PER_OZ_RE.findall(page_source)
         
         if kg_matches and oz_matches:
             # Use the first match of each (they should be consistent)
@@ -2874,191 +2247,422 @@ def extract_nutritional_info_only_natural_pet(soup, url):
         print(f"Error extracting Only Natural Pet nutritional info: {e}")
         return None
 
-def extract_ingredients(soup, url):
-    """Extract ingredients using fallback system: Brand-specific → Applaws method → Viva Raw method → Generic"""
-    import re
-    
-    # METHOD 1: Brand-specific detection (prioritize known patterns)
-    if 'onlynaturalpet.com' in url.lower():
-        result = extract_ingredients_only_natural_pet(soup, url)
-        if result:
-            return result
+def extract_from_product_description(description_html, url):
+    """Extract ingredients, guaranteed analysis and calories from a product description HTML fragment"""
+    results = {}
+    if not description_html:
+        return results
     
-    if 'vivarawpets.com' in url.lower():
-        result = extract_ingredients_viva_raw(soup, url)
-        if result:
-            return result
+    description_soup = BeautifulSoup(description_html, 'html.parser')
+    lines = [line.strip() for line in description_soup.get_text('\n').split('\n') if line.strip()]
+    text = '\n'.join(lines)
     
-    if 'applaws.com' in url.lower():
-        result = extract_ingredients_applaws(soup, url)
-        if result:
-            return result
+    # Ingredients run from an "Ingredients" label to the next section heading
+    for match in DESCRIPTION_INGREDIENTS_RE.finditer(text):
+        ingredients_text = WHITESPACE_RE.sub(' ', match.group(1)).strip()
+        ingredients_text = REPEATED_INGREDIENTS_LABEL_RE.sub('', ingredients_text)  # accordion heading + label
+        if ingredients_text.count(',') >= 2 and is_likely_ingredient_list(ingredients_text):
+            formatted_content = format_ingredient_list(ingredients_text)
+            if len(formatted_content) > 20:
+                results['ingredients'] = convert_ingredients_to_array(formatted_content)
+                break
     
-    # METHOD 2: Try Applaws method for any unknown brand (Selenium dropdown approach)
-    result = extract_ingredients_applaws(soup, url)
-    if result:
-        return result
+    # Crude protein/fat/fiber/moisture components, same reconstruction as Only Natural Pet
+    guaranteed_analysis = extract_guaranteed_analysis_only_natural_pet(description_soup, url)
+    if guaranteed_analysis:
+        results['guaranteed_analysis'] = guaranteed_analysis
     
-    # METHOD 3: Try Viva Raw method for any unknown brand (visible page content)
-    result = extract_ingredients_viva_raw(soup, url)
-    if result:
-        return result
+    calories = []
+    for value, unit in DESCRIPTION_CALORIES_RE.findall(text):
+        entry = f"{value.replace(',', '')} kcal/{unit.lower()}"
+        if entry not in calories:
+            calories.append(entry)
+    if calories:
+        results['nutritional_info'] = {'calories': ', '.join(calories)}
     
-    # METHOD 4: Generic extraction methods (existing fallback logic)
-    # Try Target.com Selenium method
-    if 'target.com' in url.lower():
-        try:
-            from selenium_scraper import _get_browser
-            import time
-            from selenium.webdriver.common.by import By
-            
-            driver = _get_browser()
-            driver.get(url)
-            time.sleep(5)  # Allow page to load completely
-            
-            # Look for clickable "Ingredients" sections on Applaws
-            ingredient_buttons = driver.find_elements(By.XPATH, "//*[contains(text(), 'Ingredients') or contains(text(), 'INGREDIENTS')]")
-            
-            for i, button in enumerate(ingredient_buttons):
-                try:
-                    element_text = button.text.strip()
-                    
-                    # Look for exact "Ingredients" dropdown (not marketing text like "100% Natural Ingredients")
-                    if element_text == 'Ingredients':
-                        # Click to reveal hidden ingredient content
-                        driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", button)
-                        time.sleep(1)
-                        driver.execute_script("arguments[0].click();", button)
-                        time.sleep(5)  # Wait longer for content to load
-                        
-                        # Get the new page content and extract ingredients
-                        new_source = driver.page_source
-                        soup_selenium = BeautifulSoup(new_source, 'html.parser')
-                        page_text = soup_selenium.get_text()
-                        
-                        # Extract ingredients from the revealed content
-                        result = extract_ingredients_from_text(page_text)
-                        if result and len(result) > 10:
-                            return convert_ingredients_to_array(result)
-                        
-                        # More aggressive search in the revealed content
-                        # Look for ingredient patterns directly in the page text
-                        import re
-                        
-                        # Try multiple patterns to find ingredients after clicking (based on debug findings)
-                        patterns = [
-                            # Pattern that works well based on debug (captures until period)
-                            r'(chicken\s+broth[^.]+\.)',
-                            r'((?:chicken|fish|tuna|beef|turkey|lamb)\s+broth[^.]+\.)',
-                            # More general patterns
-                            r'ingredients[:\s]*([^.]+\.)',
-                            r'ingredients[:\s]*\n\s*(.+?)(?:\n\n|\n[A-Z]|$)',
-                            # Fallback pattern for other formats
-                            r'([a-z][a-z\s,()]+(?:chicken|fish|tuna|beef|turkey|lamb)[a-z\s,()]*(?:,\s*[a-z][a-z\s()]*){2,}\.?)'
-                        ]
-                        
-                        for pattern in patterns:
-                            matches = re.findall(pattern, page_text, re.IGNORECASE)
-                            for match in matches:
-                                # Clean up the match
-                                match = match.strip()
-                                # Remove extra whitespace and newlines
-                                match = re.sub(r'\s+', ' ', match)
-                                # Remove any leading/trailing punctuation except period
-                                match = re.sub(r'^[^\w]+', '', match)
-                                match = re.sub(r'[^\w\.]+$', '', match)
-                                # Remove trailing period if present
-                                if match.endswith('.'):
-                                    match = match[:-1]
-                                
-                                # Validate it looks like ingredients (has food words and commas)
-                                if (len(match) > 20 and 
-                                    match.count(',') >= 2 and
-                                    any(word in match.lower() for word in ['chicken', 'fish', 'tuna', 'beef', 'turkey', 'lamb', 'broth', 'water', 'oil'])):
-                                    return convert_ingredients_to_array(match)
-                        
-                        # Also try a direct search around the word "ingredients" as backup
-                        if 'ingredients' in page_text.lower():
-                            ingredients_pos = page_text.lower().find('ingredients')
-                            context = page_text[ingredients_pos:ingredients_pos+500]
-                            
-                            # Look for simple patterns like "Tuna Fillet, Fish Broth, Rice"
-                            import re
-                            simple_pattern = r'ingredients[^\n]*?\n\s*([a-z][^.]*?(?:,\s*[a-z][^.,]*?){1,10})[.\n]'
-                            match = re.search(simple_pattern, context, re.IGNORECASE)
-                            if match:
-                                simple_result = match.group(1).strip()
-                                return convert_ingredients_to_array(simple_result)
-                        
-                        break  # Found and clicked the ingredients button
-                        
-                except Exception as e:
-                    continue
-            
-        except Exception as e:
-            # Fall through to regular extraction if Selenium fails
-            pass
+    return results
+
+def is_shopify_page(soup):
+    """Detect Shopify storefronts from their theme assets and JavaScript globals"""
+    if soup.find('meta', attrs={'name': 'shopify-checkout-api-token'}) or soup.find('link', href=SHOPIFY_CDN_RE):
+        return True
+    for script in soup.find_all('script'):
+        src = script.get('src') or ''
+        if 'cdn.shopify.com' in src or '/cdn/shop/' in src:
+            return True
+        if script.string and ('Shopify.shop' in script.string or 'ShopifyAnalytics' in script.string):
+            return True
+    return False
+
+def shopify_product_endpoint(url):
+    """Turn a Shopify product URL into its lightweight .js product endpoint"""
+    parsed = urlparse(url)
+    match = SHOPIFY_PRODUCT_PATH_RE.search(parsed.path)
+    if not match:
+        return None
+    return f"{parsed.scheme}://{parsed.netloc}{match.group(1)}.js"
+
+def extract_shopify_product_data(soup, url, context=None):
+    """Extract product data from a Shopify store's /products/<handle>.js (or .json) endpoint"""
+    from urllib.parse import parse_qs
     
-    page_text = soup.get_text()
-    fallback_json_ingredients = None  # Store suspicious JSON ingredients as fallback
+    results = {}
+    endpoint = shopify_product_endpoint(url)
+    if not endpoint:
+        return results
     
+    try:
+        # The .js endpoint is a few KB; .json is the fallback for stores that disable it
+        product = fetch_json(endpoint, context)
+        if not isinstance(product, dict) or not product.get('title'):
+            product = (fetch_json(endpoint[:-3] + '.json', context) or {}).get('product')
+        if not isinstance(product, dict):
+            return results
+        
+        if product.get('title'):
+            results['name'] = clean_product_name(product['title'])
+        if product.get('vendor'):
+            results['brand'] = add_proper_brand_spacing(product['vendor'].strip())
+        
+        images = product.get('images') or []
+        image = product.get('featured_image') or (images[0] if images else None)
+        if isinstance(image, dict):
+            image = image.get('src')
+        if image:
+            results['image_url'] = 'https:' + image if image.startswith('//') else image
+        
+        # Size comes from the selected variant (?variant=<id>), falling back to the first one
+        variants = product.get('variants') or []
+        variant_id = parse_qs(urlparse(url).query).get('variant', [None])[0]
+        variant = next((v for v in variants if str(v.get('id')) == variant_id), variants[0] if variants else None)
+        if variant:
+            option_names = [o.get('name', '') if isinstance(o, dict) else str(o) for o in product.get('options') or []]
+            candidates = [variant.get(f'option{i + 1}') for i, name in enumerate(option_names)
+                          if SIZE_OPTION_NAME_RE.search(name)]
+            candidates += [variant.get('option1'), variant.get('title')]
+            for candidate in candidates:
+                if candidate and SIZE_IN_TEXT_RE.search(candidate):
+                    results['size'] = clean_product_size(candidate)
+                    break
+        
+        results.update(extract_from_product_description(product.get('description') or product.get('body_html'), url))
+        
+    except Exception as e:
+        print(f"Error extracting Shopify product data: {e}")
+    return results
 
+def wordpress_api_root(soup, url):
+    """Return the WordPress REST API root for a page (e.g. https://applaws.com/us/wp-json/), or None if not WordPress"""
+    api_link = soup.find('link', rel='https://api.w.org/')
+    if api_link and api_link.get('href'):
+        return api_link['href'].rstrip('/') + '/'
     
-    # TARGET.COM UNIVERSAL FIX: Use Selenium to extract from "Label info" dropdown 
-    # This completely bypasses all other extraction methods for Target.com
-    if 'target.com' in url.lower():
-        try:
-            from selenium_scraper import get_target_ingredients_with_selenium
-            selenium_ingredients = get_target_ingredients_with_selenium(url)
-            if selenium_ingredients and len(selenium_ingredients) > 50:
-                # Clean and return the Selenium results
-                formatted_content = format_ingredient_list(selenium_ingredients)
-                formatted_content = clean_extra_content(formatted_content)
-                if len(formatted_content) > 50:
-                    return convert_ingredients_to_array(formatted_content)
+    # Sites that strip the discovery link still serve theme assets from /wp-content/
+    asset = soup.find(['img', 'script', 'link'], src=WP_CONTENT_RE) or soup.find('link', href=WP_CONTENT_RE)
+    if asset:
+        asset_url = urljoin(url, asset.get('src') or asset.get('href'))
+        return asset_url.split('/wp-content/')[0] + '/wp-json/'
+    return None
 
-            # If Selenium didn't find anything valid, check if this is a supplement without detailed ingredients
-            # For supplements/vitamins, Target often only shows marketing descriptions, not ingredient lists
-            if any(word in url.lower() for word in ['vitamin', 'supplement', 'multivitamin', 'probiotic']):
-                return "Ingredient information not available - this appears to be a supplement product where Target.com only provides marketing descriptions rather than detailed ingredient lists."
-            else:
-                return "Unable to extract ingredients from Label info dropdown. Please check that the product has ingredient information available."
-        except Exception as e:
-            print(f"Warning: Selenium extraction failed: {e}")
-            return f"Error accessing Label info dropdown: {str(e)}"
+def collect_custom_field_html(fields):
+    """Flatten ACF/meta custom fields into one HTML string (accordion content is usually stored here)"""
+    parts = []
+    stack = [fields]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            stack.extend(reversed(list(node.values())))
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
+        elif isinstance(node, str) and len(node) > 3:
+            parts.append(f"<div>{node}</div>")
+    return '\n'.join(parts)
 
+def extract_wordpress_product_data(soup, url, context=None):
+    """Extract product data from a WordPress/WooCommerce site's public REST API instead of rendering accordions"""
+    import html
+    from urllib.parse import quote
     
-        # ABSOLUTE HOLISTIC SPECIFIC: Use Selenium to extract from ingredients dropdown
-    # Use browser automation to properly handle dropdown interactions
-    if 'absolute-holistic.com' in url.lower():
-        try:
-            from selenium_scraper import _get_browser
-            import time
-            
-            driver = _get_browser()
-            driver.get(url)
-            time.sleep(3)  # Allow page to load
-            
-            # Look for the ingredients text in the page
-            page_source = driver.page_source
-            soup_selenium = BeautifulSoup(page_source, 'html.parser')
-            page_text_selenium = soup_selenium.get_text()
-            
-            # Use our proven extraction logic with Selenium-loaded content
-            # Look for any Absolute Holistic ingredient pattern
-            ingredient_patterns = ['IngredientsChicken', 'IngredientsLamb', 'IngredientsSalmon', 'IngredientsBeef']
-            
-            for pattern in ingredient_patterns:
-                ingredients_start = page_text_selenium.find(pattern)
-                if ingredients_start != -1:
-                    remaining_text = page_text_selenium[ingredients_start + 11:]  # Skip "Ingredients"
+    results = {}
+    api_root = wordpress_api_root(soup, url)
+    if not api_root:
+        return results
+    
+    try:
+        slug = quote([segment for segment in urlparse(url).path.split('/') if segment][-1])
+        
+        # WooCommerce Store API (public, no auth)
+        products = fetch_json(f"{api_root}wc/store/v1/products?slug={slug}", context)
+        if isinstance(products, list) and products:
+            product = products[0]
+            if product.get('name'):
+                results['name'] = clean_product_name(html.unescape(product['name']))
+            if product.get('images'):
+                results['image_url'] = product['images'][0].get('src')
+            description_html = (product.get('description') or '') + (product.get('short_description') or '')
+            results.update(extract_from_product_description(description_html, url))
+            return results
+        
+        # Plain WordPress: WP links the current post's REST resource from the page head, otherwise look it up by slug
+        post = None
+        alternate = soup.find('link', rel='alternate', type='application/json')
+        if alternate and alternate.get('href') and '/wp-json/' in alternate['href']:
+            post = fetch_json(alternate['href'] + ('&' if '?' in alternate['href'] else '?') + '_embed=1', context)
+        if not isinstance(post, dict):
+            for post_type in ['product', 'products', 'pages', 'posts']:
+                posts = fetch_json(f"{api_root}wp/v2/{post_type}?slug={slug}&_embed=1", context)
+                if isinstance(posts, list) and posts:
+                    post = posts[0]
+                    break
+        if not isinstance(post, dict):
+            return results
+        
+        title = (post.get('title') or {}).get('rendered')
+        if title:
+            results['name'] = clean_product_name(html.unescape(title))
+        featured_media = (post.get('_embedded') or {}).get('wp:featuredmedia') or []
+        if featured_media and isinstance(featured_media[0], dict) and featured_media[0].get('source_url'):
+            results['image_url'] = featured_media[0]['source_url']
+        
+        # Accordion sections are in the post content or in custom fields (ACF exposes them as `acf`)
+        description_html = (post.get('content') or {}).get('rendered') or ''
+        description_html += collect_custom_field_html(post.get('acf') or {})
+        description_html += collect_custom_field_html(post.get('meta') or {})
+        results.update(extract_from_product_description(description_html, url))
+        
+    except Exception as e:
+        print(f"Error extracting WordPress product data: {e}")
+    return results
+
+def extract_target_embedded_data(soup, url):
+    """Extract Target product data from the JSON state embedded in the HTML (no browser needed)"""
+    import html
+    from embedded_state import get_embedded_state, find_key
+    
+    results = {}
+    try:
+        state = get_embedded_state(soup)
+        if not state:
+            return results
+        
+        # Ingredients and nutrients live under item.enrichment.nutrition_facts
+        nutrition_facts = find_key(state, 'nutrition_facts', lambda v: isinstance(v, dict) and v.get('ingredients'))
+        if nutrition_facts:
+            ingredients_text = html.unescape(HTML_TAG_RE.sub(' ', nutrition_facts['ingredients']))
+            ingredients_text = INGREDIENTS_LABEL_RE.sub('', ingredients_text)
+            formatted_content = format_ingredient_list(ingredients_text)
+            if len(formatted_content) > 20:
+                results['ingredients'] = convert_ingredients_to_array(formatted_content)
+            
+            ga_parts = []
+            for prepared in nutrition_facts.get('value_prepared_list') or []:
+                for nutrient in prepared.get('nutrients') or []:
+                    name = (nutrient.get('name') or '').strip()
+                    value = nutrient.get('value')
+                    unit = nutrient.get('unit_of_measurement') or ''
+                    if not name or value in (None, ''):
+                        continue
+                    if 'calor' in name.lower() or 'kcal' in unit.lower():
+                        results['nutritional_info'] = {'calories': f"{value} {unit}".strip()}
+                    else:
+                        ga_parts.append(f"{name} {value}{unit}")
+            if ga_parts:
+                results['guaranteed_analysis'] = ", ".join(ga_parts)
+        
+        primary_brand = find_key(state, 'primary_brand', lambda v: isinstance(v, dict) and v.get('name'))
+        if primary_brand:
+            results['brand'] = html.unescape(primary_brand['name']).strip()
+        
+        images = find_key(state, 'images', lambda v: isinstance(v, dict) and v.get('primary_image_url'))
+        if images:
+            results['image_url'] = images['primary_image_url']
+        
+        description = find_key(state, 'product_description', lambda v: isinstance(v, dict) and v.get('title'))
+        if description:
+            title = html.unescape(description['title']).strip()
+            # Target titles end with the package size, e.g. "... Dry Cat Food - 5lbs"
+            size_match = TARGET_TITLE_SIZE_RE.search(title)
+            if size_match:
+                results['size'] = clean_product_size(size_match.group(1))
+                title = title[:size_match.start()].strip()
+            results['name'] = clean_product_name(title)
+        
+    except Exception as e:
+        print(f"Error extracting Target embedded data: {e}")
+    return results
+
+def extract_ingredients_target_embedded(soup, url):
+    """Target.com embeds the product state (including nutrition_facts) in the HTML; Chrome is only needed without it"""
+    return extract_target_embedded_data(soup, url).get('ingredients')
+
+def extract_ingredients_target_rendered_accordion(soup, url):
+    """Extract ingredients from Target.com by opening the "Ingredients" accordion in the browser"""
+    try:
+        from selenium_scraper import render_accordion_snapshots, INGREDIENTS_ACCORDION
+        
+        # Click the "Ingredients" dropdown (reuses a cached snapshot when available)
+        new_source = render_accordion_snapshots(url, [INGREDIENTS_ACCORDION]).get(INGREDIENTS_ACCORDION[0])
+        if new_source:
+            soup_selenium = BeautifulSoup(new_source, 'html.parser')
+            page_text = soup_selenium.get_text()
+            
+            # Extract ingredients from the revealed content
+            result = extract_ingredients_from_text(page_text)
+            if result and len(result) > 10:
+                return convert_ingredients_to_array(result)
+            
+            # More aggressive search in the revealed content
+            # Look for ingredient patterns directly in the page text (based on debug findings)
+            for pattern in TARGET_RENDERED_INGREDIENT_PATTERNS:
+                matches = pattern.findall(page_text)
+                for match in matches:
+                    # Clean up the match
+                    match = match.strip()
+                    # Remove extra whitespace and newlines
+                    match = WHITESPACE_RE.sub(' ', match)
+                    # Remove any leading/trailing punctuation except period
+                    match = LEADING_NON_WORD_RE.sub('', match)
+                    match = TRAILING_NON_WORD_RE.sub('', match)
+                    # Remove trailing period if present
+                    if match.endswith('.'):
+                        match = match[:-1]
+                    
+                    # Validate it looks like ingredients (has food words and commas)
+                    if (len(match) > 20 and 
+                        match.count(',') >= 2 and
+                        any(word in match.lower() for word in ['chicken', 'fish', 'tuna', 'beef', 'turkey', 'lamb', 'broth', 'water', 'oil'])):
+                        return convert_ingredients_to_array(match)
+            
+            # Also try a direct search around the word "ingredients" as backup
+            if 'ingredients' in page_text.lower():
+                ingredients_pos = page_text.lower().find('ingredients')
+                context = page_text[ingredients_pos:ingredients_pos+500]
+                
+                # Look for simple patterns like "Tuna Fillet, Fish Broth, Rice"
+                match = TARGET_RENDERED_SIMPLE_RE.search(context)
+                if match:
+                    simple_result = match.group(1).strip()
+                    return convert_ingredients_to_array(simple_result)
+        
+    except Exception as e:
+        # Fall through to regular extraction if Selenium fails
+        pass
+    return None
+
+def extract_ingredients_target_label_info(soup, url):
+    """
+    Extract ingredients from Target.com's "Label info" dropdown with Selenium.
+    
+    Always answers for Target pages: the ingredients, or a message explaining why there are none.
+    """
+    try:
+        from selenium_scraper import get_target_ingredients_with_selenium
+        selenium_ingredients = get_target_ingredients_with_selenium(url)
+        if selenium_ingredients and len(selenium_ingredients) > 50:
+            # Clean and return the Selenium results
+            formatted_content = format_ingredient_list(selenium_ingredients)
+            if len(formatted_content) > 50:
+                return convert_ingredients_to_array(formatted_content)
+
+        # If Selenium didn't find anything valid, check if this is a supplement without detailed ingredients
+        # For supplements/vitamins, Target often only shows marketing descriptions, not ingredient lists
+        if any(word in url.lower() for word in ['vitamin', 'supplement', 'multivitamin', 'probiotic']):
+            return "Ingredient information not available - this appears to be a supplement product where Target.com only provides marketing descriptions rather than detailed ingredient lists."
+        else:
+            return "Unable to extract ingredients from Label info dropdown. Please check that the product has ingredient information available."
+    except Exception as e:
+        print(f"Warning: Selenium extraction failed: {e}")
+        return f"Error accessing Label info dropdown: {str(e)}"
+
+def extract_ingredients_absolute_holistic(soup, url):
+    """Extract ingredients from Absolute Holistic using Selenium to open the ingredients dropdown"""
+    page_text = soup.get_text()
+    
+    try:
+        from selenium_scraper import render_page_snapshot
+        
+        # Look for the ingredients text in the rendered page (cached per URL)
+        page_source = render_page_snapshot(url)
+        soup_selenium = BeautifulSoup(page_source, 'html.parser')
+        page_text_selenium = soup_selenium.get_text()
+        
+        # Use our proven extraction logic with Selenium-loaded content
+        # Look for any Absolute Holistic ingredient pattern
+        ingredient_patterns = ['IngredientsChicken', 'IngredientsLamb', 'IngredientsSalmon', 'IngredientsBeef']
+        
+        for pattern in ingredient_patterns:
+            ingredients_start = page_text_selenium.find(pattern)
+            if ingredients_start != -1:
+                remaining_text = page_text_selenium[ingredients_start + 11:]  # Skip "Ingredients"
+                
+                # Look for multiple possible end patterns for Absolute Holistic
+                end_patterns = [
+                    ('Folic Acid)', 11),  # Some products end with this
+                    ('Vitamin D3', 10),   # Some products end with this
+                    ('Vitamin K', 9),     # Some might end with this
+                    ('Biotin', 6),        # Fallback
+                ]
+                
+                potential_ingredients = None
+                for end_pattern, offset in end_patterns:
+                    end_pos = remaining_text.find(end_pattern)
+                    if end_pos != -1:
+                        potential_ingredients = remaining_text[:end_pos + offset].strip()
+                        break
+                
+                # If no specific ending found, use generic terminators
+                if not potential_ingredients:
+                    end_patterns_generic = [
+                        'OUR NEW ZEALAND SOURCED',
+                        '____________________________',
+                        'Guaranteed Analysis',
+                        'Storage Recommendations',
+                        'Feeding Instructions'
+                    ]
+                    
+                    end_pos = len(remaining_text)
+                    for pattern_generic in end_patterns_generic:
+                        pos = remaining_text.find(pattern_generic)
+                        if pos != -1 and pos < end_pos:
+                            end_pos = pos
+                    
+                    potential_ingredients = remaining_text[:end_pos].strip()
+                
+                if potential_ingredients:
+                    # Clean up any HTML entities and extra whitespace
+                    potential_ingredients = potential_ingredients.replace('&amp;', '&')
+                    potential_ingredients = WHITESPACE_RE.sub(' ', potential_ingredients)
                     
-                    # Look for multiple possible end patterns for Absolute Holistic
+                    # Validate this looks like ingredients
+                    first_word = potential_ingredients.split(',')[0].strip().lower()
+                    valid_starters = ['chicken', 'lamb', 'salmon', 'beef', 'duck', 'turkey']
+                    
+                    if len(potential_ingredients) > 50 and any(starter in first_word for starter in valid_starters):
+                        formatted_content = format_ingredient_list(potential_ingredients)
+                        if len(formatted_content) > 50:
+                            return formatted_content
+                break
+                        
+    except Exception as e:
+        print(f"Warning: Absolute Holistic Selenium setup failed: {e}")
+        # If Selenium fails, fall back to direct BeautifulSoup extraction
+        print("Falling back to direct page extraction for Absolute Holistic...")
+        
+        try:
+            # Direct extraction as fallback when Selenium fails
+            ingredient_patterns = ['IngredientsChicken', 'IngredientsLamb', 'IngredientsSalmon', 'IngredientsBeef']
+            
+            for pattern in ingredient_patterns:
+                ingredients_start = page_text.find(pattern)
+                if ingredients_start != -1:
+                    remaining_text = page_text[ingredients_start + 11:]  # Skip "Ingredients"
+                    
+                    # Look for multiple possible end patterns
                     end_patterns = [
-                        ('Folic Acid)', 11),  # Some products end with this
-                        ('Vitamin D3', 10),   # Some products end with this
-                        ('Vitamin K', 9),     # Some might end with this
-                        ('Biotin', 6),        # Fallback
+                        ('Folic Acid)', 11),
+                        ('Vitamin D3', 10),
+                        ('Vitamin K', 9),
+                        ('Biotin', 6),
                     ]
                     
                     potential_ingredients = None
@@ -3068,14 +2672,12 @@ def extract_ingredients(soup, url):
                             potential_ingredients = remaining_text[:end_pos + offset].strip()
                             break
                     
-                    # If no specific ending found, use generic terminators
+                    # Generic fallback if no specific ending found
                     if not potential_ingredients:
                         end_patterns_generic = [
                             'OUR NEW ZEALAND SOURCED',
                             '____________________________',
-                            'Guaranteed Analysis',
-                            'Storage Recommendations',
-                            'Feeding Instructions'
+                            'Guaranteed Analysis'
                         ]
                         
                         end_pos = len(remaining_text)
@@ -3087,97 +2689,56 @@ def extract_ingredients(soup, url):
                         potential_ingredients = remaining_text[:end_pos].strip()
                     
                     if potential_ingredients:
-                        # Clean up any HTML entities and extra whitespace
+                        # Clean up and validate
                         potential_ingredients = potential_ingredients.replace('&amp;', '&')
-                        potential_ingredients = re.sub(r'\s+', ' ', potential_ingredients)
+                        potential_ingredients = WHITESPACE_RE.sub(' ', potential_ingredients)
                         
-                        # Validate this looks like ingredients
                         first_word = potential_ingredients.split(',')[0].strip().lower()
                         valid_starters = ['chicken', 'lamb', 'salmon', 'beef', 'duck', 'turkey']
                         
                         if len(potential_ingredients) > 50 and any(starter in first_word for starter in valid_starters):
                             formatted_content = format_ingredient_list(potential_ingredients)
                             if len(formatted_content) > 50:
+                                print(f"Fallback extraction successful: {len(formatted_content)} characters")
                                 return formatted_content
                     break
-                            
-        except Exception as e:
-            print(f"Warning: Absolute Holistic Selenium setup failed: {e}")
-            # If Selenium fails, fall back to direct BeautifulSoup extraction
-            print("Falling back to direct page extraction for Absolute Holistic...")
-            
-            try:
-                # Direct extraction as fallback when Selenium fails
-                ingredient_patterns = ['IngredientsChicken', 'IngredientsLamb', 'IngredientsSalmon', 'IngredientsBeef']
-                
-                for pattern in ingredient_patterns:
-                    ingredients_start = page_text.find(pattern)
-                    if ingredients_start != -1:
-                        remaining_text = page_text[ingredients_start + 11:]  # Skip "Ingredients"
-                        
-                        # Look for multiple possible end patterns
-                        end_patterns = [
-                            ('Folic Acid)', 11),
-                            ('Vitamin D3', 10),
-                            ('Vitamin K', 9),
-                            ('Biotin', 6),
-                        ]
-                        
-                        potential_ingredients = None
-                        for end_pattern, offset in end_patterns:
-                            end_pos = remaining_text.find(end_pattern)
-                            if end_pos != -1:
-                                potential_ingredients = remaining_text[:end_pos + offset].strip()
-                                break
-                        
-                        # Generic fallback if no specific ending found
-                        if not potential_ingredients:
-                            end_patterns_generic = [
-                                'OUR NEW ZEALAND SOURCED',
-                                '____________________________',
-                                'Guaranteed Analysis'
-                            ]
-                            
-                            end_pos = len(remaining_text)
-                            for pattern_generic in end_patterns_generic:
-                                pos = remaining_text.find(pattern_generic)
-                                if pos != -1 and pos < end_pos:
-                                    end_pos = pos
-                            
-                            potential_ingredients = remaining_text[:end_pos].strip()
-                        
-                        if potential_ingredients:
-                            # Clean up and validate
-                            potential_ingredients = potential_ingredients.replace('&amp;', '&')
-                            potential_ingredients = re.sub(r'\s+', ' ', potential_ingredients)
-                            
-                            first_word = potential_ingredients.split(',')[0].strip().lower()
-                            valid_starters = ['chicken', 'lamb', 'salmon', 'beef', 'duck', 'turkey']
-                            
-                            if len(potential_ingredients) > 50 and any(starter in first_word for starter in valid_starters):
-                                formatted_content = format_ingredient_list(potential_ingredients)
-                                if len(formatted_content) > 50:
-                                    print(f"Fallback extraction successful: {len(formatted_content)} characters")
-                                    return formatted_content
-                        break
-                        
-            except Exception as fallback_e:
-                print(f"Warning: Fallback extraction also failed: {fallback_e}")
-            
-            # Only return error message if both Selenium AND fallback fail
-            return "Unable to extract ingredients from Absolute Holistic dropdown. Please ensure the page has ingredient information available."
+                    
+        except Exception as fallback_e:
+            print(f"Warning: Fallback extraction also failed: {fallback_e}")
+        
+        # Only return error message if both Selenium AND fallback fail
+        return "Unable to extract ingredients from Absolute Holistic dropdown. Please ensure the page has ingredient information available."
+
+def ingredient_confidence(ingredients):
+    """Full ingredient lists score 1; short lists and explanation messages score lower"""
+    if isinstance(ingredients, str):
+        if not is_field_complete(ingredients):
+            return 0.1
+        count = ingredients.count(',') + 1
+    else:
+        count = len(ingredients)
+    return 1.0 if count >= 5 else 0.6
+
+def extract_ingredients(soup, url, context=None):
+    """Extract ingredients with a confidence cascade: Site extractors → Viva Raw method → Generic → Applaws method"""
+    site = domain_config(url)
     
-    # PRIORITY 0: Highest-priority search using regex with scoring - FIXED: More precise boundary detection
-    ingredient_start_patterns = [
-        # Most precise: Stop at specific section markers
-        r'ingredients?[:\s]+(.*?)(?=\n\s*(?:guaranteed\s+analysis|feeding|directions|nutritional\s+info|calories|shipping|returns|nutrition\s+facts|allergen|warning|storage|best\s+before|expir|net\s+weight|related\s+products|you\s+may\s+also\s+like|similar\s+products|product\s+details|$))',
-        # Medium precision: Stop at paragraph breaks or section headers, but limit length
-        r'ingredients?[:\s]+(.{20,800}?)(?=\n\n|\n\s*[A-Z][A-Z\s]+:|\n\s*\d+\s*%|$)',
-        # Fallback with strict length limit to prevent cross-contamination
-        r'ingredient\s+list[:\s]+(.{20,600}?)(?=\n\n|\n[A-Z]|$)',
-        r'contains[:\s]+(.{20,500}?)(?=\n\n|\n[A-Z]|$)'
-    ]
+    # Static strategies run before the Applaws probe, which starts the browser on any site
+    strategies = site_strategies(site, 'ingredients', soup, url)
+    if not skips(site, STRATEGY_VIVA_RAW_PROBE):
+        strategies.append(('viva_raw_probe', 0.85, lambda: extract_ingredients_viva_raw(soup, url)))
+    if not skips(site, STRATEGY_GENERIC):
+        strategies.append(('generic', 0.85, lambda: extract_ingredients_generic(soup, url)))
+    if not skips(site, STRATEGY_APPLAWS_PROBE):
+        strategies.append(('applaws_probe', 0.8, lambda: extract_ingredients_applaws(soup, url)))
     
+    return run_cascade('ingredients', strategies, ingredient_confidence, url, context).value
+
+def extract_ingredients_generic(soup, url):
+    """Search the page for an ingredient list with the generic patterns (existing fallback logic)"""
+    page_text = soup.get_text()
+    
+    # PRIORITY 0: Highest-priority search using regex with scoring - FIXED: More precise boundary detection
     # Enhanced scoring system for ingredient validation
     primary_starters = [
         'ground yellow corn', 'chicken', 'water sufficient for processing', 
@@ -3222,8 +2783,8 @@ def extract_ingredients(soup, url):
     best_match = None
     best_score = 0
     
-    for pattern in ingredient_start_patterns:
-        matches = re.finditer(pattern, page_text, re.IGNORECASE | re.DOTALL)
+    for pattern in INGREDIENT_START_PATTERNS:
+        matches = pattern.finditer(page_text)
         for match in matches:
             potential_text = match.group(1).strip()
             
@@ -3286,23 +2847,13 @@ def extract_ingredients(soup, url):
     
     if best_match and is_likely_ingredient_list(best_match):
         formatted_content = format_ingredient_list(best_match)
-        formatted_content = clean_extra_content(formatted_content)
         if len(formatted_content) > 50:
             return formatted_content
 
     # PRIORITY 0.3: Enhanced "Label Info" dropdown search for Target.com
     # Look for "Label Info" sections that contain "Ingredients:" prefix
-    label_info_patterns = [
-        # Target-specific pattern: Label info section with "Ingredients:" prefix
-        r'label\s+info[^:]*?ingredients:\s*([^.]*?(?:vitamin\s+d-?3\s+supplement|folic\s+acid|[a-z]\d{6,}\.?))',
-        # More general patterns
-        r'label\s+info[:\s]*([^<]*?)(?=\s*(?:guaranteed\s+analysis|feeding|directions|nutritional|calories|shipping|returns|$))',
-        r'label\s+information[:\s]*([^<]*?)(?=\s*(?:guaranteed\s+analysis|feeding|directions|nutritional|calories|shipping|returns|$))',
-        r'product\s+label[:\s]*([^<]*?)(?=\s*(?:guaranteed\s+analysis|feeding|directions|nutritional|calories|shipping|returns|$))'
-    ]
-    
-    for i, pattern in enumerate(label_info_patterns):
-        matches = re.finditer(pattern, page_text, re.IGNORECASE | re.DOTALL)
+    for i, pattern in enumerate(LABEL_INFO_PATTERNS):
+        matches = pattern.finditer(page_text)
         for match in matches:
             potential_content = match.group(1).strip()
             
@@ -3312,61 +2863,47 @@ def extract_ingredients(soup, url):
                     if (potential_content.count(',') >= 8 and 
                         is_likely_ingredient_list(potential_content)):
                         formatted_content = format_ingredient_list(potential_content)
-                        formatted_content = clean_extra_content(formatted_content)
                         if len(formatted_content) > 50:
                             return formatted_content
                 else:
                     # For other patterns, look for ingredients within the content
                     # Search for "Ingredients:" followed by ingredient list
-                    ingredient_match = re.search(
-                        r'ingredients:\s*([^.]*?(?:vitamin\s+d-?3\s+supplement|folic\s+acid|[a-z]\d{6,}\.?))',
-                        potential_content, 
-                        re.IGNORECASE | re.DOTALL
-                    )
+                    ingredient_match = LABEL_INGREDIENTS_RE.search(potential_content)
                     if ingredient_match:
                         ingredient_text = ingredient_match.group(1).strip()
                         if (len(ingredient_text) > 100 and 
                             ingredient_text.count(',') >= 8 and
                             is_likely_ingredient_list(ingredient_text)):
                             formatted_content = format_ingredient_list(ingredient_text)
-                            formatted_content = clean_extra_content(formatted_content)
                             if len(formatted_content) > 50:
                                 return formatted_content
                     
                     # Fallback: try to find ingredients starting with common proteins
-                    ingredient_match = re.search(
-                        r'((?:water|chicken|beef|salmon|tuna|turkey|duck|lamb)[^.]*?(?:rosemary\s+extract|vitamin\s+e|mixed\s+tocopherols|vitamin\s+d-?3\s+supplement))',
-                        potential_content, 
-                        re.IGNORECASE | re.DOTALL
-                    )
+                    ingredient_match = LABEL_PROTEIN_LIST_RE.search(potential_content)
                     if ingredient_match:
                         ingredient_text = ingredient_match.group(1).strip()
                         if (len(ingredient_text) > 100 and 
                             is_likely_ingredient_list(ingredient_text)):
                             formatted_content = format_ingredient_list(ingredient_text)
-                            formatted_content = clean_extra_content(formatted_content)
                             if len(formatted_content) > 50:
                                 return formatted_content
 
     # PRIORITY 0.35: NEW - More aggressive search for any "Chicken" to "Rosemary Extract" content
     # This is specifically for the Instinct Target.com case mentioned by user
     if 'chicken' in page_text.lower() and 'rosemary extract' in page_text.lower():
-        chicken_to_rosemary_pattern = r'(chicken[^.]*?rosemary\s+extract)'
-        matches = re.finditer(chicken_to_rosemary_pattern, page_text, re.IGNORECASE | re.DOTALL)
+        matches = CHICKEN_TO_ROSEMARY_RE.finditer(page_text)
         for match in matches:
             potential_ingredients = match.group(1).strip()
             if (len(potential_ingredients) > 100 and 
                 potential_ingredients.count(',') >= 5 and
                 is_likely_ingredient_list(potential_ingredients)):
                 formatted_content = format_ingredient_list(potential_ingredients)
-                formatted_content = clean_extra_content(formatted_content)
                 if len(formatted_content) > 50:
                     return formatted_content
 
     # PRIORITY 0.36: NEW - Search for any long comma-separated list that starts with "Chicken" 
     # and contains common ingredient endings, regardless of surrounding text
-    chicken_list_pattern = r'chicken[,\s][^.]*?(?:rosemary\s+extract|vitamin\s+e\s+supplement|mixed\s+tocopherols|sodium\s+selenite|ethylenediamine\s+dihydriodide)'
-    matches = re.finditer(chicken_list_pattern, page_text, re.IGNORECASE | re.DOTALL)
+    matches = CHICKEN_LIST_RE.finditer(page_text)
     for match in matches:
         potential_ingredients = match.group(0).strip()
         if (len(potential_ingredients) > 150 and 
@@ -3378,7 +2915,6 @@ def extract_ingredients(soup, url):
             ]) and
             is_likely_ingredient_list(potential_ingredients)):
             formatted_content = format_ingredient_list(potential_ingredients)
-            formatted_content = clean_extra_content(formatted_content)
             if len(formatted_content) > 100:
                 return formatted_content
 
@@ -3403,7 +2939,6 @@ def extract_ingredients(soup, url):
                     any(ender in content.lower() for ender in ['rosemary extract', 'vitamin e', 'mixed tocopherols']) and
                     is_likely_ingredient_list(content)):
                     formatted_content = format_ingredient_list(content)
-                    formatted_content = clean_extra_content(formatted_content)
                     if len(formatted_content) > 50:
                         return formatted_content
         except:
@@ -3420,246 +2955,26 @@ def extract_ingredients(soup, url):
             container_text.count(',') >= 10):
             
             # Try to extract just the ingredient portion
-            chicken_match = re.search(
-                r'(chicken[^.]*?rosemary\s+extract)', 
-                container_text, 
-                re.IGNORECASE | re.DOTALL
-            )
+            chicken_match = CHICKEN_TO_ROSEMARY_RE.search(container_text)
             if chicken_match:
                 potential_ingredients = chicken_match.group(1).strip()
                 if (len(potential_ingredients) > 150 and 
                     potential_ingredients.count(',') >= 8 and
                     is_likely_ingredient_list(potential_ingredients)):
                     formatted_content = format_ingredient_list(potential_ingredients)
-                    formatted_content = clean_extra_content(formatted_content)
                     if len(formatted_content) > 100:
                         return formatted_content
 
-    # PRIORITY 0.47: NEW - Target.com specific "Label info" section extraction
-    # Target.com has a specific structure with "Label info" heading followed by content
-    if 'target.com' in url.lower():
-        # Look for the "Label info" heading and its following content
-        label_info_headings = soup.find_all(['h3', 'h2', 'h4'], string=re.compile(r'label\s*info', re.I))
-        for heading in label_info_headings:
-            # Look for the next sibling div that contains the actual content
-            next_sibling = heading.find_next_sibling()
-            if next_sibling:
-                sibling_text = next_sibling.get_text()
-                if (len(sibling_text) > 100 and 
-                    any(starter in sibling_text.lower() for starter in ['chicken', 'ground', 'corn', 'meal']) and
-                    sibling_text.count(',') >= 5):
-                    # Extract potential ingredient content
-                    if is_likely_ingredient_list(sibling_text):
-                        formatted_content = format_ingredient_list(sibling_text)
-                        formatted_content = clean_extra_content(formatted_content)
-                        if len(formatted_content) > 50:
-                            return formatted_content
-        
-        # Also check for Target's product detail tab container structure
-        tab_containers = soup.find_all(attrs={'data-test': re.compile(r'product.*detail.*tab', re.I)})
-        for container in tab_containers:
-            container_text = container.get_text()
-            # Look for content after "Label info" within the container
-            if 'label info' in container_text.lower():
-                # Try to extract the section after "Label info"
-                label_info_match = re.search(
-                    r'label\s+info(.*?)(?:shipping\s*&\s*returns|q&a|specifications|details|$)',
-                    container_text,
-                    re.IGNORECASE | re.DOTALL
-                )
-                if label_info_match:
-                    potential_content = label_info_match.group(1).strip()
-                    if (len(potential_content) > 100 and 
-                        potential_content.count(',') >= 5 and
-                        any(starter in potential_content.lower() for starter in ['chicken', 'ground', 'corn', 'meal']) and
-                        is_likely_ingredient_list(potential_content)):
-                        formatted_content = format_ingredient_list(potential_content)
-                        formatted_content = clean_extra_content(formatted_content)
-                        if len(formatted_content) > 50:
-                            return formatted_content
-
-        # PRIORITY 0.48: NEW - Target.com JavaScript/JSON ingredient extraction
-        # Target.com embeds ingredient data in JavaScript objects with various structures
-        script_tags = soup.find_all('script')
-        for script in script_tags:
-            if script.string and len(script.string) > 1000:
-                # Multiple patterns to handle different Target.com product page structures
-                ingredient_patterns = [
-                    # SPECIFIC pattern for nutrition_facts Blue Buffalo: "nutrition_facts":{"ingredients":"Deboned Chicken..."
-                    r'"nutrition_facts":\s*\{\s*"ingredients":\s*"([^"]{100,})"',
-                    # Pattern for escaped JSON (alternative): \\"nutrition_facts\\":{\\"ingredients\\":\\"...
-                    r'\\\\"nutrition_facts\\\\":\s*\{\s*\\\\"ingredients\\\\":\s*\\\\"([^\\]{100,})\\\\"',
-                    # Primary pattern: nutrition_facts structure
-                    r'nutrition_facts[^}]*\\?["\']ingredients\\?["\']\s*:\s*\\?["\']([^"\'\\]{100,})["\']',
-                    # Enhanced pattern for Blue Buffalo with better JSON parsing
-                    r'\\?["\']nutrition_facts\\?["\']\s*:\s*\{[^}]*\\?["\']ingredients\\?["\']\s*:\s*\\?["\']([^"\'\\]{100,})["\']',
-                    # Fallback patterns for different JSON structures
-                    r'product_info[^}]*\\?["\']ingredients\\?["\']\s*:\s*\\?["\']([^"\'\\]*)["\']',
-                    r'nutrition[^}]*\\?["\']ingredients\\?["\']\s*:\s*\\?["\']([^"\'\\]*)["\']',
-                    r'label_info[^}]*\\?["\']ingredients\\?["\']\s*:\s*\\?["\']([^"\'\\]*)["\']',
-                    # More flexible patterns that just look for ingredients key with substantial content
-                    r'\\?["\']ingredients\\?["\']\s*:\s*\\?["\']([^"\'\\]*(?:chicken|beef|salmon|ground|corn|meal)[^"\'\\]*)["\']',
-                    # Very broad pattern for any ingredients field with long content
-                    r'\\?["\']ingredients\\?["\']\s*:\s*\\?["\']([^"\'\\]{100,})["\']'
-                ]
-                
-                for pattern in ingredient_patterns:
-                    matches = re.finditer(pattern, script.string, re.IGNORECASE | re.DOTALL)
-                    for match in matches:
-                        potential_ingredients = match.group(1)
-                        if (len(potential_ingredients) > 50 and 
-                            potential_ingredients.count(',') >= 5 and
-                            any(starter in potential_ingredients.lower() for starter in ['chicken', 'ground', 'corn', 'meal', 'beef', 'salmon', 'turkey', 'fish']) and
-                            is_likely_ingredient_list(potential_ingredients)):
-                            # Clean up any escaped characters
-                            cleaned_ingredients = potential_ingredients.replace('\\u003c', '<').replace('\\u003e', '>')
-                            cleaned_ingredients = re.sub(r'\\u[0-9a-fA-F]{4}', '', cleaned_ingredients)  # Remove unicode escapes
-                            
-                            formatted_content = format_ingredient_list(cleaned_ingredients)
-                            formatted_content = clean_extra_content(formatted_content)
-                            
-                            # VALIDATION: Check if JSON ingredients seem suspicious/generic
-                            # If product mentions specific protein but JSON has generic terms, be suspicious
-                            if len(formatted_content) > 50:
-                                page_title = soup.find('title')
-                                title_text = page_title.get_text().lower() if page_title else ''
-                                url_lower = url.lower()
-                                
-                                # Check for mismatches between title/URL and ingredients
-                                suspicious = False
-                                if ('chicken' in title_text or 'chicken' in url_lower):
-                                    if ('beef' in formatted_content.lower() and 'chicken' not in formatted_content.lower()):
-                                        suspicious = True
-                                if ('turkey' in title_text or 'turkey' in url_lower):
-                                    if ('poultry' in formatted_content.lower() and 'turkey' not in formatted_content.lower()):
-                                        suspicious = True
-                                
-                                # If ingredients seem suspicious, continue searching for better ones
-                                if not suspicious:
-                                    return formatted_content
-                                else:
-                                    # Store as fallback but keep searching
-                                    if fallback_json_ingredients is None:  # Only store first fallback
-                                        fallback_json_ingredients = formatted_content
-                
-                # For Blue Buffalo specifically, if we found JSON ingredients, return them immediately
-                if fallback_json_ingredients is not None and 'blue-buffalo' in url.lower():
-                    return fallback_json_ingredients
-                
-                # Stop searching script tags if we found valid JSON ingredients 
-                # (even if suspicious - we'll return them as fallback later)
-                if fallback_json_ingredients is not None:
-                    break
-                
-                # FALLBACK: If no structured patterns work, search for any ingredient-like content in scripts
-                # This is for cases where the JSON structure might be different or malformed
-                for script in script_tags:
-                    if script.string and len(script.string) > 1000 and 'ingredient' in script.string.lower():
-                        # Look for any substantial text that contains common ingredient indicators
-                        # and is surrounded by quotes (likely to be ingredient data)
-                        fallback_patterns = [
-                            r'["\']([^"\']{200,}(?:chicken|beef|salmon)[^"\']{200,}(?:rosemary extract|vitamin|mineral|oxide|extract)[^"\']*)["\']',
-                            r'["\']([^"\']*(?:ground whole grain corn|chicken by-product meal)[^"\']{300,})["\']',
-                            r'["\']([^"\']*(?:chicken, chicken by-product meal)[^"\']{200,})["\']'
-                        ]
-                        
-                        for pattern in fallback_patterns:
-                            matches = re.finditer(pattern, script.string, re.IGNORECASE | re.DOTALL)
-                            for match in matches:
-                                potential_ingredients = match.group(1)
-                                if (len(potential_ingredients) > 100 and 
-                                    potential_ingredients.count(',') >= 10 and
-                                    # Check for multiple food-related terms
-                                    sum(1 for term in ['chicken', 'ground', 'corn', 'meal', 'beef', 'salmon', 'protein', 'fat', 'vitamin'] 
-                                        if term in potential_ingredients.lower()) >= 3 and
-                                    is_likely_ingredient_list(potential_ingredients)):
-                                    
-                                    # Clean up any escaped characters
-                                    cleaned_ingredients = potential_ingredients.replace('\\u003c', '<').replace('\\u003e', '>')
-                                    cleaned_ingredients = re.sub(r'\\u[0-9a-fA-F]{4}', '', cleaned_ingredients)
-                                    
-                                    formatted_content = format_ingredient_list(cleaned_ingredients)
-                                    formatted_content = clean_extra_content(formatted_content)
-                                    if len(formatted_content) > 100:  # Higher threshold for fallback
-                                        return formatted_content
-
-    # PRIORITY 0.49: Enhanced search when JSON ingredients are suspicious 
-    # Look more aggressively for correct ingredients that match the product title
-    if fallback_json_ingredients is not None:
-        page_title = soup.find('title')
-        title_text = page_title.get_text().lower() if page_title else ''
-        url_lower = url.lower()
-        
-        # Extract expected proteins from title/URL
-        expected_proteins = []
-        if 'chicken' in title_text or 'chicken' in url_lower:
-            expected_proteins.append('chicken')
-        if 'turkey' in title_text or 'turkey' in url_lower:
-            expected_proteins.append('turkey')
-        if 'salmon' in title_text or 'salmon' in url_lower:
-            expected_proteins.append('salmon')
-        if 'beef' in title_text or 'beef' in url_lower:
-            expected_proteins.append('beef')
-            
-        if expected_proteins:
-            # Look for ANY text that contains the expected proteins and looks like ingredients
-            for protein in expected_proteins:
-                # Search for ingredients starting with water and the expected protein
-                protein_pattern = rf'(water[,\s]+{protein}[^.]*?(?:vitamin\s+[a-z]-?\d*\s+supplement|folic\s+acid|[a-z]\d{{6,}}\.?))'
-                matches = re.finditer(protein_pattern, page_text, re.IGNORECASE | re.DOTALL)
-                for match in matches:
-                    potential_ingredients = match.group(1).strip()
-                    if (len(potential_ingredients) > 100 and 
-                        potential_ingredients.count(',') >= 8 and
-                        is_likely_ingredient_list(potential_ingredients)):
-                        formatted_content = format_ingredient_list(potential_ingredients)
-                        formatted_content = clean_extra_content(formatted_content)
-                        if len(formatted_content) > 50:
-                            # Verify this is better than our fallback
-                            if protein.lower() in formatted_content.lower():
-                                return formatted_content
-
     # PRIORITY 0.5: Special handling for "Our Ingredients" pattern (like Instinct)
-    our_ingredients_pattern = r'our\s+ingredients[:\s]*([A-Z][^.]*?(?:rosemary\s+extract|vitamin\s+[a-z]\d*\s+supplement|sodium\s+selenite|ethylenediamine\s+dihydriodide)\.?)'
-    matches = re.finditer(our_ingredients_pattern, page_text, re.IGNORECASE | re.DOTALL)
+    matches = OUR_INGREDIENTS_RE.finditer(page_text)
     for match in matches:
         potential_ingredients = match.group(1).strip()
         if (len(potential_ingredients) > 50 and len(potential_ingredients) < 3000 and
             is_likely_ingredient_list(potential_ingredients)):
             formatted_content = format_ingredient_list(potential_ingredients)
-            formatted_content = clean_extra_content(formatted_content)
             if len(formatted_content) > 50:
                 return formatted_content
 
-    # FINAL FALLBACK: Try Selenium for Target.com if no other method worked or we have suspicious ingredients
-    if ('target.com' in url.lower()):
-        # Don't use Selenium for Blue Buffalo if we already have JSON ingredients
-        if 'blue-buffalo' in url.lower() and fallback_json_ingredients is not None:
-            should_use_selenium = False
-        else:
-            # Use Selenium if: we have suspicious JSON OR no ingredients found at all
-            # (If we reach this point and it's Target.com, that means no other method succeeded)
-            should_use_selenium = True  # Always try Selenium for Target.com as final fallback
-        
-        if should_use_selenium:
-            try:
-                from selenium_scraper import get_target_ingredients_with_selenium
-                selenium_ingredients = get_target_ingredients_with_selenium(url)
-                if (selenium_ingredients and 
-                    len(selenium_ingredients) > 50 and
-                    selenium_ingredients.count(',') >= 8):
-                    # Selenium found ingredients
-                    formatted_content = format_ingredient_list(selenium_ingredients)
-                    formatted_content = clean_extra_content(formatted_content)
-                    if len(formatted_content) > 50:
-                        return convert_ingredients_to_array(formatted_content)
-            except Exception as e:
-                print(f"Selenium fallback failed: {e}")
-
-    # Return suspicious JSON ingredients if Selenium also failed
-    if fallback_json_ingredients is not None:
-        return convert_ingredients_to_array(fallback_json_ingredients)
-    
     # If all strategies fail, return None
     return None
 
@@ -3733,29 +3048,15 @@ def extract_ingredients_from_json_ld(data):
 
 def extract_ingredients_from_text(text):
     """Extract ingredients from a large text block using patterns"""
-    import re
-    
     try:
         text_lower = text.lower()
         
-        # Look for ingredient section patterns - FIXED: More precise boundary detection to prevent cross-contamination
-        patterns = [
-            # Most precise: Stop at specific section markers and product boundaries
-            r'ingredients?[:\s]+(.*?)(?=\n\s*(?:guaranteed\s+analysis|feeding|directions|nutritional\s+info|calories|shipping|returns|nutrition\s+facts|allergen|warning|storage|best\s+before|expir|net\s+weight|related\s+products|you\s+may\s+also\s+like|similar\s+products|product\s+details|other\s+flavors|$))',
-            r'ingredient (?:list|panel)[:\s]+(.*?)(?=\n\s*(?:guaranteed\s+analysis|feeding|directions|nutritional\s+info|calories|shipping|returns|nutrition\s+facts|allergen|warning|storage|best\s+before|expir|net\s+weight|related\s+products|you\s+may\s+also\s+like|similar\s+products|product\s+details|$))',
-            r'contains[:\s]+(.*?)(?=\n\s*(?:guaranteed\s+analysis|feeding|directions|nutritional\s+info|calories|shipping|returns|nutrition\s+facts|allergen|warning|storage|best\s+before|expir|net\s+weight|related\s+products|you\s+may\s+also\s+like|similar\s+products|product\s+details|$))',
-            r'made with[:\s]+(.*?)(?=\n\s*(?:guaranteed\s+analysis|feeding|directions|nutritional\s+info|calories|shipping|returns|nutrition\s+facts|allergen|warning|storage|best\s+before|expir|net\s+weight|related\s+products|you\s+may\s+also\s+like|similar\s+products|product\s+details|$))',
-            # Controlled length patterns to prevent cross-contamination
-            r'ingredients?[:\s]+(.{20,800}?)(?=\n\n|\n\s*[A-Z][A-Z\s]+:|\n\s*\d+\s*%|\n\s*guaranteed|$)',
-            r'ingredient (?:list|panel)[:\s]+(.{20,600}?)(?=\n\s*[A-Z][A-Z\s]+:|\n\s*\d+\s*%|\n\s*guaranteed|$)'
-        ]
-        
         # Collect all matches with their quality scores to pick the best one
         all_matches = []
         
-        for pattern_idx, pattern in enumerate(patterns):
-            import re
-            matches = re.findall(pattern, text_lower, re.DOTALL | re.IGNORECASE)
+        # Look for ingredient section patterns, most precise first
+        for pattern_idx, pattern in enumerate(INGREDIENT_TEXT_PATTERNS):
+            matches = pattern.findall(text_lower)
             for match in matches:
                 if len(match.strip()) > 20 and is_likely_ingredient_list(match):
                     # Check for cross-contamination indicators
@@ -3782,26 +3083,14 @@ def extract_ingredients_from_text(text):
     except:
         return None
 
-def is_likely_ingredient_list(text):
-    """Check if text is likely to be an ingredient list rather than marketing content"""
-    if not text or len(text.strip()) < 10:
-        return False
-
-    text_lower = text.lower()
-
-    # Immediately reject navigation content
-    navigation_indicators = [
+# Phrase lists used to tell real ingredient lists apart from navigation, marketing and label text
+INGREDIENT_LIST_KEYWORDS = {
+    'navigation': [
         'navigate to', 'contact us', 'facebook', 'twitter', 'instagram', 'youtube',
         'sitemap', 'terms of service', 'privacy policy', 'where to buy', 'shop',
-        'find a store', 'customer service', 'subscribe', 'newsletter', 'follow us'
-    ]
-
-    for nav_indicator in navigation_indicators:
-        if nav_indicator in text_lower:
-            return False
-
-    # Immediately reject product descriptions and marketing copy
-    description_indicators = [
+        'find a store', 'customer service', 'subscribe', 'newsletter', 'follow us', 'shopping'
+    ],
+    'description': [
         'designed to help', 'nutritional needs', 'high protein', 'specialized cat food',
         'energy levels', 'maintain a healthy weight', 'you can rest assured',
         'essential nutrients they deserve', 'promotes digestive health',
@@ -3819,27 +3108,8 @@ def is_likely_ingredient_list(text):
         'boosted nutrition recipes', 'support healthy digestion', 'healthy skin',
         'immune health', 'perfect for any pet', 'tailored nutrition',
         'variety of healthy solutions', 'life stages'
-    ]
-
-    # Check for description patterns - these are NOT ingredient lists
-    description_count = sum(1 for desc in description_indicators if desc in text_lower)
-    if description_count >= 2:  # If it has multiple description phrases, it's marketing copy
-        return False
-
-    # Enhanced marketing detection - reject text that starts with marketing phrases
-    marketing_starters = [
-        '- packed with', 'freeze-dried raw -', 'all natural,', 'protein packed,',
-        'minimally processed', 'l-carnitine to help', 'made without -', 'made in the usa with',
-        'available in', 'more about', 'raw + kibble', '100% raw pieces',
-        'boosted nutrition', 'perfect for any pet'
-    ]
-    
-    for starter in marketing_starters:
-        if text_lower.startswith(starter):
-            return False
-
-    # Reject text that contains too much marketing language relative to actual ingredients
-    marketing_indicators = [
+    ],
+    'marketing': [
         'tantalize', 'tastebuds', 'gourmet', 'delicious flavor', 'perfect way',
         'hand-crafted', 'toppers offer', 'invite your cat', 'experience gourmet',
         'looks good enough for you', 'crafted especially for her', 'attention to detail',
@@ -3851,46 +3121,80 @@ def is_likely_ingredient_list(text):
         'finest ingredients', 'from around the world', 'high protein kibble',
         'raw nutrition and taste', 'boosted nutrition', 'immune health',
         'tailored nutrition', 'healthy solutions'
-    ]
-
-    marketing_count = sum(1 for marketing_term in marketing_indicators if marketing_term in text_lower)
-    # If it contains multiple marketing terms, it's likely marketing copy
-    if marketing_count >= 3:
-        return False
-
-    # Immediately reject disclaimer text
-    disclaimer_indicators = [
+    ],
+    'disclaimer': [
         'can change in consistency', 'microwave', 'refrigerate', 'use by',
         'best by', 'sell by', 'store in', 'keep refrigerated', 'do not microwave'
-    ]
-
-    for disclaimer in disclaimer_indicators:
-        if disclaimer in text_lower:
-            return False
-
-    # Immediately reject nutritional information
-    nutritional_indicators = [
+    ],
+    'nutritional': [
         'nutritional info', 'guaranteed analysis', 'crude protein', 'crude fat',
         'crude fiber', 'moisture', 'ash content', 'calorie content', 'kcal per',
         'feeding instructions', 'feed daily', 'body weight'
-    ]
-
-    for nutritional in nutritional_indicators:
-        if nutritional in text_lower:
-            return False
-
-    # Immediately reject page titles/product names
-    title_indicators = [
+    ],
+    'title': [
         '| applaws', '| purina', '| hill\'s', '| royal canin', '| blue buffalo', '| instinct',
         'oz can', 'oz bag', 'lb bag', 'kg bag', 'pouches', 'pack of',
         'wet cat food', 'dry cat food', 'cat treats', 'dog food', 'pet food', 
         '- amazon', '- chewy', '- petco', '- petsmart', 'product page', 'buy online'
-    ]
+    ],
+    'ingredient': [
+        'chicken', 'beef', 'salmon', 'tuna', 'turkey', 'lamb', 'duck', 'fish',
+        'rice', 'wheat', 'corn', 'meal', 'by-product', 'oil', 'fat', 'vitamin',
+        'mineral', 'starch', 'flour', 'extract', 'powder', 'dried', 'dehydrated',
+        'salt', 'phosphate', 'chloride', 'sulfate', 'carbonate', 'oxide',
+        'supplement', 'preserve', 'preserved', 'natural flavor', 'artificial flavor',
+        'liver', 'heart', 'gizzard', 'bone meal', 'blood meal'
+    ],
+    'technical': [
+        'sodium selenite', 'thiamine mononitrate', 'pyridoxine hydrochloride', 
+        'riboflavin supplement', 'biotin', 'folic acid', 'choline chloride',
+        'zinc sulfate', 'ferrous sulfate', 'manganese sulfate', 'copper sulfate',
+        'vitamin e supplement', 'vitamin a supplement', 'vitamin d-3 supplement'
+    ],
+}
+INGREDIENT_LIST_MATCHER = KeywordMatcher(INGREDIENT_LIST_KEYWORDS)
 
-    for title in title_indicators:
-        if title in text_lower:
+def is_likely_ingredient_list(text):
+    """Check if text is likely to be an ingredient list rather than marketing content"""
+    if not text or len(text.strip()) < 10:
+        return False
+
+    text_lower = text.lower()
+
+    # One scan finds every navigation/marketing/label/ingredient phrase in the text
+    found = INGREDIENT_LIST_MATCHER.found(text_lower)
+
+    # Immediately reject navigation content
+    if found['navigation']:
+        return False
+
+    # Check for description patterns - these are NOT ingredient lists
+    description_count = len(found['description'])
+    if description_count >= 2:  # If it has multiple description phrases, it's marketing copy
+        return False
+
+    # Enhanced marketing detection - reject text that starts with marketing phrases
+    marketing_starters = [
+        '- packed with', 'freeze-dried raw -', 'all natural,', 'protein packed,',
+        'minimally processed', 'l-carnitine to help', 'made without -', 'made in the usa with',
+        'available in', 'more about', 'raw + kibble', '100% raw pieces',
+        'boosted nutrition', 'perfect for any pet'
+    ]
+    
+    for starter in marketing_starters:
+        if text_lower.startswith(starter):
             return False
 
+    # Reject text that contains too much marketing language relative to actual ingredients
+    marketing_count = len(found['marketing'])
+    # If it contains multiple marketing terms, it's likely marketing copy
+    if marketing_count >= 3:
+        return False
+
+    # Immediately reject disclaimer text, nutritional information and page titles/product names
+    if found['disclaimer'] or found['nutritional'] or found['title']:
+        return False
+
     # For actual ingredient lists, look for specific patterns
     # Real ingredient lists typically start with ingredients and are comma-separated
     actual_ingredient_patterns = [
@@ -3908,26 +3212,9 @@ def is_likely_ingredient_list(text):
     has_percentages = '%' in text or 'percent' in text_lower
     word_count = len(text.split())
     
-    # Look for specific ingredient terms that appear in actual lists
-    ingredient_indicators = [
-        'chicken', 'beef', 'salmon', 'tuna', 'turkey', 'lamb', 'duck', 'fish',
-        'rice', 'wheat', 'corn', 'meal', 'by-product', 'oil', 'fat', 'vitamin',
-        'mineral', 'starch', 'flour', 'extract', 'powder', 'dried', 'dehydrated',
-        'salt', 'phosphate', 'chloride', 'sulfate', 'carbonate', 'oxide',
-        'supplement', 'preserve', 'natural flavor', 'artificial flavor',
-        'liver', 'heart', 'gizzard', 'bone meal', 'blood meal'
-    ]
+    # Count specific ingredient terms that appear in actual lists
+    ingredient_count = len(found['ingredient'])
 
-    ingredient_count = sum(1 for ingredient in ingredient_indicators if ingredient in text_lower)
-
-    # Check for technical ingredient terms that are strong indicators
-    technical_indicators = [
-        'sodium selenite', 'thiamine mononitrate', 'pyridoxine hydrochloride', 
-        'riboflavin supplement', 'biotin', 'folic acid', 'choline chloride',
-        'zinc sulfate', 'ferrous sulfate', 'manganese sulfate', 'copper sulfate',
-        'vitamin e supplement', 'vitamin a supplement', 'vitamin d-3 supplement'
-    ]
-    
     # Check for common first ingredients
     common_first_ingredients = [
         'ground yellow corn', 'ground corn', 'chicken', 'beef', 'salmon', 'tuna',
@@ -3935,7 +3222,8 @@ def is_likely_ingredient_list(text):
         'lamb', 'fish meal', 'chicken meal', 'poultry meal'
     ]
     
-    has_technical_terms = any(term in text_lower for term in technical_indicators)
+    # Technical vitamin/mineral terms are strong indicators
+    has_technical_terms = bool(found['technical'])
     starts_with_ingredient = any(text_lower.startswith(ingredient) for ingredient in common_first_ingredients)
     
     # Valid ingredient list criteria (more comprehensive):
@@ -3961,72 +3249,6 @@ def clean_ingredients_text(text):
         # Remove extra whitespace and normalize
         text = ' '.join(text.split())
         
-        # Convert British spelling "fibre" to American spelling "fiber"
-        import re
-        text = re.sub(r'\bfibre\b', 'fiber', text, flags=re.IGNORECASE)
-        
-        # Remove "Vitamins" wrapper and keep only the individual vitamins
-        # Pattern: "Vitamins (Vitamin E Supplement, Vitamin B3 (Niacin Supplement), ...)"
-        # Should become: "Vitamin E Supplement, Vitamin B3 (Niacin Supplement), ..."
-        
-        # Use a more robust approach to handle nested parentheses
-        def extract_vitamins_content(text):
-            # Find "Vitamins (" and then match balanced parentheses
-            start_pattern = r'\bVitamins\s*\('
-            match = re.search(start_pattern, text, re.IGNORECASE)
-            if match:
-                start_pos = match.end() - 1  # Position of opening parenthesis
-                paren_count = 0
-                end_pos = start_pos
-                
-                for i, char in enumerate(text[start_pos:], start_pos):
-                    if char == '(':
-                        paren_count += 1
-                    elif char == ')':
-                        paren_count -= 1
-                        if paren_count == 0:
-                            end_pos = i
-                            break
-                
-                if paren_count == 0:  # Found matching closing parenthesis
-                    vitamins_content = text[start_pos + 1:end_pos]  # Content inside parentheses
-                    # Replace the entire "Vitamins (...)" with just the content
-                    return text[:match.start()] + vitamins_content + text[end_pos + 1:]
-            
-            return text
-        
-        # Remove "Minerals" wrapper and keep only the individual minerals
-        # Pattern: "Minerals (Zinc Proteinate, Iron Proteinate, Potassium Chloride, ...)"
-        # Should become: "Zinc Proteinate, Iron Proteinate, Potassium Chloride, ..."
-        
-        def extract_minerals_content(text):
-            # Find "Minerals (" and then match balanced parentheses
-            start_pattern = r'\bMinerals\s*\('
-            match = re.search(start_pattern, text, re.IGNORECASE)
-            if match:
-                start_pos = match.end() - 1  # Position of opening parenthesis
-                paren_count = 0
-                end_pos = start_pos
-                
-                for i, char in enumerate(text[start_pos:], start_pos):
-                    if char == '(':
-                        paren_count += 1
-                    elif char == ')':
-                        paren_count -= 1
-                        if paren_count == 0:
-                            end_pos = i
-                            break
-                
-                if paren_count == 0:  # Found matching closing parenthesis
-                    minerals_content = text[start_pos + 1:end_pos]  # Content inside parentheses
-                    # Replace the entire "Minerals (...)" with just the content
-                    return text[:match.start()] + minerals_content + text[end_pos + 1:]
-            
-            return text
-        
-        text = extract_vitamins_content(text)
-        text = extract_minerals_content(text)
-        
         # Check if this looks like a valid ingredient list first
         # Valid ingredient lists are typically comma-separated and contain food ingredients
         if ',' in text and len(text) < 5000:  # Increased length limit to capture complete ingredient lists
@@ -4087,16 +3309,12 @@ def clean_ingredients_text(text):
                         text = text[:pos].strip()
                         break
                 
-                # Clean up the text
-                text = text.strip()
-                if text.endswith('.'):
-                    text = text[:-1]  # Remove trailing period
-                
                 # Remove any remaining "ingredients" at the start if it got through
+                text = text.strip()
                 if text.lower().startswith('ingredients '):
                     text = text[12:].strip()
                 
-                return text
+                return format_ingredient_list(text)
         
         # If it doesn't look like a valid ingredient list, apply stricter filtering
         # Filter out page titles, product names, and disclaimer content
@@ -4136,9 +3354,9 @@ def clean_ingredients_text(text):
         
         # Limit length to avoid overly long ingredient lists (but allow for complete lists)
         if len(text) > 5000:  # Increased from 2500 to 5000 to accommodate complete ingredient lists
-            text = text[:5000] + "..."
+            text = text[:5000]
         
-        return text.strip()
+        return format_ingredient_list(text)
     except:
         return text
 
@@ -4177,7 +3395,6 @@ def extract_ingredients_from_json_data(json_data):
             if value and isinstance(value, str) and len(value) > 50:
                 if is_likely_ingredient_list(value):
                     formatted_content = format_ingredient_list(value)
-                    formatted_content = clean_extra_content(formatted_content)
                     if len(formatted_content) > 50:
                         return formatted_content
         
@@ -4185,6 +3402,671 @@ def extract_ingredients_from_json_data(json_data):
     except:
         return None
 
+# Site-specific extractors that domain_registry entries refer to by name. Field extractors take
+# (soup, url); bundles take the URL and render the page themselves.
+SITE_EXTRACTORS = {
+    'platform': {
+        'target_embedded': extract_target_embedded_data,
+    },
+    'bundle': {
+        'applaws_dropdowns': extract_applaws_dropdown_data,
+    },
+    'brand': {
+        'target_shop_all': extract_target_brand_from_shop_all,
+    },
+    'ingredients': {
+        'only_natural_pet': extract_ingredients_only_natural_pet,
+        'viva_raw': extract_ingredients_viva_raw,
+        'applaws': extract_ingredients_applaws,
+        'target_embedded': extract_ingredients_target_embedded,
+        'target_rendered_accordion': extract_ingredients_target_rendered_accordion,
+        'target_label_info': extract_ingredients_target_label_info,
+        'absolute_holistic': extract_ingredients_absolute_holistic,
+    },
+    'guaranteed_analysis': {
+        'only_natural_pet': extract_guaranteed_analysis_only_natural_pet,
+        'viva_raw': extract_guaranteed_analysis_viva_raw,
+        'applaws': extract_guaranteed_analysis_applaws,
+        'applaws_rendered_analysis': extract_guaranteed_analysis_applaws_rendered,
+    },
+    'nutritional_info': {
+        'only_natural_pet': extract_nutritional_info_only_natural_pet,
+        'viva_raw': extract_nutritional_info_viva_raw,
+        'applaws': extract_nutritional_info_applaws,
+        'applaws_rendered_calories': extract_nutritional_info_applaws_rendered,
+    },
+}
+
+def extract_configured_field(soup, site, field):
+    """Value for a field from the CSS selectors / JSON paths a domain registry entry declares"""
+    from embedded_state import get_embedded_state, resolve_path
+    
+    value = None
+    for selector in site.get('selectors', {}).get(field, ()):
+        element = soup.select_one(selector)
+        if element:
+            value = WHITESPACE_RE.sub(' ', element.get_text(' ')).strip()
+            if value:
+                break
+    
+    paths = site.get('json_paths', {}).get(field, ())
+    if not value and paths:
+        # Paths start at an embedded state marker ('__NEXT_DATA__') or 'ld_json' (list of JSON-LD blocks)
+        roots = dict(get_embedded_state(soup))
+        roots['ld_json'] = []
+        for script in soup.find_all('script', type='application/ld+json'):
+            try:
+                roots['ld_json'].append(json.loads(script.string or ''))
+            except ValueError:
+                continue
+        for path in paths:
+            value = resolve_path(roots, path)
+            if isinstance(value, str):
+                value = value.strip()
+            if value:
+                break
+    
+    if not value:
+        return None
+    if field == 'ingredients' and isinstance(value, str):
+        return normalize_ingredients(value) or None
+    if field == 'nutritional_info' and isinstance(value, str):
+        return {'calories': value}
+    return value
+
+def site_strategies(site, field, soup, url, confidence=SITE_CONFIDENCE):
+    """A domain's declared selectors/JSON paths and named extractors for one field, as cascade strategies"""
+    strategies = []
+    if site.get('selectors', {}).get(field) or site.get('json_paths', {}).get(field):
+        strategies.append(('site:config', confidence, lambda: extract_configured_field(soup, site, field)))
+    for name in site.get('extractors', {}).get(field, ()):
+        strategies.append((f'site:{name}', confidence, lambda extractor=SITE_EXTRACTORS[field][name]: extractor(soup, url)))
+    return strategies
+
+def run_site_fallbacks(site, field, soup, url):
+    """Run a domain's named fallback extractors for one field; the first result wins"""
+    for name in site.get('fallbacks', {}).get(field, ()):
+        result = SITE_EXTRACTORS[field][name](soup, url)
+        if result:
+            return result
+    return None
+
+def extract_embedded_data(soup, url):
+    """Structured product data embedded in the page itself (the domain's registered platform extractor); no requests"""
+    platform = domain_config(url).get('platform')
+    if platform:
+        return SITE_EXTRACTORS['platform'][platform](soup, url)
+    return {}
+
+def extract_platform_api_data(soup, url, context=None):
+    """
+    Product data from the store platform's public API (Shopify, WooCommerce/WordPress REST). These
+    are extra requests, within the context's budget; domains with a registered platform extractor
+    don't make them.
+    """
+    if domain_config(url).get('platform'):
+        return {}
+    if is_shopify_page(soup):
+        return extract_shopify_product_data(soup, url, context)
+    if wordpress_api_root(soup, url):
+        return extract_wordpress_product_data(soup, url, context)
+    return {}
+
+def extract_product_details(soup, url, known=None, context=None):
+    """Extract ingredients, guaranteed analysis and nutritional info from a parsed page"""
+    known = known or {}
+    ingredients = known.get('ingredients')
+    guaranteed_analysis = known.get('guaranteed_analysis')
+    nutritional_info = known.get('nutritional_info')
+    if ingredients and guaranteed_analysis and nutritional_info:
+        return ingredients, guaranteed_analysis, nutritional_info
+    
+    # Sites with a bundle extractor (Applaws dropdowns) get all three fields in one go to be more efficient
+    bundle = domain_config(url).get('bundle')
+    bundle_data = SITE_EXTRACTORS['bundle'][bundle](url) if bundle else {}
+    if context is not None:
+        for field in ('ingredients', 'guaranteed_analysis', 'nutritional_info'):
+            if not known.get(field) and bundle_data.get(field):
+                context.record_source(field, f'bundle:{bundle}')
+    ingredients = ingredients or bundle_data.get('ingredients') or extract_ingredients(soup, url, context)
+    guaranteed_analysis = guaranteed_analysis or bundle_data.get('guaranteed_analysis') or extract_guaranteed_analysis(soup, url, context)
+    nutritional_info = nutritional_info or bundle_data.get('nutritional_info') or extract_nutritional_info(soup, url, context)
+    return ingredients, guaranteed_analysis, nutritional_info
+
+def is_field_complete(value):
+    """Check that an extracted ingredients/GA/nutrition value is real data, not empty or an error message"""
+    if not value:
+        return False
+    if isinstance(value, str):
+        return not any(phrase in value.lower() for phrase in ['unable to extract', 'error', 'not available', 'please check'])
+    return True
+
+def extract_product_details_routed(soup, url, known=None, context=None):
+    """
+    Extract ingredients/GA/nutrition, using the browser only when the domain's history says it helps.
+    
+    Returns ((ingredients, guaranteed_analysis, nutritional_info), route). Domains on the 'render'
+    route run the extractors as-is. Otherwise a static pass runs first with the browser disabled;
+    'probe' domains then get a browser pass for whichever fields are still missing. Both outcomes
+    are recorded so the domain's route is learned over time, unless the domain registry pins it
+    with 'render'.
+    
+    With a context, the browser is only started while RENDER_MIN_BUDGET seconds of its budget are
+    left; fields still incomplete when the browser was ruled out are flagged as skipped.
+    """
+    with render_deadline(context.deadline if context is not None else None):
+        details, route = route_product_details(soup, url, known, context)
+    if context is not None and route != ROUTE_STATIC and not context.can_afford(RENDER_MIN_BUDGET):
+        for field, value in zip(('ingredients', 'guaranteed_analysis', 'nutritional_info'), details):
+            if not is_field_complete(value):
+                context.skip(field, ['render'])
+    return details, route
+
+def route_product_details(soup, url, known, context):
+    """Static and/or browser passes for extract_product_details_routed"""
+    # Sites pinned in the domain registry skip the learned route
+    render = domain_config(url).get('render')
+    if render:
+        return extract_product_details(soup, url, known, context), ROUTE_RENDER
+    if render is False:
+        with static_only():
+            return extract_product_details(soup, url, known, context), ROUTE_STATIC
+    
+    route = choose_route(url)
+    if route == ROUTE_RENDER:
+        return extract_product_details(soup, url, known, context), route
+    
+    with static_only():
+        details = list(extract_product_details(soup, url, known, context))
+    static_complete = all(is_field_complete(value) for value in details)
+    record_static_result(url, static_complete)
+    
+    if static_complete or route == ROUTE_STATIC:
+        return tuple(details), route
+    
+    # Not enough budget left to start a browser: keep the static result without recording a render outcome
+    if context is not None and not context.can_afford(RENDER_MIN_BUDGET):
+        return tuple(details), route
+    
+    # Fields the static pass already completed are passed in, so the browser only works on the rest
+    complete = {key: value for key, value in zip(('ingredients', 'guaranteed_analysis', 'nutritional_info'), details)
+                if is_field_complete(value)}
+    rendered = extract_product_details(soup, url, dict(known or {}, **complete), context)
+    added = False
+    for i, value in enumerate(rendered):
+        if not is_field_complete(details[i]) and is_field_complete(value):
+            details[i] = value
+            added = True
+    record_render_result(url, added)
+    return tuple(details), route
+
+# Texture keywords in a product name, checked in order; they override the general wet/dry classification
+NAME_TEXTURE_OVERRIDES = (
+    (('air dried', 'air-dried'), "air dried"),
+    (('freeze dried', 'freeze-dried'), "freeze dried"),
+    (('dehydrated',), "dehydrated"),
+    (('broth',), "broth"),
+    (('gravy',), "gravy"),
+    (('mousse',), "mousse"),
+    (('pate', 'pâté'), "pate"),
+    (('dry food', 'dry cat food', 'dry dog food', 'kibble'), "kibble"),
+)
+
+# Brands known to make only raw/frozen food
+RAW_FOOD_BRANDS = (
+    'viva raw',
+    'stella & chewy\'s',
+    'primal pet foods',
+    'northwest naturals',
+    'instinct raw',
+    'nature\'s variety instinct',
+    'bravo!',
+    'darwin\'s natural pet products',
+    'small batch',
+    'answers pet food',
+    'vital essentials',
+    'k9 natural',
+    'ziwi peak',
+    'honest kitchen',
+    'the honest kitchen',
+    'barf world',
+    'raw paws',
+    'tucker\'s raw frozen',
+    'big country raw',
+    'iron will raw',
+)
+
+def apply_texture_overrides(texture, name, brand):
+    """Texture from name keywords first, then "raw" for raw-only brands"""
+    if name:
+        name_lower = name.lower()
+        for keywords, override in NAME_TEXTURE_OVERRIDES:
+            if any(keyword in name_lower for keyword in keywords):
+                texture = override
+                break
+    if brand:
+        brand_lower = brand.lower()
+        if any(raw_brand in brand_lower for raw_brand in RAW_FOOD_BRANDS):
+            texture = "raw"
+    return texture
+
+def apply_life_stage_override(life_stage, name):
+    """"Senior" in the product name wins over any other life stage (including "all life stages")"""
+    if name and 'senior' in name.lower():
+        return "senior"
+    return life_stage
+
+# Response fields /scrape can be limited to with 'fields'; all of them by default
+SCRAPE_FIELDS = ('brand', 'name', 'imageUrl', 'petType', 'texture', 'lifeStage',
+                 'ingredients', 'guaranteedAnalysis', 'nutritionalInfo')
+
+# Fields from the ingredient/GA/nutrition extraction, which report failures as messages rather than None
+DETAIL_FIELDS = ('ingredients', 'guaranteedAnalysis', 'nutritionalInfo')
+
+def direct_image_fields(url):
+    """Lazy /scrape fields for a direct image URL; everything comes from the URL itself"""
+    return LazyFields({
+        'brand': lambda fields: extract_brand_from_url(url) or "Brand not found",
+        'name': lambda fields: extract_product_name_from_url(url),
+        'imageUrl': lambda fields: url,
+        'petType': lambda fields: extract_pet_type_from_url(url),
+        'texture': lambda fields: apply_texture_overrides(extract_food_type_from_url(url), fields['name'], fields['brand']),
+        'lifeStage': lambda fields: apply_life_stage_override(extract_life_stage_from_url(url), fields['name']),
+        'ingredients': lambda fields: extract_ingredients_from_url(url),
+        'guaranteedAnalysis': lambda fields: None,  # Cannot extract guaranteed analysis from direct images
+        'nutritionalInfo': lambda fields: None,  # Cannot extract nutritional info from direct images
+    })
+
+def page_fields(soup, url, context):
+    """
+    Lazy /scrape fields for a product page.
+    
+    Structured data embedded in the page wins over HTML scraping. Platform API calls (Shopify,
+    WooCommerce) are only made for a requested field that needs them: ingredients/GA/nutrition,
+    or a brand, image, name or size the static extractors didn't find with confidence. Ingredients,
+    GA and nutrition share one routed extraction ('details'); texture and life stage depend on the
+    name (and texture on the brand), which is resolved on demand.
+    """
+    def embedded_data(fields):
+        with context.timed('platform_data'):
+            return extract_embedded_data(soup, url)
+    
+    def api_data(fields):
+        with context.timed('platform_data'):
+            return extract_platform_api_data(soup, url, context)
+    
+    def with_platform_data(fields, key, field, static):
+        """
+        `key` from the embedded data, else the static extractor's value; the platform API is only
+        asked when that found nothing, or (for cascaded fields) nothing that cleared its threshold
+        """
+        value = fields['embedded_data'].get(key)
+        if not value:
+            value = static()
+            cascade = context.cascades.get(field)
+            if value and (cascade is None or cascade.score >= CONFIDENCE_THRESHOLDS.get(field, DEFAULT_THRESHOLD)):
+                return value
+            api_value = fields['api_data'].get(key)
+            if not api_value:
+                return value
+            value = api_value
+        context.record_source(field, 'platform_data')
+        return value
+    
+    def brand(fields):
+        with context.timed('brand'):
+            return with_platform_data(fields, 'brand', 'brand', lambda: extract_brand(soup, url, context))
+    
+    def image_url(fields):
+        with context.timed('image'):
+            return with_platform_data(fields, 'image_url', 'image', lambda: extract_image_url(soup, url, context))
+    
+    def details(fields):
+        # Static HTML first; the browser only runs for domains that have needed it
+        with context.timed('details'):
+            known = fields['embedded_data']
+            if not all(known.get(field) for field in ('ingredients', 'guaranteed_analysis', 'nutritional_info')):
+                known = dict(fields['api_data'], **{key: value for key, value in known.items() if value})
+            for field in ('ingredients', 'guaranteed_analysis', 'nutritional_info'):
+                if known.get(field):
+                    context.record_source(field, 'platform_data')
+            return extract_product_details_routed(soup, url, known, context)
+    
+    def name(fields):
+        # Product name with the size in parentheses when one is found
+        with context.timed('name'):
+            product_name = with_platform_data(fields, 'name', 'name', lambda: extract_product_name(soup, url))
+            product_size = with_platform_data(fields, 'size', 'size', lambda: extract_product_size(soup, url, context))
+        if product_name and product_size:
+            return f"{product_name} ({product_size})"
+        return product_name
+    
+    return LazyFields({
+        'embedded_data': embedded_data,
+        'api_data': api_data,
+        'details': details,
+        'brand': brand,
+        'name': name,
+        'imageUrl': image_url,
+        'petType': lambda fields: extract_pet_type(soup, url),
+        'texture': lambda fields: apply_texture_overrides(extract_food_type(soup, url), fields['name'], fields['brand']),
+        'lifeStage': lambda fields: apply_life_stage_override(extract_life_stage(soup, url), fields['name']),
+        'ingredients': lambda fields: fields['details'][0][0],
+        'guaranteedAnalysis': lambda fields: fields['details'][0][1],
+        'nutritionalInfo': lambda fields: fields['details'][0][2],
+    })
+
+
+# values: the requested fields; debug_info is saved with the record, debug_message is returned to the UI;
+# content_hash is the fetched page's page_hash() and validators its ETag/Last-Modified for conditional
+# requests (both None when the page wasn't fetched by scrape())
+ExtractionResult = namedtuple('ExtractionResult', ['values', 'skipped_fields', 'debug_info', 'debug_message',
+                                                   'content_hash', 'validators'],
+                              defaults=(None, None))
+
+def select_fields(fields):
+    """Requested fields in SCRAPE_FIELDS order; a list or comma-separated string, all fields when empty"""
+    if not fields:
+        return list(SCRAPE_FIELDS)
+    if isinstance(fields, str):
+        fields = [field.strip() for field in fields.split(',') if field.strip()]
+    unknown = [field for field in fields if field not in SCRAPE_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(map(str, unknown))}. Available: {', '.join(SCRAPE_FIELDS)}")
+    return [field for field in SCRAPE_FIELDS if field in fields]
+
+def parse_extraction_options(options):
+    """(url, fields, budget) from a /scrape or /extract payload; raises ValueError with a message for the client"""
+    url = (options.get('url') or '').strip()
+    if not url:
+        raise ValueError('URL is required')
+    
+    # Add http if not present
+    if not url.startswith(('http://', 'https://')):
+        url = 'https://' + url
+    if not is_valid_url(url):
+        raise ValueError(f'Invalid URL: {url}')
+    
+    # Seconds this scrape may take (0 = unlimited); expensive fallbacks are skipped once it runs out
+    try:
+        budget = float(options.get('budget', SCRAPE_BUDGET))
+    except (TypeError, ValueError):
+        budget = -1
+    if budget < 0:
+        raise ValueError('budget must be a number of seconds')
+    
+    return url, select_fields(options.get('fields')), budget
+
+def is_direct_image_url(url):
+    """True for URLs that point at an image file rather than a product page"""
+    image_extensions = ['.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp', '.svg', '.pdf']
+    # Handle URLs with query parameters by checking the path part
+    url_lower = url.lower()
+    url_path = urlparse(url_lower).path
+    
+    # Check both the full URL and the path without query parameters
+    return (
+        any(url_path.endswith(ext) for ext in image_extensions) or 
+        any(url_lower.endswith(ext) for ext in image_extensions) or
+        # Also check if the path contains image extensions before query params
+        any(ext in url_path for ext in image_extensions) or
+        # Super aggressive: check if URL contains 'photo' and image domain
+        ('photo' in url_lower and any(domain in url_lower for domain in ['images.', 'image.', 'img.', 'static.', 'cdn.']))
+    )
+
+def decompress_html(data):
+    """Gunzip HTML, refusing anything that inflates past EXTRACT_MAX_BYTES"""
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    try:
+        html = decompressor.decompress(data, EXTRACT_MAX_BYTES)
+    except zlib.error as e:
+        raise ValueError(f'Invalid gzip data: {e}')
+    if decompressor.unconsumed_tail:
+        raise ValueError(f'HTML is larger than {EXTRACT_MAX_BYTES} bytes once decompressed')
+    return html
+
+def collect_fields(fields, requested, context, extraction_method, image_counts):
+    """Evaluate the requested lazy fields and build the debug info for an ExtractionResult"""
+    values = {field: fields[field] for field in requested}
+    
+    # Ingredients are saved as a list so they can be stored as canonical ingredient IDs
+    if 'ingredients' in values:
+        values['ingredients'] = convert_ingredients_to_array(values['ingredients'])
+    
+    # Debug message with image strategy info
+    total_images, images_with_src = image_counts
+    is_direct_image = extraction_method == 'direct_image'
+    debug_message = f"Found {total_images}/{images_with_src} images on page (including data-src)"
+    if values.get('imageUrl') and values['imageUrl'] != "Image not found":
+        debug_message += f" - Using strategy: {'direct_url' if is_direct_image else context.strategy('image') or 'none_successful'}"
+        image_cascade = context.cascades.get('image')
+        if image_cascade:
+            debug_message += f" (confidence {image_cascade.score})"
+    
+    debug_info = {
+        'total_images': total_images,
+        'images_with_src': images_with_src,
+        'extraction_method': extraction_method,
+        'fields': list(requested),
+        'render_route': fields['details'][1] if 'details' in fields and fields.computed('details') else None,
+        'strategies': None if is_direct_image else context.strategy_summary(),
+        'timings': context.timings,
+        'warnings': context.warnings,
+        'skipped': context.skipped
+    }
+    return ExtractionResult(values, sorted(context.skipped), debug_info, debug_message)
+
+def extract_from_image_url(url, fields=None, context=None):
+    """Extract /scrape fields from a direct image URL (from the URL alone); returns an ExtractionResult"""
+    context = context or ExtractionContext(url)
+    return collect_fields(direct_image_fields(url), select_fields(fields), context, 'direct_image', (1, 1))
+
+def extract_from_html(html, url, fields=None, context=None):
+    """
+    Extract /scrape fields from a page the caller has already fetched.
+    
+    `html` is a str or bytes (gzip-compressed bytes are detected and inflated) and `url` the
+    page it came from, which selects the site's extractors and resolves relative links.
+    `fields` limits the extraction like /scrape's 'fields'; pass an ExtractionContext to set a
+    budget. Returns an ExtractionResult; nothing is saved.
+    """
+    context = context or ExtractionContext(url)
+    if isinstance(html, bytes) and html[:2] == b'\x1f\x8b':
+        html = decompress_html(html)
+    with context.timed('parse'):
+        soup = BeautifulSoup(html, 'html.parser')
+    
+    # Debug: Count total images found on page
+    total_images = len(soup.find_all('img'))
+    images_with_src = len(soup.find_all('img', src=True)) + len(soup.find_all('img', attrs={'data-src': True}))
+    return collect_fields(page_fields(soup, url, context), select_fields(fields), context, 'html_parsing',
+                          (total_images, images_with_src))
+
+class FetchError(Exception):
+    """A page that can't be fetched; `status` is the HTTP status /scrape reports"""
+    
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+class RobotsDisallowed(FetchError):
+    """A page the site's robots.txt doesn't let us fetch; raised before any request is made"""
+    
+    def __init__(self, url):
+        super().__init__(f'Disallowed by robots.txt: {url}', 403)
+
+def response_validators(response):
+    """ETag/Last-Modified of a response, for revalidating the page later; None when it sent neither"""
+    validators = {key: response.headers[header] for key, header in (('etag', 'ETag'), ('lastModified', 'Last-Modified'))
+                  if response.headers.get(header)}
+    return validators or None
+
+def fetch_page(url, context, validators=None):
+    """
+    GET a page with retries and user-agent rotation, within the context's budget; returns the response.
+    
+    With `validators` from an earlier response, the request is conditional and an unchanged page
+    comes back as an empty 304 response. robots.txt (cached per host) is checked first: a
+    disallowed URL raises RobotsDisallowed, and a Crawl-delay spaces requests to the site.
+    """
+    if context.expired():
+        raise FetchError('Scrape budget ran out before the page was fetched', 504)
+    # robots.txt is fetched within the budget too (a fetch the budget cuts short raises Timeout)
+    if not robots_cache.is_allowed(url, REQUEST_HEADERS, context.remaining()):
+        if robots_cache.rules_for(url, REQUEST_HEADERS).unreachable:
+            # Nothing was disallowed: the host didn't answer (or failed) for robots.txt
+            raise FetchError(f'Could not reach {urlparse(url).netloc}: its robots.txt could not be fetched', 502)
+        raise RobotsDisallowed(url)
+    if robots_cache.wait_turn(url, REQUEST_HEADERS, context.remaining()) is None:
+        delay = robots_cache.crawl_delay(url, REQUEST_HEADERS)
+        raise FetchError(f'The site asks for {delay:g}s between requests (Crawl-delay) and the scrape budget ran out waiting', 504)
+    
+    # Make request with retry logic
+    session = requests.Session()
+    session.headers.update(REQUEST_HEADERS)
+    if validators:
+        if validators.get('etag'):
+            session.headers['If-None-Match'] = validators['etag']
+        if validators.get('lastModified'):
+            session.headers['If-Modified-Since'] = validators['lastModified']
+    
+    max_retries = 3
+    for attempt in range(max_retries):
+        try:
+            # Add a small delay to be more polite
+            if attempt > 0:
+                if not context.can_afford(3):
+                    raise FetchError('Scrape budget ran out while fetching the page', 504)
+                time.sleep(2)
+            
+            # The request timeout never runs past the scrape's deadline
+            remaining = context.remaining()
+            timeout = 15 if remaining is None else max(1, min(15, remaining))
+            with context.timed('fetch'):
+                response = session.get(url, timeout=timeout, allow_redirects=True)
+            response.raise_for_status()
+            break
+            
+        except requests.exceptions.HTTPError as e:
+            if e.response.status_code == 403:
+                if attempt < max_retries - 1:
+                    context.warn(f"403 on attempt {attempt + 1}, retrying with another user agent")
+                    # Try with a different user agent
+                    alternate_agents = [
+                        'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+                        'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.1 Safari/605.1.15',
+                        'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+                    ]
+                    session.headers.update({'User-Agent': alternate_agents[attempt]})
+                    continue
+                else:
+                    raise FetchError('Access denied by website (403). This site may be blocking automated requests. Try a different URL or the site may require authentication.', 400)
+            else:
+                raise
+        except requests.exceptions.RequestException:
+            if attempt == max_retries - 1:
+                raise
+    
+    return response
+
+def scrape(url, fields=None, context=None, stored=None):
+    """
+    Fetch a URL and extract /scrape fields from it; returns an ExtractionResult and saves nothing.
+    
+    Concurrent scrapes of the same page (normalized URL) for the same fields share one fetch and
+    extraction; the callers that joined one already running get its result, marked 'coalesced'
+    in debug_info. With `stored`, the page's stored record (find_record), the request is
+    conditional on the record's ETag/Last-Modified, and a page the server reports as not modified,
+    or whose content hash matches the record's, is not extracted again: its stored values are
+    returned, marked 'unchanged'. Raises FetchError (or a requests exception) when the page can't
+    be fetched.
+    """
+    requested = select_fields(fields)
+    known_hash = stored and stored.get('contentHash')
+    result, shared = scrape_flights.do((normalize_url(url), tuple(requested), known_hash),
+                                       lambda: scrape_once(url, requested, context or ExtractionContext(url), stored))
+    if shared:
+        result = result._replace(debug_info=dict(result.debug_info, coalesced=True))
+    return result
+
+def unchanged_result(stored, fields, message, validators):
+    """ExtractionResult of a page that hasn't changed since `stored` was scraped: the stored values"""
+    return ExtractionResult({field: stored.get(field) for field in fields}, [],
+                            dict(stored.get('debug_info') or {}, unchanged=True), message,
+                            stored['contentHash'], validators)
+
+def scrape_once(url, fields, context, stored=None):
+    """Fetch and extract one page (scrape() without coalescing)"""
+    # Only records with a content hash hold values for every field, so only they can stand in for the page
+    if stored and not stored.get('contentHash'):
+        stored = None
+    response = fetch_page(url, context, stored and stored.get('validators'))
+    if is_direct_image_url(url):
+        # For direct images, everything comes from the URL
+        return extract_from_image_url(url, fields, context)
+    if response.status_code == 304:
+        return unchanged_result(stored, fields, 'Page not modified since the last scrape - stored values kept',
+                                stored.get('validators'))
+    content_hash = page_hash(response.content)
+    validators = response_validators(response)
+    if stored and stored['contentHash'] == content_hash:
+        return unchanged_result(stored, fields, 'Page unchanged since the last scrape - stored values kept', validators)
+    return extract_from_html(response.content, url, fields, context)._replace(content_hash=content_hash,
+                                                                               validators=validators)
+
+def save_extraction(url, result):
+    """
+    Store an extraction and return the /scrape style response.
+    
+    There is one record per canonical URL: a rescrape of a stored product (however its link was
+    written) updates that record in place, replacing only the fields it extracted, rather than
+    adding a row.
+    """
+    timestamp = datetime.now().isoformat()
+    with data_file_lock():
+        index, data = index_records(load_data())
+        record = index.get(canonicalize_url(url))
+        if record is None:
+            record = {
+                'id': max((item.get('id') or 0 for item in data), default=0) + 1,
+                # Generate random barcode ID placeholder
+                'barcodeId': generate_random_id(),
+                'url': url,
+                'canonicalUrl': canonicalize_url(url),
+                **{field: result.values.get(field) for field in SCRAPE_FIELDS},
+                'timestamp': timestamp,
+                'firstSeen': timestamp,
+                'domain': urlparse(url).netloc,
+                'debug_info': result.debug_info
+            }
+            data.append(record)
+            changed = None
+        else:
+            changed = update_record(record, result.values, url, timestamp, result.debug_info)
+        # Only a hash of a page fully extracted can stand in for all of the record's values; after a
+        # partial or failed extraction of a new page version it must be extracted again next time
+        if (result.content_hash and set(result.values) == set(SCRAPE_FIELDS) and not result.skipped_fields
+                and all(is_field_complete(result.values[field]) for field in DETAIL_FIELDS)):
+            record['contentHash'] = result.content_hash
+            record['validators'] = result.validators
+        elif record.get('contentHash') != result.content_hash:
+            record.pop('contentHash', None)
+            record.pop('validators', None)
+        save_data(data)
+    
+    return {
+        'success': True,
+        'barcodeId': record['barcodeId'],
+        **result.values,
+        'id': record['id'],
+        'url': url,
+        'updated': changed is not None,
+        'changedFields': changed or [],
+        'unchanged': bool(result.debug_info.get('unchanged')),
+        'skippedFields': result.skipped_fields,
+        'debug_info': result.debug_message
+    }
+
 @app.route('/')
 def index():
     """Main page"""
@@ -4195,311 +4077,52 @@ def index():
 def scrape_url():
     """Scrape the provided URL for brand information"""
     try:
-        url = request.json.get('url', '').strip()
-        
-        if not url:
-            return jsonify({'error': 'URL is required'}), 400
-        
-        # Add http if not present
-        if not url.startswith(('http://', 'https://')):
-            url = 'https://' + url
-        
-        # Validate URL
-        parsed = urlparse(url)
-        if not parsed.netloc:
-            return jsonify({'error': 'Invalid URL format'}), 400
-        
-        # Set up comprehensive headers to mimic a real browser
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate',
-            'DNT': '1',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-            'Sec-Fetch-Dest': 'document',
-            'Sec-Fetch-Mode': 'navigate',
-            'Sec-Fetch-Site': 'none',
-            'Sec-Fetch-User': '?1',
-            'Cache-Control': 'max-age=0'
-        }
-        
-        # Make request with retry logic
-        session = requests.Session()
-        session.headers.update(headers)
-        
-        max_retries = 3
-        for attempt in range(max_retries):
-            try:
-                # Add a small delay to be more polite
-                if attempt > 0:
-                    time.sleep(2)
-                
-                response = session.get(url, timeout=15, allow_redirects=True)
-                response.raise_for_status()
-                break
-                
-            except requests.exceptions.HTTPError as e:
-                if e.response.status_code == 403:
-                    if attempt < max_retries - 1:
-                        # Try with a different user agent
-                        alternate_agents = [
-                            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                            'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.1 Safari/605.1.15',
-                            'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-                        ]
-                        session.headers.update({'User-Agent': alternate_agents[attempt]})
-                        continue
-                    else:
-                        return jsonify({'error': f'Access denied by website (403). This site may be blocking automated requests. Try a different URL or the site may require authentication.'}), 400
-                else:
-                    raise
-            except requests.exceptions.RequestException:
-                if attempt == max_retries - 1:
-                    raise
-        
-        # Check if this is a direct image URL
-        image_extensions = ['.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp', '.svg', '.pdf']
-        # Handle URLs with query parameters by checking the path part
-        parsed_url = urlparse(url.lower())
-        url_path = parsed_url.path
-        
-        # Check both the full URL and the path without query parameters
-        is_direct_image = (
-            any(url_path.endswith(ext) for ext in image_extensions) or 
-            any(url.lower().endswith(ext) for ext in image_extensions) or
-            # Also check if the path contains image extensions before query params
-            any(ext in url_path for ext in image_extensions) or
-            # Super aggressive: check if URL contains 'photo' and image domain
-            ('photo' in url.lower() and any(domain in url.lower() for domain in ['images.', 'image.', 'img.', 'static.', 'cdn.']))
-        )
-        
-        if is_direct_image:
-            # This is a direct image URL
-            brand = extract_brand_from_url(url) or "Brand not found"
-            image_url = url
-            # For direct images, only extract pet type, food type, and life stage from URL
-            pet_type = extract_pet_type_from_url(url)
-            texture = extract_food_type_from_url(url)
-            life_stage = extract_life_stage_from_url(url)
-            ingredients = extract_ingredients_from_url(url)
-            guaranteed_analysis = None  # Cannot extract guaranteed analysis from direct images
-            nutritional_info = None  # Cannot extract nutritional info from direct images
-            
-            # For direct images, extract name from URL
-            name = extract_product_name_from_url(url)
-            
-            # TEXTURE OVERRIDE: Check product name for specific texture keywords
-            # These take priority over general wet/dry classification
-            if name:
-                name_lower = name.lower()
-                if 'air dried' in name_lower or 'air-dried' in name_lower:
-                    texture = "air dried"
-                elif 'freeze dried' in name_lower or 'freeze-dried' in name_lower:
-                    texture = "freeze dried"
-                elif 'dehydrated' in name_lower:
-                    texture = "dehydrated"
-                elif 'broth' in name_lower:
-                    texture = "broth"
-                elif 'gravy' in name_lower:
-                    texture = "gravy"
-                elif 'mousse' in name_lower:
-                    texture = "mousse"
-                elif 'pate' in name_lower or 'pâté' in name_lower:
-                    texture = "pate"
-                elif 'dry food' in name_lower or 'dry cat food' in name_lower or 'dry dog food' in name_lower or 'kibble' in name_lower:
-                    texture = "kibble"
-            
-            # RAW BRAND OVERRIDE: Check if brand is known to be exclusively raw food
-            # These brands only make raw/frozen food products
-            raw_food_brands = [
-                'viva raw',
-                'stella & chewy\'s',
-                'primal pet foods',
-                'northwest naturals',
-                'instinct raw',
-                'nature\'s variety instinct',
-                'bravo!',
-                'darwin\'s natural pet products',
-                'small batch',
-                'answers pet food',
-                'vital essentials',
-                'k9 natural',
-                'ziwi peak',
-                'honest kitchen',
-                'the honest kitchen',
-                'barf world',
-                'raw paws',
-                'tucker\'s raw frozen',
-                'big country raw',
-                'iron will raw'
-            ]
-            
-            if brand:
-                brand_lower = brand.lower()
-                for raw_brand in raw_food_brands:
-                    if raw_brand in brand_lower:
-                        texture = "raw"
-                        break
-            
-            # OVERRIDE: If "Senior" appears in the product name, set life stage to "senior"
-            # This takes priority over any other life stage detection (including "all life stages")
-            if name and 'senior' in name.lower():
-                life_stage = "senior"
-            
-            # Debug info for direct images
-            total_images = 1  # The direct image itself
-            images_with_src = 1
-            images_with_data_src = 0
+        try:
+            url, requested, budget = parse_extraction_options(request.json)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        # Strategies, timings, warnings and the deadline for this scrape only
+        stored = None if request.json.get('force') else find_record(url)
+        result = scrape(url, requested, ExtractionContext(url, budget), stored)
+        return jsonify(save_extraction(url, result))
+        
+    except RobotsDisallowed as e:
+        return jsonify({'error': str(e), 'disallowedByRobots': True}), e.status
+    except FetchError as e:
+        return jsonify({'error': str(e)}), e.status
+    except requests.exceptions.RequestException as e:
+        return jsonify({'error': f'Failed to fetch URL: {str(e)}'}), 400
+    except Exception as e:
+        import traceback
+        print(f"FLASK ERROR: {str(e)}")
+        print("Full traceback:")
+        traceback.print_exc()
+        return jsonify({'error': f'An error occurred: {str(e)}'}), 500
+
+@app.route('/extract', methods=['POST'])
+def extract_html():
+    """Run extraction on HTML the caller already fetched: JSON {"url", "html", "fields", "budget"},
+    or a raw HTML body with the same options in the query string; either may be gzip-compressed"""
+    try:
+        body = request.get_data()
+        if request.headers.get('Content-Encoding', '').lower() == 'gzip':
+            body = decompress_html(body)
+        if request.mimetype == 'application/json':
+            options = json.loads(body or b'{}')
+            html = options.get('html')
         else:
-            # Parse HTML for regular web pages
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Extract brand, image, pet type, food type, life stage, ingredients, guaranteed analysis, nutritional info, and product name
-            brand = extract_brand(soup, url)
-            image_url = extract_image_url(soup, url)
-            pet_type = extract_pet_type(soup, url)
-            texture = extract_food_type(soup, url)
-            life_stage = extract_life_stage(soup, url)
-            
-            # For Applaws, extract all dropdown content in one go to be more efficient
-            if 'applaws.com' in url.lower():
-                applaws_data = extract_applaws_dropdown_data(url)
-                ingredients = applaws_data.get('ingredients') or extract_ingredients(soup, url)
-                guaranteed_analysis = applaws_data.get('guaranteed_analysis') or extract_guaranteed_analysis(soup, url)
-                nutritional_info = applaws_data.get('nutritional_info') or extract_nutritional_info(soup, url)
-            else:
-                ingredients = extract_ingredients(soup, url)
-                guaranteed_analysis = extract_guaranteed_analysis(soup, url)
-                nutritional_info = extract_nutritional_info(soup, url)
-            
-            # Extract product name and size, then combine them
-            product_name = extract_product_name(soup, url)
-            product_size = extract_product_size(soup, url)
-            
-            # Create the final name with size in parentheses if size is found
-            if product_name and product_size:
-                name = f"{product_name} ({product_size})"
-            else:
-                name = product_name  # Just the name without size if size not found
-            
-            # TEXTURE OVERRIDE: Check product name for specific texture keywords
-            # These take priority over general wet/dry classification
-            if name:
-                name_lower = name.lower()
-                if 'air dried' in name_lower or 'air-dried' in name_lower:
-                    texture = "air dried"
-                elif 'freeze dried' in name_lower or 'freeze-dried' in name_lower:
-                    texture = "freeze dried"
-                elif 'dehydrated' in name_lower:
-                    texture = "dehydrated"
-                elif 'broth' in name_lower:
-                    texture = "broth"
-                elif 'gravy' in name_lower:
-                    texture = "gravy"
-                elif 'mousse' in name_lower:
-                    texture = "mousse"
-                elif 'pate' in name_lower or 'pâté' in name_lower:
-                    texture = "pate"
-                elif 'dry food' in name_lower or 'dry cat food' in name_lower or 'dry dog food' in name_lower or 'kibble' in name_lower:
-                    texture = "kibble"
-            
-            # RAW BRAND OVERRIDE: Check if brand is known to be exclusively raw food
-            # These brands only make raw/frozen food products
-            raw_food_brands = [
-                'viva raw',
-                'stella & chewy\'s',
-                'primal pet foods',
-                'northwest naturals',
-                'instinct raw',
-                'nature\'s variety instinct',
-                'bravo!',
-                'darwin\'s natural pet products',
-                'small batch',
-                'answers pet food',
-                'vital essentials',
-                'k9 natural',
-                'ziwi peak',
-                'honest kitchen',
-                'the honest kitchen',
-                'barf world',
-                'raw paws',
-                'tucker\'s raw frozen',
-                'big country raw',
-                'iron will raw'
-            ]
-            
-            if brand:
-                brand_lower = brand.lower()
-                for raw_brand in raw_food_brands:
-                    if raw_brand in brand_lower:
-                        texture = "raw"
-                        break
-            
-            # OVERRIDE: If "Senior" appears in the product name, set life stage to "senior"
-            # This takes priority over any other life stage detection (including "all life stages")
-            if name and 'senior' in name.lower():
-                life_stage = "senior"
-            
-            # Debug: Count total images found on page
-            total_images = len(soup.find_all('img'))
-            images_with_src = len(soup.find_all('img', src=True))
-            images_with_data_src = len(soup.find_all('img', attrs={'data-src': True}))
+            options = request.args
+            html = body
+        url, requested, budget = parse_extraction_options(options)
+        if not html:
+            return jsonify({'error': 'HTML is required'}), 400
         
-        # Store debug message with image strategy info
-        debug_message = f"Found {total_images}/{images_with_src + images_with_data_src} images on page (including data-src)"
-        if image_url != "Image not found":
-            debug_message += f" - Using strategy: {extract_image_url._last_strategy if hasattr(extract_image_url, '_last_strategy') else 'direct_url'}"
+        result = extract_from_html(html, url, requested, ExtractionContext(url, budget))
+        return jsonify(save_extraction(url, result))
         
-        # Generate random barcode ID placeholder
-        barcode_id = generate_random_id()
-        
-        # Save to data file
-        data = load_data()
-        new_entry = {
-            'id': len(data) + 1,
-            'barcodeId': barcode_id,
-            'url': url,
-            'brand': brand,
-            'name': name,
-            'imageUrl': image_url,
-            'petType': pet_type,
-            'texture': texture,
-            'lifeStage': life_stage,
-            'ingredients': ingredients,
-            'guaranteedAnalysis': guaranteed_analysis,
-            'nutritionalInfo': nutritional_info,
-            'timestamp': datetime.now().isoformat(),
-            'domain': parsed.netloc,
-            'debug_info': {
-                'total_images': total_images,
-                'images_with_src': images_with_src + images_with_data_src,
-                'extraction_method': 'direct_image' if is_direct_image else 'html_parsing'
-            }
-        }
-        data.append(new_entry)
-        save_data(data)
-        
-        return jsonify({
-            'success': True,
-            'brand': brand,
-            'barcodeId': barcode_id,
-            'name': name,
-            'imageUrl': image_url,
-            'petType': pet_type,
-            'texture': texture,
-            'lifeStage': life_stage,
-            'ingredients': ingredients,
-            'guaranteedAnalysis': guaranteed_analysis,
-            'nutritionalInfo': nutritional_info,
-            'id': new_entry['id'],
-            'url': url,
-            'debug_info': debug_message
-        })
-        
-    except requests.exceptions.RequestException as e:
-        return jsonify({'error': f'Failed to fetch URL: {str(e)}'}), 400
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         import traceback
         print(f"FLASK ERROR: {str(e)}")
@@ -4509,19 +4132,267 @@ def scrape_url():
 
 @app.route('/data')
 def get_data():
-    """Get all scraped data"""
-    data = load_data()
-    return jsonify(data)
+    """Get all scraped data (only products containing ?ingredient=<name> when given); history is left out"""
+    records = load_stored_data()
+    ingredient = request.args.get('ingredient')
+    if ingredient:
+        ingredient_id = find_ingredient_id(ingredient)
+        if ingredient_id is None:
+            return jsonify([])
+        records = [item for item in records if ingredient_id in item.get('ingredientIds', ())]
+    return jsonify([unpack_record({key: value for key, value in item.items() if key != 'history'})
+                    for item in records])
+
+@app.route('/changes')
+def get_changes():
+    """Products whose ingredients or guaranteed analysis (or ?fields=) changed since ?since=<ISO date>, latest first"""
+    if not request.args.get('since'):
+        return jsonify({'error': 'since is required, e.g. 2024-06-01'}), 400
+    since = local_datetime(request.args['since'])
+    if since is None:
+        return jsonify({'error': 'since must be an ISO date or time, e.g. 2024-06-01'}), 400
+    try:
+        fields = select_fields(request.args.get('fields') or CHANGE_FIELDS)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    changes = []
+    for record in load_data():
+        changed = {field: at for field, at in (record.get('changedAt') or {}).items() if field in fields and changed_since(at, since)}
+        if not changed:
+            continue
+        previous = [dict(entry, values={field: value for field, value in entry['values'].items() if field in changed})
+                    for entry in record_history(record) if changed_since(entry['replaced'], since)]
+        changes.append({
+            'id': record.get('id'),
+            'url': record.get('url'),
+            'brand': record.get('brand'),
+            'name': record.get('name'),
+            'changed': changed,
+            'current': {field: record.get(field) for field in changed},
+            'previous': [entry for entry in previous if entry['values']],
+        })
+    changes.sort(key=lambda item: max(local_datetime(at) for at in item['changed'].values()), reverse=True)
+    return jsonify(changes)
+
+@app.route('/data/<int:item_id>/history')
+def get_data_history(item_id):
+    """Earlier values of a record's fields, one entry per rescrape that changed them, newest first"""
+    record = next((item for item in load_stored_data() if item.get('id') == item_id), None)
+    if record is None:
+        return jsonify({'error': 'Record not found'}), 404
+    return jsonify({'id': item_id, 'url': record.get('url'), 'firstSeen': record.get('firstSeen', record.get('timestamp')),
+                    'history': record_history(record)})
+
+@app.route('/ingredients')
+def get_ingredients():
+    """Canonical ingredients with the number of saved products containing each, most common first"""
+    counts = Counter()
+    for item in load_stored_data():
+        counts.update(set(item.get('ingredientIds', ())))
+    return jsonify([{'id': ingredient_id, 'name': ingredient_name(ingredient_id), 'products': count}
+                    for ingredient_id, count in counts.most_common()])
 
 @app.route('/data/<int:item_id>', methods=['DELETE'])
 def delete_data_item(item_id):
     """Delete a specific data item"""
-    data = load_data()
-    data = [item for item in data if item.get('id') != item_id]
-    save_data(data)
+    with data_file_lock():
+        data = load_data()
+        data = [item for item in data if item.get('id') != item_id]
+        save_data(data)
     return jsonify({'success': True})
 
+@app.route('/admin/rendering')
+def get_rendering_stats():
+    """Per-domain static/render history and the route future URLs will take"""
+    return jsonify(get_render_stats())
+
+@app.route('/admin/rendering/<domain>', methods=['DELETE'])
+def reset_rendering_stats(domain):
+    """Forget a domain's rendering history so it is probed again"""
+    if not reset_domain(domain):
+        return jsonify({'error': f'No rendering history for {domain}'}), 404
+    return jsonify({'success': True})
+
+@app.route('/admin/robots/<host>', methods=['DELETE'])
+def reset_robots_cache(host):
+    """Forget a host's cached robots.txt so it is fetched again on the next scrape"""
+    if not any(robots_cache.forget(f'{scheme}://{host}') for scheme in ('https', 'http')):
+        return jsonify({'error': f'No cached robots.txt for {host}'}), 404
+    return jsonify({'success': True})
+
+@app.route('/admin/strategies')
+def get_strategy_history():
+    """Per-domain cascade strategy wins, runs and mean cost, and the strategy each field tries first"""
+    return jsonify(get_strategy_stats())
+
+@app.route('/admin/strategies/<domain>', methods=['DELETE'])
+def reset_strategy_history(domain):
+    """Forget a domain's strategy history so its cascades use the default order again"""
+    if not reset_strategy_domain(domain):
+        return jsonify({'error': f'No strategy history for {domain}'}), 404
+    return jsonify({'success': True})
+
+def process_job_item(url, options):
+    """Scrape one queued job URL and save it like /scrape; failures come back as {'error': ...}"""
+    try:
+        url, requested, budget = parse_extraction_options(dict(options, url=url))
+        stored = None if options.get('force') else find_record(url)
+        if options.get('refresh'):
+            # Scheduled refreshes take turns on each site
+            refresh_scheduler.domain_limiter.wait(url)
+        return save_extraction(url, scrape(url, requested, ExtractionContext(url, budget), stored))
+    except RobotsDisallowed as e:
+        return {'error': str(e), 'disallowedByRobots': True}
+    except (ValueError, FetchError) as e:
+        return {'error': str(e)}
+    except requests.exceptions.RequestException as e:
+        return {'error': f'Failed to fetch URL: {str(e)}'}
+
+@app.route('/metrics')
+def get_metrics():
+    """Counters for monitoring: scrape coalescing and the job queue"""
+    return jsonify({
+        'scrapes': scrape_flights.stats(),
+        'robots': robots_cache.get_stats(),
+        'jobs': {job['jobId']: job['counts'] for job in list_jobs() if job['status'] in ('queued', 'running', 'cancelling')}
+    })
+
+@app.route('/refresh')
+def get_refresh_status():
+    """Refresh scheduler settings and last run, plus the records it would queue next (?limit=, default 20)"""
+    limit = min(request.args.get('limit', 20, type=int), 1000)
+    due = refresh_scheduler.stale_records(load_data(), limit=limit)
+    return jsonify(dict(refresh_scheduler.status(), due=[
+        {'id': record.get('id'), 'url': record.get('url'), 'timestamp': record.get('timestamp'),
+         'priority': round(priority, 3)}
+        for priority, record in due
+    ]))
+
+@app.route('/refresh', methods=['POST'])
+def refresh_stale():
+    """Queue a refresh of stale records now: optional JSON {"maxAge": seconds, "limit": n}"""
+    payload = request.get_json(silent=True) or {}
+    try:
+        max_age = float(payload.get('maxAge', refresh_scheduler.REFRESH_MAX_AGE))
+        limit = int(payload.get('limit', refresh_scheduler.REFRESH_BATCH))
+    except (TypeError, ValueError):
+        return jsonify({'error': 'maxAge and limit must be numbers'}), 400
+    if max_age < 0 or limit < 1:
+        return jsonify({'error': 'maxAge must be at least 0 and limit at least 1'}), 400
+    
+    job_id, count = refresh_scheduler.schedule_refresh(load_data(), max_age, limit)
+    if job_id is None:
+        message = 'The previous refresh is still running' if refresh_scheduler.refresh_active() else 'No stale records'
+        return jsonify({'success': True, 'jobId': None, 'total': 0, 'message': message})
+    start_workers(process_job_item)
+    return jsonify({'success': True, 'jobId': job_id, 'total': count}), 202
+
+@app.route('/discover', methods=['POST'])
+def discover_products():
+    """
+    Find a site's product URLs and queue the new ones for scraping: JSON {"url": site root, sitemap or
+    category page, "pattern", "limit", "fields", "budget", "dryRun"}
+    """
+    payload = request.json or {}
+    try:
+        url, requested, budget = parse_extraction_options(payload)
+        limit = int(payload.get('limit', DISCOVERY_MAX_URLS))
+        if limit < 1:
+            raise ValueError('limit must be at least 1')
+        found = discover(url, REQUEST_HEADERS, {record_key(item) for item in load_stored_data()},
+                         payload.get('pattern'), limit)
+    except re.error as e:
+        return jsonify({'error': f'Invalid pattern: {e}'}), 400
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except requests.exceptions.RequestException as e:
+        return jsonify({'error': f'Failed to fetch {url}: {e}'}), 400
+    
+    response = {'success': True, 'jobId': None, 'total': len(found['products']), **found}
+    if payload.get('dryRun') or not found['products']:
+        return jsonify(response)
+    options = {key: payload[key] for key in ('fields', 'budget') if key in payload}
+    response['jobId'] = create_job(found['products'], options)
+    start_workers(process_job_item)
+    return jsonify(response), 202
+
+@app.route('/jobs', methods=['POST'])
+def submit_job():
+    """Queue a batch of URLs to be scraped in the background: JSON {"urls": [...], "fields", "budget", "force"}"""
+    payload = request.json or {}
+    urls = payload.get('urls')
+    if not isinstance(urls, list) or not urls:
+        return jsonify({'error': 'urls must be a non-empty list'}), 400
+    options = {key: payload[key] for key in ('fields', 'budget', 'force') if key in payload}
+    
+    # Every URL is validated up front so a bad line is reported now rather than as a failed item later
+    normalized = []
+    for url in urls:
+        try:
+            normalized.append(parse_extraction_options(dict(options, url=url if isinstance(url, str) else ''))[0])
+        except ValueError as e:
+            return jsonify({'error': f'{url}: {e}'}), 400
+    
+    job_id = create_job(normalized, options)
+    start_workers(process_job_item)
+    return jsonify({'success': True, 'jobId': job_id, 'total': len(normalized)}), 202
+
+@app.route('/jobs')
+def get_jobs():
+    """Most recent jobs with their status and item counts"""
+    return jsonify(list_jobs())
+
+@app.route('/jobs/<job_id>')
+def get_job_status(job_id):
+    """Status and item counts for one job"""
+    job = get_job(job_id)
+    if job is None:
+        return jsonify({'error': f'Unknown job {job_id}'}), 404
+    return jsonify(job)
+
+@app.route('/jobs/<job_id>/results')
+def get_job_results(job_id):
+    """Items finished since the ?after= cursor (default: from the start), with the cursor for the next call"""
+    after = request.args.get('after', 0, type=int)
+    limit = min(request.args.get('limit', 100, type=int), 1000)
+    results = get_results(job_id, after, limit)
+    if results is None:
+        return jsonify({'error': f'Unknown job {job_id}'}), 404
+    return jsonify({
+        'job': get_job(job_id),
+        'results': results,
+        'next': results[-1]['seq'] if results else after
+    })
+
+@app.route('/jobs/<job_id>/retry', methods=['POST'])
+def retry_job_route(job_id):
+    """Queue a job's dead-lettered items again"""
+    count = retry_dead(job_id)
+    if count is None:
+        return jsonify({'error': f'Unknown job {job_id}'}), 404
+    start_workers(process_job_item)
+    return jsonify({'success': True, 'requeued': count, 'job': get_job(job_id)})
+
+@app.route('/jobs/<job_id>', methods=['DELETE'])
+def cancel_job_route(job_id):
+    """Cancel a job's queued items; items already being scraped finish"""
+    if not cancel_job(job_id):
+        return jsonify({'error': f'Unknown job {job_id}'}), 404
+    return jsonify({'success': True, 'job': get_job(job_id)})
+
 # Simple copy-paste functionality - no complex API needed!
 
+def start_job_workers():
+    """
+    Resume queued jobs in this process (once per process). Importing the app starts nothing: the
+    server that serves it calls this, python app.py below and gunicorn through gunicorn.conf.py.
+    """
+    start_workers(process_job_item)
+
 if __name__ == '__main__':
+    # Only in the serving process, not the debug reloader's watcher
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        start_job_workers()
+        refresh_scheduler.start_scheduler(load_data, start_job_workers)
     app.run(debug=True, host='0.0.0.0', port=8000) 
\ No newline at end of file
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+
+import json
+import re
+import time
+
+from ingredient_normalizer import is_valid_ingredient, normalize_ingredients
+from ingredient_dictionary import unpack_record
+from patterns import (FIBRE_RE, GENERIC_ENDING_RE, INGREDIENT_CODE_RE, INGREDIENT_COMMA_FIXES,
+                      UNWANTED_TRAILING_CONTENT_RE, WHITESPACE_RE, TRAILING_COMMA_RE)
+
+ROUNDS = 200
+
+# Tail that scraped ingredient text usually drags along from the rest of the page
+PAGE_TAIL = " Guaranteed Analysis Crude Protein (min) 10% Reviews (12) Write a review | Contact Us | Sitemap"
+
+# Cases the stored data may not cover: website codes, run-together names, generic endings, page tails.
+# Both versions must give the same list for every one of them (and for every stored list).
+SAMPLE_STRINGS = [
+    "Chicken, Chicken Broth, Liver, Vitamins (Vitamin E Supplement, Thiamine Mononitrate), "
+    "Minerals (Zinc Proteinate, Iron Proteinate), Fibre.",
+    "Chicken, Rice, Peas, Beet Pulp, Blue 2. N600123, Red 40 D600724, and more",
+    "ChickenRiceWater, Salt",
+    "Chicken Salmon Broth Tuna",
+    "Deboned Chicken, Turkey Meal, Oatmeal, Barley, Natural Flavor, Download Ingredient List Here",
+    "Tuna, Water, Guar Gum, Vitamin B12 Supplement, Taurine, etc.",
+    "Lamb, Brown Rice, Dried Plain Beet Pulp, Powdered Cellulose, Choline Chloride. Contact Us | Sitemap",
+    "Chicken, k600323, abc123, Rice Bran, Flaxseed, Vitamin E",
+    "Chicken (fresh), Rice (brown), Oats, Peas, Carrots",
+    "Salmon",
+]
+
+# Previous cleanup chain: format_ingredient_list followed by clean_extra_content
+_VITAMINS_GROUP_RE = re.compile(r'\bVitamins\s*\(', re.IGNORECASE)
+_MINERALS_GROUP_RE = re.compile(r'\bMinerals\s*\(', re.IGNORECASE)
+
+def _legacy_unwrap(text, group_re):
+    match = group_re.search(text)
+    if match:
+        start_pos = match.end() - 1
+        paren_count = 0
+        end_pos = start_pos
+        for i, char in enumerate(text[start_pos:], start_pos):
+            if char == '(':
+                paren_count += 1
+            elif char == ')':
+                paren_count -= 1
+                if paren_count == 0:
+                    end_pos = i
+                    break
+        if paren_count == 0:
+            return text[:match.start()] + text[start_pos + 1:end_pos] + text[end_pos + 1:]
+    return text
+
+def _legacy_clean_items(text):
+    ingredients = []
+    for ing in text.split(','):
+        cleaned = ing.strip()
+        while cleaned and cleaned[-1] in '.\\"\',;':
+            cleaned = cleaned[:-1].strip()
+        if '. ' in cleaned and len(cleaned.split('. ')) == 2:
+            first_part, second_part = cleaned.split('. ', 1)
+            if is_valid_ingredient(first_part) and not is_valid_ingredient(second_part):
+                ingredients.append(first_part)
+            elif is_valid_ingredient(cleaned):
+                ingredients.append(cleaned)
+        elif ' ' in cleaned and len(cleaned.split()) >= 2:
+            parts = cleaned.split()
+            if INGREDIENT_CODE_RE.match(parts[-1]) and not is_valid_ingredient(parts[-1]):
+                clean_part = ' '.join(parts[:-1])
+                if is_valid_ingredient(clean_part):
+                    ingredients.append(clean_part)
+            elif is_valid_ingredient(cleaned):
+                ingredients.append(cleaned)
+        elif cleaned and is_valid_ingredient(cleaned):
+            ingredients.append(cleaned)
+    return ', '.join(ingredients)
+
+def _strip_junk(text):
+    while text and text[-1] in '.\\"\',;':
+        text = text[:-1].strip()
+    return text
+
+def legacy_format_ingredient_list(ingredient_text):
+    ingredient_text = FIBRE_RE.sub('fiber', ingredient_text)
+    ingredient_text = _legacy_unwrap(ingredient_text, _VITAMINS_GROUP_RE)
+    ingredient_text = _legacy_unwrap(ingredient_text, _MINERALS_GROUP_RE)
+    ingredient_text = _strip_junk(ingredient_text.strip())
+    if ', ' in ingredient_text and ingredient_text.count(',') > 3:
+        return GENERIC_ENDING_RE.sub('', _legacy_clean_items(ingredient_text)).strip()
+    for pattern, replacement in INGREDIENT_COMMA_FIXES:
+        ingredient_text = pattern.sub(replacement, ingredient_text)
+    if ',' in ingredient_text:
+        ingredient_text = _legacy_clean_items(ingredient_text)
+    return GENERIC_ENDING_RE.sub('', _strip_junk(ingredient_text)).strip()
+
+def legacy_clean_extra_content(ingredient_text):
+    unwanted = UNWANTED_TRAILING_CONTENT_RE.search(ingredient_text)
+    if unwanted:
+        ingredient_text = ingredient_text[:unwanted.start()]
+    ingredient_text = TRAILING_COMMA_RE.sub('', WHITESPACE_RE.sub(' ', ingredient_text)).strip()
+    if ',' in ingredient_text:
+        ingredient_text = _legacy_clean_items(ingredient_text)
+    return _strip_junk(ingredient_text)
+
+def legacy_chain(text):
+    cleaned = legacy_clean_extra_content(legacy_format_ingredient_list(text))
+    return [ingredient.strip() for ingredient in cleaned.split(',') if ingredient.strip()]
+
+def load_ingredient_strings():
+    """The sample strings plus saved ingredient lists from scraped_data.json, as stored and with a scraped page tail"""
+    try:
+        with open('scraped_data.json', 'r') as f:
+            products = [unpack_record(product) for product in json.load(f)]
+    except (OSError, ValueError):
+        products = []
+
+    strings = list(SAMPLE_STRINGS)
+    for product in products:
+        ingredients = product.get('ingredients')
+        if isinstance(ingredients, list):
+            ingredients = ', '.join(ingredients)
+        if isinstance(ingredients, str) and ingredients:
+            strings.append(ingredients)
+            strings.append("Vitamins (" + ingredients + "), Minerals (Zinc Proteinate, Iron Proteinate), Fibre." + PAGE_TAIL)
+    return strings
+
+def time_per_string(func, strings):
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for text in strings:
+            func(text)
+    return (time.perf_counter() - start) / (ROUNDS * len(strings)) * 1_000_000
+
+def main():
+    strings = load_ingredient_strings()
+
+    print("=== INGREDIENT CLEANUP PER STRING ===")
+    print(f"Strings: {len(strings)} | Average length: {sum(map(len, strings)) // len(strings)} chars | Rounds: {ROUNDS}")
+    print()
+    print(f"Legacy chain (format_ingredient_list + clean_extra_content): {time_per_string(legacy_chain, strings):8.1f} us")
+    print(f"Single-pass normalize_ingredients:                          {time_per_string(normalize_ingredients, strings):8.1f} us")
+    print()
+
+    differences = 0
+    for text in strings:
+        legacy, current = legacy_chain(text), normalize_ingredients(text)
+        if legacy != current:
+            differences += 1
+            print(f"Differs for: {text[:80]}...")
+            print(f"  legacy:     {legacy}")
+            print(f"  normalizer: {current}")
+    if differences:
+        raise SystemExit(f"{differences} of {len(strings)} strings give different ingredient lists")
+    print(f"Identical ingredient lists for all {len(strings)} strings")
+
+if __name__ == "__main__":
+    main()
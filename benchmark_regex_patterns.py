@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+
+import json
+import re
+import time
+
+from ingredient_dictionary import unpack_record
+from patterns import (REGISTRY, iter_patterns, UNWANTED_TRAILING_PATTERNS, UNWANTED_TRAILING_CONTENT_RE,
+                      GENERIC_ENDING_PATTERNS, GENERIC_ENDING_RE)
+
+ROUNDS = 20
+
+def build_page_text():
+    """Synthetic product page: saved ingredient lists surrounded by navigation and marketing copy"""
+    try:
+        with open('scraped_data.json', 'r') as f:
+            products = [unpack_record(product) for product in json.load(f)]
+    except (OSError, ValueError):
+        products = []
+
+    sections = []
+    for product in products:
+        ingredients = product.get('ingredients')
+        if isinstance(ingredients, list):
+            ingredients = ', '.join(ingredients)
+        sections.append(f"{product.get('brand', '')} {product.get('name', '')}")
+        sections.append(f"Ingredients: {ingredients or 'Chicken, Brown Rice, Fibre, Vitamins (Vitamin E Supplement), Salt'}")
+        sections.append(f"Guaranteed Analysis {product.get('guaranteedAnalysis') or 'Crude Protein (min) 30%, Crude Fat (min) 15%'}")
+    sections.append("Calories 3,500 kcal/kg, 400 kcal/cup. 5 lb bag. SKU: 12345")
+    filler = ("Shop All Cat Food | Free shipping on orders over $49 | Add to cart | Subscribe & Save | "
+              "Our finest ingredients from around the world, made in the USA. Feeding Instructions: see chart. ")
+    return (filler * 40) + '\n'.join(sections) + '\n' + (filler * 40)
+
+def uncompiled_pass(entries, text):
+    """Per-page pass the way the extractors used to run: module-level re functions with pattern strings"""
+    for source, flags in entries:
+        re.search(source, text, flags)
+
+def compiled_pass(compiled, text):
+    for pattern in compiled:
+        pattern.search(text)
+
+def purged_pass(entries, text):
+    """Same pass after the re module's cache was thrashed by other patterns"""
+    re.purge()
+    uncompiled_pass(entries, text)
+
+def sequential_trailing_cut(text):
+    for source in UNWANTED_TRAILING_PATTERNS:
+        text = re.sub(source, '', text, flags=re.IGNORECASE | re.DOTALL)
+    return text
+
+def combined_trailing_cut(text):
+    unwanted = UNWANTED_TRAILING_CONTENT_RE.search(text)
+    return text[:unwanted.start()] if unwanted else text
+
+def sequential_generic_endings(items):
+    result = []
+    for item in items:
+        for source in GENERIC_ENDING_PATTERNS:
+            item = re.sub(source, '', item, flags=re.IGNORECASE).strip()
+        result.append(item)
+    return result
+
+def combined_generic_endings(items):
+    return [GENERIC_ENDING_RE.sub('', item).strip() for item in items]
+
+def time_per_round(func, *args):
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        func(*args)
+    return (time.perf_counter() - start) / ROUNDS * 1000
+
+def main():
+    text = build_page_text()
+    compiled = list(iter_patterns(REGISTRY))
+    entries = [(pattern.pattern, pattern.flags & ~re.UNICODE) for pattern in compiled]
+
+    print("=== REGEX COST PER PAGE ===")
+    print(f"Patterns: {len(compiled)} | Page text: {len(text):,} chars | Rounds: {ROUNDS}")
+    print()
+
+    uncompiled_pass(entries, text)  # Warm the re module cache
+    print(f"re.* with pattern strings (warm cache):  {time_per_round(uncompiled_pass, entries, text):8.2f} ms")
+    print(f"re.* with pattern strings (cache purged): {time_per_round(purged_pass, entries, text):8.2f} ms")
+    print(f"Precompiled registry:                    {time_per_round(compiled_pass, compiled, text):8.2f} ms")
+    print()
+
+    ingredient_text = "Chicken, Brown Rice, Salt, Taurine. " * 20 + text
+    items = [item.strip() for item in ingredient_text.split(',') if item.strip()]
+    print("=== SEQUENTIAL VS COMBINED ALTERNATIONS ===")
+    print(f"Unwanted trailing content ({len(UNWANTED_TRAILING_PATTERNS)} patterns)")
+    print(f"  sequential re.sub: {time_per_round(sequential_trailing_cut, ingredient_text):8.2f} ms")
+    print(f"  combined search:   {time_per_round(combined_trailing_cut, ingredient_text):8.2f} ms")
+    print(f"Generic endings ({len(GENERIC_ENDING_PATTERNS)} patterns, {len(items)} items)")
+    print(f"  sequential re.sub: {time_per_round(sequential_generic_endings, items):8.2f} ms")
+    print(f"  combined sub:      {time_per_round(combined_generic_endings, items):8.2f} ms")
+
+if __name__ == "__main__":
+    main()
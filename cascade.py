@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+
+import time
+from collections import namedtuple
+
+from strategy_stats import order_strategies, record_cascade
+
+# A cascade stops as soon as a result scores at least this much (0-1)
+CONFIDENCE_THRESHOLDS = {
+    'brand': 0.8,
+    'image': 0.7,
+    'ingredients': 0.8,
+    'guaranteed_analysis': 0.8,
+    'nutritional_info': 0.8,
+    'size': 0.7,
+}
+DEFAULT_THRESHOLD = 0.8
+
+# value/strategy/score of the chosen result; attempts is one {'strategy', 'score', 'ms'} per strategy that ran
+CascadeResult = namedtuple('CascadeResult', ['value', 'strategy', 'score', 'attempts'])
+
+def run_cascade(field, strategies, score=None, url=None, context=None):
+    """
+    Run (name, confidence, function) strategies in order and keep the best-scoring result.
+
+    `confidence` is how far the source is trusted (a JSON-LD brand more than a CSS class match);
+    `score(value)` scales it by how plausible the value itself looks (0-1, default 1). The cascade
+    stops as soon as a result clears the field's threshold, or once no remaining strategy has a
+    confidence above the best score so far. A strategy that raises counts as finding nothing.
+    
+    With a `url`, the strategy that has won most reliably on that domain runs first and the
+    outcome is added to the domain's strategy stats. With a `context` (ExtractionContext), the
+    result and any strategy errors are recorded on it for the current scrape; once the context's
+    deadline has passed, the remaining strategies are skipped and the best result so far is kept.
+    """
+    threshold = CONFIDENCE_THRESHOLDS.get(field, DEFAULT_THRESHOLD)
+    if url:
+        strategies = order_strategies(url, field, strategies)
+    best_value, best_strategy, best_score = None, None, 0.0
+    attempts = []
+    skipped = []
+    for i, (name, confidence, strategy) in enumerate(strategies):
+        if best_strategy is not None and best_score >= max(c for _, c, _ in strategies[i:]):
+            break
+        if context is not None and context.expired():
+            skipped = [n for n, _, _ in strategies[i:]]
+            break
+        start = time.perf_counter()
+        try:
+            value = strategy()
+        except Exception as e:
+            value = None
+            if context is not None:
+                context.warn(f"{field} strategy {name} failed: {e}")
+        value_score = confidence * (score(value) if score else 1.0) if value else 0.0
+        attempts.append({'strategy': name, 'score': round(value_score, 3),
+                         'ms': round((time.perf_counter() - start) * 1000, 1)})
+        if value and value_score > best_score:
+            best_value, best_strategy, best_score = value, name, value_score
+            if best_score >= threshold:
+                break
+    result = CascadeResult(best_value, best_strategy, round(best_score, 3), attempts)
+    if url:
+        record_cascade(url, field, result, threshold)
+    if context is not None:
+        context.record_cascade(field, result)
+        if skipped:
+            context.skip(field, skipped)
+    return result
+
+def cascade_summary(result):
+    """Compact form of a CascadeResult for debug_info"""
+    return {
+        'strategy': result.strategy,
+        'score': result.score,
+        'ms': round(sum(attempt['ms'] for attempt in result.attempts), 1),
+        'attempts': result.attempts,
+    }
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+
+import gzip
+import os
+import re
+import xml.etree.ElementTree as ET
+from functools import lru_cache
+from urllib.parse import urljoin, urlparse
+
+import requests
+from bs4 import BeautifulSoup
+
+import robots_cache
+from domain_registry import DOMAIN_REGISTRY, domain_config
+from patterns import PRODUCT_URL_RE
+from url_utils import canonicalize_url, registered_domain
+
+# Most product URLs one discovery returns
+DISCOVERY_MAX_URLS = int(os.environ.get('DISCOVERY_MAX_URLS', 5000))
+
+# Most sitemap files read per discovery (an index counts, and so does each sitemap it lists)
+DISCOVERY_MAX_SITEMAPS = int(os.environ.get('DISCOVERY_MAX_SITEMAPS', 50))
+
+# Most listing pages read per discovery when following "next page" links
+DISCOVERY_MAX_PAGES = int(os.environ.get('DISCOVERY_MAX_PAGES', 20))
+
+# Seconds to wait for each sitemap or listing page
+DISCOVERY_TIMEOUT = 20
+
+def _local_name(tag):
+    """'{http://www.sitemaps.org/schemas/sitemap/0.9}loc' -> 'loc'"""
+    return tag.rsplit('}', 1)[-1]
+
+@lru_cache(maxsize=None)
+def _site_patterns(domain):
+    return tuple(re.compile(pattern, re.IGNORECASE) for pattern in DOMAIN_REGISTRY[domain]['product_urls'])
+
+def is_product_url(url, pattern=None):
+    """True if a URL looks like a product page: `pattern`, else the site's 'product_urls', else PRODUCT_URL_RE"""
+    path = urlparse(url).path
+    if pattern is not None:
+        return bool(pattern.search(path))
+    if 'product_urls' in domain_config(url):
+        return any(site_pattern.search(path) for site_pattern in _site_patterns(registered_domain(url)))
+    return bool(PRODUCT_URL_RE.search(path))
+
+def is_sitemap_url(url):
+    path = urlparse(url).path.lower()
+    return path.endswith(('.xml', '.xml.gz')) or 'sitemap' in path
+
+def iter_sitemap(url, session, budget):
+    """
+    Yield the page URLs listed in a sitemap, following sitemap indexes into their sitemaps.
+
+    The XML is parsed as it downloads and each entry is discarded once read, so a 50,000-URL
+    sitemap never sits in memory; gzip sitemaps (.xml.gz) are inflated on the fly. `budget` is
+    a one-item list holding the number of sitemap files that may still be read. Each sitemap is
+    checked against robots.txt and waits out the site's Crawl-delay; one whose turn is more than
+    ROBOTS_MAX_CRAWL_DELAY seconds away raises ValueError instead of blocking.
+    """
+    if budget[0] <= 0:
+        return
+    budget[0] -= 1
+    if not robots_cache.is_allowed(url, session.headers):
+        raise ValueError(f'Disallowed by robots.txt: {url}')
+    if robots_cache.wait_turn(url, session.headers) is None:
+        raise ValueError(f'Crawl-delay wait longer than ROBOTS_MAX_CRAWL_DELAY: {url}')
+    with session.get(url, timeout=DISCOVERY_TIMEOUT, stream=True) as response:
+        response.raise_for_status()
+        response.raw.decode_content = True
+        stream = response.raw
+        content_type = response.headers.get('Content-Type', '')
+        if urlparse(url).path.lower().endswith('.gz') or 'gzip' in content_type:
+            stream = gzip.GzipFile(fileobj=stream)
+        children = []
+        root = None
+        try:
+            for event, element in ET.iterparse(stream, events=('start', 'end')):
+                if root is None:
+                    root = element
+                    continue
+                if event != 'end' or _local_name(element.tag) != 'loc' or not element.text:
+                    continue
+                location = element.text.strip()
+                if _local_name(root.tag) == 'sitemapindex':
+                    children.append(location)
+                else:
+                    yield location
+                # Entries already read are dropped so memory stays flat
+                root.clear()
+        except (ET.ParseError, OSError, EOFError) as e:
+            raise ValueError(f'Could not read sitemap {url}: {e}')
+    for child in children:
+        yield from iter_sitemap(child, session, budget)
+
+def site_sitemaps(root_url, session):
+    """Sitemaps a site declares in robots.txt (from the robots cache), or its /sitemap.xml"""
+    return robots_cache.rules_for(root_url, session.headers).sitemaps or [urljoin(root_url, '/sitemap.xml')]
+
+def iter_listing(url, session, max_pages=DISCOVERY_MAX_PAGES):
+    """Yield the links on a category/listing page, following its "next page" links (robots.txt and Crawl-delay permitting)"""
+    seen_pages = set()
+    while url and url not in seen_pages and len(seen_pages) < max_pages:
+        seen_pages.add(url)
+        if not robots_cache.is_allowed(url, session.headers):
+            if len(seen_pages) == 1:
+                raise ValueError(f'Disallowed by robots.txt: {url}')
+            return
+        if robots_cache.wait_turn(url, session.headers) is None:
+            if len(seen_pages) == 1:
+                raise ValueError(f'Crawl-delay wait longer than ROBOTS_MAX_CRAWL_DELAY: {url}')
+            print(f"Discovery: stopping at {url} (Crawl-delay wait longer than ROBOTS_MAX_CRAWL_DELAY)")
+            return
+        response = session.get(url, timeout=DISCOVERY_TIMEOUT)
+        response.raise_for_status()
+        soup = BeautifulSoup(response.content, 'html.parser')
+        for link in soup.find_all('a', href=True):
+            yield urljoin(response.url or url, link['href'])
+        next_link = soup.find(['link', 'a'], rel='next', href=True)
+        url = urljoin(response.url or url, next_link['href']) if next_link else None
+
+def _site_links(root_url, session):
+    """Links from a site's sitemaps, or from its home page when it has no readable sitemap"""
+    budget = [DISCOVERY_MAX_SITEMAPS]
+    found = False
+    for sitemap in site_sitemaps(root_url, session):
+        try:
+            for link in iter_sitemap(sitemap, session, budget):
+                found = True
+                yield link
+        except (requests.exceptions.RequestException, ValueError) as e:
+            print(f"Discovery: skipping sitemap {sitemap} ({e})")
+    if not found:
+        yield from iter_listing(root_url, session)
+
+def discover(start_url, headers=None, known=(), pattern=None, limit=DISCOVERY_MAX_URLS):
+    """
+    Find product URLs from a site root, a sitemap (or sitemap index) or a category page.
+
+    A site root is read through the sitemaps its robots.txt lists (or /sitemap.xml), falling
+    back to its links when it has none; a sitemap URL is read directly; any other page is read
+    as a listing, following its "next page" links. Links are kept when they are on the same
+    site and look like product pages (`pattern`, a regex on the URL path, or the site's
+    patterns), once per canonical URL; those whose canonical URL is in `known` (already stored)
+    or that robots.txt disallows are counted but left out. Returns {'source', 'products',
+    'scanned', 'alreadyStored', 'disallowed'}.
+    """
+    session = requests.Session()
+    session.headers.update(headers or {})
+    if pattern is not None:
+        pattern = re.compile(pattern, re.IGNORECASE)
+    site = registered_domain(start_url)
+
+    if is_sitemap_url(start_url):
+        source, links = 'sitemap', iter_sitemap(start_url, session, [DISCOVERY_MAX_SITEMAPS])
+    elif urlparse(start_url).path in ('', '/'):
+        source, links = 'site', _site_links(start_url, session)
+    else:
+        source, links = 'listing', iter_listing(start_url, session)
+
+    products = []
+    seen = set()
+    scanned = already_stored = disallowed = 0
+    for link in links:
+        scanned += 1
+        if registered_domain(link) != site or not is_product_url(link, pattern):
+            continue
+        key = canonicalize_url(link)
+        if key in seen:
+            continue
+        seen.add(key)
+        if key in known:
+            already_stored += 1
+            continue
+        if not robots_cache.is_allowed(link, session.headers):
+            disallowed += 1
+            continue
+        products.append(link)
+        if len(products) >= limit:
+            break
+    return {'source': source, 'products': products, 'scanned': scanned, 'alreadyStored': already_stored,
+            'disallowed': disallowed}
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+
+from url_utils import registered_domain
+
+# Generic strategies a domain entry can switch off with 'skip'
+STRATEGY_APPLAWS_PROBE = 'applaws_probe'    # Browser dropdown pass tried on every site
+STRATEGY_VIVA_RAW_PROBE = 'viva_raw_probe'  # Viva Raw page/metafield patterns tried on every site
+STRATEGY_GENERIC = 'generic'                # Page-wide pattern search after the site extractors
+
+# Confidence of a site's own selectors and extractors in the extraction cascades (see cascade.py)
+SITE_CONFIDENCE = 0.95
+
+# Per-domain extraction config, keyed by registered domain (subdomains share their site's entry).
+# Entries are data only; every key is optional:
+#   'render'     - True: always use the browser route, False: never, missing: learned by render_router
+#   'platform'   - named structured-data extractor that runs before any HTML scraping
+#   'bundle'     - named extractor that returns ingredients, GA and nutrition from one browser session
+#   'selectors'  - {field: [CSS selectors]}; the first non-empty match wins
+#   'json_paths' - {field: ['__NEXT_DATA__.props.pageProps.product.ingredients', 'ld_json.0.brand.name']}
+#   'extractors' - {field: [names]}; site extractors tried, in order, before the generic strategies
+#                  (each is a cascade strategy with SITE_CONFIDENCE)
+#   'fallbacks'  - {field: [names]}; site extractors tried once the first generic pass found nothing
+#   'skip'       - generic strategies that never work for the site
+#   'product_urls' - regexes matched against URL paths to pick product pages during discovery
+#                  (replacing patterns.PRODUCT_URL_RE for the site)
+# Extractor names are resolved by app.SITE_EXTRACTORS.
+DOMAIN_REGISTRY = {
+    'onlynaturalpet.com': {
+        'extractors': {
+            'ingredients': ['only_natural_pet'],
+            'guaranteed_analysis': ['only_natural_pet'],
+            'nutritional_info': ['only_natural_pet'],
+        },
+    },
+    'vivarawpets.com': {
+        'extractors': {
+            'ingredients': ['viva_raw'],
+            'guaranteed_analysis': ['viva_raw'],
+            'nutritional_info': ['viva_raw'],
+        },
+        'skip': (STRATEGY_VIVA_RAW_PROBE,),
+    },
+    'applaws.com': {
+        # Ingredients, GA and calories only exist behind dropdowns
+        'render': True,
+        'bundle': 'applaws_dropdowns',
+        'extractors': {
+            'ingredients': ['applaws'],
+            'guaranteed_analysis': ['applaws'],
+            'nutritional_info': ['applaws', 'applaws_rendered_calories'],
+        },
+        'fallbacks': {
+            'guaranteed_analysis': ['applaws_rendered_analysis'],
+        },
+        'skip': (STRATEGY_APPLAWS_PROBE, STRATEGY_VIVA_RAW_PROBE),
+        'product_urls': [r'^/us/products/[^/]+/?$'],
+    },
+    'target.com': {
+        'platform': 'target_embedded',
+        'extractors': {
+            'brand': ['target_shop_all'],
+            # The last Target extractor always answers (ingredients or an explanation of why not)
+            'ingredients': ['target_embedded', 'target_rendered_accordion', 'target_label_info'],
+        },
+        'skip': (STRATEGY_APPLAWS_PROBE, STRATEGY_VIVA_RAW_PROBE, STRATEGY_GENERIC),
+        'product_urls': [r'^/p/[^/]+/-/A-\d+'],
+    },
+    'absolute-holistic.com': {
+        'extractors': {
+            'ingredients': ['absolute_holistic'],
+        },
+    },
+}
+
+# Entry used for sites that aren't in the registry
+DEFAULT_CONFIG = {}
+
+def domain_config(url):
+    """Registry entry for a URL's site; a single dict lookup on the registered domain"""
+    return DOMAIN_REGISTRY.get(registered_domain(url), DEFAULT_CONFIG)
+
+def skips(config, strategy):
+    """True if the entry switches off a generic strategy"""
+    return strategy in config.get('skip', ())
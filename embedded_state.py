@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+
+import json
+import re
+import weakref
+
+# Global state objects that single-page storefronts (Target, Next.js sites) serialize into the HTML
+STATE_MARKERS = ('__NEXT_DATA__', '__TGT_DATA__', '__PRELOADED_QUERIES__', '__PRELOADED_STATE__', '__APOLLO_STATE__')
+
+# Parsed state per soup, so several extractors on the same page share one json.loads
+_state_cache = weakref.WeakKeyDictionary()
+
+_decoder = json.JSONDecoder()
+_assignment_re = re.compile(r'(?:window\.|self\.)?(' + '|'.join(STATE_MARKERS) + r')\s*=\s*')
+
+def _decode_js_string(text, start):
+    """Decode a JS string literal starting at text[start] (a quote character)"""
+    quote = text[start]
+    end = start + 1
+    while end < len(text):
+        if text[end] == '\\':
+            end += 2
+            continue
+        if text[end] == quote:
+            break
+        end += 1
+    body = text[start + 1:end]
+    if quote == "'":
+        body = body.replace("\\'", "'").replace('"', '\\"')
+    return json.loads('"' + body + '"')
+
+def _parse_assignment(text, start):
+    """Parse the value of `window.X = ...` starting at text[start]"""
+    # Unwrap helpers like deepFreeze(JSON.parse("...")) down to the JSON.parse argument or literal
+    parse_pos = text.find('JSON.parse(', start, start + 200)
+    if parse_pos != -1:
+        pos = parse_pos + len('JSON.parse(')
+        while pos < len(text) and text[pos].isspace():
+            pos += 1
+        if pos < len(text) and text[pos] in '"\'':
+            return json.loads(_decode_js_string(text, pos))
+        return None
+
+    while start < len(text) and text[start] in ' \t\r\n(':
+        start += 1
+    if start < len(text) and text[start] in '{[':
+        value, _ = _decoder.raw_decode(text, start)
+        return value
+    return None
+
+def get_embedded_state(soup):
+    """
+    Return {marker: parsed JSON} for every embedded state object found in the page.
+
+    Handles <script id="__NEXT_DATA__" type="application/json"> blocks as well as inline
+    `window.__X__ = {...}` and `window.__X__ = JSON.parse("...")` assignments. Results are
+    cached per soup object.
+    """
+    cached = _state_cache.get(soup)
+    if cached is not None:
+        return cached
+
+    states = {}
+    for script in soup.find_all('script'):
+        text = script.string or script.get_text()
+        if not text:
+            continue
+
+        script_id = script.get('id')
+        if script_id in STATE_MARKERS:
+            try:
+                states[script_id] = json.loads(text)
+            except ValueError:
+                pass
+            continue
+
+        if '__' not in text:
+            continue
+        for match in _assignment_re.finditer(text):
+            marker = match.group(1)
+            if marker in states:
+                continue
+            try:
+                value = _parse_assignment(text, match.end())
+            except ValueError:
+                continue
+            if value is not None:
+                states[marker] = value
+
+    _state_cache[soup] = states
+    return states
+
+def iter_key(data, key):
+    """Yield every value stored under `key` anywhere inside nested dicts/lists"""
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            children = []
+            for k, v in node.items():
+                if k == key:
+                    yield v
+                if isinstance(v, (dict, list)):
+                    children.append(v)
+            stack.extend(reversed(children))
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
+
+def find_key(data, key, predicate=None):
+    """Return the first value under `key` (optionally passing predicate), or None"""
+    for value in iter_key(data, key):
+        if predicate is None or predicate(value):
+            return value
+    return None
+
+def resolve_path(data, path):
+    """Follow a dotted path ('props.pageProps.product.0.name') through nested dicts/lists, or None"""
+    node = data
+    for part in path.split('.'):
+        if isinstance(node, dict):
+            node = node.get(part)
+        elif isinstance(node, list) and part.isdigit() and int(part) < len(node):
+            node = node[int(part)]
+        else:
+            return None
+        if node is None:
+            return None
+    return node
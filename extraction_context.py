@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+
+import os
+import time
+from contextlib import contextmanager
+
+from cascade import cascade_summary
+
+# Default time budget for one scrape in seconds (0 = unlimited); /scrape callers can pass their own 'budget'
+SCRAPE_BUDGET = float(os.environ.get('SCRAPE_BUDGET', 60))
+
+class ExtractionContext:
+    """
+    Per-scrape record of how each field was found.
+
+    One context is created per scrape and passed down to the extractors, instead of leaving the
+    last result on module or function attributes, so concurrent scrapes can't see each other's
+    strategies, timings or warnings.
+    """
+
+    def __init__(self, url, budget=SCRAPE_BUDGET):
+        self.url = url
+        # time.monotonic() by which the scrape should be done, or None for no limit
+        self.deadline = time.monotonic() + budget if budget else None
+        self.cascades = {}  # field -> CascadeResult of the cascade that produced it
+        self.sources = {}   # field -> where a value came from when no cascade ran ('platform_data', 'bundle:...')
+        self.timings = {}   # stage -> milliseconds
+        self.warnings = []
+        self.skipped = {}   # field -> strategies or stages left out because the budget ran out
+
+    def record_cascade(self, field, result):
+        self.cascades[field] = result
+        self.sources.pop(field, None)
+
+    def record_source(self, field, source):
+        self.sources[field] = source
+        self.cascades.pop(field, None)
+
+    def warn(self, message):
+        self.warnings.append(message)
+
+    def remaining(self):
+        """Seconds left before the deadline (never negative), or None without a deadline"""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+    def expired(self):
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def can_afford(self, seconds):
+        """True if at least `seconds` of the budget are left"""
+        return self.deadline is None or self.remaining() >= seconds
+
+    def skip(self, field, names):
+        """Flag a field whose remaining strategies/stages were skipped to stay within the budget"""
+        self.skipped.setdefault(field, []).extend(names)
+
+    @contextmanager
+    def timed(self, stage):
+        """Add the time spent inside the block to `timings[stage]`"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            self.timings[stage] = round(self.timings.get(stage, 0.0) + elapsed, 1)
+
+    def strategy(self, field):
+        """Name of the strategy or source that produced a field, or None"""
+        if field in self.sources:
+            return self.sources[field]
+        result = self.cascades.get(field)
+        return result.strategy if result else None
+
+    def strategy_summary(self):
+        """{field: {'strategy', 'score', 'ms', 'attempts'}} for debug_info"""
+        summary = {field: cascade_summary(result) for field, result in self.cascades.items()}
+        for field, source in self.sources.items():
+            summary[field] = {'strategy': source, 'score': 1.0, 'ms': 0.0, 'attempts': []}
+        return summary
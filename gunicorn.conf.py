@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+"""
+gunicorn settings and server hooks, picked up automatically from the working directory:
+
+    gunicorn app:app
+
+Importing app.py starts no background threads, so they are started here: the job workers once in
+each gunicorn worker process after it has loaded the app, and the refresh scheduler once in the
+master, so a deployment runs a single scheduler however many workers it has.
+"""
+
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+workers = int(os.environ.get('GUNICORN_WORKERS', 2))
+
+def when_ready(server):
+    """Start the refresh scheduler in the master process (the workers poll the queue for its jobs)"""
+    import refresh_scheduler
+    from app import load_data
+    refresh_scheduler.start_scheduler(load_data)
+
+def post_worker_init(worker):
+    """Resume the job queue in this worker process"""
+    from app import start_job_workers
+    start_job_workers()
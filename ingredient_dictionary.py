@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+
+import json
+import os
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: only the in-process lock applies
+    fcntl = None
+
+from patterns import FIBRE_RE
+
+# Canonical ingredient names; an ingredient's ID is its position in the list, so IDs never change.
+# Stored records hold these IDs, so the file lives next to DATA_FILE by default: every process (and
+# machine) writing that data file must share this one too.
+INGREDIENT_DICTIONARY_FILE = os.environ.get('INGREDIENT_DICTIONARY_FILE') or os.path.join(
+    os.path.dirname(os.environ.get('DATA_FILE', 'scraped_data.json')), 'ingredient_dictionary.json')
+
+# Spelling differences that don't make a different ingredient
+_KEY_TRANSLATION = str.maketrans({'’': "'", '‘': "'", '–': '-', '—': '-', ' ': ' '})
+_KEY_TRAILING = ' .,;:*'
+
+_names = None      # ID -> canonical name
+_ids = None        # normalized key -> ID
+_file_state = None  # (inode, mtime, size) of the file _names was read from
+_lock = threading.RLock()
+_lock_depth = 0     # dictionary_lock() nesting in the thread holding _lock
+_lock_file = None
+
+def ingredient_key(name):
+    """Normalized spelling used to recognise the same ingredient ("Vitamin E supplement." == "Vitamin E Supplement")"""
+    key = ' '.join(name.translate(_KEY_TRANSLATION).split()).rstrip(_KEY_TRAILING).casefold()
+    key = key.replace('( ', '(').replace(' )', ')')
+    return FIBRE_RE.sub('fiber', key)
+
+def _canonical_name(name):
+    """Display spelling stored for a newly seen ingredient"""
+    return FIBRE_RE.sub('fiber', ' '.join(name.translate(_KEY_TRANSLATION).split()).rstrip(_KEY_TRAILING))
+
+def _stat_dictionary():
+    try:
+        stat = os.stat(INGREDIENT_DICTIONARY_FILE)
+    except OSError:
+        return None
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+def _load_dictionary():
+    """The dictionary, read again whenever another process has replaced the file (caller holds _lock)"""
+    global _names, _ids, _file_state
+    state = _stat_dictionary()
+    if _names is None or state != _file_state:
+        try:
+            with open(INGREDIENT_DICTIONARY_FILE, 'r') as f:
+                _names = json.load(f).get('ingredients', [])
+        except (OSError, ValueError, AttributeError):
+            _names = []
+        _file_state = state
+        _ids = {}
+        for ingredient_id, name in enumerate(_names):
+            _ids.setdefault(ingredient_key(name), ingredient_id)
+    return _names
+
+def _save_dictionary():
+    """Write the dictionary file atomically (caller holds dictionary_lock())"""
+    global _file_state
+    tmp_path = INGREDIENT_DICTIONARY_FILE + '.tmp'
+    try:
+        with open(tmp_path, 'w') as f:
+            json.dump({'ingredients': _names}, f, indent=0)
+        os.replace(tmp_path, INGREDIENT_DICTIONARY_FILE)
+        _file_state = _stat_dictionary()
+    except OSError as e:
+        print(f"Warning: could not save ingredient dictionary: {e}")
+
+@contextmanager
+def dictionary_lock():
+    """
+    Hold the dictionary for assigning IDs, across threads and across processes sharing the file.
+
+    Re-entrant within a thread, so a caller can hold it around a whole save while
+    encode_ingredients() takes it again. The file is re-read on entry if it changed, so new IDs
+    always continue the list as it is on disk.
+    """
+    global _lock_depth, _lock_file
+    with _lock:
+        if _lock_depth == 0 and fcntl is not None:
+            _lock_file = open(INGREDIENT_DICTIONARY_FILE + '.lock', 'a')
+            fcntl.flock(_lock_file, fcntl.LOCK_EX)
+        _lock_depth += 1
+        try:
+            _load_dictionary()
+            yield
+        finally:
+            _lock_depth -= 1
+            if _lock_depth == 0 and _lock_file is not None:
+                fcntl.flock(_lock_file, fcntl.LOCK_UN)
+                _lock_file.close()
+                _lock_file = None
+
+def find_ingredient_id(name):
+    """Return the ID of a known ingredient, or None"""
+    with _lock:
+        _load_dictionary()
+        return _ids.get(ingredient_key(name))
+
+def ingredient_name(ingredient_id):
+    """Canonical name for an ID"""
+    with _lock:
+        return _load_dictionary()[ingredient_id]
+
+def encode_ingredients(ingredients):
+    """
+    Turn a list of ingredient strings into (IDs, exceptions).
+
+    `exceptions` maps a position (as a string, for JSON) to the original text wherever it differs
+    from the canonical name, so decoding gives back exactly what was scraped.
+    """
+    ids = []
+    exceptions = {}
+    added = False
+    with dictionary_lock():
+        names = _names
+        for position, ingredient in enumerate(ingredients):
+            key = ingredient_key(ingredient)
+            ingredient_id = _ids.get(key)
+            if ingredient_id is None:
+                ingredient_id = len(names)
+                names.append(_canonical_name(ingredient))
+                _ids[key] = ingredient_id
+                added = True
+            ids.append(ingredient_id)
+            if names[ingredient_id] != ingredient:
+                exceptions[str(position)] = ingredient
+        if added:
+            _save_dictionary()
+    return ids, exceptions
+
+def decode_ingredients(ids, exceptions=None):
+    """Turn stored IDs (and exceptions) back into the ingredient list; names are shared, not copied"""
+    exceptions = exceptions or {}
+    with _lock:
+        names = _load_dictionary()
+        return [exceptions.get(str(position)) or names[ingredient_id] for position, ingredient_id in enumerate(ids)]
+
+def pack_record(record):
+    """Storage form of a scraped record: an ingredient list becomes ingredientIds (+ ingredientExceptions)"""
+    ingredients = record.get('ingredients')
+    if not isinstance(ingredients, list):
+        # Error messages and missing ingredients are stored as they are
+        return record
+    packed = {key: value for key, value in record.items() if key != 'ingredients'}
+    packed['ingredientIds'], exceptions = encode_ingredients(ingredients)
+    if exceptions:
+        packed['ingredientExceptions'] = exceptions
+    return packed
+
+def unpack_record(record):
+    """API form of a stored record, with the ingredient list rebuilt from its IDs"""
+    if 'ingredientIds' not in record:
+        return record
+    unpacked = {key: value for key, value in record.items() if key not in ('ingredientIds', 'ingredientExceptions')}
+    unpacked['ingredients'] = decode_ingredients(record['ingredientIds'], record.get('ingredientExceptions'))
+    return unpacked
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+
+from patterns import (FIBRE_RE, GENERIC_ENDING_RE, INGREDIENT_COMMA_FIXES, INGREDIENT_CODE_RE, INGREDIENT_STRUCTURE_RE,
+                      NUTRIENT_GROUP_LABEL_RE, UNWANTED_TRAILING_PATTERNS, UNWANTED_TRAILING_CONTENT_RE,
+                      VITAMIN_CODE_RE, HYPHENATED_CODE_RE, LETTERS_THEN_DIGITS_RE, DIGITS_THEN_LETTERS_RE,
+                      MIXED_DIGIT_GROUPS_RE)
+
+# Stripped from the end of every ingredient (periods, slashes, quotes left over from scraped JSON/HTML)
+TRAILING_JUNK = '.\\"\',;'
+
+# The trailing-content patterns are literal words joined by '.*', so plain substring searches find them
+# ('download.*ingredient.*list.*' -> ('download', 'ingredient', 'list'))
+_STOP_PHRASES = tuple(tuple(part for part in pattern.split('.*') if part) for pattern in UNWANTED_TRAILING_PATTERNS)
+
+def is_valid_ingredient(ingredient):
+    """Check if an ingredient is valid and not a website error/typo"""
+    if not ingredient or len(ingredient.strip()) < 2:
+        return False
+
+    ingredient = ingredient.strip().lower()
+
+    # Allow known valid patterns first (vitamins, E-numbers, etc.)
+    # But only for specific known prefixes
+    if VITAMIN_CODE_RE.match(ingredient):  # B1, E300, etc. (common vitamin/additive prefixes)
+        return True
+    if HYPHENATED_CODE_RE.match(ingredient):  # B-12, etc.
+        return True
+    if 'vitamin' in ingredient or 'supplement' in ingredient:
+        return True
+
+    # Exclude random alphanumeric codes (like k600323, abc123, etc.)
+    # Pattern: letters followed by many numbers (3+)
+    if LETTERS_THEN_DIGITS_RE.match(ingredient):  # e.g., k600323, ab12345
+        return False
+    # Pattern: many numbers followed by few letters
+    if DIGITS_THEN_LETTERS_RE.match(ingredient):  # e.g., 12345k, 600ab
+        return False
+    # Pattern: alternating letters and numbers (multiple digit groups)
+    if MIXED_DIGIT_GROUPS_RE.search(ingredient) and len(ingredient) > 3:  # z2z3z4, abc123def456
+        return False
+
+    # Exclude single characters or very short nonsensical combinations
+    if len(ingredient) <= 2 and not ingredient.isalpha():
+        return False
+
+    # Exclude items that are mostly numbers with minimal letters (but allow vitamins/E-numbers)
+    letter_count = sum(map(str.isalpha, ingredient))
+    number_count = sum(map(str.isdigit, ingredient))
+    if (number_count > 0 and letter_count > 0 and
+        number_count >= letter_count * 3 and  # More strict ratio
+        len(ingredient) > 4):  # Don't apply to short ingredients
+        return False
+
+    return True
+
+def find_trailing_content(text):
+    """Index where navigation, footer or marketing copy starts in an ingredient string, or -1"""
+    lowered = text.lower()
+    if len(lowered) != len(text):
+        # Lowercasing changed the length (rare Unicode), so indexes wouldn't line up
+        unwanted = UNWANTED_TRAILING_CONTENT_RE.search(text)
+        return unwanted.start() if unwanted else -1
+
+    cut = -1
+    for first, *rest in _STOP_PHRASES:
+        start = lowered.find(first)
+        if start == -1 or (cut != -1 and start >= cut):
+            continue
+        # Multi-word phrases only count if the other words follow ("download ... ingredient ... list")
+        pos = start + len(first)
+        for part in rest:
+            pos = lowered.find(part, pos)
+            if pos == -1:
+                break
+            pos += len(part)
+        else:
+            cut = start
+    return cut
+
+def split_ingredients(text):
+    """
+    Split an ingredient string on the commas that are outside parentheses.
+
+    "Vitamins (...)" and "Minerals (...)" groups are unwrapped on the way, so their members become
+    top-level ingredients while other parentheses ("Fish Oil (Source of DHA, EPA)") stay in one piece.
+    The walk only stops at commas and parentheses. If a parenthesis is never closed, the unfinished
+    ingredient is split on every comma instead of swallowing the rest of the list.
+    """
+    items = []
+    parts = []   # Pieces of the ingredient being built
+    groups = []  # One entry per open parenthesis: True if it opened an unwrapped Vitamins/Minerals group
+    depth = 0    # Open parentheses that are kept in the output
+    pos = 0
+    for match in INGREDIENT_STRUCTURE_RE.finditer(text):
+        char = match.group()
+        piece = text[pos:match.start()]
+        pos = match.end()
+        if char == ',':
+            if depth:
+                parts.append(piece + ',')
+            else:
+                parts.append(piece)
+                items.append(''.join(parts))
+                parts = []
+        elif char == '(':
+            label = NUTRIENT_GROUP_LABEL_RE.search(piece)
+            if label:
+                parts.append(piece[:label.start()])
+                groups.append(True)
+            else:
+                parts.append(piece + '(')
+                groups.append(False)
+                depth += 1
+        else:
+            if groups and groups.pop():
+                parts.append(piece)
+            else:
+                parts.append(piece + ')')
+                depth = max(depth - 1, 0)
+    parts.append(text[pos:])
+
+    if depth:
+        items.extend(''.join(parts).split(','))
+    else:
+        items.append(''.join(parts))
+    return items
+
+def _clean_ingredient(ingredient):
+    """Tidy one ingredient, dropping website codes glued to it; returns None if nothing valid is left"""
+    cleaned = FIBRE_RE.sub('fiber', ' '.join(ingredient.split()))
+    while cleaned and cleaned[-1] in TRAILING_JUNK:
+        cleaned = cleaned[:-1].strip()
+    if not cleaned:
+        return None
+
+    # "Blue 2. N600123" (period + space + invalid code)
+    if '. ' in cleaned and cleaned.count('. ') == 1:
+        first_part, second_part = cleaned.split('. ', 1)
+        if is_valid_ingredient(first_part) and not is_valid_ingredient(second_part):
+            return first_part
+        return cleaned if is_valid_ingredient(cleaned) else None
+
+    # "Blue 2 D600724" (space + invalid code starting with letter+numbers)
+    words = cleaned.split(' ')
+    if len(words) >= 2 and INGREDIENT_CODE_RE.match(words[-1]) and not is_valid_ingredient(words[-1]):
+        clean_part = ' '.join(words[:-1])
+        return clean_part if is_valid_ingredient(clean_part) else None
+
+    return cleaned if is_valid_ingredient(cleaned) else None
+
+def normalize_ingredients(text):
+    """
+    Turn a scraped ingredient string into the final list of ingredients in one walk.
+
+    Cuts at the first navigation/marketing phrase, unwraps Vitamins/Minerals groups, splits on
+    top-level commas, separates run-together names ("ChickenRice") when the text isn't already a
+    comma separated list, spells "fibre" as "fiber", drops website codes and removes a generic
+    ending ("and more", "etc.").
+    """
+    if not text:
+        return []
+
+    cut = find_trailing_content(text)
+    if cut != -1:
+        text = text[:cut]
+
+    # Text that is already comma separated is trusted; anything else may have names running together
+    run_together = not (', ' in text and text.count(',') > 3)
+
+    ingredients = []
+    for item in split_ingredients(text):
+        if run_together:
+            for pattern, replacement in INGREDIENT_COMMA_FIXES:
+                item = pattern.sub(replacement, item)
+            pieces = split_ingredients(item) if ',' in item else [item]
+        else:
+            pieces = [item]
+        for piece in pieces:
+            cleaned = _clean_ingredient(piece)
+            if cleaned:
+                ingredients.append(cleaned)
+
+    if ingredients:
+        last = GENERIC_ENDING_RE.sub('', ingredients[-1]).strip()
+        if last:
+            ingredients[-1] = last
+        else:
+            ingredients.pop()
+    return ingredients
@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import closing
+from datetime import datetime
+
+# SQLite file holding batch jobs and their items. Put it on a shared volume to run worker
+# daemons (worker.py) on several machines against the same queue.
+JOB_DB_FILE = os.environ.get('JOB_DB_FILE', 'jobs.db')
+
+# Worker threads processing job items in this process (0 = only queue jobs, let worker daemons run them)
+JOB_WORKERS = int(os.environ.get('JOB_WORKERS', 2))
+
+# Seconds an idle worker waits before checking the queue again
+JOB_POLL_INTERVAL = float(os.environ.get('JOB_POLL_INTERVAL', 2))
+
+# Seconds a claimed item stays leased to its worker. Heartbeats renew the lease while the item is
+# being scraped; an item whose lease runs out (crashed worker, lost machine) is claimed again.
+JOB_LEASE_SECONDS = float(os.environ.get('JOB_LEASE_SECONDS', 120))
+JOB_HEARTBEAT_INTERVAL = float(os.environ.get('JOB_HEARTBEAT_INTERVAL', 30))
+
+# Longest a worker keeps renewing one item's lease; a scrape hung past this lets its lease run out
+# so the item is retried (and dead-lettered after JOB_MAX_ATTEMPTS) instead of being held forever
+JOB_MAX_RUN_SECONDS = float(os.environ.get('JOB_MAX_RUN_SECONDS', 600))
+
+# Claims an item gets before it is dead-lettered (a URL that keeps crashing or hanging workers)
+JOB_MAX_ATTEMPTS = int(os.environ.get('JOB_MAX_ATTEMPTS', 3))
+
+# Item states; a job is finished once none of its items are pending or running
+ITEM_PENDING = 'pending'
+ITEM_RUNNING = 'running'
+ITEM_DONE = 'done'
+ITEM_FAILED = 'failed'
+ITEM_DEAD = 'dead'
+ITEM_CANCELLED = 'cancelled'
+ITEM_STATES = (ITEM_PENDING, ITEM_RUNNING, ITEM_DONE, ITEM_FAILED, ITEM_DEAD, ITEM_CANCELLED)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    options TEXT NOT NULL,
+    cancelled INTEGER NOT NULL DEFAULT 0,
+    created TEXT NOT NULL,
+    updated TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS items (
+    job_id TEXT NOT NULL REFERENCES jobs(id),
+    position INTEGER NOT NULL,
+    url TEXT NOT NULL,
+    status TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    started TEXT,
+    finished TEXT,
+    seq INTEGER,
+    lease_owner TEXT,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (job_id, position)
+);
+CREATE INDEX IF NOT EXISTS items_status ON items (status, job_id, position);
+CREATE INDEX IF NOT EXISTS items_seq ON items (job_id, seq);
+"""
+
+# Columns added to `items` after its first version: name -> definition
+ADDED_COLUMNS = {
+    'lease_owner': 'TEXT',
+    'lease_expires': 'REAL',
+    'attempts': 'INTEGER NOT NULL DEFAULT 0',
+}
+
+# Identifies this process's leases; each worker thread's owner ID is NODE_ID/<n>
+NODE_ID = f'{socket.gethostname()}:{os.getpid()}'
+
+_lock = threading.Lock()
+_initialized = False
+_workers = []
+_wakeup = threading.Event()
+_stopping = threading.Event()
+_in_progress = {}  # owner -> (job_id, position, time.monotonic() when its scrape started)
+
+def _connect():
+    """Open the queue database, creating or upgrading the schema on first use (caller holds _lock)"""
+    global _initialized
+    connection = sqlite3.connect(JOB_DB_FILE, timeout=30)
+    connection.row_factory = sqlite3.Row
+    if not _initialized:
+        existing = {row['name'] for row in connection.execute('PRAGMA table_info(items)')}
+        if existing:
+            for column, definition in ADDED_COLUMNS.items():
+                if column not in existing:
+                    connection.execute(f'ALTER TABLE items ADD COLUMN {column} {definition}')
+        connection.executescript(SCHEMA)
+        _initialized = True
+    return connection
+
+def _now():
+    return datetime.now().isoformat()
+
+def _has_active_job(connection, option):
+    return connection.execute(
+        "SELECT EXISTS (SELECT 1 FROM items JOIN jobs ON jobs.id = items.job_id "
+        "WHERE items.status IN (?, ?) AND json_extract(jobs.options, '$.' || ?))",
+        (ITEM_PENDING, ITEM_RUNNING, option)).fetchone()[0] == 1
+
+def has_active_job(option):
+    """True if any job whose options set `option` (e.g. 'refresh') still has pending or running items"""
+    with _lock, closing(_connect()) as connection:
+        return _has_active_job(connection, option)
+
+def create_job(urls, options=None, exclusive=None):
+    """
+    Queue one item per URL and return the new job's ID.
+
+    With `exclusive`, an option name, nothing is queued (None is returned) while another job with
+    that option set is unfinished. The check and the insert are one write transaction, so callers
+    in other processes sharing the database can't both queue.
+    """
+    job_id = uuid.uuid4().hex[:12]
+    now = _now()
+    with _lock, closing(_connect()) as connection, connection:
+        if exclusive:
+            connection.execute('BEGIN IMMEDIATE')
+            if _has_active_job(connection, exclusive):
+                return None
+        connection.execute('INSERT INTO jobs (id, options, created, updated) VALUES (?, ?, ?, ?)',
+                           (job_id, json.dumps(options or {}), now, now))
+        connection.executemany('INSERT INTO items (job_id, position, url, status) VALUES (?, ?, ?, ?)',
+                               [(job_id, position, url, ITEM_PENDING) for position, url in enumerate(urls)])
+    _wakeup.set()
+    return job_id
+
+def _job_summary(connection, job):
+    counts = dict(connection.execute('SELECT status, COUNT(*) FROM items WHERE job_id = ? GROUP BY status',
+                                     (job['id'],)).fetchall())
+    total = sum(counts.values())
+    active = counts.get(ITEM_PENDING, 0) + counts.get(ITEM_RUNNING, 0)
+    if job['cancelled']:
+        status = 'cancelled' if not counts.get(ITEM_RUNNING) else 'cancelling'
+    elif active == 0:
+        status = 'done'
+    elif active == total:
+        status = 'queued' if not counts.get(ITEM_RUNNING) else 'running'
+    else:
+        status = 'running'
+    return {
+        'jobId': job['id'],
+        'status': status,
+        'total': total,
+        'counts': {state: counts.get(state, 0) for state in ITEM_STATES},
+        'options': json.loads(job['options']),
+        'created': job['created'],
+        'updated': job['updated'],
+    }
+
+def get_job(job_id):
+    """Status and item counts for a job, or None if unknown"""
+    with _lock, closing(_connect()) as connection:
+        job = connection.execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        return _job_summary(connection, job) if job else None
+
+def list_jobs(limit=20):
+    """Most recent jobs first"""
+    with _lock, closing(_connect()) as connection:
+        jobs = connection.execute('SELECT * FROM jobs ORDER BY created DESC LIMIT ?', (limit,)).fetchall()
+        return [_job_summary(connection, job) for job in jobs]
+
+def get_results(job_id, after=0, limit=100):
+    """
+    Done, failed and dead-lettered items in the order they finished, starting after the `seq`
+    cursor a previous call returned; None if the job is unknown. Partial results are available
+    while the job runs.
+    """
+    with _lock, closing(_connect()) as connection:
+        if not connection.execute('SELECT 1 FROM jobs WHERE id = ?', (job_id,)).fetchone():
+            return None
+        rows = connection.execute('SELECT * FROM items WHERE job_id = ? AND seq > ? ORDER BY seq LIMIT ?',
+                                  (job_id, after, limit)).fetchall()
+    return [{
+        'seq': row['seq'],
+        'position': row['position'],
+        'url': row['url'],
+        'status': row['status'],
+        'result': json.loads(row['result']) if row['result'] else None,
+        'error': row['error'],
+        'attempts': row['attempts'],
+        'finished': row['finished'],
+    } for row in rows]
+
+def cancel_job(job_id):
+    """Cancel a job's pending items (running ones finish); returns False if the job is unknown"""
+    now = _now()
+    with _lock, closing(_connect()) as connection, connection:
+        updated = connection.execute('UPDATE jobs SET cancelled = 1, updated = ? WHERE id = ?', (now, job_id)).rowcount
+        connection.execute('UPDATE items SET status = ?, finished = ? WHERE job_id = ? AND status = ?',
+                           (ITEM_CANCELLED, now, job_id, ITEM_PENDING))
+    return bool(updated)
+
+def retry_dead(job_id):
+    """Queue a job's dead-lettered items again with a fresh attempt count; returns how many, or None if unknown"""
+    with _lock, closing(_connect()) as connection, connection:
+        if not connection.execute('SELECT 1 FROM jobs WHERE id = ?', (job_id,)).fetchone():
+            return None
+        count = connection.execute(
+            'UPDATE items SET status = ?, attempts = 0, error = NULL, finished = NULL, seq = NULL '
+            'WHERE job_id = ? AND status = ?', (ITEM_PENDING, job_id, ITEM_DEAD)).rowcount
+        if count:
+            connection.execute('UPDATE jobs SET cancelled = 0, updated = ? WHERE id = ?', (_now(), job_id))
+    _wakeup.set()
+    return count
+
+# Next result cursor of the item's job, computed inside the UPDATE that stores the result: the statement
+# holds the database's write lock, so two nodes finishing items at once can't both read the same MAX(seq)
+NEXT_SEQ = '(SELECT COALESCE(MAX(seq), 0) + 1 FROM items AS finished WHERE finished.job_id = items.job_id)'
+
+def claim_item(owner):
+    """
+    Lease the oldest claimable item to `owner` and return (job_id, position, url, options), or None.
+
+    Claimable items are pending ones and running ones whose lease has expired. An item that has
+    already been claimed JOB_MAX_ATTEMPTS times is dead-lettered instead of handed out again.
+    Every claim bumps the item's attempt count and only applies if the count is still the one
+    that was read, so workers in other processes or on other machines sharing the database
+    never get the same item.
+    """
+    with _lock, closing(_connect()) as connection:
+        while True:
+            now = time.time()
+            with connection:
+                row = connection.execute(
+                    'SELECT items.job_id, items.position, items.url, items.status, items.attempts, items.error, jobs.options '
+                    'FROM items JOIN jobs ON jobs.id = items.job_id '
+                    'WHERE items.status = ? OR (items.status = ? AND COALESCE(items.lease_expires, 0) < ?) '
+                    'ORDER BY jobs.created, items.position LIMIT 1',
+                    (ITEM_PENDING, ITEM_RUNNING, now)).fetchone()
+                if row is None:
+                    return None
+                unchanged = (row['job_id'], row['position'], row['status'], row['attempts'])
+                if row['attempts'] >= JOB_MAX_ATTEMPTS:
+                    connection.execute(
+                        f'UPDATE items SET status = ?, error = ?, finished = ?, seq = {NEXT_SEQ}, lease_owner = NULL, '
+                        'lease_expires = NULL WHERE job_id = ? AND position = ? AND status = ? AND attempts = ?',
+                        (ITEM_DEAD, f"Gave up after {row['attempts']} attempts: {row['error'] or 'worker stopped or lease expired'}",
+                         _now()) + unchanged)
+                    continue
+                claimed = connection.execute(
+                    'UPDATE items SET status = ?, started = ?, lease_owner = ?, lease_expires = ?, attempts = attempts + 1 '
+                    'WHERE job_id = ? AND position = ? AND status = ? AND attempts = ?',
+                    (ITEM_RUNNING, _now(), owner, now + JOB_LEASE_SECONDS) + unchanged).rowcount
+                if claimed:
+                    connection.execute('UPDATE jobs SET updated = ? WHERE id = ?', (_now(), row['job_id']))
+                    return row['job_id'], row['position'], row['url'], json.loads(row['options'])
+
+def heartbeat():
+    """
+    Renew the leases of the items this process's workers are still scraping; returns how many.
+    Only items a worker thread is inside process() for are renewed, and only for JOB_MAX_RUN_SECONDS.
+    """
+    now = time.monotonic()
+    with _lock:
+        live = [(time.time() + JOB_LEASE_SECONDS, job_id, position, ITEM_RUNNING, owner)
+                for owner, (job_id, position, started) in _in_progress.items()
+                if now - started < JOB_MAX_RUN_SECONDS]
+        if not live:
+            return 0
+        with closing(_connect()) as connection, connection:
+            return sum(connection.execute(
+                'UPDATE items SET lease_expires = ? WHERE job_id = ? AND position = ? AND status = ? AND lease_owner = ?',
+                item).rowcount for item in live)
+
+def finish_item(job_id, position, owner, result=None, error=None):
+    """
+    Store an item's result (or error) under the job's next result cursor. Returns False and stores
+    nothing if `owner` no longer holds the lease (it expired and another worker took the item).
+    """
+    now = _now()
+    with _lock, closing(_connect()) as connection, connection:
+        stored = connection.execute(
+            f'UPDATE items SET status = ?, result = ?, error = ?, finished = ?, seq = {NEXT_SEQ}, lease_owner = NULL, '
+            'lease_expires = NULL WHERE job_id = ? AND position = ? AND status = ? AND lease_owner = ?',
+            (ITEM_FAILED if error else ITEM_DONE, json.dumps(result) if result is not None else None,
+             error, now, job_id, position, ITEM_RUNNING, owner)).rowcount
+        if stored:
+            connection.execute('UPDATE jobs SET updated = ? WHERE id = ?', (now, job_id))
+    return bool(stored)
+
+def release_item(job_id, position, owner, error):
+    """Give a crashed item back to the queue; its attempt count is kept, so it is dead-lettered eventually"""
+    with _lock, closing(_connect()) as connection, connection:
+        connection.execute(
+            'UPDATE items SET status = ?, error = ?, lease_owner = NULL, lease_expires = NULL '
+            'WHERE job_id = ? AND position = ? AND status = ? AND lease_owner = ?',
+            (ITEM_PENDING, error, job_id, position, ITEM_RUNNING, owner))
+
+def _worker(process, owner):
+    while not _stopping.is_set():
+        try:
+            claimed = claim_item(owner)
+        except sqlite3.OperationalError as e:
+            # Another node held the database lock past the busy timeout; try again on the next poll
+            print(f"Job queue: claim failed ({e}), retrying")
+            claimed = None
+        if claimed is None:
+            _wakeup.wait(JOB_POLL_INTERVAL)
+            _wakeup.clear()
+            continue
+        job_id, position, url, options = claimed
+        with _lock:
+            _in_progress[owner] = (job_id, position, time.monotonic())
+        try:
+            result = process(url, options)
+        except Exception as e:
+            release_item(job_id, position, owner, str(e) or type(e).__name__)
+            continue
+        finally:
+            with _lock:
+                _in_progress.pop(owner, None)
+        error = result.get('error') if isinstance(result, dict) else None
+        if not finish_item(job_id, position, owner, result=result, error=error):
+            print(f"Job queue: lease on {job_id}/{position} was lost, result dropped")
+
+def _heartbeat():
+    while not _stopping.wait(JOB_HEARTBEAT_INTERVAL):
+        try:
+            heartbeat()
+        except sqlite3.OperationalError as e:
+            print(f"Job queue: heartbeat failed ({e})")
+
+def _after_fork():
+    """
+    A forked child (e.g. a gunicorn worker of a --preload master) has none of its parent's threads:
+    give it its own node ID and lock and let it start its own pool.
+    """
+    global NODE_ID, _lock
+    NODE_ID = f'{socket.gethostname()}:{os.getpid()}'
+    _lock = threading.Lock()
+    _workers.clear()
+    _in_progress.clear()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_after_fork)
+
+def start_workers(process, count=JOB_WORKERS):
+    """
+    Start `count` daemon worker threads (once per process) that call `process(url, options)` for each
+    queued item and store what it returns; a returned dict with an 'error' marks the item failed,
+    an exception puts it back in the queue. A heartbeat thread keeps the leases of items still being
+    scraped alive, for up to JOB_MAX_RUN_SECONDS each.
+    Items whose lease expired (a worker or machine that went away) are claimed again, so a
+    restart resumes the work.
+    """
+    if count <= 0:
+        return
+    with _lock:
+        if _workers:
+            return
+        _workers.append(None)  # Claimed before the threads exist so a concurrent call doesn't start a second pool
+    threads = [threading.Thread(target=_worker, args=(process, f'{NODE_ID}/{i + 1}'), name=f'job-worker-{i + 1}',
+                                daemon=True)
+               for i in range(count)]
+    threads.append(threading.Thread(target=_heartbeat, name='job-heartbeat', daemon=True))
+    for thread in threads:
+        thread.start()
+    with _lock:
+        _workers[:] = threads
+
+def stop_workers(timeout=None):
+    """Stop claiming new items and wait for the items being scraped to finish"""
+    _stopping.set()
+    _wakeup.set()
+    for thread in list(_workers):
+        if thread is not None:
+            thread.join(timeout)
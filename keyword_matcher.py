@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+
+import re
+from collections import namedtuple
+
+# One keyword occurrence: which category it belongs to, where it was found and how much that region counts
+Hit = namedtuple('Hit', ['label', 'keyword', 'start', 'end', 'region', 'weight'])
+
+# Keywords only match as whole words: a letter may not touch either end ("cat" does not match "category"),
+# but digits may ("12oz can" still matches "oz can"). Spaces, hyphens and underscores inside a keyword
+# are interchangeable (and optional) so "dry cat food" also matches "dry-cat-food" and "cat food" matches "catfood".
+_NOT_AFTER_LETTER = r'(?<![^\W\d_])'
+_NOT_BEFORE_LETTER = r'(?![^\W\d_])'
+_SEPARATOR = r'[\s_\-]*'
+_PLURALS = ('', 's', 'es')
+
+_WORD_RE = re.compile(r'[^\W\d_]+')
+
+def _normalize_keyword(keyword):
+    """Lowercase and collapse separators so 'freeze-dried' and 'freeze dried' are the same keyword"""
+    keyword = re.sub(r'\s+', ' ', keyword.strip().lower())
+    return re.sub(r'(?<=\w)[_\-](?=\w)', ' ', keyword)
+
+def _keyword_pattern(keyword, plurals, leading_boundary=True):
+    """Regex for one normalized keyword, with boundaries only on letter edges"""
+    pattern = ''.join(_SEPARATOR if ch == ' ' else re.escape(ch) for ch in keyword)
+    if keyword[0].isalpha() and leading_boundary:
+        pattern = _NOT_AFTER_LETTER + pattern
+    if keyword[-1].isalpha():
+        pattern += (r'(?:e?s)?' if plurals else '') + _NOT_BEFORE_LETTER
+    return pattern
+
+def _search_phrase(compiled, text):
+    """Search for a phrase compiled without its leading boundary (so the regex engine can skip ahead
+    to its literal first word), checking the boundary here"""
+    pos = 0
+    while True:
+        match = compiled.search(text, pos)
+        if match is None:
+            return None
+        start = match.start()
+        if start == 0 or not text[start - 1].isalpha():
+            return match
+        pos = start + 1
+
+class KeywordMatcher:
+    """
+    Finds every keyword of several categories in a text with one pass over its words.
+
+    `categories` maps a label to its keywords, e.g. {'cat': ['cat', 'feline'], 'dog': ['dog', 'canine']}.
+    Indexes are built once: single words are dictionary lookups on the text's words, multi-word
+    phrases are only confirmed where their first word occurs, and the few keywords that start
+    with punctuation or digits ('| applaws', '7+ years') share a regex per leading character. Overlapping
+    keywords and keywords sharing a start ('biscuit' and 'biscuit treat') are all reported.
+    """
+
+    def __init__(self, categories, plurals=True):
+        self.categories = {label: [_normalize_keyword(k) for k in keywords] for label, keywords in categories.items()}
+        self.plurals = plurals
+
+        self._words = {}    # word as it appears in text -> [(label, keyword)]
+        self._phrases = {}  # first word -> [(label, keyword, compiled)]
+        self._others = {}   # keyword -> [label], for keywords not starting with a letter
+        seen = set()
+        for label, keywords in self.categories.items():
+            for keyword in keywords:
+                if not keyword or (label, keyword) in seen:
+                    continue
+                seen.add((label, keyword))
+                forms = _PLURALS if plurals else ('',)
+                if _WORD_RE.fullmatch(keyword):
+                    for suffix in forms:
+                        self._words.setdefault(keyword + suffix, []).append((label, keyword))
+                elif keyword[0].isalpha():
+                    # The leading boundary is already guaranteed by where the first word was found
+                    compiled = re.compile(_keyword_pattern(keyword, plurals, leading_boundary=False))
+                    self._phrases.setdefault(_WORD_RE.match(keyword).group(), []).append((label, keyword, compiled))
+                    # Separators are optional, so "cat food" is also the single word "catfood"
+                    joined = keyword.replace(' ', '')
+                    if _WORD_RE.fullmatch(joined):
+                        for suffix in forms:
+                            self._words.setdefault(joined + suffix, []).append((label, keyword))
+                else:
+                    self._others.setdefault(keyword, []).append(label)
+
+        # One regex per leading character ('|', '-', '7', ...) so each starts with a literal the engine can skip to
+        self._other_res = []
+        by_first_char = {}
+        for keyword in sorted(self._others, key=len, reverse=True):  # longest first
+            by_first_char.setdefault(keyword[0], []).append(keyword)
+        for first_char, keywords in sorted(by_first_char.items()):
+            alternatives = '|'.join('(' + _keyword_pattern(k, plurals)[len(re.escape(first_char)):] + ')' for k in keywords)
+            self._other_res.append((re.compile(re.escape(first_char) + '(?:' + alternatives + ')'), keywords))
+
+    def _scan_others(self, text_lower):
+        for compiled, keywords in self._other_res:
+            for match in compiled.finditer(text_lower):
+                yield keywords[match.lastindex - 1], match
+
+    def scan(self, text, region=None, weight=1):
+        """Return every keyword hit in text, in order of position"""
+        hits = []
+        if not text:
+            return hits
+        text_lower = text.lower()
+        for word in _WORD_RE.finditer(text_lower):
+            token = word.group()
+            for label, keyword in self._words.get(token, ()):
+                hits.append(Hit(label, keyword, word.start(), word.end(), region, weight))
+            for label, keyword, compiled in self._phrases.get(token, ()):
+                match = compiled.match(text_lower, word.start())
+                if match:
+                    hits.append(Hit(label, keyword, word.start(), match.end(), region, weight))
+        if self._other_res:
+            for keyword, match in self._scan_others(text_lower):
+                for label in self._others[keyword]:
+                    hits.append(Hit(label, keyword, match.start(), match.end(), region, weight))
+            hits.sort(key=lambda hit: hit.start)
+        return hits
+
+    def scan_regions(self, regions):
+        """Scan (region, weight, text) triples in order, yielding (region, weight, hits) per region"""
+        for region, weight, text in regions:
+            yield region, weight, self.scan(text, region, weight)
+
+    def found(self, text):
+        """Return {label: set of distinct keywords found} for a single text (no positions, so cheaper than scan)"""
+        found = {label: set() for label in self.categories}
+        if not text:
+            return found
+        text_lower = text.lower()
+        for token in set(_WORD_RE.findall(text_lower)):
+            for label, keyword in self._words.get(token, ()):
+                found[label].add(keyword)
+            for label, keyword, compiled in self._phrases.get(token, ()):
+                if keyword not in found[label] and _search_phrase(compiled, text_lower):
+                    found[label].add(keyword)
+        for keyword, _ in self._scan_others(text_lower):
+            for label in self._others[keyword]:
+                found[label].add(keyword)
+        return found
+
+def score_hits(hits):
+    """Sum region weights per label, counting each distinct keyword once per region"""
+    scores = {}
+    counted = set()
+    for hit in hits:
+        key = (hit.label, hit.keyword, hit.region)
+        if key in counted:
+            continue
+        counted.add(key)
+        scores[hit.label] = scores.get(hit.label, 0) + hit.weight
+    return scores
@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+
+class LazyFields:
+    """
+    Values computed on first access from named producer functions.
+
+    Each producer is called with this object and reads the values it depends on from it
+    (`fields['name']`), so asking for one field runs exactly that field's producer and its
+    dependencies, each at most once, and nothing else.
+    """
+
+    def __init__(self, producers):
+        self._producers = producers
+        self._values = {}
+
+    def __getitem__(self, name):
+        if name not in self._values:
+            self._values[name] = self._producers[name](self)
+        return self._values[name]
+
+    def __contains__(self, name):
+        return name in self._producers
+
+    def computed(self, name):
+        """True if a value has already been produced (without producing it)"""
+        return name in self._values
@@ -0,0 +1,443 @@
+#!/usr/bin/env python3
+
+import re
+
+# Every regex the extraction cascade uses, compiled once at import. Calling re.search/re.sub with a
+# pattern string looks the pattern up in re's small internal cache on every call, and with a few hundred
+# patterns per page (plus BeautifulSoup's own) entries get evicted and recompiled. Ordered tuples are
+# tried in sequence by the extractors because the first pattern that matches wins; lists whose order
+# does not change the result are combined into a single alternation and scanned once.
+
+def any_of(patterns):
+    """Join pattern strings into one alternation (each alternative wrapped in its own group)"""
+    return '|'.join('(?:' + pattern + ')' for pattern in patterns)
+
+# Whitespace, punctuation and escape cleanup
+WHITESPACE_RE = re.compile(r'\s+')
+SLASH_SPACING_RE = re.compile(r'\s*/\s*')
+NUMBER_RE = re.compile(r'(\d+(?:\.\d+)?)')
+DIGITS_ONLY_RE = re.compile(r'^\d+$')
+LEADING_NON_WORD_RE = re.compile(r'^[^\w]+')
+TRAILING_NON_WORD_RE = re.compile(r'[^\w\.]+$')
+TRAILING_NON_INGREDIENT_RE = re.compile(r'[^\w\s,().-]+$')
+TRAILING_NON_ANALYSIS_RE = re.compile(r'[^\w\.%\)]+$')
+TRAILING_COMMA_RE = re.compile(r',\s*$')
+HTML_TAG_RE = re.compile(r'<[^>]+>')
+UNICODE_ESCAPE_RE = re.compile(r'\\u[0-9a-fA-F]{4}')
+ESCAPED_NEWLINE_RE = re.compile(r'\\[rn]')
+ESCAPED_SLASH_RE = re.compile(r'\\/')
+FIBRE_RE = re.compile(r'\bfibre\b', re.IGNORECASE)
+
+# Brand names
+# "PetNaturals" -> "Pet Naturals", "HillsScience" -> "Hill's Science"; the prefixes are mutually exclusive
+BRAND_PREFIX_RE = re.compile(r'^([Pp]et|[Bb]lue|[Hh]ills|[Rr]oyal|[Nn]atural|[Ss]tella)([A-Z][a-z]+)')
+CAMEL_CASE_BREAK_RE = re.compile(r'([a-z])([A-Z][a-z]+)')
+BRAND_CLASS_RE = re.compile(r'brand', re.I)
+BRAND_LABEL_RE = re.compile(r'brand:', re.I)
+BRAND_NAME_RE = re.compile(r'^[A-Za-z][A-Za-z0-9\s&\'-]*$')
+FRISKIES_RE = re.compile(r'friskies', re.IGNORECASE)
+FRISKIES_WORD_RE = re.compile(r'\bfriskies\b', re.IGNORECASE)
+TARGET_SHOP_ALL_PATTERNS = (
+    re.compile(r'show\s+all\s+([\w\s&\'-]{2,25})(?=\s|$|\.)', re.IGNORECASE),  # "Show all Pet Honesty"
+    re.compile(r'shop\s+all\s+([\w\s&\'-]{2,25})(?=\s|$|\.)', re.IGNORECASE),  # "Shop all Pet Honesty"
+)
+TARGET_ESCAPED_BRAND_NAME_RE = re.compile(r'\\"name\\":\\s*\\"([^"\\]+)\\"')
+
+# Images
+IMAGE_EXTENSIONS = r'(?:jpg|jpeg|png|gif|webp|bmp)'
+BACKGROUND_IMAGE_RE = re.compile(r'background-image:\s*url\(["\']?([^"\')]+)["\']?\)', re.I)
+SCRIPT_IMAGE_PATTERNS = (
+    re.compile(r'["\']([^"\']*\.' + IMAGE_EXTENSIONS + r'[^"\']*)["\']', re.I),
+    re.compile(r'image["\']?\s*:\s*["\']([^"\']+)["\']', re.I),
+    re.compile(r'src["\']?\s*:\s*["\']([^"\']+\.' + IMAGE_EXTENSIONS + r'[^"\']*)["\']', re.I),
+)
+HTML_IMAGE_URL_PATTERNS = (
+    # Standard image URLs
+    re.compile(r'https?://[^\s"\'<>]+\.' + IMAGE_EXTENSIONS + r'(?:\?[^\s"\'<>]*)?', re.I),
+    re.compile(r'//[^\s"\'<>]+\.' + IMAGE_EXTENSIONS + r'(?:\?[^\s"\'<>]*)?', re.I),
+    re.compile(r'/[^\s"\'<>]+\.' + IMAGE_EXTENSIONS + r'(?:\?[^\s"\'<>]*)?', re.I),
+    # CDN and Shopify patterns
+    re.compile(r'https?://cdn\.shopify\.com/[^\s"\'<>]+', re.I),
+    re.compile(r'https?://[^\s"\'<>]*\.shopifycdn\.com/[^\s"\'<>]+', re.I),
+    re.compile(r'https?://[^\s"\'<>]*amazonaws\.com/[^\s"\'<>]+\.(?:jpg|jpeg|png|gif|webp)', re.I),
+    # Common CMS patterns
+    re.compile(r'https?://[^\s"\'<>]*\.(?:cloudinary|imgix|cloudfront)\.com/[^\s"\'<>]+', re.I),
+    # Any URL with 'image' in the path
+    re.compile(r'https?://[^\s"\'<>]*image[^\s"\'<>]*\.' + IMAGE_EXTENSIONS, re.I),
+    re.compile(r'https?://[^\s"\'<>]*/images?/[^\s"\'<>]+\.' + IMAGE_EXTENSIONS, re.I),
+    # data-src and other lazy loading attributes
+    re.compile(r'data-src=["\'](https?://[^"\']+\.' + IMAGE_EXTENSIONS + r'[^"\']*)["\']', re.I),
+    re.compile(r'data-original=["\'](https?://[^"\']+\.' + IMAGE_EXTENSIONS + r'[^"\']*)["\']', re.I),
+)
+OG_IMAGE_PATTERNS = (
+    re.compile(r'<meta[^>]*property=["\']og:image["\'][^>]*content=["\']([^"\']+)["\'][^>]*>', re.I),
+    re.compile(r'<meta[^>]*content=["\']([^"\']+)["\'][^>]*property=["\']og:image["\'][^>]*>', re.I),
+    re.compile(r'property=["\']og:image["\'][^>]*content=["\']([^"\']+)["\']', re.I),
+    re.compile(r'content=["\']([^"\']+)["\'][^>]*property=["\']og:image["\']', re.I),
+)
+
+# Product size
+SIZE_UNITS = r'(?:lb|oz|g|kg)'
+PACKAGE_SIZE_PATTERNS = (
+    re.compile(r'sold\s+(?:as\s+)?(?:two\s+)?(\d+(?:\.\d+)?\s*' + SIZE_UNITS + r')\s+packages?', re.IGNORECASE),
+    re.compile(r'sold\s+in\s+(\d+(?:\.\d+)?\s*' + SIZE_UNITS + r')\s+packages?', re.IGNORECASE),
+    re.compile(r'individual\s+package[:\s]*(\d+(?:\.\d+)?\s*' + SIZE_UNITS + r')', re.IGNORECASE),
+    re.compile(r'each\s+package[:\s]*(\d+(?:\.\d+)?\s*' + SIZE_UNITS + r')', re.IGNORECASE),
+    re.compile(r'package\s+size[:\s]*(\d+(?:\.\d+)?\s*' + SIZE_UNITS + r')', re.IGNORECASE),
+    re.compile(r'(\d+(?:\.\d+)?\s*' + SIZE_UNITS + r')\s+packages?', re.IGNORECASE),
+)
+SIZE_DETAIL_ATTR_RE = re.compile(r'(product|details|spec|info|size|weight)', re.I)
+SKU_LABEL_RE = re.compile(r'(product code|sku|item|model)', re.I)
+SIZE_PATTERNS = (
+    # Most specific patterns first (exact matches)
+    re.compile(r'(\d+(?:\.\d+)?\s*oz)\b', re.IGNORECASE),  # "2.47 oz"
+    re.compile(r'(\d+(?:\.\d+)?\s*lbs?)\b', re.IGNORECASE),  # "5.5 lb" or "5.5 lbs"
+    re.compile(r'(\d+(?:\.\d+)?\s*g)\b', re.IGNORECASE),  # "100 g"
+    re.compile(r'(\d+(?:\.\d+)?\s*kg)\b', re.IGNORECASE),  # "1.5 kg"
+    re.compile(r'(\d+(?:\.\d+)?\s*ml)\b', re.IGNORECASE),  # "250 ml"
+    re.compile(r'(\d+(?:\.\d+)?\s*fl\s*oz)\b', re.IGNORECASE),  # "8 fl oz"
+    # More general patterns
+    re.compile(r'(\d+(?:\.\d+)?\s*(?:ounce|ounces))\b', re.IGNORECASE),
+    re.compile(r'(\d+(?:\.\d+)?\s*(?:pound|pounds))\b', re.IGNORECASE),
+    re.compile(r'(\d+(?:\.\d+)?\s*(?:gram|grams))\b', re.IGNORECASE),
+    re.compile(r'(\d+(?:\.\d+)?\s*(?:kilogram|kilograms))\b', re.IGNORECASE),
+    re.compile(r'(\d+(?:\.\d+)?\s*(?:milliliter|milliliters))\b', re.IGNORECASE),
+    re.compile(r'(\d+(?:\.\d+)?\s*(?:liter|liters))\b', re.IGNORECASE),
+    re.compile(r'(\d+(?:\.\d+)?\s*(?:fluid\s*ounce|fluid\s*ounces))\b', re.IGNORECASE),
+    # Titles like "Product Name | 2.47 oz Pouch"
+    re.compile(r'[|\-–]\s*(\d+(?:\.\d+)?\s*oz)\s*(?:pouch|can|bag|package)?', re.IGNORECASE),
+    re.compile(r'[|\-–]\s*(\d+(?:\.\d+)?\s*lbs?)\s*(?:pouch|can|bag|package)?', re.IGNORECASE),
+    # Parenthetical sizes like "(2.47oz)"
+    re.compile(r'\((\d+(?:\.\d+)?\s*oz)\)', re.IGNORECASE),
+    re.compile(r'\((\d+(?:\.\d+)?\s*lbs?)\)', re.IGNORECASE),
+)
+# Applied in order: "fluid ounces" has already become "fluid oz" by the time the fluid ounce rule runs
+SIZE_UNIT_STANDARDIZATIONS = (
+    (re.compile(r'\bounces?\b', re.IGNORECASE), 'oz'),
+    (re.compile(r'\bpounds?\b', re.IGNORECASE), 'lbs'),
+    (re.compile(r'\bpound\b', re.IGNORECASE), 'lb'),
+    (re.compile(r'\bgrams?\b', re.IGNORECASE), 'g'),
+    (re.compile(r'\bkilograms?\b', re.IGNORECASE), 'kg'),
+    (re.compile(r'\bmilliliters?\b', re.IGNORECASE), 'ml'),
+    (re.compile(r'\bliters?\b', re.IGNORECASE), 'l'),
+    (re.compile(r'\bfluid\s+ounces?\b', re.IGNORECASE), 'fl oz'),
+    (re.compile(r'\bfl\s+oz\b', re.IGNORECASE), 'fl oz'),
+)
+SIZE_NUMBER_UNIT_RE = re.compile(r'(\d+(?:\.\d+)?)\s+(oz|lb|lbs|g|kg|ml|l)\b')
+SIZE_IN_TEXT_RE = re.compile(r'\d+(?:\.\d+)?\s*(?:fl\s*oz|oz|lbs?|pounds?|g|kg|ml|ounces?)\b', re.IGNORECASE)
+SIZE_OPTION_NAME_RE = re.compile(r'size|weight', re.IGNORECASE)
+# Target titles end with the package size, e.g. "... Dry Cat Food - 5lbs"
+TARGET_TITLE_SIZE_RE = re.compile(r'\s+-\s+(\d+(?:\.\d+)?\s*(?:fl oz|oz|lbs?|g|kg|ml)\b.*)$', re.IGNORECASE)
+
+# Ingredient list cleanup
+# Everything from the first of these phrases onwards is navigation, footer or marketing copy. Removing
+# each pattern's match in turn and cutting at the earliest match of any of them leave the same text.
+UNWANTED_TRAILING_PATTERNS = [
+    r'view all ingredients.*',
+    r'download.*ingredient.*list.*',
+    r'open in new window.*',
+    r'contact us.*',
+    r'reviews.*',
+    r'discover similar.*',
+    r'sitemap.*',
+    r'navigate to.*',
+    r'all rights reserved.*',
+    r'trademark.*',
+    r'©.*',
+    r'facebook.*',
+    r'twitter.*',
+    r'youtube.*',
+    r'instagram.*',
+    r'feed.*instructions.*',
+    r'guaranteed.*analysis.*',
+    r'nutritional.*info.*',
+    # Marketing phrases
+    r'tantalize.*',
+    r'gourmet.*',
+    r'delicious flavor.*',
+    r'hand-crafted.*',
+    r'toppers offer.*',
+    r'invite your cat.*',
+    r'experience gourmet.*',
+    r'looks good enough for you.*',
+    r'crafted especially for.*',
+    r'attention to detail.*',
+    r'unique taste cats love.*',
+    r'tender bites.*',
+    r'savory broth.*',
+    r'most refined.*',
+    r'between-meal snack.*',
+    r'complement tray.*',
+    r'single-serve.*',
+    r'adult cat food complement.*',
+    r'made to meet your.*',
+    r'ingredient criteria.*',
+    r'serve fancy feast.*',
+    r'favorite fancy feast.*',
+    r'add delicious flavor.*',
+    r'real high quality ingredients.*',
+    r'perfect way.*',
+    r'grain free.*appetizers.*',
+    r'cats alone or over.*',
+    r'the right size for.*',
+]
+UNWANTED_TRAILING_CONTENT_RE = re.compile(any_of(UNWANTED_TRAILING_PATTERNS), re.IGNORECASE | re.DOTALL)
+
+# Endings that don't name a specific ingredient; at most one of them can end a given text
+GENERIC_ENDING_PATTERNS = [
+    r',?\s*and\s+other\s+minerals?\s*$',
+    r',?\s*and\s+other\s+vitamins?\s*$',
+    r',?\s*and\s+other\s+supplements?\s*$',
+    r',?\s*and\s+other\s+additives?\s*$',
+    r',?\s*and\s+other\s+ingredients?\s*$',
+    r',?\s*etc\.?\s*$',
+    r',?\s*and\s+more\s*$',
+]
+GENERIC_ENDING_RE = re.compile(any_of(GENERIC_ENDING_PATTERNS), re.IGNORECASE)
+
+# The ingredient normalizer only stops at commas and parentheses; a "Vitamins"/"Minerals" label
+# right before an opening parenthesis marks a group that is unwrapped
+INGREDIENT_STRUCTURE_RE = re.compile(r'[(),]')
+NUTRIENT_GROUP_LABEL_RE = re.compile(r'\b(?:vitamins|minerals)\s*$', re.IGNORECASE)
+
+# Ingredients that run together in scraped text ("ChickenRice", "Oil-, "), fixed in this order
+INGREDIENT_COMMA_FIXES = (
+    # Dry food patterns that start with meat: "ChickenRice" -> "Chicken, Rice"
+    (re.compile(r'(Chicken|Beef|Salmon|Turkey|Duck|Lamb)(Rice|Meal|Protein)'), r'\1, \2'),
+    # "RicePoultry" -> "Rice, Poultry"
+    (re.compile(r'(Rice|Corn|Wheat|Oat)(Poultry|Chicken|Beef|Protein|Meal)'), r'\1, \2'),
+    (re.compile(r'(Rice|Corn|Wheat|Oat)(Poultry By-Product)'), r'\1, \2'),
+    # Lowercase/number/parenthesis followed by a capital letter starts a new ingredient
+    (re.compile(r'([a-z0-9\)])([A-Z][a-z])'), r'\1, \2'),
+    # Undo splits inside names the rule above breaks apart
+    (re.compile(r', (Vitamin [A-Z]-?\d+)'), r', \1'),
+    (re.compile(r'Starch-, Modified'), 'Starch-Modified'),
+    (re.compile(r'B-, (\d)'), r'B-\1'),
+    (re.compile(r'Oil-, '), 'Oil, '),
+    (re.compile(r'Acid-, '), 'Acid, '),
+    (re.compile(r'Meal-, '), 'Meal, '),
+    (re.compile(r'By-, Product'), 'By-Product'),
+    # Fish/meat + other ingredients
+    (re.compile(r'(Salmon|Chicken|Beef|Turkey|Duck|Tuna|Lamb)(Meal|Broth|Oil|Fat)'), r'\1, \2'),
+    # Double, leading and trailing commas
+    (re.compile(r',\s*,'), ','),
+    (re.compile(r'^,\s*'), ''),
+    (TRAILING_COMMA_RE, ''),
+)
+
+# Ingredient validation
+INGREDIENT_CODE_RE = re.compile(r'^[A-Za-z]\d{5,}$')  # D600724, N600123
+VITAMIN_CODE_RE = re.compile(r'^[be]\d{1,3}$')  # B1, E300
+HYPHENATED_CODE_RE = re.compile(r'^[a-z]{1,2}-\d+$')  # B-12
+LETTERS_THEN_DIGITS_RE = re.compile(r'^[a-z]{1,3}\d{3,}$')  # k600323, ab12345
+DIGITS_THEN_LETTERS_RE = re.compile(r'^\d{3,}[a-z]{1,3}$')  # 12345k, 600ab
+MIXED_DIGIT_GROUPS_RE = re.compile(r'\d.*[a-z].*\d')  # z2z3z4, abc123def456
+
+# Ingredient sections in page text
+SECTION_MARKERS = (r'guaranteed\s+analysis|feeding|directions|nutritional\s+info|calories|shipping|returns|nutrition\s+facts|'
+                   r'allergen|warning|storage|best\s+before|expir|net\s+weight|related\s+products|you\s+may\s+also\s+like|'
+                   r'similar\s+products|product\s+details')
+INGREDIENT_TEXT_PATTERNS = (
+    # Most precise: stop at specific section markers and product boundaries
+    re.compile(r'ingredients?[:\s]+(.*?)(?=\n\s*(?:' + SECTION_MARKERS + r'|other\s+flavors|$))', re.DOTALL | re.IGNORECASE),
+    re.compile(r'ingredient (?:list|panel)[:\s]+(.*?)(?=\n\s*(?:' + SECTION_MARKERS + r'|$))', re.DOTALL | re.IGNORECASE),
+    re.compile(r'contains[:\s]+(.*?)(?=\n\s*(?:' + SECTION_MARKERS + r'|$))', re.DOTALL | re.IGNORECASE),
+    re.compile(r'made with[:\s]+(.*?)(?=\n\s*(?:' + SECTION_MARKERS + r'|$))', re.DOTALL | re.IGNORECASE),
+    # Controlled length patterns to prevent cross-contamination
+    re.compile(r'ingredients?[:\s]+(.{20,800}?)(?=\n\n|\n\s*[A-Z][A-Z\s]+:|\n\s*\d+\s*%|\n\s*guaranteed|$)', re.DOTALL | re.IGNORECASE),
+    re.compile(r'ingredient (?:list|panel)[:\s]+(.{20,600}?)(?=\n\s*[A-Z][A-Z\s]+:|\n\s*\d+\s*%|\n\s*guaranteed|$)', re.DOTALL | re.IGNORECASE),
+)
+INGREDIENT_START_PATTERNS = (
+    # Most precise: stop at specific section markers
+    re.compile(r'ingredients?[:\s]+(.*?)(?=\n\s*(?:' + SECTION_MARKERS + r'|$))', re.IGNORECASE | re.DOTALL),
+    # Medium precision: stop at paragraph breaks or section headers, but limit length
+    re.compile(r'ingredients?[:\s]+(.{20,800}?)(?=\n\n|\n\s*[A-Z][A-Z\s]+:|\n\s*\d+\s*%|$)', re.IGNORECASE | re.DOTALL),
+    # Fallback with strict length limit to prevent cross-contamination
+    re.compile(r'ingredient\s+list[:\s]+(.{20,600}?)(?=\n\n|\n[A-Z]|$)', re.IGNORECASE | re.DOTALL),
+    re.compile(r'contains[:\s]+(.{20,500}?)(?=\n\n|\n[A-Z]|$)', re.IGNORECASE | re.DOTALL),
+)
+LABEL_SECTION_END = r'(?=\s*(?:guaranteed\s+analysis|feeding|directions|nutritional|calories|shipping|returns|$))'
+LABEL_INFO_PATTERNS = (
+    # Target-specific pattern: Label info section with "Ingredients:" prefix
+    re.compile(r'label\s+info[^:]*?ingredients:\s*([^.]*?(?:vitamin\s+d-?3\s+supplement|folic\s+acid|[a-z]\d{6,}\.?))', re.IGNORECASE | re.DOTALL),
+    # More general patterns
+    re.compile(r'label\s+info[:\s]*([^<]*?)' + LABEL_SECTION_END, re.IGNORECASE | re.DOTALL),
+    re.compile(r'label\s+information[:\s]*([^<]*?)' + LABEL_SECTION_END, re.IGNORECASE | re.DOTALL),
+    re.compile(r'product\s+label[:\s]*([^<]*?)' + LABEL_SECTION_END, re.IGNORECASE | re.DOTALL),
+)
+LABEL_INGREDIENTS_RE = re.compile(r'ingredients:\s*([^.]*?(?:vitamin\s+d-?3\s+supplement|folic\s+acid|[a-z]\d{6,}\.?))', re.IGNORECASE | re.DOTALL)
+LABEL_PROTEIN_LIST_RE = re.compile(r'((?:water|chicken|beef|salmon|tuna|turkey|duck|lamb)[^.]*?(?:rosemary\s+extract|vitamin\s+e|mixed\s+tocopherols|vitamin\s+d-?3\s+supplement))', re.IGNORECASE | re.DOTALL)
+CHICKEN_TO_ROSEMARY_RE = re.compile(r'(chicken[^.]*?rosemary\s+extract)', re.IGNORECASE | re.DOTALL)
+CHICKEN_LIST_RE = re.compile(r'chicken[,\s][^.]*?(?:rosemary\s+extract|vitamin\s+e\s+supplement|mixed\s+tocopherols|sodium\s+selenite|ethylenediamine\s+dihydriodide)', re.IGNORECASE | re.DOTALL)
+OUR_INGREDIENTS_RE = re.compile(r'our\s+ingredients[:\s]*([A-Z][^.]*?(?:rosemary\s+extract|vitamin\s+[a-z]\d*\s+supplement|sodium\s+selenite|ethylenediamine\s+dihydriodide)\.?)', re.IGNORECASE | re.DOTALL)
+INGREDIENTS_LABEL_PREFIX_RE = re.compile(r'^ingredients\s*', re.IGNORECASE)
+INGREDIENTS_LABEL_RE = re.compile(r'^\s*ingredients\s*:\s*', re.IGNORECASE)
+REPEATED_INGREDIENTS_LABEL_RE = re.compile(r'^(?:ingredients\s*:?\s*)+', re.IGNORECASE)  # accordion heading + label
+
+# Ingredients in product description HTML run from an "Ingredients" label to the next section heading
+DESCRIPTION_SECTION_END = r'(?=\n\s*(?:guaranteed\s+analysis|typical\s+analysis|calori|feeding|directions|nutrition|analytical)|$)'
+DESCRIPTION_INGREDIENTS_RE = re.compile(r'ingredients\s*:?\s*(.+?)' + DESCRIPTION_SECTION_END, re.IGNORECASE | re.DOTALL)
+DESCRIPTION_CALORIES_RE = re.compile(r'(\d[\d,]*(?:\.\d+)?)\s*kcal\s*(?:ME\s*)?/\s*(kg|cup|can|oz|lb|pouch|treat)', re.IGNORECASE)
+
+# Target
+# Ingredients revealed by clicking Target's accordion
+TARGET_RENDERED_INGREDIENT_PATTERNS = (
+    # Captures until period
+    re.compile(r'(chicken\s+broth[^.]+\.)', re.IGNORECASE),
+    re.compile(r'((?:chicken|fish|tuna|beef|turkey|lamb)\s+broth[^.]+\.)', re.IGNORECASE),
+    # More general patterns
+    re.compile(r'ingredients[:\s]*([^.]+\.)', re.IGNORECASE),
+    re.compile(r'ingredients[:\s]*\n\s*(.+?)(?:\n\n|\n[A-Z]|$)', re.IGNORECASE),
+    # Fallback pattern for other formats
+    re.compile(r'([a-z][a-z\s,()]+(?:chicken|fish|tuna|beef|turkey|lamb)[a-z\s,()]*(?:,\s*[a-z][a-z\s()]*){2,}\.?)', re.IGNORECASE),
+)
+TARGET_RENDERED_SIMPLE_RE = re.compile(r'ingredients[^\n]*?\n\s*([a-z][^.]*?(?:,\s*[a-z][^.,]*?){1,10})[.\n]', re.IGNORECASE)
+
+# Applaws accordions
+APPLAWS_INGREDIENTS_RE = re.compile(r'ingredients\s+([a-z][a-z\s,]*(?:chicken|tuna|fish|beef|turkey|lamb|rice|flour|broth|water|oil)[a-z\s,]*?)(?=\s*\.\s*nutritional|\s*nutritional|\s*guaranteed|\s*peek|\s*$)', re.IGNORECASE)
+APPLAWS_INGREDIENT_FALLBACK_PATTERNS = (
+    # "Ingredients X, Y, Z" format
+    re.compile(r'ingredients[:\s]+([a-z][^.]*?(?:,\s*[a-z][^,]*){1,})', re.IGNORECASE),
+    # Clean ingredient lists (protein + at least 2 other items)
+    re.compile(r'((?:chicken|fish|tuna|beef|turkey|lamb)[^,]*(?:,\s*[a-z][^,]*){1,})', re.IGNORECASE),
+    # Broth-based ingredients
+    re.compile(r'((?:chicken|fish|tuna|beef|turkey|lamb)\s+(?:broth|fillet)[^,]*(?:,\s*[a-z][^,]*){1,})', re.IGNORECASE),
+)
+APPLAWS_INGREDIENT_PATTERNS = (
+    re.compile(r'Ingredients[:\s]*([^.]*?(?:Tuna|Chicken|Fish|Beef|Turkey|Lamb)[^.]*?(?:Broth|Oil|Starch|Gum)[^.]*?)(?:\s*\*|Nutritional|Guaranteed|$)', re.IGNORECASE),
+    re.compile(r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*(?:,\s*[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*){3,})', re.IGNORECASE),
+    re.compile(r'((?:Tuna|Chicken|Fish|Beef|Turkey|Lamb)[^.]*?(?:,\s*[^.,]{3,30}){2,}[^.]*?)(?:\.|$)', re.IGNORECASE),
+)
+APPLAWS_GA_PATTERNS = (
+    # Protein-first format
+    re.compile(r'(crude\s+protein[^%]+%[^,]*,\s*crude\s+fat[^%]+%[^,]*,\s*crude\s+fiber[^%]+%[^,]*,\s*moisture[^%]+%[^.]*)', re.IGNORECASE),
+    re.compile(r'(crude\s+protein[^.]+fat[^.]+fiber[^.]+moisture[^.]*%)', re.IGNORECASE),
+    re.compile(r'(protein[^.]*%[^.]*fat[^.]*%[^.]*fiber[^.]*%[^.]*moisture[^.]*%)', re.IGNORECASE),
+    # Fat-first format (like kitten tuna)
+    re.compile(r'(crude\s+fat[^%]+%[^,]*,\s*crude\s+fib[a-z]*[^%]+%[^,]*,\s*moisture[^%]+%[^,]*,\s*crude\s+protein[^%]+%)', re.IGNORECASE),
+    # Any order
+    re.compile(r'((?:crude\s+)?(?:fat|protein|fiber|fibre|moisture)[^%]*%[^,]*,\s*(?:crude\s+)?(?:fat|protein|fiber|fibre|moisture)[^%]*%[^,]*,\s*(?:crude\s+)?(?:fat|protein|fiber|fibre|moisture)[^%]*%[^,]*,\s*(?:crude\s+)?(?:fat|protein|fiber|fibre|moisture)[^%]*%)', re.IGNORECASE),
+    # Any sequence with multiple nutritional components
+    re.compile(r'((?:crude\s+)?(?:fat|protein|fib[a-z]*|moisture)[^%]*%[^.]*(?:,\s*[^.]*%[^.]*){2,})', re.IGNORECASE),
+)
+
+# Guaranteed analysis
+GA_COMPONENT_PATTERNS = (
+    ('Crude Protein (min)', re.compile(r'Crude\s+Protein\s+\([^)]+\)\s*:?\s*(\d+(?:\.\d+)?%)', re.IGNORECASE)),
+    ('Crude Fat (min)', re.compile(r'Crude\s+Fat\s+\([^)]+\)\s*:?\s*(\d+(?:\.\d+)?%)', re.IGNORECASE)),
+    ('Crude Fiber (max)', re.compile(r'(?:Crude\s+)?Fiber\s+\([^)]+\)\s*:?\s*(\d+(?:\.\d+)?%)', re.IGNORECASE)),
+    ('Moisture (max)', re.compile(r'Moisture\s+\([^)]+\)\s*:?\s*(\d+(?:\.\d+)?%)', re.IGNORECASE)),
+)
+GA_PROTEIN_MIN_RE = re.compile(r'Crude\s+Protein\s+\(min\)\s+(\d+(?:\.\d+)?%)', re.IGNORECASE)
+GA_FAT_MIN_RE = re.compile(r'Crude\s+Fat\s+\(min\)\s+(\d+(?:\.\d+)?%)', re.IGNORECASE)
+GA_MOISTURE_MAX_RE = re.compile(r'Moisture\s+\(max\)\s+(\d+(?:\.\d+)?%)', re.IGNORECASE)
+# Components in raw HTML (Only Natural Pet, product descriptions), stopping at the next tag
+HTML_GA_COMPONENT_PATTERNS = (
+    ('protein', re.compile(r'Crude Protein[^<]*?(\d+(?:\.\d+)?%)', re.IGNORECASE)),
+    ('fat', re.compile(r'Crude Fat[^<]*?(\d+(?:\.\d+)?%)', re.IGNORECASE)),
+    ('fiber', re.compile(r'Crude Fiber[^<]*?(\d+(?:\.\d+)?%)', re.IGNORECASE)),
+    ('moisture', re.compile(r'Moisture[^<]*?(\d+(?:\.\d+)?%)', re.IGNORECASE)),
+)
+
+# Calories
+CALORIES_PER_KG_PATTERNS = (
+    re.compile(r'(\d+(?:\.\d+)?\s*kcal/kg)', re.IGNORECASE),
+    re.compile(r'(\d+(?:\.\d+)?\s*kcal\s*/\s*kg)', re.IGNORECASE),
+    re.compile(r'(\d+(?:\.\d+)?\s*kilocalories?\s*/\s*kg)', re.IGNORECASE),
+    re.compile(r'(\d+(?:\.\d+)?\s*cal/kg)', re.IGNORECASE),
+)
+KCAL_PER_KG_RE = re.compile(r'(\d+,?\d*)\s*kcal/kg', re.IGNORECASE)
+KCAL_PER_OZ_RE = re.compile(r'(\d+(?:\.\d+)?)\s*kcal/oz', re.IGNORECASE)
+
+# Viva Raw (and other Shopify stores with "facts" metafields)
+VARIANT_PARAM_RE = re.compile(r'variant[=:](\d+)')
+METAFIELD_FACTS_RE = re.compile(r'"facts":\s*\[(.*?)\]', re.DOTALL)
+FACT_ITEM_RE = re.compile(r'"([^"]*\|[^"]*)"')
+# (pattern, per ounce): per-ounce values are checked against a lower calorie range
+VIVA_CALORIE_PATTERNS = tuple((pattern, False) for pattern in CALORIES_PER_KG_PATTERNS) + (
+    (re.compile(r'(\d+(?:\.\d+)?\s*kcal)', re.IGNORECASE), False),
+    (re.compile(r'calories\s+per\s+ounce[:\s]*(\d+(?:\.\d+)?)', re.IGNORECASE), True),
+    (re.compile(r'(\d+(?:\.\d+)?)\s*calories\s+per\s+ounce', re.IGNORECASE), True),
+    (re.compile(r'calories[:\s]*(\d+(?:\.\d+)?)\s*(?:per\s+)?(?:oz|ounce)', re.IGNORECASE), True),
+    (re.compile(r'(\d+(?:\.\d+)?)\s*kcal\s*/\s*oz', re.IGNORECASE), True),
+    (re.compile(r'(\d+(?:\.\d+)?)\s*kcal\s+per\s+oz', re.IGNORECASE), True),
+)
+VIVA_INFO_KCAL_PER_OUNCE_RE = re.compile(r'"info":\s*"~?(\d+(?:\.\d+)?)\s*kilocalories?\s+per\s+ounce[^"]*"', re.IGNORECASE | re.DOTALL)
+VIVA_SCRIPT_CALORIE_PATTERNS = (
+    re.compile(r'"info":\s*"~?(\d+(?:\.\d+)?)\s*kilocalories?\s+per\s+ounce"', re.IGNORECASE),
+    re.compile(r'"info":\s*"~?(\d+(?:\.\d+)?)\s*kcal\s+per\s+oz"', re.IGNORECASE),
+    re.compile(r'"info":\s*"~?(\d+(?:\.\d+)?)\s*calories?\s+per\s+ounce"', re.IGNORECASE),
+    re.compile(r'"info":\s*"[^"]*?(\d+(?:\.\d+)?)[^"]*?(?:kilocalories?|kcal)[^"]*?per\s+ounce[^"]*?"', re.IGNORECASE),
+)
+VIVA_PURE_INGREDIENTS_RE = re.compile(r'Ingredients:\s*([A-Z][^.]*?(?:Ground Bone|Heart|Liver)[^.]*?)(?:\s*Humanely|$)', re.IGNORECASE | re.DOTALL)
+VIVA_MARKETING_END_PATTERNS = (
+    re.compile(r'3%\s+Natural\s+Supplements', re.IGNORECASE),
+    re.compile(r'growth-promoting\s+antibiotics[^.]*?supplements', re.IGNORECASE),
+    re.compile(r'\d+%\s+Natural\s+Supplements', re.IGNORECASE),
+)
+VIVA_AAFCO_START_PATTERNS = (
+    re.compile(r'Formulated\s+to\s+meet', re.IGNORECASE),
+    re.compile(r'AAFCO\s+Cat\s+Food', re.IGNORECASE),
+)
+VIVA_INGREDIENT_PATTERNS = (
+    # Standard "with Ground Bone" format
+    re.compile(r'((?:Turkey|Chicken|Duck|Rabbit)\s+with\s+Ground\s+Bone[^.]*?(?:Chelate|Supplement|Extract|Acid|Oil|Yeast))', re.IGNORECASE | re.DOTALL),
+    # Beef format (no "with Ground Bone")
+    re.compile(r'(Beef,\s+Beef\s+Heart[^.]*?(?:Chelate|Supplement|Extract|Acid|Oil|Yeast))', re.IGNORECASE | re.DOTALL),
+    # General protein-based format
+    re.compile(r'((?:Turkey|Chicken|Beef|Duck|Rabbit)(?:\s+with\s+Ground\s+Bone)?,\s*(?:Turkey|Chicken|Beef|Duck|Rabbit)[^.]*?(?:Chelate|Supplement|Extract|Acid|Oil|Yeast))', re.IGNORECASE | re.DOTALL),
+)
+VIVA_FALLBACK_INGREDIENTS_RE = re.compile(r'Ingredients[:\s]*([^.]*?(?:Chicken|Beef|Duck|Turkey|Rabbit)[^.]*?(?:Heart|Liver|Gizzard|Bone)[^.]*?)(?:\s*(?:Humanely|Formulated)|$)', re.IGNORECASE | re.DOTALL)
+VIVA_HUMANELY_RAISED_RE = re.compile(r'\d+%\s+Humanely\s+Raised[^,]*,?\s*', re.IGNORECASE)
+VIVA_NATURAL_SUPPLEMENTS_RE = re.compile(r'\d+%\s+Natural\s+Supplements\s*', re.IGNORECASE)
+
+# Only Natural Pet
+ONP_INGREDIENT_PATTERNS = (
+    # The clean ingredient list in metafields
+    re.compile(r'"ingredients":\s*"[^"]*INGREDIENTS[^:]*:\s*([^"]*Turkey[^"]*Folic Acid[^"]*)"', re.IGNORECASE | re.DOTALL),
+    # Ingredients in the main content
+    re.compile(r'INGREDIENTS[^:]*:\s*([A-Z][^<]*?(?:Turkey|Chicken)[^<]*?Folic Acid)', re.IGNORECASE | re.DOTALL),
+)
+
+# Platform detection
+SHOPIFY_CDN_RE = re.compile(r'cdn\.shopify\.com')
+SHOPIFY_PRODUCT_PATH_RE = re.compile(r'^(.*?/products/[^/?#.]+)')
+WP_CONTENT_RE = re.compile(r'/wp-content/')
+
+# Discovery: URL paths of product pages on common shop platforms (Shopify and WooCommerce /products/ and
+# /product/, Target /p/, Amazon and Chewy /dp/, Walmart /ip/); sites can override with 'product_urls'
+PRODUCT_URL_RE = re.compile(any_of([
+    r'/products?/[^/]+/?$',
+    r'/p/[^/]+/-/A-\d+',
+    r'/dp/\w+',
+    r'/ip/[^/]+/\d+',
+]), re.IGNORECASE)
+
+# URL validation: a DNS host name (letters, digits and hyphens per label, at least two labels)
+HOSTNAME_RE = re.compile(r'^(?:[a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?\.)+[a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?$',
+                         re.IGNORECASE)
+
+# Change detection: markup that differs between requests for the same content
+VOLATILE_MARKUP_RE = re.compile(any_of([
+    r'\snonce="[^"]*"',
+    r'<input[^>]+name="[^"]*(?:csrf|token|authenticity)[^"]*"[^>]*>',
+    r'<meta[^>]+name="csrf[^"]*"[^>]*>',
+    r'"(?:requestId|request_id|csrfToken|nonce|serverTime)"\s*:\s*"[^"]*"',
+]), re.IGNORECASE)
+
+# Name -> compiled pattern (or ordered group of patterns) for everything above
+REGISTRY = {
+    name: value for name, value in list(globals().items())
+    if name.isupper() and isinstance(value, (re.Pattern, tuple, dict))
+}
+
+def iter_patterns(value):
+    """Yield the compiled patterns inside a registry entry (a pattern, an ordered tuple, or a dict of them)"""
+    if isinstance(value, re.Pattern):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from iter_patterns(item)
+    elif isinstance(value, tuple):
+        for item in value:
+            yield from iter_patterns(item)
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+
+import threading
+import time
+
+from url_utils import registered_domain
+
+class DomainRateLimiter:
+    """
+    Space requests to the same site at least `interval` seconds apart.
+
+    Each caller reserves the next free slot for the URL's registered domain (or whatever `key`
+    maps the URL to) and sleeps until it, so concurrent workers take turns on one site while
+    requests to other sites go straight through. Slots are kept per process; worker daemons each
+    pace their own requests.
+    """
+
+    def __init__(self, interval, key=registered_domain):
+        self.interval = interval
+        self.key = key
+        self._lock = threading.Lock()
+        self._next_slot = {}
+
+    def wait(self, url, interval=None, max_wait=None):
+        """
+        Block until a request to url's site may be made; returns the seconds waited.
+
+        `interval` overrides the spacing for this site (e.g. its robots.txt Crawl-delay). With
+        `max_wait`, a turn further away than that isn't taken: None is returned at once.
+        """
+        interval = self.interval if interval is None else interval
+        if interval <= 0:
+            return 0.0
+        domain = self.key(url)
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(domain, now))
+            if max_wait is not None and slot - now > max_wait:
+                return None
+            self._next_slot[domain] = slot + interval
+            # Forget sites whose slots have passed so the table doesn't grow with every domain seen
+            if len(self._next_slot) > 1000:
+                self._next_slot = {key: value for key, value in self._next_slot.items() if value > now}
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+        return delay
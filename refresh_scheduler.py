@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+
+import os
+import threading
+import time
+from datetime import datetime
+
+from job_queue import create_job, has_active_job
+from rate_limiter import DomainRateLimiter
+
+# Records last scraped longer ago than this (seconds) are due for a refresh
+REFRESH_MAX_AGE = float(os.environ.get('REFRESH_MAX_AGE', 7 * 24 * 3600))
+
+# Seconds between scheduler runs (0 = no scheduler; POST /refresh still works)
+REFRESH_INTERVAL = float(os.environ.get('REFRESH_INTERVAL', 3600))
+
+# Most records queued by one scheduler run
+REFRESH_BATCH = int(os.environ.get('REFRESH_BATCH', 50))
+
+# Seconds between refresh requests to the same site
+REFRESH_DOMAIN_INTERVAL = float(os.environ.get('REFRESH_DOMAIN_INTERVAL', 5))
+
+# Paces refresh job items per site (see process_job_item)
+domain_limiter = DomainRateLimiter(REFRESH_DOMAIN_INTERVAL)
+
+_lock = threading.Lock()
+_scheduler = []
+_state = {'lastRun': None, 'lastJobId': None, 'lastQueued': 0}
+
+def _seconds_since(timestamp, now):
+    """Age of an ISO timestamp (missing or unreadable ones count as infinitely old)"""
+    try:
+        return (now - datetime.fromisoformat(timestamp).replace(tzinfo=None)).total_seconds()
+    except (TypeError, ValueError):
+        return float('inf')
+
+def change_rate(record, now):
+    """Changes per REFRESH_MAX_AGE period since the record was first seen, from its history"""
+    changes = len(record.get('history') or [])
+    if not changes:
+        return 0.0
+    known_for = _seconds_since(record.get('firstSeen') or record.get('timestamp'), now)
+    if REFRESH_MAX_AGE <= 0 or known_for == float('inf'):
+        return float(changes)
+    return changes / max(known_for / REFRESH_MAX_AGE, 1.0)
+
+def refresh_priority(record, now, max_age=REFRESH_MAX_AGE):
+    """
+    How urgently a record needs rescraping: its age in units of max_age, weighted up by how
+    often the product has changed before (a page that changed every period counts double).
+    Records younger than max_age get 0.
+    """
+    age = _seconds_since(record.get('timestamp'), now)
+    if age < max_age:
+        return 0.0
+    staleness = age / max_age if max_age > 0 else age
+    return staleness * (1 + change_rate(record, now))
+
+def stale_records(records, max_age=REFRESH_MAX_AGE, limit=REFRESH_BATCH):
+    """Records due for a refresh, most urgent first, with their priority"""
+    now = datetime.now()
+    due = [(refresh_priority(record, now, max_age), record) for record in records if record.get('url')]
+    due = [(priority, record) for priority, record in due if priority > 0]
+    due.sort(key=lambda item: item[0], reverse=True)
+    return due[:limit]
+
+def refresh_active():
+    """True while any refresh job in the queue (from this process or another) still has items to scrape"""
+    return has_active_job('refresh')
+
+def schedule_refresh(records, max_age=REFRESH_MAX_AGE, limit=REFRESH_BATCH):
+    """
+    Queue a refresh job for the most urgent stale records; returns (job ID, number queued), or
+    (None, 0) when nothing is due or the previous refresh job hasn't finished.
+    """
+    with _lock:
+        _state['lastRun'] = datetime.now().isoformat()
+        if refresh_active():
+            return None, 0
+        due = stale_records(records, max_age, limit)
+        if not due:
+            return None, 0
+        job_id = create_job([record['url'] for _, record in due], {'refresh': True}, exclusive='refresh')
+        if job_id is None:
+            return None, 0
+        _state.update(lastJobId=job_id, lastQueued=len(due))
+        return job_id, len(due)
+
+def status():
+    """Scheduler settings and its last run"""
+    return dict(_state, enabled=bool(_scheduler), interval=REFRESH_INTERVAL, maxAge=REFRESH_MAX_AGE,
+                batch=REFRESH_BATCH, domainInterval=REFRESH_DOMAIN_INTERVAL, active=refresh_active())
+
+def _run(load_records, on_queued):
+    while True:
+        time.sleep(REFRESH_INTERVAL)
+        try:
+            job_id, count = schedule_refresh(load_records())
+            if job_id:
+                print(f"Refresh: queued {count} stale record(s) as job {job_id}")
+                on_queued()
+        except Exception as e:
+            print(f"Refresh: scheduler run failed ({e})")
+
+def _after_fork():
+    """A forked child has none of its parent's threads: let it start its own scheduler"""
+    global _lock
+    _lock = threading.Lock()
+    _scheduler.clear()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_after_fork)
+
+def start_scheduler(load_records, on_queued=lambda: None):
+    """
+    Start the background scheduler (once per process, and only with REFRESH_INTERVAL > 0): every
+    REFRESH_INTERVAL seconds the records from load_records() that are due are queued as a job,
+    and on_queued() is called so workers pick it up.
+    """
+    if REFRESH_INTERVAL <= 0:
+        return
+    with _lock:
+        if _scheduler:
+            return
+        _scheduler.append(threading.Thread(target=_run, args=(load_records, on_queued), name='refresh-scheduler',
+                                           daemon=True))
+    _scheduler[0].start()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+
+import gzip
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+
+# Rendered snapshots are keyed by URL + render recipe (e.g. which accordion was clicked),
+# so the same page rendered two different ways is cached twice.
+RENDER_CACHE_TTL = int(os.environ.get('RENDER_CACHE_TTL', 6 * 60 * 60))  # seconds
+RENDER_CACHE_MAX_BYTES = int(os.environ.get('RENDER_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+RENDER_CACHE_MAX_FILES = int(os.environ.get('RENDER_CACHE_MAX_FILES', 500))
+
+# Snapshots are also written to disk so debug scripts and restarts can reuse them.
+# Set RENDER_CACHE_DIR to an empty string to keep the cache in memory only.
+RENDER_CACHE_DIR = os.environ.get('RENDER_CACHE_DIR', 'render_cache')
+
+_snapshots = OrderedDict()  # key -> (stored_at, page_source), least recently used first
+_total_size = 0
+_lock = threading.Lock()
+_stats = {'hits': 0, 'disk_hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0}
+
+def _cache_key(url, recipe):
+    """Build the cache key for a URL rendered with a given recipe"""
+    return hashlib.sha1(f"{recipe}|{url}".encode('utf-8')).hexdigest()
+
+def _snapshot_path(key):
+    return os.path.join(RENDER_CACHE_DIR, f"{key}.html.gz")
+
+def _forget(key):
+    """Remove a snapshot from the in-memory LRU"""
+    global _total_size
+    entry = _snapshots.pop(key, None)
+    if entry is not None:
+        _total_size -= len(entry[1])
+
+def _remember(key, stored_at, page_source):
+    """Insert a snapshot into the in-memory LRU and evict until it fits the size bound"""
+    global _total_size
+
+    _forget(key)
+
+    # A single snapshot bigger than the whole budget is not worth keeping in memory
+    if len(page_source) > RENDER_CACHE_MAX_BYTES:
+        return
+
+    _snapshots[key] = (stored_at, page_source)
+    _total_size += len(page_source)
+
+    while _total_size > RENDER_CACHE_MAX_BYTES and _snapshots:
+        _, (_, evicted) = _snapshots.popitem(last=False)
+        _total_size -= len(evicted)
+        _stats['evictions'] += 1
+
+def _read_from_disk(key):
+    """Load a fresh snapshot from disk, or None if missing or expired"""
+    if not RENDER_CACHE_DIR:
+        return None
+    path = _snapshot_path(key)
+    try:
+        stored_at = os.path.getmtime(path)
+        if time.time() - stored_at > RENDER_CACHE_TTL:
+            os.remove(path)
+            return None
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            return stored_at, f.read()
+    except (OSError, EOFError):
+        return None
+
+def _write_to_disk(key, page_source):
+    """Persist a snapshot and keep the directory under RENDER_CACHE_MAX_FILES"""
+    if not RENDER_CACHE_DIR:
+        return
+    try:
+        os.makedirs(RENDER_CACHE_DIR, exist_ok=True)
+        tmp_path = _snapshot_path(key) + '.tmp'
+        with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+            f.write(page_source)
+        os.replace(tmp_path, _snapshot_path(key))
+
+        files = [os.path.join(RENDER_CACHE_DIR, name) for name in os.listdir(RENDER_CACHE_DIR)
+                 if name.endswith('.html.gz')]
+        if len(files) > RENDER_CACHE_MAX_FILES:
+            files.sort(key=os.path.getmtime)
+            for path in files[:len(files) - RENDER_CACHE_MAX_FILES]:
+                os.remove(path)
+    except OSError as e:
+        print(f"Warning: could not write render snapshot to disk: {e}")
+
+def get_snapshot(url, recipe):
+    """Return the cached rendered page source for url/recipe, or None if missing or expired"""
+    key = _cache_key(url, recipe)
+    now = time.time()
+
+    with _lock:
+        entry = _snapshots.get(key)
+        if entry is not None:
+            stored_at, page_source = entry
+            if now - stored_at <= RENDER_CACHE_TTL:
+                _snapshots.move_to_end(key)
+                _stats['hits'] += 1
+                return page_source
+            _forget(key)  # expired
+
+    disk_entry = _read_from_disk(key)
+    with _lock:
+        if disk_entry is not None:
+            _remember(key, *disk_entry)
+            _stats['disk_hits'] += 1
+            return disk_entry[1]
+        _stats['misses'] += 1
+    return None
+
+def store_snapshot(url, recipe, page_source):
+    """Cache a rendered page source (driver.page_source) for url/recipe"""
+    if not page_source:
+        return
+    key = _cache_key(url, recipe)
+    with _lock:
+        _remember(key, time.time(), page_source)
+        _stats['stores'] += 1
+    _write_to_disk(key, page_source)
+
+def clear_snapshots():
+    """Drop every cached snapshot, in memory and on disk"""
+    global _total_size
+    with _lock:
+        _snapshots.clear()
+        _total_size = 0
+    if RENDER_CACHE_DIR and os.path.isdir(RENDER_CACHE_DIR):
+        for name in os.listdir(RENDER_CACHE_DIR):
+            if name.endswith('.html.gz'):
+                try:
+                    os.remove(os.path.join(RENDER_CACHE_DIR, name))
+                except OSError:
+                    pass
+
+def snapshot_stats():
+    """Return cache counters for debugging"""
+    with _lock:
+        return dict(_stats, entries=len(_snapshots), size=_total_size,
+                    max_size=RENDER_CACHE_MAX_BYTES, ttl=RENDER_CACHE_TTL)
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+
+import atexit
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+from stats_file import flush_stats, merge_counts, read_stats
+from url_utils import registered_domain
+
+# Per-domain record of whether static HTML was enough and whether the browser ever helped
+RENDER_STATS_FILE = os.environ.get('RENDER_STATS_FILE', 'render_stats.json')
+
+# Keep probing (static pass, then browser for what's missing) until a domain has this many samples
+RENDER_MIN_SAMPLES = int(os.environ.get('RENDER_MIN_SAMPLES', 3))
+# Share of static passes that must be complete before a domain is trusted as static
+RENDER_STATIC_RATIO = float(os.environ.get('RENDER_STATIC_RATIO', 0.9))
+# Re-probe a decided domain every N scrapes so site changes are picked up
+RENDER_REPROBE_INTERVAL = int(os.environ.get('RENDER_REPROBE_INTERVAL', 25))
+# Seconds a scrape must have left of its budget before a browser is started for it
+RENDER_MIN_BUDGET = float(os.environ.get('RENDER_MIN_BUDGET', 10))
+# Seconds between writes of the stats file; counts are kept in memory in between (and written at exit)
+RENDER_STATS_FLUSH_INTERVAL = float(os.environ.get('RENDER_STATS_FLUSH_INTERVAL', 30))
+
+ROUTE_STATIC = 'static'
+ROUTE_RENDER = 'render'
+ROUTE_PROBE = 'probe'
+
+_stats = None    # counts from the file at the last flush plus this process's since then
+_pending = {}    # this process's counts since the last flush
+_last_flush = time.monotonic()
+_lock = threading.Lock()
+_local = threading.local()
+
+class RenderingDisabled(RuntimeError):
+    """Raised when the browser is requested while a scrape is routed to the static path or out of budget"""
+
+def _load_stats():
+    """Load the per-domain stats file once"""
+    global _stats
+    if _stats is None:
+        _stats = read_stats(RENDER_STATS_FILE)
+    return _stats
+
+def _save_stats(removed=()):
+    """
+    Add this process's counts to the stats file (merged with other processes' counts on disk) and
+    pick up theirs (caller holds _lock)
+    """
+    global _stats, _pending, _last_flush
+    _last_flush = time.monotonic()
+    try:
+        _stats = flush_stats(RENDER_STATS_FILE, _pending, removed)
+        _pending = {}
+    except OSError as e:
+        print(f"Warning: could not save render stats: {e}")
+
+def _record(domain, counts):
+    """Add counts to a domain's entry, writing the file once RENDER_STATS_FLUSH_INTERVAL has passed (caller holds _lock)"""
+    _domain_entry(domain)
+    merge_counts(_stats, {domain: counts})
+    merge_counts(_pending, {domain: counts})
+    if time.monotonic() - _last_flush >= RENDER_STATS_FLUSH_INTERVAL:
+        _save_stats()
+
+def flush_render_stats():
+    """Write counts recorded since the last write to the stats file"""
+    with _lock:
+        if _pending:
+            _save_stats()
+
+atexit.register(flush_render_stats)
+
+def _domain_entry(domain):
+    """A domain's counters, with zeros for any the file doesn't have yet (caller holds _lock)"""
+    entry = _load_stats().setdefault(domain, {})
+    for key in ('scrapes', 'static_attempts', 'static_complete', 'render_attempts', 'render_added'):
+        entry.setdefault(key, 0)
+    entry.setdefault('last_route', None)
+    entry.setdefault('updated', None)
+    return entry
+
+def _route_for(entry):
+    """Decide the route from a domain's counters"""
+    static_attempts = entry['static_attempts']
+    if static_attempts >= RENDER_MIN_SAMPLES and entry['static_complete'] / static_attempts >= RENDER_STATIC_RATIO:
+        return ROUTE_STATIC
+    if entry['render_added'] > 0:
+        # The browser has filled in fields static HTML was missing
+        return ROUTE_RENDER
+    if entry['render_attempts'] >= RENDER_MIN_SAMPLES:
+        # Rendering was tried repeatedly and never added anything
+        return ROUTE_STATIC
+    return ROUTE_PROBE
+
+def choose_route(url):
+    """Return 'static', 'render' or 'probe' for a URL based on what its domain has needed before"""
+    domain = registered_domain(url)
+    with _lock:
+        entry = _domain_entry(domain)
+        route = _route_for(entry)
+        if route != ROUTE_PROBE and (entry['scrapes'] + 1) % RENDER_REPROBE_INTERVAL == 0:
+            route = ROUTE_PROBE
+        _record(domain, {'scrapes': 1, 'last_route': route})
+        return route
+
+def record_static_result(url, complete):
+    """Record whether the static (no browser) pass produced complete ingredients/GA/nutrition"""
+    domain = registered_domain(url)
+    with _lock:
+        _record(domain, {'static_attempts': 1, 'static_complete': int(bool(complete)),
+                         'updated': datetime.now().isoformat()})
+
+def record_render_result(url, added):
+    """Record whether the browser pass filled in anything the static pass missed"""
+    domain = registered_domain(url)
+    with _lock:
+        _record(domain, {'render_attempts': 1, 'render_added': int(bool(added)),
+                         'updated': datetime.now().isoformat()})
+
+def get_render_stats():
+    """Return {domain: counters + current route} for the admin endpoint"""
+    with _lock:
+        return {domain: dict(entry, route=_route_for(entry))
+                for domain, entry in ((domain, _domain_entry(domain)) for domain in sorted(_load_stats()))}
+
+def reset_domain(domain):
+    """Forget what was learned about a domain so it is probed again; returns False if unknown"""
+    domain = registered_domain(domain)
+    with _lock:
+        if domain not in _load_stats():
+            return False
+        _pending.pop(domain, None)
+        _save_stats(removed=[domain])
+        _stats.pop(domain, None)
+        return True
+
+@contextmanager
+def static_only():
+    """Within this block the browser may not be started on the current thread"""
+    previous = getattr(_local, 'static_only', False)
+    _local.static_only = True
+    try:
+        yield
+    finally:
+        _local.static_only = previous
+
+@contextmanager
+def render_deadline(deadline):
+    """Within this block the browser may only be started while RENDER_MIN_BUDGET seconds remain before `deadline`
+    (a time.monotonic() value; None means no deadline)"""
+    previous = getattr(_local, 'deadline', None)
+    _local.deadline = deadline
+    try:
+        yield
+    finally:
+        _local.deadline = previous
+
+def rendering_allowed():
+    """False while the current thread is inside static_only() or too close to its render_deadline()"""
+    if getattr(_local, 'static_only', False):
+        return False
+    deadline = getattr(_local, 'deadline', None)
+    return deadline is None or deadline - time.monotonic() >= RENDER_MIN_BUDGET
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlparse
+
+import requests
+
+from rate_limiter import DomainRateLimiter
+from singleflight import SingleFlight
+
+# Check robots.txt before fetching (set to 0 to ignore it, e.g. for a brand's own staging site)
+ROBOTS_RESPECT = os.environ.get('ROBOTS_RESPECT', '1') != '0'
+
+# Product token matched against robots.txt User-agent groups ('*' groups apply when none names it)
+ROBOTS_USER_AGENT = os.environ.get('ROBOTS_USER_AGENT', 'PetScraper')
+
+# Seconds a host's parsed robots.txt is reused; failures (5xx, timeouts) are retried sooner
+ROBOTS_CACHE_TTL = float(os.environ.get('ROBOTS_CACHE_TTL', 24 * 60 * 60))
+ROBOTS_ERROR_TTL = float(os.environ.get('ROBOTS_ERROR_TTL', 10 * 60))
+ROBOTS_CACHE_SIZE = int(os.environ.get('ROBOTS_CACHE_SIZE', 2000))
+ROBOTS_TIMEOUT = 10
+
+# Longest robots.txt read; anything after it is ignored
+ROBOTS_MAX_BYTES = 500 * 1024
+
+# Longest wait for a host's Crawl-delay turn; a fetch whose turn is further away is skipped instead
+ROBOTS_MAX_CRAWL_DELAY = float(os.environ.get('ROBOTS_MAX_CRAWL_DELAY', 30))
+
+class RobotsRules:
+    """
+    One host's robots.txt rules for our user agent, compiled once.
+
+    Rules are kept longest pattern first (allow before disallow at equal length), so the first
+    one that matches a path decides, as in RFC 9309. '*' and a trailing '$' work as in Google's
+    robots.txt; a path no rule matches is allowed.
+    """
+
+    def __init__(self, rules=(), crawl_delay=None, sitemaps=(), disallow_all=False, unreachable=False):
+        self._rules = sorted(((len(pattern), allow, _compile(pattern)) for allow, pattern in rules),
+                             key=lambda rule: (rule[0], rule[1]), reverse=True)
+        self.crawl_delay = crawl_delay
+        self.sitemaps = list(sitemaps)
+        self.disallow_all = disallow_all
+        # robots.txt couldn't be fetched (5xx, network error): the host is treated as disallowing everything
+        self.unreachable = unreachable
+
+    def allowed(self, url):
+        if self.disallow_all:
+            return False
+        parsed = urlparse(url)
+        path = (parsed.path or '/') + (f'?{parsed.query}' if parsed.query else '')
+        if path == '/robots.txt':
+            return True
+        for _, allow, matcher in self._rules:
+            if matcher(path):
+                return allow
+        return True
+
+def _compile(pattern):
+    """Matcher for one Allow/Disallow path pattern"""
+    anchored = pattern.endswith('$')
+    body = pattern[:-1] if anchored else pattern
+    if '*' not in body and not anchored:
+        # Plain prefixes (nearly all rules) skip the regex engine
+        return lambda path: path.startswith(body)
+    regex = re.compile('.*'.join(re.escape(part) for part in body.split('*')) + ('$' if anchored else ''))
+    return lambda path: regex.match(path) is not None
+
+def parse_robots(text, agent=ROBOTS_USER_AGENT):
+    """
+    RobotsRules from robots.txt text: the groups naming `agent` (case-insensitive), or the '*'
+    groups when none does. Sitemap lines are collected whichever group they are in.
+    """
+    agent = agent.lower()
+    groups = []
+    sitemaps = []
+    current = None
+    in_agents = False
+    for line in text.splitlines():
+        line = line.split('#', 1)[0].strip()
+        if ':' not in line:
+            continue
+        key, value = (part.strip() for part in line.split(':', 1))
+        key = key.lower()
+        if key == 'sitemap':
+            sitemaps.append(value)
+        elif key == 'user-agent':
+            # Consecutive User-agent lines share the rules that follow them
+            if not in_agents:
+                current = {'agents': [], 'rules': [], 'delay': None}
+                groups.append(current)
+            current['agents'].append(value.lower())
+            in_agents = True
+        elif current is not None:
+            in_agents = False
+            if key in ('allow', 'disallow') and value:
+                current['rules'].append((key == 'allow', value))
+            elif key == 'crawl-delay':
+                try:
+                    current['delay'] = float(value)
+                except ValueError:
+                    pass
+
+    matching = [group for group in groups if agent in group['agents']]
+    if not matching:
+        matching = [group for group in groups if '*' in group['agents']]
+    rules = [rule for group in matching for rule in group['rules']]
+    delays = [group['delay'] for group in matching if group['delay'] is not None]
+    return RobotsRules(rules, max(delays) if delays else None, sitemaps)
+
+_cache = OrderedDict()  # origin -> (expires, RobotsRules), least recently used first
+_lock = threading.Lock()
+_fetches = SingleFlight()
+_stats = {'hits': 0, 'misses': 0}
+
+def _origin(url):
+    parsed = urlparse(url if '://' in url else 'https://' + url)
+    return f'{parsed.scheme.lower()}://{parsed.netloc.lower()}'
+
+# Spaces fetches to hosts whose robots.txt asks for a Crawl-delay (page scrapes, API calls, discovery).
+# Turns are kept per origin, like the rules, since each subdomain has its own robots.txt.
+crawl_limiter = DomainRateLimiter(0, key=_origin)
+
+def _fetch(origin, headers, timeout=ROBOTS_TIMEOUT):
+    """(RobotsRules, seconds to cache them) for an origin"""
+    try:
+        response = requests.get(f'{origin}/robots.txt', headers=headers, timeout=timeout)
+    except requests.exceptions.Timeout:
+        if timeout < ROBOTS_TIMEOUT:
+            # Cut short by the caller's budget, not the host: nothing is learned or cached
+            raise
+        return RobotsRules(disallow_all=True, unreachable=True), ROBOTS_ERROR_TTL
+    except requests.exceptions.RequestException:
+        # Unreachable robots.txt: assume everything is disallowed until it can be read (RFC 9309)
+        return RobotsRules(disallow_all=True, unreachable=True), ROBOTS_ERROR_TTL
+    if response.status_code >= 500:
+        return RobotsRules(disallow_all=True, unreachable=True), ROBOTS_ERROR_TTL
+    if response.status_code >= 400:
+        # No robots.txt (404, 403, ...): nothing is disallowed
+        return RobotsRules(), ROBOTS_CACHE_TTL
+    text = response.content[:ROBOTS_MAX_BYTES].decode('utf-8', 'replace')
+    return parse_robots(text), ROBOTS_CACHE_TTL
+
+def rules_for(url, headers=None, timeout=None):
+    """
+    The robots.txt rules for a URL's host, fetched once per ROBOTS_CACHE_TTL; concurrent lookups
+    for a host that isn't cached share one fetch. `timeout` (e.g. what is left of a scrape's budget)
+    shortens the fetch below ROBOTS_TIMEOUT; a fetch it cuts short raises requests' Timeout.
+    """
+    origin = _origin(url)
+    now = time.time()
+    with _lock:
+        entry = _cache.get(origin)
+        if entry is not None and entry[0] > now:
+            _cache.move_to_end(origin)
+            _stats['hits'] += 1
+            return entry[1]
+        _stats['misses'] += 1
+    timeout = ROBOTS_TIMEOUT if timeout is None else min(ROBOTS_TIMEOUT, timeout)
+    (rules, ttl), _ = _fetches.do(origin, lambda: _fetch(origin, headers, timeout))
+    with _lock:
+        _cache[origin] = (time.time() + ttl, rules)
+        _cache.move_to_end(origin)
+        while len(_cache) > ROBOTS_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return rules
+
+def is_allowed(url, headers=None, timeout=None):
+    """True if robots.txt lets us fetch the URL (always, with ROBOTS_RESPECT off)"""
+    return not ROBOTS_RESPECT or rules_for(url, headers, timeout).allowed(url)
+
+def crawl_delay(url, headers=None, timeout=None):
+    """Seconds the URL's host asks between requests (Crawl-delay), or None"""
+    return rules_for(url, headers, timeout).crawl_delay if ROBOTS_RESPECT else None
+
+def wait_turn(url, headers=None, max_wait=None):
+    """
+    Wait out the host's Crawl-delay before fetching the URL; returns the seconds waited, or None
+    (at once) when the turn is more than `max_wait` (at most ROBOTS_MAX_CRAWL_DELAY) seconds away.
+    """
+    delay = crawl_delay(url, headers)
+    if not delay:
+        return 0.0
+    max_wait = ROBOTS_MAX_CRAWL_DELAY if max_wait is None else min(max_wait, ROBOTS_MAX_CRAWL_DELAY)
+    return crawl_limiter.wait(url, delay, max_wait)
+
+def forget(url):
+    """Drop a host's cached rules so the next lookup fetches robots.txt again"""
+    with _lock:
+        return _cache.pop(_origin(url), None) is not None
+
+def get_stats():
+    """Cache hit/miss counters and cached hosts"""
+    with _lock:
+        return dict(_stats, hosts=len(_cache))
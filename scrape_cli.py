@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Batch scraper: run URLs through the /scrape pipeline without the web server.
+
+    python scrape_cli.py urls.txt -o results.jsonl --checkpoint results.done -j 8
+    cat urls.txt | python scrape_cli.py --fields brand,imageUrl > thumbnails.jsonl
+
+Reads one URL per line (blank lines and lines starting with # are ignored) and writes one JSON
+object per URL, in completion order. Progress and the final throughput/latency summary go to
+stderr. With --checkpoint, every finished URL is appended to the checkpoint file after its
+result is written, and URLs already listed there are skipped, so an interrupted run picks up
+where it stopped when restarted with the same arguments.
+"""
+
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, as_completed, wait
+
+from app import scrape, parse_extraction_options, save_extraction, find_record, FetchError, RobotsDisallowed
+from extraction_context import ExtractionContext, SCRAPE_BUDGET
+from url_utils import normalize_url
+
+# Seconds between progress lines on stderr
+PROGRESS_INTERVAL = 5
+
+def read_urls(source):
+    """URLs from a file object, skipping blank lines and comments"""
+    for line in source:
+        line = line.strip()
+        if line and not line.startswith('#'):
+            yield line
+
+def load_checkpoint(path):
+    """URLs already finished by an earlier run"""
+    try:
+        with open(path, 'r') as f:
+            return {line.strip() for line in f if line.strip()}
+    except OSError:
+        return set()
+
+def scrape_one(line, fields, budget, save, force=False):
+    """Scrape one input line; returns the JSONL record (never raises)"""
+    start = time.perf_counter()
+    record = {'url': line}
+    try:
+        url, requested, budget = parse_extraction_options({'url': line, 'fields': fields, 'budget': budget})
+        record['url'] = url
+        # When saving, pages unchanged since they were stored keep their stored values
+        stored = find_record(url) if save and not force else None
+        result = scrape(url, requested, ExtractionContext(url, budget), stored)
+        if save:
+            response = save_extraction(url, result)
+            record.update(success=True, id=response['id'], barcodeId=response['barcodeId'],
+                          changedFields=response['changedFields'], unchanged=response['unchanged'])
+        else:
+            record['success'] = True
+        record.update(result.values, skippedFields=result.skipped_fields)
+    except RobotsDisallowed as e:
+        record.update(success=False, error=str(e), disallowedByRobots=True)
+    except (ValueError, FetchError) as e:
+        record.update(success=False, error=str(e))
+    except Exception as e:
+        record.update(success=False, error=f'{type(e).__name__}: {e}')
+    record['ms'] = round((time.perf_counter() - start) * 1000, 1)
+    return record
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+def summarize(latencies, succeeded, failed, skipped, duplicates, elapsed):
+    """Final throughput/latency summary"""
+    latencies = sorted(latencies)
+    done = succeeded + failed
+    return (
+        f"Done: {done} scraped ({succeeded} ok, {failed} failed), {skipped} already in checkpoint, "
+        f"{duplicates} duplicate URLs skipped, "
+        f"{elapsed:.1f}s, {done / elapsed if elapsed else 0:.2f} URLs/s\n"
+        f"Latency ms: p50 {percentile(latencies, 0.5):.0f}, p90 {percentile(latencies, 0.9):.0f}, "
+        f"p99 {percentile(latencies, 0.99):.0f}, max {latencies[-1] if latencies else 0:.0f}"
+    )
+
+def run(urls, output, concurrency, fields, budget, checkpoint=None, save=False, force=False, log=sys.stderr):
+    """
+    Scrape URLs with `concurrency` workers, writing a JSON line per distinct URL to `output`; returns the
+    number that failed. A line naming a URL already given earlier in the input (compared with
+    normalize_url) is skipped, so it gets neither a second result line nor a second checkpoint entry.
+    """
+    done_urls = load_checkpoint(checkpoint) if checkpoint else set()
+    checkpoint_file = open(checkpoint, 'a') if checkpoint else None
+    latencies = []
+    dispatched = set()
+    succeeded = failed = skipped = duplicates = 0
+    started = last_progress = time.perf_counter()
+
+    # Results are written from this thread only, as workers finish
+    def finish(future):
+        nonlocal succeeded, failed, last_progress
+        record = future.result()
+        line = record.pop('line')
+        output.write(json.dumps(record) + '\n')
+        output.flush()
+        # The checkpoint is written after the result, so an interruption can repeat a URL but never lose one
+        if checkpoint_file:
+            checkpoint_file.write(line + '\n')
+            checkpoint_file.flush()
+        latencies.append(record['ms'])
+        if record['success']:
+            succeeded += 1
+        else:
+            failed += 1
+        now = time.perf_counter()
+        if now - last_progress >= PROGRESS_INTERVAL:
+            last_progress = now
+            rate = (succeeded + failed) / (now - started)
+            print(f"{succeeded + failed} scraped ({failed} failed), {rate:.2f} URLs/s", file=log, flush=True)
+
+    def task(line):
+        record = scrape_one(line, fields, budget, save, force)
+        record['line'] = line
+        return record
+
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            pending = set()
+            for line in urls:
+                if line in done_urls:
+                    skipped += 1
+                    continue
+                key = normalize_url(line if '://' in line else 'https://' + line)
+                if key in dispatched:
+                    duplicates += 1
+                    continue
+                dispatched.add(key)
+                # Keep a bounded number of URLs in flight so huge inputs aren't read into memory at once
+                if len(pending) >= concurrency * 2:
+                    finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        finish(future)
+                pending.add(executor.submit(task, line))
+            for future in as_completed(pending):
+                finish(future)
+    finally:
+        if checkpoint_file:
+            checkpoint_file.close()
+        print(summarize(latencies, succeeded, failed, skipped, duplicates, time.perf_counter() - started), file=log,
+              flush=True)
+    return failed
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Scrape product URLs to JSON lines without running the web server')
+    parser.add_argument('input', nargs='?', default='-', help='file with one URL per line (default: stdin)')
+    parser.add_argument('-o', '--output', default='-', help='JSONL output file, appended to (default: stdout)')
+    parser.add_argument('-j', '--concurrency', type=int, default=4, help='URLs scraped in parallel (default: 4)')
+    parser.add_argument('--fields', help='comma-separated fields to extract (default: all)')
+    parser.add_argument('--budget', type=float, default=SCRAPE_BUDGET,
+                        help=f'seconds per URL, 0 = unlimited (default: {SCRAPE_BUDGET:g})')
+    parser.add_argument('--checkpoint', help='file of finished URLs; existing entries are skipped so a run can resume')
+    parser.add_argument('--save', action='store_true', help='also store results in the data file like /scrape')
+    parser.add_argument('--force', action='store_true', help='with --save, extract pages even when unchanged since stored')
+    args = parser.parse_args(argv)
+
+    if args.concurrency < 1:
+        parser.error('--concurrency must be at least 1')
+    source = sys.stdin if args.input == '-' else open(args.input, 'r')
+    output = sys.stdout if args.output == '-' else open(args.output, 'a')
+    try:
+        failed = run(read_urls(source), output, args.concurrency, args.fields, args.budget,
+                     checkpoint=args.checkpoint, save=args.save, force=args.force)
+    except KeyboardInterrupt:
+        print("Interrupted; rerun with the same --checkpoint to resume", file=sys.stderr)
+        return 130
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if output is not sys.stdout:
+            output.close()
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
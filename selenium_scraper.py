@@ -9,14 +9,38 @@ from selenium.common.exceptions import TimeoutException, NoSuchElementException
 import time
 import re
 import atexit
+import threading
+from functools import wraps
+
+from render_cache import get_snapshot, store_snapshot
+from render_router import rendering_allowed, RenderingDisabled
 
 # Global browser instance for performance (reuse instead of creating new ones)
 _browser = None
+# The browser is shared, so concurrent scrapes take turns driving it
+_browser_lock = threading.RLock()
+
+# Render recipes: (cache recipe, XPath of candidate toggles, exact toggle labels to click)
+INGREDIENTS_ACCORDION = (
+    'accordion:ingredients',
+    "//*[contains(text(), 'Ingredients') or contains(text(), 'INGREDIENTS')]",
+    ('Ingredients',),
+)
+NUTRITION_ACCORDION = (
+    'accordion:nutritional',
+    "//*[contains(text(), 'Nutritional Information') or contains(text(), 'Guaranteed Analysis') or contains(text(), 'Nutrition')]",
+    ('Nutritional Information', 'Guaranteed Analysis', 'Nutrition'),
+)
+TARGET_LABEL_RECIPE = 'target:label-info'
 
 def _get_browser():
     """Get or create a reusable browser instance for SPEED with session validation"""
     global _browser
     
+    # Scrapes routed to the static path or short on budget must not start Chrome; callers treat this like any browser failure
+    if not rendering_allowed():
+        raise RenderingDisabled("Rendering skipped: domain is routed to static extraction or the scrape is out of budget")
+    
     # Check if existing browser is still valid
     if _browser is not None:
         try:
@@ -47,6 +71,14 @@ def _get_browser():
         atexit.register(_cleanup_browser)
     return _browser
 
+def _exclusive_browser(func):
+    """Run a render function while holding the shared browser"""
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with _browser_lock:
+            return func(*args, **kwargs)
+    return wrapper
+
 def _cleanup_browser():
     """Clean up browser instance on exit"""
     global _browser
@@ -57,11 +89,74 @@ def _cleanup_browser():
             pass
         _browser = None
 
+@_exclusive_browser
+def render_page_snapshot(url, recipe='load', wait=3):
+    """Return the rendered page source for url, loading it in the browser only on a cache miss"""
+    page_source = get_snapshot(url, recipe)
+    if page_source is not None:
+        return page_source
+    
+    driver = _get_browser()
+    driver.get(url)
+    time.sleep(wait)  # Allow page to load
+    page_source = driver.page_source
+    store_snapshot(url, recipe, page_source)
+    return page_source
+
+@_exclusive_browser
+def render_accordion_snapshots(url, accordions, load_wait=5, click_wait=5):
+    """
+    Return {recipe: page_source} after clicking each accordion in `accordions`.
+    
+    Each accordion is a (recipe, xpath, labels) tuple such as INGREDIENTS_ACCORDION. Snapshots
+    already in the render cache are reused; the browser is only started for the missing ones,
+    and all of those are clicked in a single page load.
+    """
+    snapshots = {}
+    missing = []
+    for recipe, xpath, labels in accordions:
+        cached = get_snapshot(url, recipe)
+        if cached is not None:
+            snapshots[recipe] = cached
+        else:
+            missing.append((recipe, xpath, labels))
+    
+    if not missing:
+        return snapshots
+    
+    driver = _get_browser()
+    driver.get(url)
+    time.sleep(load_wait)  # Allow page to load completely
+    
+    for recipe, xpath, labels in missing:
+        try:
+            for element in driver.find_elements(By.XPATH, xpath):
+                if element.text.strip() in labels:
+                    # Click to reveal the hidden content
+                    driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", element)
+                    time.sleep(1)
+                    driver.execute_script("arguments[0].click();", element)
+                    time.sleep(click_wait)  # Wait for content to load
+                    
+                    snapshots[recipe] = driver.page_source
+                    store_snapshot(url, recipe, snapshots[recipe])
+                    break
+        except Exception:
+            continue
+    
+    return snapshots
+
+@_exclusive_browser
 def get_target_ingredients_with_selenium(url):
     """
     IMPROVED VERSION: Extract ingredients from Target.com using multiple strategies including JSON parsing
     """
     try:
+        # A previously rendered snapshot answers without starting the browser
+        cached_source = get_snapshot(url, TARGET_LABEL_RECIPE)
+        if cached_source is not None:
+            return _find_target_ingredients_in_source(cached_source)
+        
         # Use reusable browser for SPEED
         driver = _get_browser()
         driver.get(url)
@@ -105,6 +200,7 @@ def get_target_ingredients_with_selenium(url):
                 cleaned_ingredients = js_result.replace('\\u003c', '<').replace('\\u003e', '>')
                 cleaned_ingredients = re.sub(r'\\u[0-9a-fA-F]{4}', '', cleaned_ingredients)
                 print(f"Found valid Target ingredients via JavaScript: {cleaned_ingredients[:100]}...")
+                store_snapshot(url, TARGET_LABEL_RECIPE, driver.page_source)
                 return cleaned_ingredients
         except Exception as e:
             print(f"JavaScript extraction failed: {e}")
@@ -224,73 +320,86 @@ def get_target_ingredients_with_selenium(url):
         except:
             pass
         
-        # TARGET SPECIFIC: Enhanced ingredient patterns focusing on supplements
-        ingredient_patterns = [
-            # Pattern 1: Specific for Pet Naturals - vitamin content starting with common supplement ingredients
-            r'(?i)(?:chicken liver|brewers dried yeast|dicalcium phosphate|microcrystalline cellulose)[^.]*?(?:vitamin\s+[a-z]\d*|folic\s+acid|biotin|niacin)[^.]*',
-            
-            # Pattern 2: "Ingredients:" followed by any legitimate ingredient list
-            r'(?i)ingredients[:\s]*([a-z][^<>]*?(?:,\s*[^<>,]{2,30}){3,}[^<>]*?)(?:[\.<"]|$)',
-            
-            # Pattern 3: Supplement specific - Vitamins and minerals with better matching
-            r'((?:chicken liver|brewers yeast|dicalcium phosphate|microcrystalline cellulose|vitamin|mineral|extract|oil|powder|acid)[^<>]*?(?:,\s*[^<>,]{3,30}){3,}[^<>]*?)(?:[\.<"\s\}]|$)',
-            
-            # Pattern 4: Pet food specific - Traditional pet food ingredients
-            r'((?:whole ground corn|corn gluten meal|chicken meal|fish meal|deboned chicken|chicken by-product|poultry meal|beef tallow|soybean meal|water|chicken|fish)[^<>]*?(?:,\s*[^<>,]{3,30}){5,}[^<>]*?)(?:[\.<"\s\}]|$)',
-            
-            # Pattern 5: Universal pattern for any ingredient list with 5+ comma-separated items
-            r'([a-z][a-z\s,\(\)-]*(?:,\s*[a-z][a-z\s\(\)-]{2,25}){5,}[^<>]*?)(?:[\.<"\s]|$)',
-            
-            # Pattern 6: Shorter lists for supplements (3+ items)
-            r'([a-z][a-z\s,\(\)-]*(?:,\s*[a-z][a-z\s\(\)-]{2,25}){3,}[^<>]*?)(?:[\.<"\s]|$)'
-        ]
-        
-        # Process patterns efficiently
-        for pattern in ingredient_patterns:
-            matches = re.finditer(pattern, page_source, re.IGNORECASE | re.DOTALL)
-            for match in matches:
-                content = match.group(1).strip()
-                
-                # Quick cleanup (optimized)
-                content = re.sub(r'&[a-zA-Z0-9#]+;', '', content)
-                content = re.sub(r'<[^>]+>', '', content)
-                content = re.sub(r'^["\':\\\\]+', '', content)
-                content = re.sub(r'["\'\\\\\.]+$', '', content)
-                content = re.sub(r'\s+', ' ', content)
-                content = content.strip()
-                
-                # STRICT validation to ensure we have actual ingredients, not page titles or marketing
-                if (len(content) > 30 and 
-                    content.count(',') >= 2 and
-                    # Must contain legitimate ingredients (expanded for supplements)
-                    any(word in content.lower() for word in [
-                        'meal', 'rice', 'vitamin', 'supplement', 'chicken', 'fish', 'corn', 'barley', 'wheat',
-                        'liver', 'calcium', 'mineral', 'extract', 'oil', 'powder', 'acid', 'yeast', 'protein'
-                    ]) and
-                    # Must NOT contain page metadata, titles, or marketing content
-                    not any(bad in content.lower() for bad in [
-                        'prohibited', 'otc products', 'warning', 'do not', 'consult', 
-                        'doctor', 'physician', 'medical', 'drug', 'medication',
-                        'strikethrough_enabled', 'privacy_link', 'product_detail_view',
-                        'tracking_enabled', 'global_', 'true', 'false', 'enabled', 'event_tracking',
-                        'javascript', 'function', 'var ', 'const ', 'let ', '":', '":"', '_enabled',
-                        'please note that', 'this product', 'not intended', 'the statements',
-                        # Reject page titles and marketing content
-                        'target', ': target', 'everyday health', 'health support', 'flavor',
-                        'count', 'daily multi', 'delicious', 'chewable', 'multivitamin',
-                        'name="keywords"', 'property="og:', 'content="', 'data-',
-                        # Reject marketing descriptions
-                        'provides over', 'healthful nutrients', 'to support your', 'maintain peak',
-                        'immune system', 'eye function', 'throughout his life', 'any age',
-                        'peak condition', 'antioxidants and minerals', 'B complex'
-                    ]) and
-                    # Must be mostly lowercase (ingredients are typically lowercase)
-                    sum(c.islower() for c in content if c.isalpha()) > sum(c.isupper() for c in content if c.isalpha())):
-                    print(f"Found valid Target ingredients via Selenium: {content[:100]}...")
-                    return content
-        
-        return None
+        store_snapshot(url, TARGET_LABEL_RECIPE, page_source)
+        return _find_target_ingredients_in_source(page_source)
         
     except Exception as e:
         print(f"Selenium error: {e}")
-        return None 
\ No newline at end of file
+        return None
+
+def _find_target_ingredients_in_source(page_source):
+    """Find a Target ingredient list in rendered page source (JSON state first, then visible text patterns)"""
+    # Same nutrition_facts lookup the in-browser JavaScript does, so cached snapshots give identical results
+    nutrition_match = re.search(r'"nutrition_facts":\s*\{[^}]*"ingredients":\s*"([^"]{100,})"', page_source)
+    if nutrition_match:
+        cleaned_ingredients = nutrition_match.group(1).replace('\\u003c', '<').replace('\\u003e', '>')
+        cleaned_ingredients = re.sub(r'\\u[0-9a-fA-F]{4}', '', cleaned_ingredients)
+        if len(cleaned_ingredients) > 50:
+            return cleaned_ingredients
+    
+    # TARGET SPECIFIC: Enhanced ingredient patterns focusing on supplements
+    ingredient_patterns = [
+        # Pattern 1: Specific for Pet Naturals - vitamin content starting with common supplement ingredients
+        r'(?i)(?:chicken liver|brewers dried yeast|dicalcium phosphate|microcrystalline cellulose)[^.]*?(?:vitamin\s+[a-z]\d*|folic\s+acid|biotin|niacin)[^.]*',
+        
+        # Pattern 2: "Ingredients:" followed by any legitimate ingredient list
+        r'(?i)ingredients[:\s]*([a-z][^<>]*?(?:,\s*[^<>,]{2,30}){3,}[^<>]*?)(?:[\.<"]|$)',
+        
+        # Pattern 3: Supplement specific - Vitamins and minerals with better matching
+        r'((?:chicken liver|brewers yeast|dicalcium phosphate|microcrystalline cellulose|vitamin|mineral|extract|oil|powder|acid)[^<>]*?(?:,\s*[^<>,]{3,30}){3,}[^<>]*?)(?:[\.<"\s\}]|$)',
+        
+        # Pattern 4: Pet food specific - Traditional pet food ingredients
+        r'((?:whole ground corn|corn gluten meal|chicken meal|fish meal|deboned chicken|chicken by-product|poultry meal|beef tallow|soybean meal|water|chicken|fish)[^<>]*?(?:,\s*[^<>,]{3,30}){5,}[^<>]*?)(?:[\.<"\s\}]|$)',
+        
+        # Pattern 5: Universal pattern for any ingredient list with 5+ comma-separated items
+        r'([a-z][a-z\s,\(\)-]*(?:,\s*[a-z][a-z\s\(\)-]{2,25}){5,}[^<>]*?)(?:[\.<"\s]|$)',
+        
+        # Pattern 6: Shorter lists for supplements (3+ items)
+        r'([a-z][a-z\s,\(\)-]*(?:,\s*[a-z][a-z\s\(\)-]{2,25}){3,}[^<>]*?)(?:[\.<"\s]|$)'
+    ]
+    
+    # Process patterns efficiently
+    for pattern in ingredient_patterns:
+        matches = re.finditer(pattern, page_source, re.IGNORECASE | re.DOTALL)
+        for match in matches:
+            content = match.group(1).strip()
+            
+            # Quick cleanup (optimized)
+            content = re.sub(r'&[a-zA-Z0-9#]+;', '', content)
+            content = re.sub(r'<[^>]+>', '', content)
+            content = re.sub(r'^["\':\\\\]+', '', content)
+            content = re.sub(r'["\'\\\\\.]+$', '', content)
+            content = re.sub(r'\s+', ' ', content)
+            content = content.strip()
+            
+            # STRICT validation to ensure we have actual ingredients, not page titles or marketing
+            if (len(content) > 30 and 
+                content.count(',') >= 2 and
+                # Must contain legitimate ingredients (expanded for supplements)
+                any(word in content.lower() for word in [
+                    'meal', 'rice', 'vitamin', 'supplement', 'chicken', 'fish', 'corn', 'barley', 'wheat',
+                    'liver', 'calcium', 'mineral', 'extract', 'oil', 'powder', 'acid', 'yeast', 'protein'
+                ]) and
+                # Must NOT contain page metadata, titles, or marketing content
+                not any(bad in content.lower() for bad in [
+                    'prohibited', 'otc products', 'warning', 'do not', 'consult', 
+                    'doctor', 'physician', 'medical', 'drug', 'medication',
+                    'strikethrough_enabled', 'privacy_link', 'product_detail_view',
+                    'tracking_enabled', 'global_', 'true', 'false', 'enabled', 'event_tracking',
+                    'javascript', 'function', 'var ', 'const ', 'let ', '":', '":"', '_enabled',
+                    'please note that', 'this product', 'not intended', 'the statements',
+                    # Reject page titles and marketing content
+                    'target', ': target', 'everyday health', 'health support', 'flavor',
+                    'count', 'daily multi', 'delicious', 'chewable', 'multivitamin',
+                    'name="keywords"', 'property="og:', 'content="', 'data-',
+                    # Reject marketing descriptions
+                    'provides over', 'healthful nutrients', 'to support your', 'maintain peak',
+                    'immune system', 'eye function', 'throughout his life', 'any age',
+                    'peak condition', 'antioxidants and minerals', 'B complex'
+                ]) and
+                # Must be mostly lowercase (ingredients are typically lowercase)
+                sum(c.islower() for c in content if c.isalpha()) > sum(c.isupper() for c in content if c.isalpha())):
+                print(f"Found valid Target ingredients via Selenium: {content[:100]}...")
+                return content
+    
+    return None
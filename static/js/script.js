@@ -32,6 +32,7 @@ function openTab(evt, tabName) {
 }
 
 // Scraping functionality
+// Batches run as server-side jobs, so closing the tab doesn't stop them
 async function scrapeAllUrls() {
     const urlInputs = [
         document.getElementById('url-input-1'),
@@ -79,58 +80,142 @@ async function scrapeAllUrls() {
     const resultsContainer = document.getElementById('results-container');
     resultsContainer.innerHTML = '';
     
+    try {
+        const response = await fetch('/jobs', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({ urls: urls })
+        });
+        const data = await response.json();
+        
+        if (!data.success) {
+            showError(data.error || 'Could not start batch');
+            return;
+        }
+        
+        // Remembered so a reloaded page picks the job back up
+        localStorage.setItem('activeJobId', data.jobId);
+        await followJob(data.jobId);
+        
+    } catch (err) {
+        showError('Batch scraping error: ' + err.message);
+    } finally {
+        // Reset button state
+        loading.classList.add('hidden');
+        scrapeBtn.disabled = false;
+        scrapeBtn.textContent = 'Scrape All URLs';
+    }
+}
+
+// Find a brand's product URLs (site root, sitemap or category page) and scrape the ones not stored yet
+async function discoverProducts() {
+    const url = document.getElementById('discover-input').value.trim();
+    if (!url) {
+        showError('Please enter a site, sitemap or category URL');
+        return;
+    }
+    
+    const scrapeBtn = document.getElementById('scrape-btn');
+    const loading = document.getElementById('loading');
+    loading.classList.remove('hidden');
+    document.getElementById('results').classList.add('hidden');
+    document.getElementById('error').classList.add('hidden');
+    document.getElementById('results-container').innerHTML = '';
+    scrapeBtn.disabled = true;
+    scrapeBtn.textContent = 'Discovering products...';
+    
+    try {
+        const response = await fetch('/discover', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({ url: url })
+        });
+        const data = await response.json();
+        
+        if (!data.success) {
+            showError(data.error || 'Discovery failed');
+            return;
+        }
+        if (!data.jobId) {
+            showError(`No new product URLs found (${data.scanned} links checked, ${data.alreadyStored} products already stored)`);
+            return;
+        }
+        
+        localStorage.setItem('activeJobId', data.jobId);
+        await followJob(data.jobId);
+        
+    } catch (err) {
+        showError('Discovery error: ' + err.message);
+    } finally {
+        loading.classList.add('hidden');
+        scrapeBtn.disabled = false;
+        scrapeBtn.textContent = 'Scrape All URLs';
+    }
+}
+
+// Poll a batch job, adding a result card for each URL as it finishes
+async function followJob(jobId) {
+    const scrapeBtn = document.getElementById('scrape-btn');
+    let after = 0;
     let successCount = 0;
     let errorCount = 0;
-    const allResults = [];
     
-    try {
-        // Process URLs sequentially to avoid overwhelming the server
-        for (let i = 0; i < urls.length; i++) {
-            const url = urls[i];
-            const urlNumber = i + 1;
-            
-            try {
-                // Update loading message
-                scrapeBtn.textContent = `Scraping URL ${urlNumber}/${urls.length}...`;
-                
-                const response = await fetch('/scrape', {
-                    method: 'POST',
-                    headers: {
-                        'Content-Type': 'application/json',
-                    },
-                    body: JSON.stringify({ url: url })
-                });
-                
-                const data = await response.json();
-                
-                if (data.success) {
-                    successCount++;
-                    allResults.push({ ...data, urlNumber, status: 'success' });
-                    addResultCard(data, urlNumber, 'success');
-                } else {
-                    errorCount++;
-                    allResults.push({ error: data.error, url, urlNumber, status: 'error' });
-                    addResultCard({ error: data.error, url }, urlNumber, 'error');
-                }
-            } catch (err) {
+    while (true) {
+        const response = await fetch(`/jobs/${jobId}/results?after=${after}`);
+        if (response.status === 404) {
+            localStorage.removeItem('activeJobId');
+            return;
+        }
+        const data = await response.json();
+        
+        data.results.forEach(item => {
+            const urlNumber = item.position + 1;
+            if (item.status === 'done') {
+                successCount++;
+                addResultCard(item.result, urlNumber, 'success');
+            } else {
                 errorCount++;
-                allResults.push({ error: err.message, url, urlNumber, status: 'error' });
-                addResultCard({ error: err.message, url }, urlNumber, 'error');
-            }
-            
-            // Small delay between requests to be respectful to servers
-            if (i < urls.length - 1) {
-                await new Promise(resolve => setTimeout(resolve, 1000));
+                addResultCard({ error: item.error, url: item.url }, urlNumber, 'error');
             }
-        }
+        });
+        after = data.next;
+        
+        const job = data.job;
+        const finished = job.counts.done + job.counts.failed + job.counts.dead + job.counts.cancelled;
+        scrapeBtn.textContent = `Scraping URL ${Math.min(finished + 1, job.total)}/${job.total}...`;
         
-        // Show results and summary
-        showBatchResults(successCount, errorCount, urls.length);
+        if (job.status === 'done' || job.status === 'cancelled') {
+            localStorage.removeItem('activeJobId');
+            showBatchResults(successCount, errorCount, job.total);
+            return;
+        }
         
+        await new Promise(resolve => setTimeout(resolve, 2000));
+    }
+}
+
+// Reattach to a batch that was still running when the page was closed
+async function resumeActiveJob() {
+    const jobId = localStorage.getItem('activeJobId');
+    if (!jobId) {
+        return;
+    }
+    
+    const scrapeBtn = document.getElementById('scrape-btn');
+    const loading = document.getElementById('loading');
+    loading.classList.remove('hidden');
+    scrapeBtn.disabled = true;
+    document.getElementById('results-container').innerHTML = '';
+    
+    try {
+        await followJob(jobId);
     } catch (err) {
         showError('Batch scraping error: ' + err.message);
     } finally {
-        // Reset button state
         loading.classList.add('hidden');
         scrapeBtn.disabled = false;
         scrapeBtn.textContent = 'Scrape All URLs';
@@ -215,6 +300,7 @@ function addResultCard(data, urlNumber, status) {
             <div class="result-item"><strong>Guaranteed Analysis:</strong> ${escapeHtml(data.guaranteedAnalysis || 'Not found')}</div>
             <div class="result-item"><strong>Nutritional Info:</strong> ${data.nutritionalInfo && data.nutritionalInfo.calories ? escapeHtml(`Calories: ${data.nutritionalInfo.calories}`) : 'Not found'}</div>
             <div class="result-item"><strong>Image URL:</strong> <span class="image-url">${escapeHtml(data.imageUrl || 'Not found')}</span></div>
+            ${data.skippedFields && data.skippedFields.length ? `<div class="result-item"><strong>Skipped (time budget):</strong> ${escapeHtml(data.skippedFields.join(', '))}</div>` : ''}
         `;
     } else {
         resultCard.innerHTML = `
@@ -433,14 +519,18 @@ document.addEventListener('click', function(e) {
 document.addEventListener('DOMContentLoaded', function() {
     const urlInput = document.getElementById('url-input');
     
-    urlInput.addEventListener('keypress', function(e) {
-        if (e.key === 'Enter') {
-            scrapeUrl();
-        }
-    });
+    // The single-URL input is gone from the batch form; without this guard the rest never ran
+    if (urlInput) {
+        urlInput.addEventListener('keypress', function(e) {
+            if (e.key === 'Enter') {
+                scrapeUrl();
+            }
+        });
+    }
     
     // Load data on page load
     loadStoredData();
+    resumeActiveJob();
 });
 
 // Bulk selection functions
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+
+import json
+import os
+
+try:
+    import fcntl
+except ImportError:  # Windows: only the callers' in-process locks apply
+    fcntl = None
+
+def merge_counts(target, delta):
+    """
+    Add nested counters from `delta` into `target` in place: numbers are summed, dicts merged
+    recursively and anything else (timestamps, last route) replaced. Returns `target`.
+    """
+    for key, value in delta.items():
+        if isinstance(value, dict):
+            merge_counts(target.setdefault(key, {}), value)
+        elif isinstance(value, (int, float)) and not isinstance(value, bool) and isinstance(target.get(key), (int, float)):
+            target[key] = round(target[key] + value, 1) if isinstance(value, float) else target[key] + value
+        else:
+            target[key] = value
+    return target
+
+def read_stats(path):
+    """A stats file's contents, or {} if it is missing or unreadable"""
+    try:
+        with open(path, 'r') as f:
+            stats = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return stats if isinstance(stats, dict) else {}
+
+def flush_stats(path, delta, removed=()):
+    """
+    Add `delta` (counters recorded since the last flush) to the file's counts and drop the `removed`
+    top-level keys, under an exclusive lock on path + '.lock' so processes sharing the file (gunicorn
+    workers, worker daemons) add to each other's counts instead of overwriting them. Returns the
+    merged stats, which include what the other processes have written; raises OSError if the
+    file can't be written.
+    """
+    lock_file = open(path + '.lock', 'a') if fcntl is not None else None
+    try:
+        if lock_file is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        stats = read_stats(path)
+        for key in removed:
+            stats.pop(key, None)
+        merge_counts(stats, delta)
+        # Written to a temporary file first so readers never see a half-written file
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(stats, f, indent=2)
+        os.replace(tmp_path, path)
+        return stats
+    finally:
+        if lock_file is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+            lock_file.close()
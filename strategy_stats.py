@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+
+import atexit
+import os
+import threading
+import time
+from datetime import datetime
+
+from stats_file import flush_stats, merge_counts, read_stats
+from url_utils import registered_domain
+
+# Per-domain, per-field record of which cascade strategies ran, how long they took and which won
+STRATEGY_STATS_FILE = os.environ.get('STRATEGY_STATS_FILE', 'strategy_stats.json')
+
+# Wins a strategy needs on a domain before it is tried first there
+STRATEGY_MIN_WINS = int(os.environ.get('STRATEGY_MIN_WINS', 2))
+
+# Mean milliseconds from which a strategy counts as expensive on a domain (in practice: it starts a
+# browser). An expensive strategy that wins is only moved ahead of other expensive ones, never ahead
+# of cheap static strategies.
+STRATEGY_EXPENSIVE_MS = float(os.environ.get('STRATEGY_EXPENSIVE_MS', 1000))
+
+# Seconds between writes of the stats file; counters are kept in memory in between (and written at exit)
+STRATEGY_STATS_FLUSH_INTERVAL = float(os.environ.get('STRATEGY_STATS_FLUSH_INTERVAL', 30))
+
+_stats = None    # counters from the file at the last flush plus this process's since then
+_pending = {}    # this process's counters since the last flush
+_lock = threading.Lock()
+_last_flush = time.monotonic()
+
+def _load_stats():
+    """Load the stats file once"""
+    global _stats
+    if _stats is None:
+        _stats = read_stats(STRATEGY_STATS_FILE)
+    return _stats
+
+def _save_stats(removed=()):
+    """
+    Add this process's counters to the stats file (merged with other processes' counters on disk)
+    and pick up theirs (caller holds _lock)
+    """
+    global _stats, _pending, _last_flush
+    _last_flush = time.monotonic()
+    try:
+        _stats = flush_stats(STRATEGY_STATS_FILE, _pending, removed)
+        _pending = {}
+    except OSError as e:
+        print(f"Warning: could not save strategy stats: {e}")
+
+def _is_expensive(counters):
+    return bool(counters) and counters['total_ms'] / counters['runs'] >= STRATEGY_EXPENSIVE_MS
+
+def _preferred(field_stats):
+    """The strategy with the best win rate (then lowest mean cost) among those with enough wins, or None"""
+    best, best_key = None, None
+    for name, entry in field_stats.items():
+        if entry['wins'] < STRATEGY_MIN_WINS:
+            continue
+        key = (entry['wins'] / entry['runs'], -entry['total_ms'] / entry['runs'])
+        if best_key is None or key > best_key:
+            best, best_key = name, key
+    return best
+
+def order_strategies(url, field, strategies):
+    """
+    Move the strategy that has won most reliably on this domain ahead of the others of its cost
+    class: a cheap one to the front, an expensive one (see STRATEGY_EXPENSIVE_MS) only ahead of the
+    first expensive strategy, so cheap strategies still run before a browser is started. Others
+    keep their order.
+    """
+    domain = registered_domain(url)
+    with _lock:
+        field_stats = _load_stats().get(domain, {}).get(field, {})
+        preferred = _preferred(field_stats)
+        expensive = {name for name, counters in field_stats.items() if _is_expensive(counters)}
+    if preferred is None:
+        return strategies
+    first = [strategy for strategy in strategies if strategy[0] == preferred]
+    rest = [strategy for strategy in strategies if strategy[0] != preferred]
+    position = 0
+    if preferred in expensive:
+        # Never later than where it already was
+        original = next(i for i, strategy in enumerate(strategies) if strategy[0] == preferred) if first else len(rest)
+        position = min(next((i for i, strategy in enumerate(rest) if strategy[0] in expensive), len(rest)), original)
+    return rest[:position] + first + rest[position:]
+
+def record_cascade(url, field, result, threshold):
+    """
+    Add a cascade's attempts to the domain's stats; the chosen strategy wins if it cleared the threshold.
+    The counters change in memory; the file is written at most every STRATEGY_STATS_FLUSH_INTERVAL seconds.
+    """
+    if not result.attempts:
+        return
+    field_counts = {}
+    for attempt in result.attempts:
+        counts = field_counts.setdefault(attempt['strategy'], {'runs': 0, 'wins': 0, 'total_ms': 0.0})
+        counts['runs'] += 1
+        counts['total_ms'] = round(counts['total_ms'] + attempt['ms'], 1)
+    if result.strategy is not None and result.score >= threshold:
+        field_counts[result.strategy]['wins'] += 1
+    delta = {registered_domain(url): {field: field_counts, 'updated': datetime.now().isoformat()}}
+    with _lock:
+        merge_counts(_load_stats(), delta)
+        merge_counts(_pending, delta)
+        if time.monotonic() - _last_flush >= STRATEGY_STATS_FLUSH_INTERVAL:
+            _save_stats()
+
+def flush_strategy_stats():
+    """Write counters recorded since the last write to the stats file"""
+    with _lock:
+        if _pending:
+            _save_stats()
+
+atexit.register(flush_strategy_stats)
+
+def get_strategy_stats():
+    """Return {domain: {field: {strategy: counters + mean_ms}, 'preferred': {field: strategy}}} for the admin endpoint"""
+    with _lock:
+        result = {}
+        for domain, entry in sorted(_load_stats().items()):
+            fields = {field: value for field, value in entry.items() if field != 'updated'}
+            result[domain] = {
+                field: {
+                    name: dict(counters, mean_ms=round(counters['total_ms'] / counters['runs'], 1))
+                    for name, counters in field_stats.items()
+                }
+                for field, field_stats in fields.items()
+            }
+            result[domain]['preferred'] = {field: _preferred(field_stats) for field, field_stats in fields.items()}
+            result[domain]['updated'] = entry.get('updated')
+        return result
+
+def reset_domain(domain):
+    """Forget a domain's strategy history so it falls back to the default order; returns False if unknown"""
+    domain = registered_domain(domain)
+    with _lock:
+        if domain not in _load_stats():
+            return False
+        _pending.pop(domain, None)
+        _save_stats(removed=[domain])
+        _stats.pop(domain, None)
+        return True
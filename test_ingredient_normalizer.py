@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+
+import pytest
+
+from benchmark_ingredient_normalizer import SAMPLE_STRINGS, legacy_chain
+from ingredient_normalizer import find_trailing_content, is_valid_ingredient, normalize_ingredients, split_ingredients
+
+@pytest.mark.parametrize('text', SAMPLE_STRINGS)
+def test_same_list_as_the_legacy_chain(text):
+    assert normalize_ingredients(text) == legacy_chain(text)
+
+def test_empty_text():
+    assert normalize_ingredients('') == []
+    assert normalize_ingredients(None) == []
+
+def test_nutrient_groups_are_unwrapped_and_fibre_spelled_fiber():
+    text = 'Chicken, Liver, Vitamins (Vitamin E Supplement, Thiamine Mononitrate), Minerals (Zinc Proteinate), Beet Fibre.'
+    assert normalize_ingredients(text) == ['Chicken', 'Liver', 'Vitamin E Supplement', 'Thiamine Mononitrate',
+                                           'Zinc Proteinate', 'Beet fiber']
+
+def test_commas_inside_other_parentheses_stay_in_one_ingredient():
+    text = 'Chicken, Fish Oil (Source of DHA, EPA), Rice, Peas, Salt'
+    assert normalize_ingredients(text) == ['Chicken', 'Fish Oil (Source of DHA, EPA)', 'Rice', 'Peas', 'Salt']
+
+def test_unclosed_parenthesis_does_not_swallow_the_list():
+    assert [item.strip() for item in split_ingredients('Beef, Vitamins (Vitamin A Acetate, Pork, Salt')] == [
+        'Beef', 'Vitamin A Acetate', 'Pork', 'Salt']
+    assert normalize_ingredients('Beef, Oil (Fish, Pork, Salt, Water') == ['Beef', 'Oil (Fish', 'Pork', 'Salt', 'Water']
+
+def test_page_tail_is_cut():
+    text = 'Lamb, Brown Rice, Oats, Peas, Choline Chloride. Guaranteed Analysis Crude Protein (min) 10% | Contact Us'
+    assert normalize_ingredients(text)[-1] == 'Choline Chloride'
+    assert find_trailing_content('Chicken, Rice Download the ingredient list') == len('Chicken, Rice ')
+    assert find_trailing_content('Chicken, Rice') == -1
+
+def test_website_codes_are_dropped():
+    assert normalize_ingredients('Chicken, Rice, Peas, Beet Pulp, Blue 2. N600123, Red 40 D600724, k600323') == [
+        'Chicken', 'Rice', 'Peas', 'Beet Pulp', 'Blue 2', 'Red 40']
+
+def test_run_together_names_are_separated_only_when_not_already_a_list():
+    assert normalize_ingredients('ChickenRiceWater, Salt') == legacy_chain('ChickenRiceWater, Salt')
+    assert normalize_ingredients('Chicken, Rice, Peas, Carrots, ChickenLiver') == [
+        'Chicken', 'Rice', 'Peas', 'Carrots', 'ChickenLiver']
+
+@pytest.mark.parametrize('ending', ['and more', 'etc.'])
+def test_generic_ending_is_removed(ending):
+    assert normalize_ingredients(f'Tuna, Water, Guar Gum, Taurine, {ending}')[-1] == 'Taurine'
+
+@pytest.mark.parametrize('ingredient, valid', [
+    ('Chicken', True), ('B12', True), ('E300', True), ('B-12', True), ('Vitamin D3 Supplement', True),
+    ('k600323', False), ('12345k', False), ('abc123def456', False), ('x', False), ('', False),
+])
+def test_is_valid_ingredient(ingredient, valid):
+    assert is_valid_ingredient(ingredient) is valid
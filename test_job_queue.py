@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+
+import multiprocessing
+import sqlite3
+
+import job_queue
+
+def _drain(db_file, owner):
+    """Claim and finish items until the queue is empty, as a worker daemon on another node would"""
+    job_queue.JOB_DB_FILE = db_file
+    while True:
+        claimed = job_queue.claim_item(owner)
+        if claimed is None:
+            return
+        job_id, position, url, options = claimed
+        assert job_queue.finish_item(job_id, position, owner, result={'url': url})
+
+def test_claim_and_finish_across_processes(tmp_path, monkeypatch):
+    """Workers in several processes never share an item, and every result gets its own cursor"""
+    db_file = str(tmp_path / 'jobs.db')
+    monkeypatch.setattr(job_queue, 'JOB_DB_FILE', db_file)
+    urls = [f'https://example.com/products/{i}' for i in range(200)]
+    job_id = job_queue.create_job(urls)
+
+    context = multiprocessing.get_context('spawn')
+    workers = [context.Process(target=_drain, args=(db_file, f'node-{i}/1')) for i in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(120)
+        assert worker.exitcode == 0
+
+    with sqlite3.connect(db_file) as connection:
+        rows = connection.execute('SELECT status, attempts, seq FROM items WHERE job_id = ?', (job_id,)).fetchall()
+    assert len(rows) == len(urls)
+    assert all(status == job_queue.ITEM_DONE and attempts == 1 for status, attempts, _ in rows)
+    assert sorted(seq for _, _, seq in rows) == list(range(1, len(urls) + 1))
+
+    results = job_queue.get_results(job_id, limit=len(urls))
+    assert sorted(result['url'] for result in results) == sorted(urls)
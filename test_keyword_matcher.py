@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+
+import pytest
+
+from keyword_matcher import KeywordMatcher, score_hits
+
+PETS = KeywordMatcher({'cat': ['cat', 'feline', 'cat food'], 'dog': ['dog', 'canine', 'puppy']})
+
+def _keywords(matcher, text):
+    return [(hit.label, hit.keyword) for hit in matcher.scan(text)]
+
+@pytest.mark.parametrize('text', [
+    'Browse by category', 'Concatenate', 'catalog', 'scattered', 'Doggerel', 'hotdogs',
+])
+def test_keywords_do_not_match_inside_words(text):
+    assert PETS.scan(text) == []
+    assert PETS.found(text) == {'cat': set(), 'dog': set()}
+
+@pytest.mark.parametrize('text', [
+    'Cat', 'cats', 'Wet food for CATS.', '(cat)', 'cat-friendly', 'best_cat_treats', 'cat/kitten', 'Cat’s favourite',
+])
+def test_keywords_match_at_word_boundaries(text):
+    assert ('cat', 'cat') in _keywords(PETS, text)
+
+def test_digits_are_not_word_characters():
+    """Sizes glued to a keyword ('12cat') still match; letters glued to it don't"""
+    assert ('cat', 'cat') in _keywords(PETS, '12cat')
+    assert _keywords(PETS, 'cat2') == [('cat', 'cat')]
+
+def test_phrases_accept_any_separator():
+    for text in ('cat food', 'Cat-Food', 'cat_food', 'catfood', 'cat  food'):
+        assert ('cat', 'cat food') in _keywords(PETS, text), text
+    assert ('cat', 'cat food') not in _keywords(PETS, 'cat foodie')
+    assert ('cat', 'cat food') not in _keywords(PETS, 'bobcat food')
+
+def test_plurals_can_be_turned_off():
+    matcher = KeywordMatcher({'dog': ['dog']}, plurals=False)
+    assert _keywords(matcher, 'dog') == [('dog', 'dog')]
+    assert matcher.scan('dogs') == []
+
+def test_keywords_starting_with_punctuation_or_digits():
+    matcher = KeywordMatcher({'senior': ['7+ years', '| senior']})
+    assert _keywords(matcher, 'For cats 7+ years old') == [('senior', '7+ years')]
+    assert _keywords(matcher, 'Chicken | Senior') == [('senior', '| senior')]
+    assert matcher.scan('For cats 7+ yearsold') == []
+
+def test_scan_reports_positions_and_overlapping_keywords():
+    matcher = KeywordMatcher({'treat': ['biscuit', 'biscuit treat']})
+    hits = matcher.scan('A biscuit treat', region='title', weight=3)
+    assert [(hit.keyword, hit.start, hit.end) for hit in hits] == [('biscuit', 2, 9), ('biscuit treat', 2, 15)]
+    assert all(hit.region == 'title' and hit.weight == 3 for hit in hits)
+
+def test_found_matches_scan():
+    text = 'Grain-free cat food for adult cats and kittens; not for dogs or canine use'
+    found = PETS.found(text)
+    scanned = {'cat': set(), 'dog': set()}
+    for hit in PETS.scan(text):
+        scanned[hit.label].add(hit.keyword)
+    assert found == scanned == {'cat': {'cat', 'cat food'}, 'dog': {'dog', 'canine'}}
+
+def test_score_hits_counts_each_keyword_once_per_region():
+    hits = [hit for _, _, region_hits in PETS.scan_regions([('title', 3, 'Cat food for cats'), ('body', 1, 'cat dog')])
+            for hit in region_hits]
+    assert score_hits(hits) == {'cat': 3 + 3 + 1, 'dog': 1}
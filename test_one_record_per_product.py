@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+
+import json
+
+import pytest
+
+import app
+import ingredient_dictionary
+from url_utils import canonicalize_url
+
+@pytest.mark.parametrize('url', [
+    'https://example.com/products/chicken',
+    'http://example.com/products/chicken',
+    'https://www.example.com/products/chicken',
+    'HTTPS://Example.COM:443/products/chicken/',
+    'https://example.com/products/chicken#reviews',
+    'https://example.com/products/chicken?utm_source=newsletter&utm_medium=email',
+    'https://example.com/products/chicken?gclid=abc&fbclid=def&ref=home',
+])
+def test_canonicalize_url_drops_what_does_not_change_the_product(url):
+    assert canonicalize_url(url) == 'https://example.com/products/chicken'
+
+def test_canonicalize_url_keeps_and_sorts_product_parameters():
+    assert (canonicalize_url('https://example.com/products/chicken?variant=2&utm_source=x&color=red')
+            == 'https://example.com/products/chicken?color=red&variant=2')
+    assert canonicalize_url('https://example.com/p?variant=1') != canonicalize_url('https://example.com/p?variant=2')
+
+def test_canonicalize_url_keeps_paths_and_ports_apart():
+    assert canonicalize_url('https://example.com/Products/Chicken') == 'https://example.com/Products/Chicken'
+    assert canonicalize_url('https://example.com:8443/p') == 'https://example.com:8443/p'
+    assert canonicalize_url('https://shop.example.com/p') != canonicalize_url('https://example.com/p')
+
+@pytest.fixture
+def data_file(tmp_path, monkeypatch):
+    """An empty data file (and ingredient dictionary) for save_extraction()"""
+    path = tmp_path / 'scraped_data.json'
+    monkeypatch.setattr(app, 'DATA_FILE', str(path))
+    monkeypatch.setattr(ingredient_dictionary, 'INGREDIENT_DICTIONARY_FILE', str(tmp_path / 'ingredient_dictionary.json'))
+    return path
+
+def _result(**values):
+    return app.ExtractionResult(values, [], {}, '')
+
+def _stored(path):
+    return json.loads(path.read_text())
+
+def test_rescrape_updates_the_record_in_place(data_file):
+    first = app.save_extraction('https://www.example.com/products/chicken?utm_source=ad',
+                                _result(name='Chicken Dinner', brand='Acme'))
+    second = app.save_extraction('https://example.com/products/chicken/',
+                                 _result(name='Chicken Dinner (3 oz)', brand='Acme'))
+
+    records = _stored(data_file)
+    assert len(records) == 1
+    assert second['id'] == first['id'] and second['barcodeId'] == first['barcodeId']
+    assert not first['updated'] and second['updated']
+    assert second['changedFields'] == ['name']
+    assert records[0]['name'] == 'Chicken Dinner (3 oz)'
+    assert records[0]['canonicalUrl'] == 'https://example.com/products/chicken'
+    assert records[0]['url'] == 'https://example.com/products/chicken/'
+    assert [entry['values'] for entry in records[0]['history']] == [{'name': 'Chicken Dinner'}]
+    assert set(records[0]['changedAt']) == {'name'}
+
+def test_rescrape_only_replaces_the_fields_it_extracted(data_file):
+    app.save_extraction('https://example.com/p/1', _result(name='Chicken Dinner', brand='Acme'))
+    response = app.save_extraction('https://example.com/p/1', _result(brand='Acme'))
+
+    record = _stored(data_file)[0]
+    assert not response['changedFields']
+    assert record['name'] == 'Chicken Dinner'
+    assert 'history' not in record
+
+def test_different_products_get_their_own_records(data_file):
+    first = app.save_extraction('https://example.com/p?variant=1', _result(name='Small'))
+    second = app.save_extraction('https://example.com/p?variant=2', _result(name='Large'))
+
+    assert second['id'] == first['id'] + 1
+    assert [record['name'] for record in _stored(data_file)] == ['Small', 'Large']
+
+def test_duplicate_rows_from_older_versions_are_merged(data_file):
+    """Rows appended per scrape before canonicalization collapse into the oldest one on the next save"""
+    data_file.write_text(json.dumps([
+        {'id': 1, 'barcodeId': 'A', 'url': 'https://www.example.com/p', 'name': 'Old', 'timestamp': '2024-01-01T00:00:00'},
+        {'id': 2, 'barcodeId': 'B', 'url': 'https://example.com/p?utm_source=x', 'name': 'New', 'timestamp': '2024-02-01T00:00:00'},
+    ]))
+    response = app.save_extraction('https://example.com/p', _result(name='New'))
+
+    records = _stored(data_file)
+    assert len(records) == 1
+    assert response['id'] == 1 and records[0]['barcodeId'] == 'A'
+    assert records[0]['name'] == 'New'
+    assert [entry['values']['name'] for entry in records[0]['history']] == ['Old']
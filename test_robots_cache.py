@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+
+import pytest
+import requests
+
+import robots_cache
+from rate_limiter import DomainRateLimiter
+from robots_cache import parse_robots
+
+def test_longest_match_wins():
+    rules = parse_robots('User-agent: *\nDisallow: /shop\nAllow: /shop/products\nDisallow: /shop/products/private\n')
+    assert not rules.allowed('https://example.com/shop/cart')
+    assert rules.allowed('https://example.com/shop/products/chicken')
+    assert not rules.allowed('https://example.com/shop/products/private/1')
+    assert rules.allowed('https://example.com/about')
+
+def test_allow_beats_disallow_of_equal_length():
+    rules = parse_robots('User-agent: *\nDisallow: /page\nAllow: /page\n')
+    assert rules.allowed('https://example.com/page')
+
+def test_wildcards_and_end_anchor():
+    rules = parse_robots('User-agent: *\nDisallow: /*?sort=\nDisallow: /*.pdf$\nAllow: /*.pdf$\nDisallow: /search$\n')
+    assert not rules.allowed('https://example.com/cat/food?sort=price')
+    assert rules.allowed('https://example.com/cat/food?page=2')
+    assert rules.allowed('https://example.com/label.pdf')
+    assert not rules.allowed('https://example.com/search')
+    assert rules.allowed('https://example.com/search/results')
+
+def test_named_group_replaces_the_wildcard_group():
+    text = ('User-agent: *\nDisallow: /\n\n'
+            'User-agent: OtherBot\nUser-agent: PetScraper\nDisallow: /private\nCrawl-delay: 2\n')
+    rules = parse_robots(text, 'petscraper')
+    assert rules.allowed('https://example.com/products/1')
+    assert not rules.allowed('https://example.com/private/1')
+    assert rules.crawl_delay == 2
+    assert not parse_robots(text, 'SomeoneElse').allowed('https://example.com/products/1')
+
+def test_crawl_delay_comments_and_sitemaps():
+    rules = parse_robots('Sitemap: https://example.com/sitemap.xml\n'
+                         'User-agent: *  # everyone\nCrawl-delay: 1.5\nCrawl-delay: soon\nDisallow:\n')
+    assert rules.crawl_delay == 1.5
+    assert rules.sitemaps == ['https://example.com/sitemap.xml']
+    assert rules.allowed('https://example.com/anything')
+    assert parse_robots('User-agent: *\nDisallow: /x\n').crawl_delay is None
+
+def test_robots_txt_itself_is_always_allowed():
+    assert parse_robots('User-agent: *\nDisallow: /\n').allowed('https://example.com/robots.txt')
+
+class _Response:
+    def __init__(self, status_code, content=b''):
+        self.status_code = status_code
+        self.content = content
+
+def _fetch_with(monkeypatch, response=None, error=None):
+    def get(url, headers=None, timeout=None):
+        if error is not None:
+            raise error
+        return response
+    monkeypatch.setattr(robots_cache.requests, 'get', get)
+    return robots_cache._fetch('https://example.com', {})
+
+def test_fetch_parses_a_robots_txt(monkeypatch):
+    rules, ttl = _fetch_with(monkeypatch, _Response(200, b'User-agent: *\nDisallow: /cart\n'))
+    assert ttl == robots_cache.ROBOTS_CACHE_TTL
+    assert not rules.allowed('https://example.com/cart')
+    assert rules.allowed('https://example.com/products/1')
+
+@pytest.mark.parametrize('status', [401, 403, 404, 410])
+def test_missing_robots_txt_allows_everything(monkeypatch, status):
+    rules, ttl = _fetch_with(monkeypatch, _Response(status))
+    assert rules.allowed('https://example.com/products/1')
+    assert not rules.unreachable
+    assert ttl == robots_cache.ROBOTS_CACHE_TTL
+
+@pytest.mark.parametrize('status', [500, 503])
+def test_server_error_disallows_everything_for_a_while(monkeypatch, status):
+    rules, ttl = _fetch_with(monkeypatch, _Response(status))
+    assert not rules.allowed('https://example.com/products/1')
+    assert rules.unreachable
+    assert ttl == robots_cache.ROBOTS_ERROR_TTL
+
+def test_unreachable_host_disallows_everything(monkeypatch):
+    rules, ttl = _fetch_with(monkeypatch, error=requests.exceptions.ConnectionError('refused'))
+    assert not rules.allowed('https://example.com/products/1')
+    assert rules.unreachable
+    assert ttl == robots_cache.ROBOTS_ERROR_TTL
+
+def test_timeout_cut_short_by_the_budget_is_not_cached(monkeypatch):
+    def get(url, headers=None, timeout=None):
+        raise requests.exceptions.Timeout()
+    monkeypatch.setattr(robots_cache.requests, 'get', get)
+    with pytest.raises(requests.exceptions.Timeout):
+        robots_cache._fetch('https://example.com', {}, timeout=1)
+    rules, ttl = robots_cache._fetch('https://example.com', {})
+    assert rules.unreachable and ttl == robots_cache.ROBOTS_ERROR_TTL
+
+def test_wait_turn_skips_turns_beyond_the_cap(monkeypatch):
+    """A Crawl-delay turn further away than ROBOTS_MAX_CRAWL_DELAY (or the caller's max_wait) returns None at once"""
+    monkeypatch.setattr(robots_cache, 'crawl_delay', lambda url, headers=None, timeout=None: 60)
+    monkeypatch.setattr(robots_cache, 'crawl_limiter', DomainRateLimiter(0, key=robots_cache._origin))
+    monkeypatch.setattr(robots_cache, 'ROBOTS_MAX_CRAWL_DELAY', 30)
+    assert robots_cache.wait_turn('https://example.com/p/1') == 0.0
+    assert robots_cache.wait_turn('https://example.com/p/2') is None
+    assert robots_cache.wait_turn('https://example.com/p/2', max_wait=5) is None
+    # Another origin on the same registered domain has its own turns
+    assert robots_cache.wait_turn('https://shop.example.com/p/1') == 0.0
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+
+import threading
+
+import pytest
+
+from singleflight import SingleFlight
+
+def _start_waiters(flight, key, fn, count, results):
+    """Start `count` threads calling flight.do(key, fn), each appending (result or exception, shared)"""
+    def call():
+        try:
+            results.append(flight.do(key, fn))
+        except Exception as e:
+            results.append((e, True))
+    threads = [threading.Thread(target=call) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads
+
+def _wait_for_waiters(flight, count):
+    """Block until `count` callers are waiting on the execution in flight"""
+    for _ in range(500):
+        if flight.stats()['waiting'] == count:
+            return
+        threading.Event().wait(0.01)
+    raise AssertionError(f'expected {count} waiting callers, got {flight.stats()}')
+
+def test_concurrent_calls_share_one_execution():
+    """Callers arriving while a key is in flight get the leader's result without running fn again"""
+    flight = SingleFlight()
+    release = threading.Event()
+    runs = []
+
+    def fn():
+        runs.append(1)
+        release.wait(5)
+        return {'name': 'Chicken Dinner'}
+
+    leader_results = []
+    leader = _start_waiters(flight, 'https://example.com/p/1', fn, 1, leader_results)
+    while not runs:
+        threading.Event().wait(0.01)
+    results = []
+    threads = _start_waiters(flight, 'https://example.com/p/1', fn, 5, results)
+    _wait_for_waiters(flight, 5)
+    release.set()
+    for thread in leader + threads:
+        thread.join(5)
+
+    assert len(runs) == 1
+    assert leader_results == [({'name': 'Chicken Dinner'}, False)]
+    assert results == [({'name': 'Chicken Dinner'}, True)] * 5
+    assert results[0][0] is leader_results[0][0]
+    assert flight.stats() == {'executions': 1, 'coalesced': 5, 'in_flight': 0, 'waiting': 0}
+
+def test_different_keys_run_separately():
+    flight = SingleFlight()
+    assert flight.do('a', lambda: 1) == (1, False)
+    assert flight.do('b', lambda: 2) == (2, False)
+    assert flight.stats()['executions'] == 2
+    assert flight.stats()['coalesced'] == 0
+
+def test_nothing_is_cached_after_the_call_finishes():
+    flight = SingleFlight()
+    calls = iter([1, 2])
+    assert flight.do('a', lambda: next(calls)) == (1, False)
+    assert flight.do('a', lambda: next(calls)) == (2, False)
+
+def test_exception_reaches_the_leader_and_every_waiter():
+    """A failed execution raises the same exception in all callers, and the key can run again afterwards"""
+    flight = SingleFlight()
+    release = threading.Event()
+    started = threading.Event()
+    error = RuntimeError('fetch failed')
+
+    def fn():
+        started.set()
+        release.wait(5)
+        raise error
+
+    leader_results = []
+    leader = _start_waiters(flight, 'key', fn, 1, leader_results)
+    started.wait(5)
+    results = []
+    threads = _start_waiters(flight, 'key', fn, 3, results)
+    _wait_for_waiters(flight, 3)
+    release.set()
+    for thread in leader + threads:
+        thread.join(5)
+
+    assert [result for result, _ in leader_results + results] == [error] * 4
+    assert flight.stats()['in_flight'] == 0
+    assert flight.do('key', lambda: 'retried') == ('retried', False)
+
+def test_exception_without_waiters():
+    flight = SingleFlight()
+    with pytest.raises(ValueError):
+        flight.do('key', lambda: int('not a number'))
+    assert flight.stats()['in_flight'] == 0
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+
+import ipaddress
+from urllib.parse import parse_qsl, urlencode, urlparse
+
+from patterns import HOSTNAME_RE
+
+# Public suffixes with two labels that show up on pet food sites (e.g. petsathome.co.uk)
+TWO_LABEL_SUFFIXES = {
+    'co.uk', 'org.uk', 'ac.uk', 'com.au', 'net.au', 'org.au', 'co.nz', 'com.br', 'co.jp', 'com.mx',
+}
+
+# Query parameters that only track where a visitor came from; they never change the product shown
+TRACKING_PARAMS = {
+    'gclid', 'gclsrc', 'dclid', 'fbclid', 'msclkid', 'yclid', 'mc_cid', 'mc_eid', '_ga', '_gl', 'igshid',
+    'ref', 'ref_', 'referrer', 'cmp', 'campaign', 'affiliate', 'aff_id', 'srsltid',
+    '_pos', '_sid', '_ss', '_psq', '_fid', 'pf_rd_p', 'pf_rd_r', 'afid', 'cjevent', 'irclickid', 'clickid',
+}
+TRACKING_PARAM_PREFIXES = ('utm_', 'pk_', 'mtm_', 'hsa_', 'trk_')
+
+def registered_domain(url):
+    """Return the registered domain for a URL or host ('https://www.target.com/p/x' -> 'target.com')"""
+    if '://' not in url:
+        url = 'https://' + url
+    host = (urlparse(url).hostname or '').lower().rstrip('.')
+    labels = [label for label in host.split('.') if label]
+    if len(labels) <= 2 or host.replace('.', '').isdigit():
+        return '.'.join(labels)
+    if '.'.join(labels[-2:]) in TWO_LABEL_SUFFIXES:
+        return '.'.join(labels[-3:])
+    return '.'.join(labels[-2:])
+
+def is_valid_url(url):
+    """True for an http(s) URL with a real host: a domain name, localhost or an IP address ('https://not a url' isn't)"""
+    try:
+        parsed = urlparse(url)
+        parsed.port  # Raises ValueError for a port that isn't a number
+        host = parsed.hostname
+    except ValueError:
+        return False
+    if parsed.scheme not in ('http', 'https') or not host:
+        return False
+    try:
+        ipaddress.ip_address(host)
+        return True
+    except ValueError:
+        pass
+    try:
+        host = host.rstrip('.').encode('idna').decode('ascii')
+    except UnicodeError:
+        return False
+    return host == 'localhost' or bool(HOSTNAME_RE.match(host))
+
+def normalize_url(url):
+    """Key for 'the same page': lowercase scheme and host, no default port, fragment or trailing slash"""
+    parsed = urlparse(url if '://' in url else 'https://' + url)
+    scheme = parsed.scheme.lower()
+    host = (parsed.hostname or '').lower().rstrip('.')
+    if parsed.port and (scheme, parsed.port) not in (('http', 80), ('https', 443)):
+        host = f'{host}:{parsed.port}'
+    path = parsed.path.rstrip('/') or '/'
+    query = f'?{parsed.query}' if parsed.query else ''
+    return f'{scheme}://{host}{path}{query}'
+
+def canonicalize_url(url):
+    """
+    One URL per stored product: normalize_url() plus https, no 'www.', no tracking parameters
+    and the remaining query parameters (e.g. ?variant=) sorted, so variants of a link that show
+    the same product compare equal.
+    """
+    parsed = urlparse(normalize_url(url))
+    host = parsed.netloc
+    if host.startswith('www.'):
+        host = host[4:]
+    params = sorted((key, value) for key, value in parse_qsl(parsed.query, keep_blank_values=True)
+                    if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PARAM_PREFIXES))
+    query = f'?{urlencode(params)}' if params else ''
+    return f'https://{host}{parsed.path}{query}'
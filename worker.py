@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Worker daemon: scrape queued job items without serving the web UI.
+
+    JOB_DB_FILE=/mnt/shared/jobs.db DATA_FILE=/mnt/shared/scraped_data.json python worker.py -w 4
+
+Run one per machine (or several per machine) against the same JOB_DB_FILE. Each item is leased
+to one worker at a time, heartbeats keep the lease alive while it is scraped, and an item whose
+worker disappears is claimed again once its lease expires; after JOB_MAX_ATTEMPTS claims it is
+dead-lettered. Set JOB_WORKERS=0 on the web server to leave all scraping to the daemons.
+SIGTERM/Ctrl-C stops claiming and lets the items in progress finish.
+"""
+
+import argparse
+import signal
+import sys
+import threading
+
+import job_queue
+from app import process_job_item
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Process queued scrape jobs from the shared job database')
+    parser.add_argument('-w', '--workers', type=int, default=max(job_queue.JOB_WORKERS, 1),
+                        help="worker threads (default: JOB_WORKERS or 1)")
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error('--workers must be at least 1')
+
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+
+    job_queue.start_workers(process_job_item, args.workers)
+    print(f"Worker {job_queue.NODE_ID}: {args.workers} thread(s) on {job_queue.JOB_DB_FILE}", flush=True)
+    try:
+        while not stop.wait(1):
+            pass
+    except KeyboardInterrupt:
+        pass
+    print("Stopping: finishing items in progress", flush=True)
+    job_queue.stop_workers()
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())